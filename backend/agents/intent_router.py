@@ -1,7 +1,15 @@
 """Intent classification router with deterministic rules and hard guardrails."""
 import re
 from enum import Enum
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+from backend.agents.text_features import (
+    TextFeatures,
+    compile_any,
+    extract_features,
+    normalize_text,
+    register_keyword_set,
+)
 
 
 class IntentType(str, Enum):
@@ -135,127 +143,147 @@ APP_DIAGNOSTIC_KEYWORDS = [
 ]
 
 
-def normalize_text(text: str) -> str:
-    """Normalize text for matching: lowercase, trim, collapse whitespace."""
-    # Lowercase
-    text = text.lower()
-    
-    # Strip leading/trailing whitespace
-    text = text.strip()
-    
-    # Collapse multiple spaces
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove some punctuation for matching (but keep for context)
-    # We'll use the original for pattern matching, but normalized for keyword matching
-    return text
+# Natural-language trade intent patterns that may not include canonical verbs.
+TRADE_PHRASE_PATTERNS = [
+    r'\bget rid of\b',
+    r'\bpick up\b',
+    r'\bput\s+\$?\d+(?:\.\d+)?\s+into\b',
+    r'\bput\s+(?:all|half|\d+%?)\s+.*\s+into\b',
+]
+
+# Price queries are never holdings queries ("BTC price" but not "BTC balance").
+PRICE_QUERY_PATTERNS = [
+    r'price of',
+    r'current price',
+    r'what\'?s the price',
+    r'how much is (\w+) worth',
+    r'(\w+) price\b',
+]
+
+# Symbol normalization map for holdings queries
+HOLDINGS_SYMBOL_MAP = {
+    'bitcoin': 'BTC', 'btc': 'BTC',
+    'ethereum': 'ETH', 'eth': 'ETH',
+    'solana': 'SOL', 'sol': 'SOL',
+    'cardano': 'ADA', 'ada': 'ADA',
+    'polkadot': 'DOT', 'dot': 'DOT',
+    'polygon': 'MATIC', 'matic': 'MATIC',
+    'avalanche': 'AVAX', 'avax': 'AVAX',
+    'chainlink': 'LINK', 'link': 'LINK',
+    'uniswap': 'UNI', 'uni': 'UNI',
+    'cosmos': 'ATOM', 'atom': 'ATOM',
+    'ripple': 'XRP', 'xrp': 'XRP',
+    'dogecoin': 'DOGE', 'doge': 'DOGE',
+    'shib': 'SHIB',
+    'litecoin': 'LTC', 'ltc': 'LTC',
+    'stellar': 'XLM', 'xlm': 'XLM',
+}
+
+PORTFOLIO_REFERENCE_PHRASES = ["biggest position", "largest holding", "top holding"]
+ACTION_VERBS = ["buy", "sell", "close", "exit", "liquidate", "rebalance", "reduce"]
+COMPARATIVE_SYMBOLS = ['btc', 'eth', 'sol', 'ada', 'dot', 'matic', 'avax', 'bitcoin', 'ethereum']
+
+
+# Compiled once at import; boolean checks use a single alternation per list.
+_GREETING_RE = compile_any(GREETING_PATTERNS)
+_OUT_OF_SCOPE_RE = compile_any(OUT_OF_SCOPE_PATTERNS)
+_PORTFOLIO_ANALYSIS_RE = compile_any(PORTFOLIO_ANALYSIS_PATTERNS)
+_TRADE_PHRASE_RE = compile_any(TRADE_PHRASE_PATTERNS)
+_PRICE_QUERY_RE = compile_any(PRICE_QUERY_PATTERNS)
+_HOLDINGS_QUERY_RES = [re.compile(p) for p in HOLDINGS_QUERY_PATTERNS]
+
+register_keyword_set("capabilities", CAPABILITIES_KEYWORDS)
+register_keyword_set("finance", FINANCE_KEYWORDS)
+register_keyword_set("trade_execution", TRADE_EXECUTION_KEYWORDS)
+register_keyword_set("portfolio", PORTFOLIO_KEYWORDS)
+register_keyword_set("app_diagnostic", APP_DIAGNOSTIC_KEYWORDS)
+register_keyword_set("crypto_symbols", CRYPTO_SYMBOLS)
+register_keyword_set("holdings_symbols", HOLDINGS_SYMBOL_MAP)
+register_keyword_set("portfolio_reference", PORTFOLIO_REFERENCE_PHRASES)
+register_keyword_set("action_verbs", ACTION_VERBS)
+register_keyword_set("comparative_symbols", COMPARATIVE_SYMBOLS)
+
+
+def _is_greeting(f: TextFeatures) -> bool:
+    return _GREETING_RE.search(f.normalized) is not None
+
+
+def _is_out_of_scope(f: TextFeatures) -> bool:
+    if _OUT_OF_SCOPE_RE.search(f.normalized) is None:
+        return False
+    # Exception: if query also contains strong finance keywords, it might be contextual
+    # e.g., "how could an election affect BTC volatility?"
+    # At least 2 finance keywords = likely finance context
+    return f.count("finance") < 2
+
+
+def _has_trade_execution_keywords(f: TextFeatures) -> bool:
+    if f.has_any("trade_execution"):
+        return True
+    return _TRADE_PHRASE_RE.search(f.normalized) is not None
+
+
+def _is_portfolio_analysis_request(f: TextFeatures) -> bool:
+    return _PORTFOLIO_ANALYSIS_RE.search(f.normalized) is not None
+
+
+def _is_holdings_query(f: TextFeatures) -> bool:
+    normalized = f.normalized
+    if _PRICE_QUERY_RE.search(normalized):
+        return False
+
+    for pattern in _HOLDINGS_QUERY_RES:
+        match = pattern.search(normalized)
+        if match:
+            # Extract the potential asset symbol from the match
+            for g in match.groups():
+                if g and g.lower() in CRYPTO_SYMBOLS:
+                    return True
+            # Also check if any crypto symbol appears in the text
+            if f.has_any("crypto_symbols"):
+                return True
+
+    return False
 
 
 def is_greeting(text: str) -> bool:
     """Check if text is a greeting."""
-    normalized = normalize_text(text)
-    
-    for pattern in GREETING_PATTERNS:
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _is_greeting(extract_features(text))
 
 
 def is_capabilities_help(text: str) -> bool:
     """Check if text is asking for capabilities/help."""
-    normalized = normalize_text(text)
-    
-    for keyword in CAPABILITIES_KEYWORDS:
-        if keyword in normalized:
-            return True
-    
-    return False
+    return extract_features(text).has_any("capabilities")
 
 
 def is_out_of_scope(text: str) -> bool:
     """Check if text is out of scope (politics, sports, trivia, etc.)."""
-    normalized = normalize_text(text)
-    
-    # Check hard out-of-scope patterns
-    for pattern in OUT_OF_SCOPE_PATTERNS:
-        if re.search(pattern, normalized):
-            # Exception: if query also contains strong finance keywords, it might be contextual
-            # e.g., "how could an election affect BTC volatility?"
-            if has_finance_keywords(text):
-                # Count finance keywords
-                finance_count = sum(1 for kw in FINANCE_KEYWORDS if kw in normalized)
-                if finance_count >= 2:  # At least 2 finance keywords = likely finance context
-                    return False
-            return True
-    
-    return False
+    return _is_out_of_scope(extract_features(text))
 
 
 def has_finance_keywords(text: str) -> bool:
     """Check if text contains finance/trading keywords."""
-    normalized = normalize_text(text)
-    
-    for keyword in FINANCE_KEYWORDS:
-        if keyword in normalized:
-            return True
-    
-    return False
+    return extract_features(text).has_any("finance")
 
 
 def has_trade_execution_keywords(text: str) -> bool:
     """Check if text contains trade execution keywords."""
-    normalized = normalize_text(text)
-    
-    for keyword in TRADE_EXECUTION_KEYWORDS:
-        if keyword in normalized:
-            return True
-
-    # Natural-language trade intent patterns that may not include canonical verbs.
-    phrase_patterns = [
-        r'\bget rid of\b',
-        r'\bpick up\b',
-        r'\bput\s+\$?\d+(?:\.\d+)?\s+into\b',
-        r'\bput\s+(?:all|half|\d+%?)\s+.*\s+into\b',
-    ]
-    for pattern in phrase_patterns:
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _has_trade_execution_keywords(extract_features(text))
 
 
 def has_portfolio_keywords(text: str) -> bool:
     """Check if text contains portfolio keywords."""
-    normalized = normalize_text(text)
-    
-    for keyword in PORTFOLIO_KEYWORDS:
-        if keyword in normalized:
-            return True
-    
-    return False
+    return extract_features(text).has_any("portfolio")
 
 
 def has_app_diagnostic_keywords(text: str) -> bool:
     """Check if text contains app diagnostic keywords."""
-    normalized = normalize_text(text)
-    
-    for keyword in APP_DIAGNOSTIC_KEYWORDS:
-        if keyword in normalized:
-            return True
-    
-    return False
+    return extract_features(text).has_any("app_diagnostic")
 
 
 def is_portfolio_analysis_request(text: str) -> bool:
     """Check if text is explicitly requesting portfolio analysis (not just mentioning portfolio)."""
-    normalized = normalize_text(text)
-    
-    for pattern in PORTFOLIO_ANALYSIS_PATTERNS:
-        if re.search(pattern, normalized):
-            return True
-    
-    return False
+    return _is_portfolio_analysis_request(extract_features(text))
 
 
 def is_holdings_query(text: str) -> bool:
@@ -271,34 +299,7 @@ def is_holdings_query(text: str) -> bool:
     - "What's the price of BTC?" (price query)
     - "Analyze BTC volatility" (analysis query)
     """
-    normalized = normalize_text(text)
-    
-    # Exclude price queries
-    price_patterns = [
-        r'price of',
-        r'current price',
-        r'what\'?s the price',
-        r'how much is (\w+) worth',
-        r'(\w+) price\b',  # "BTC price" but not "BTC balance"
-    ]
-    for pattern in price_patterns:
-        if re.search(pattern, normalized):
-            return False
-    
-    for pattern in HOLDINGS_QUERY_PATTERNS:
-        match = re.search(pattern, normalized)
-        if match:
-            # Extract the potential asset symbol from the match
-            groups = match.groups()
-            for g in groups:
-                if g and g.lower() in CRYPTO_SYMBOLS:
-                    return True
-            # Also check if any crypto symbol appears in the text
-            for symbol in CRYPTO_SYMBOLS:
-                if symbol in normalized:
-                    return True
-    
-    return False
+    return _is_holdings_query(extract_features(text))
 
 
 def extract_holdings_asset(text: str) -> Optional[str]:
@@ -312,115 +313,73 @@ def extract_holdings_asset(text: str) -> Optional[str]:
     - "What is my bitcoin balance?" -> "BTC"
     - "Do I have any ethereum?" -> "ETH"
     """
-    normalized = normalize_text(text)
-    
-    # Symbol normalization map
-    symbol_map = {
-        'bitcoin': 'BTC', 'btc': 'BTC',
-        'ethereum': 'ETH', 'eth': 'ETH',
-        'solana': 'SOL', 'sol': 'SOL',
-        'cardano': 'ADA', 'ada': 'ADA',
-        'polkadot': 'DOT', 'dot': 'DOT',
-        'polygon': 'MATIC', 'matic': 'MATIC',
-        'avalanche': 'AVAX', 'avax': 'AVAX',
-        'chainlink': 'LINK', 'link': 'LINK',
-        'uniswap': 'UNI', 'uni': 'UNI',
-        'cosmos': 'ATOM', 'atom': 'ATOM',
-        'ripple': 'XRP', 'xrp': 'XRP',
-        'dogecoin': 'DOGE', 'doge': 'DOGE',
-        'shib': 'SHIB',
-        'litecoin': 'LTC', 'ltc': 'LTC',
-        'stellar': 'XLM', 'xlm': 'XLM',
-    }
+    f = extract_features(text)
     
     # Try each pattern to extract asset
-    for pattern in HOLDINGS_QUERY_PATTERNS:
-        match = re.search(pattern, normalized)
+    for pattern in _HOLDINGS_QUERY_RES:
+        match = pattern.search(f.normalized)
         if match:
-            groups = match.groups()
-            for g in groups:
-                if g and g.lower() in symbol_map:
-                    return symbol_map[g.lower()]
+            for g in match.groups():
+                if g and g.lower() in HOLDINGS_SYMBOL_MAP:
+                    return HOLDINGS_SYMBOL_MAP[g.lower()]
     
     # Fallback: find any known symbol in the text
-    for symbol, normalized_symbol in symbol_map.items():
-        if symbol in normalized:
-            return normalized_symbol
+    if f.has_any("holdings_symbols"):
+        for symbol, normalized_symbol in HOLDINGS_SYMBOL_MAP.items():
+            if f.contains(symbol):
+                return normalized_symbol
     
     return None
 
 
-def classify_intent(text: str) -> IntentType:
-    """
-    Classify user intent using deterministic rules.
-    
-    Priority order:
-    1. GREETING (high precision)
-    2. CAPABILITIES_HELP
-    3. OUT_OF_SCOPE (hard block)
-    4. APP_DIAGNOSTICS
-    5. PORTFOLIO_ANALYSIS (explicit analysis request - must check before TRADE_EXECUTION)
-    6. TRADE_EXECUTION (if has trade keywords)
-    7. PORTFOLIO (if has portfolio keywords but not explicit analysis request)
-    8. FINANCE_ANALYSIS (if has finance keywords)
-    9. OUT_OF_SCOPE (default fallback)
-    """
-    if not text or not text.strip():
+def classify_features(f: TextFeatures) -> IntentType:
+    """Classify an already-extracted feature vector (see ``classify_intent``)."""
+    if not f.normalized:
         return IntentType.OUT_OF_SCOPE
-    
+
     # 1. Check for greeting (high precision, short queries)
-    if is_greeting(text):
+    if _is_greeting(f):
         return IntentType.GREETING
     
     # 2. Check for capabilities/help
-    if is_capabilities_help(text):
+    if f.has_any("capabilities"):
         return IntentType.CAPABILITIES_HELP
     
     # 3. Check for out-of-scope (hard block)
-    if is_out_of_scope(text):
+    if _is_out_of_scope(f):
         return IntentType.OUT_OF_SCOPE
     
     # 4. Check for app diagnostics
-    if has_app_diagnostic_keywords(text):
+    if f.has_any("app_diagnostic"):
         return IntentType.APP_DIAGNOSTICS
     
     # 5. Check for explicit portfolio analysis request (BEFORE trade execution check)
     # This handles "Analyze my portfolio" type commands
-    if is_portfolio_analysis_request(text):
+    if _is_portfolio_analysis_request(f):
         return IntentType.PORTFOLIO_ANALYSIS
     
     # 5b. Check for specific asset holdings queries (BEFORE trade execution check)
     # This handles "How much BTC do I own?" type queries that need live data
-    if is_holdings_query(text):
+    if _is_holdings_query(f):
         return IntentType.PORTFOLIO_ANALYSIS
     
     # 6. Check for trade execution (buy/sell/close/rebalance orders)
     # Portfolio references should route to execution when paired with an action.
-    normalized = normalize_text(text)
-    has_portfolio_reference = any(
-        phrase in normalized for phrase in ("biggest position", "largest holding", "top holding")
-    )
-    has_action_verb = any(
-        verb in normalized for verb in ("buy", "sell", "close", "exit", "liquidate", "rebalance", "reduce")
-    )
-    if has_portfolio_reference and has_action_verb:
+    if f.has_any("portfolio_reference") and f.has_any("action_verbs"):
         return IntentType.TRADE_EXECUTION
 
-    if has_trade_execution_keywords(text):
+    if _has_trade_execution_keywords(f):
         return IntentType.TRADE_EXECUTION
 
     # 7. Check for portfolio vs finance analysis
     # If text has both portfolio and finance keywords with specific crypto symbols,
     # prefer FINANCE_ANALYSIS (e.g., "Compare ETH vs BTC returns")
-    is_portfolio = has_portfolio_keywords(text)
-    is_finance = has_finance_keywords(text)
+    is_portfolio = f.has_any("portfolio")
+    is_finance = f.has_any("finance")
 
     if is_portfolio and is_finance:
-        # Count crypto symbols — if present, this is comparative analysis, not portfolio
-        normalized = normalize_text(text)
-        crypto_symbols = ['btc', 'eth', 'sol', 'ada', 'dot', 'matic', 'avax', 'bitcoin', 'ethereum']
-        symbol_count = sum(1 for s in crypto_symbols if s in normalized)
-        if symbol_count >= 1:
+        # Crypto symbols present means comparative analysis, not portfolio
+        if f.has_any("comparative_symbols"):
             return IntentType.FINANCE_ANALYSIS
         return IntentType.PORTFOLIO
 
@@ -433,3 +392,31 @@ def classify_intent(text: str) -> IntentType:
     
     # 9. Default: out of scope
     return IntentType.OUT_OF_SCOPE
+
+
+def classify_intent(text: str) -> IntentType:
+    """
+    Classify user intent using deterministic rules.
+    
+    Priority order:
+    1. GREETING (high precision)
+    2. CAPABILITIES_HELP
+    3. OUT_OF_SCOPE (hard block)
+    4. APP_DIAGNOSTICS
+    5. PORTFOLIO_ANALYSIS (explicit analysis request - must check before TRADE_EXECUTION)
+    6. TRADE_EXECUTION (if has trade keywords)
+    7. PORTFOLIO (if has portfolio keywords but not explicit analysis request)
+    8. FINANCE_ANALYSIS (if has finance keywords)
+    9. OUT_OF_SCOPE (default fallback)
+
+    The text is normalized and keyword-matched exactly once (see
+    ``backend.agents.text_features``); the parsers reuse the same features.
+    """
+    if not text or not text.strip():
+        return IntentType.OUT_OF_SCOPE
+    return classify_features(extract_features(text))
+
+
+def classify_many(texts: Iterable[str]) -> List[IntentType]:
+    """Classify a batch of messages, sharing features for repeated inputs."""
+    return [classify_intent(t) for t in texts]
@@ -0,0 +1,199 @@
+"""Compiled text front-end shared by the intent router and trade parsers.
+
+Every chat message used to be lowercased and whitespace-collapsed once per
+keyword check, then scanned list-by-list with substring tests. This module
+normalizes a message once and runs all registered keyword sets through a
+single Aho-Corasick automaton, producing an immutable ``TextFeatures`` vector
+that the router and parsers consult with cheap set operations.
+
+Keyword sets are registered by the modules that own them (see
+``intent_router`` and ``trade_parser``); the automaton is rebuilt lazily the
+first time features are extracted after a registration.
+"""
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for matching: lowercase, trim, collapse whitespace."""
+    return _WHITESPACE_RE.sub(' ', text.lower().strip())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting every keyword that occurs as a substring.
+
+    Matching semantics are identical to ``any(kw in text for kw in keywords)``
+    evaluated for every keyword at once, including overlapping matches.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+
+        pending: List[set] = [set()]
+        for keyword in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    pending.append(set())
+                state = nxt
+            pending[state].add(keyword)
+
+        # Breadth-first pass to compute failure links and merged outputs.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                pending[nxt] |= pending[self._fail[nxt]]
+
+        self._out = [frozenset(s) for s in pending]
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the set of keywords occurring anywhere in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        hits: set = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits |= out[state]
+        return frozenset(hits)
+
+
+_registry_lock = threading.Lock()
+_keyword_sets: Dict[str, FrozenSet[str]] = {}
+_automaton: Optional[KeywordAutomaton] = None
+
+
+def register_keyword_set(name: str, keywords: Iterable[str]) -> None:
+    """Register (or replace) a named keyword set matched by the shared automaton."""
+    global _automaton
+    with _registry_lock:
+        _keyword_sets[name] = frozenset(k for k in keywords if k)
+        _automaton = None
+    extract_features.cache_clear()
+
+
+def keyword_set(name: str) -> FrozenSet[str]:
+    """Return a registered keyword set (empty if unknown)."""
+    return _keyword_sets.get(name, frozenset())
+
+
+def _get_automaton() -> KeywordAutomaton:
+    global _automaton
+    automaton = _automaton
+    if automaton is None:
+        with _registry_lock:
+            if _automaton is None:
+                union: set = set()
+                for keywords in _keyword_sets.values():
+                    union |= keywords
+                _automaton = KeywordAutomaton(sorted(union))
+            automaton = _automaton
+    return automaton
+
+
+@dataclass(frozen=True)
+class TextFeatures:
+    """Feature vector for one message.
+
+    ``lower`` is ``text.lower().strip()`` (what the trade parsers match on);
+    ``normalized`` additionally collapses whitespace (what the intent router
+    matches on). ``hits`` / ``lower_hits`` hold every registered keyword found
+    in the respective form.
+    """
+    raw: str
+    lower: str
+    normalized: str
+    hits: FrozenSet[str]
+    lower_hits: FrozenSet[str]
+
+    def matches(self, name: str) -> FrozenSet[str]:
+        """Keywords from set ``name`` present in the normalized text."""
+        return self.hits & keyword_set(name)
+
+    def has_any(self, name: str) -> bool:
+        """True when any keyword from set ``name`` occurs in the normalized text."""
+        return not self.hits.isdisjoint(keyword_set(name))
+
+    def count(self, name: str) -> int:
+        """Number of distinct keywords from set ``name`` in the normalized text."""
+        return len(self.matches(name))
+
+    def has_any_lower(self, name: str) -> bool:
+        """Like ``has_any`` but against ``lower`` (whitespace not collapsed)."""
+        return not self.lower_hits.isdisjoint(keyword_set(name))
+
+    def contains(self, keyword: str) -> bool:
+        """Membership test for a single registered keyword in the normalized text."""
+        return keyword in self.hits
+
+
+@lru_cache(maxsize=512)
+def extract_features(text: str) -> TextFeatures:
+    """Normalize ``text`` once and match all registered keyword sets.
+
+    Results are memoized per exact input string, so the router and the
+    parsers share one extraction when they see the same message.
+    """
+    automaton = _get_automaton()
+    lower = text.lower().strip()
+    normalized = _WHITESPACE_RE.sub(' ', lower)
+    hits = automaton.find(normalized)
+    lower_hits = hits if lower == normalized else automaton.find(lower)
+    return TextFeatures(
+        raw=text,
+        lower=lower,
+        normalized=normalized,
+        hits=hits,
+        lower_hits=lower_hits,
+    )
+
+
+def compile_any(patterns: Iterable[str], flags: int = 0) -> "re.Pattern[str]":
+    """Compile a list of alternative regexes into one pattern for boolean checks."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+
+def compile_alias_matcher(aliases: Dict[str, str]) -> Tuple["re.Pattern[str]", Dict[str, int]]:
+    """Build a single word-bounded matcher for an alias -> symbol map.
+
+    Returns the compiled pattern plus each alias' priority rank (longest alias
+    first, dict order for ties). The pattern is a zero-width lookahead, so
+    ``finditer`` reports the highest-priority alias starting at every offset.
+    """
+    ordered = sorted(aliases, key=lambda a: -len(a))
+    rank = {alias: i for i, alias in enumerate(ordered)}
+    body = '|'.join(re.escape(a) for a in ordered)
+    return re.compile(rf'(?=\b({body})\b)'), rank
+
+
+def best_alias(pattern: "re.Pattern[str]", rank: Dict[str, int], text: str) -> Optional[str]:
+    """Return the highest-priority alias found in ``text`` (or None)."""
+    best = None
+    for match in pattern.finditer(text):
+        alias = match.group(1)
+        if best is None or rank[alias] < rank[best]:
+            best = alias
+    return best
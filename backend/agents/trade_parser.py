@@ -10,6 +10,13 @@ from enum import Enum
 from typing import Optional, Literal, List
 from pydantic import BaseModel
 
+from backend.agents.text_features import (
+    best_alias,
+    compile_alias_matcher,
+    extract_features,
+    register_keyword_set,
+)
+
 
 # Crypto symbols and their aliases
 CRYPTO_SYMBOLS = {
@@ -117,6 +124,59 @@ STOCK_SYMBOLS = {
 # Keywords that indicate asset class
 CRYPTO_KEYWORDS = ['crypto', 'cryptocurrency', 'coin', 'token', 'defi']
 STOCK_KEYWORDS = ['stock', 'stocks', 'equity', 'equities', 'share', 'shares', 'etf']
+PAPER_KEYWORDS = ['paper', 'simulation', 'test trade']
+
+_SELL_LAST_PATTERNS = [
+    'sell last purchase', 'sell my last purchase', 'sell the last purchase',
+    'sell last buy', 'sell the last buy', 'sell previous purchase',
+    'sell previous buy', 'sell last asset', 'sell the last asset',
+    'sell last', 'undo last buy', 'reverse last buy',
+    'last purchase', 'last buy', 'previous purchase',
+]
+
+register_keyword_set("trade_crypto_keywords", CRYPTO_KEYWORDS)
+register_keyword_set("trade_stock_keywords", STOCK_KEYWORDS)
+register_keyword_set("trade_paper_keywords", PAPER_KEYWORDS)
+register_keyword_set("trade_sell_last", _SELL_LAST_PATTERNS)
+
+# Single-pass alias matchers (longest alias wins, as with the old sorted scan).
+_CRYPTO_ALIAS_RE, _CRYPTO_ALIAS_RANK = compile_alias_matcher(CRYPTO_SYMBOLS)
+_STOCK_ALIAS_RE, _STOCK_ALIAS_RANK = compile_alias_matcher(STOCK_SYMBOLS)
+
+# Precompiled patterns used on every parse.
+_SELL_LAST_RE = re.compile(r'sell\b.*\blast\s+(?:purchase|buy|asset)')
+_PUT_INTO_RE = re.compile(r'\bput\s+\$?\d+(?:\.\d+)?\s+into\b')
+_POSITION_EXPOSURE_RE = re.compile(r'\b(position|exposure)\b')
+_WHICHEVER_DOWN_RE = re.compile(r'whichever.*down|down.*most')
+_THRESHOLD_UP_RE = re.compile(r'(?:up|above|over|>)\s*(\d+(?:\.\d+)?)\s*%')
+_THRESHOLD_DOWN_RE = re.compile(r'(?:down|below|under|<)\s*(\d+(?:\.\d+)?)\s*%')
+_LEGACY_TIME_RE = re.compile(r'(?:last\s+)?(\d+)\s*(min(?:ute)?s?|m|hours?|h|days?|d|weeks?|w)\b')
+_FULL_POSITION_SELL_RE = re.compile(r"\bsell\b(?:\s+my)?\s+(?:complete|entire|full)\s+(?:holding|position)\b")
+_CLOSE_EXIT_RE = re.compile(r'\b(close|exit|liquidate)\b')
+_SELL_ALL_RE = re.compile(r'\bsell\s+(all|everything|entire|entirely|full)\b')
+_DUMP_RE = re.compile(r'\b(dump|get rid of)\b')
+_ROTATE_OUT_RE = re.compile(r'\brotate out of\b')
+_HOLDINGS_WORD_RE = re.compile(r'\b(holdings?|positions?|portfolio)\b')
+_CLOSE_ALL_RE = re.compile(r'\b(close|exit|liquidate)\s+(all|everything|portfolio|positions?)\b')
+_PCT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_HALF_RE = re.compile(r'\bhalf\b')
+_QUARTER_RE = re.compile(r'\b(a\s+quarter|quarter)\b')
+_REBALANCE_RE = re.compile(r'\brebalance\b')
+_USD_PREFIX_RE = re.compile(r'\$\s*(\d+(?:\.\d+)?)')
+_USD_SUFFIX_RE = re.compile(r'(\d+(?:\.\d+)?)\s*\$')
+_USD_CODE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*usd\b')
+_USD_WORD_RE = re.compile(r'(\d+(?:\.\d+)?)\s*dollars?\b')
+_QTY_RE = re.compile(
+    r'\b(?:buy|sell|close|exit|liquidate|rebalance|reduce)\s+(\d+(?:\.\d+)?)\s+([a-zA-Z]{2,10})\b'
+)
+_PORTFOLIO_REF_RE = re.compile(r'\b(biggest position|largest holding|top holding|biggest holding|largest position)\b')
+_LOSER_RE = re.compile(r'\b(biggest loser|down the most)\b')
+_TICKER_TOKEN_RE = re.compile(r'\b([A-Z]{2,10})\b')
+_OF_WORD_RE = re.compile(r'\bof\s+(\w+)')
+_SINGLE_ASSET_ALL_RE = re.compile(r'\b(?:sell|close|exit|liquidate)\s+(?:all|full|entire)\s+of\s+([a-zA-Z0-9_-]+)\b')
+_CHUNK_SPLIT_RE = re.compile(r'\s*;\s*|\s+\bthen\b\s+', re.IGNORECASE)
+_AND_SPLIT_RE = re.compile(r'\s+\band\b\s+', re.IGNORECASE)
+_CHUNK_SIDE_RE = re.compile(r'\b(buy|sell|close|exit|liquidate|rebalance|reduce|invest|dump|rotate|cut)\b')
 
 
 class ParsedTradeCommand(BaseModel):
@@ -173,23 +233,17 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
         "Buy the most profitable crypto last 24h for $10" → {side: buy, is_most_profitable: True, amount_usd: 10}
         "Buy $10 BTC paper" → {side: buy, asset: BTC, amount_usd: 10, mode: PAPER}
     """
-    text_lower = text.lower().strip()
+    features = extract_features(text)
+    text_lower = features.lower
     result = ParsedTradeCommand(raw_text=text)
 
     # Detect "sell last purchase" / "sell last" / "sell previous" patterns
     # Also handles "sell $2 of last purchase" and "sell 2 dollars of last purchase"
-    _sell_last_patterns = [
-        'sell last purchase', 'sell my last purchase', 'sell the last purchase',
-        'sell last buy', 'sell the last buy', 'sell previous purchase',
-        'sell previous buy', 'sell last asset', 'sell the last asset',
-        'sell last', 'undo last buy', 'reverse last buy',
-        'last purchase', 'last buy', 'previous purchase',
-    ]
     # Match if any pattern is present AND "sell" is in the text
-    _has_sell_last = any(pat in text_lower for pat in _sell_last_patterns) and 'sell' in text_lower
+    _has_sell_last = features.has_any_lower("trade_sell_last") and 'sell' in text_lower
     # Also match regex for "sell ... last purchase/buy"
     if not _has_sell_last:
-        _has_sell_last = bool(re.search(r'sell\b.*\blast\s+(?:purchase|buy|asset)', text_lower))
+        _has_sell_last = bool(_SELL_LAST_RE.search(text_lower))
     if _has_sell_last:
         result.is_sell_last_purchase = True
         result.side = "sell"
@@ -199,7 +253,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
         or 'purchase' in text_lower
         or 'invest' in text_lower
         or 'pick up' in text_lower
-        or re.search(r'\bput\s+\$?\d+(?:\.\d+)?\s+into\b', text_lower)
+        or _PUT_INTO_RE.search(text_lower)
     ):
         result.side = "buy"
     elif (
@@ -207,7 +261,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
         or 'dump' in text_lower
         or 'get rid of' in text_lower
         or 'rotate out of' in text_lower
-        or ('cut' in text_lower and re.search(r'\b(position|exposure)\b', text_lower))
+        or ('cut' in text_lower and _POSITION_EXPOSURE_RE.search(text_lower))
     ):
         result.side = "sell"
 
@@ -235,7 +289,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
             'worst performing', 'lowest performing',
             'down the most', 'biggest loser', 'worst crypto', 'least performing',
         ))
-        or re.search(r'whichever.*down|down.*most', _text_norm)
+        or _WHICHEVER_DOWN_RE.search(_text_norm)
     ):
         result.is_most_profitable = True
         result.selection_criteria = "lowest_performing"
@@ -248,11 +302,11 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
                 result.amount_mode = AmountMode.ALL.value
 
     # Parse threshold filters (e.g., "up 20%", "down 5%", "> 10%")
-    threshold_match = re.search(r'(?:up|above|over|>)\s*(\d+(?:\.\d+)?)\s*%', text_lower)
+    threshold_match = _THRESHOLD_UP_RE.search(text_lower)
     if threshold_match:
         result.threshold_pct = float(threshold_match.group(1))
     else:
-        threshold_match = re.search(r'(?:down|below|under|<)\s*(\d+(?:\.\d+)?)\s*%', text_lower)
+        threshold_match = _THRESHOLD_DOWN_RE.search(text_lower)
         if threshold_match:
             result.threshold_pct = -float(threshold_match.group(1))
 
@@ -278,8 +332,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
             emit_timeframe_parse_telemetry(parse_result, text)
     except Exception:
         # Fallback to legacy parsing if timeframe_parser fails
-        time_pattern = r'(?:last\s+)?(\d+)\s*(min(?:ute)?s?|m|hours?|h|days?|d|weeks?|w)\b'
-        time_match = re.search(time_pattern, text_lower)
+        time_match = _LEGACY_TIME_RE.search(text_lower)
         
         if time_match:
             value = int(time_match.group(1))
@@ -307,14 +360,12 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
     # Parse amount mode qualifiers first.
     # Interpret "sell all / close / exit / liquidate" and
     # "sell my complete holding/position" as ALL.
-    full_position_sell = bool(
-        re.search(r"\bsell\b(?:\s+my)?\s+(?:complete|entire|full)\s+(?:holding|position)\b", text_lower)
-    )
+    full_position_sell = bool(_FULL_POSITION_SELL_RE.search(text_lower))
     if (
-        re.search(r'\b(close|exit|liquidate)\b', text_lower)
-        or re.search(r'\bsell\s+(all|everything|entire|entirely|full)\b', text_lower)
-        or re.search(r'\b(dump|get rid of)\b', text_lower)
-        or re.search(r'\brotate out of\b', text_lower)
+        _CLOSE_EXIT_RE.search(text_lower)
+        or _SELL_ALL_RE.search(text_lower)
+        or _DUMP_RE.search(text_lower)
+        or _ROTATE_OUT_RE.search(text_lower)
         or full_position_sell
     ):
         result.amount_mode = AmountMode.ALL.value
@@ -322,26 +373,26 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
             result.side = "sell"
 
     multi_holdings_sell = bool(
-        re.search(r'\bsell\s+(all|everything|entire|entirely|full)\b', text_lower)
-        and re.search(r'\b(holdings?|positions?|portfolio)\b', text_lower)
-    ) or bool(re.search(r'\b(close|exit|liquidate)\s+(all|everything|portfolio|positions?)\b', text_lower))
+        _SELL_ALL_RE.search(text_lower)
+        and _HOLDINGS_WORD_RE.search(text_lower)
+    ) or bool(_CLOSE_ALL_RE.search(text_lower))
 
     # Detect percentage instructions.
     # "half" => 50%, "quarter" => 25%, explicit "N%".
-    pct_match = re.search(r'(\d+(?:\.\d+)?)\s*%', text_lower)
+    pct_match = _PCT_RE.search(text_lower)
     if pct_match:
         result.amount_mode = AmountMode.PERCENT.value
         result.amount_pct = float(pct_match.group(1))
-    elif re.search(r'\bhalf\b', text_lower):
+    elif _HALF_RE.search(text_lower):
         result.amount_mode = AmountMode.PERCENT.value
         result.amount_pct = 50.0
-    elif re.search(r'\b(a\s+quarter|quarter)\b', text_lower):
+    elif _QUARTER_RE.search(text_lower):
         result.amount_mode = AmountMode.PERCENT.value
         result.amount_pct = 25.0
 
     # Detect target allocation instructions.
     # e.g. "rebalance to 60% BTC"
-    if re.search(r'\brebalance\b', text_lower) and pct_match:
+    if _REBALANCE_RE.search(text_lower) and pct_match:
         result.amount_mode = AmountMode.TARGET_ALLOC.value
         result.amount_pct = float(pct_match.group(1))
 
@@ -352,69 +403,56 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
     # - "10 dollars" or "10 dollar"
     
     # Format 1: $X (dollar sign before amount)
-    usd_match = re.search(r'\$\s*(\d+(?:\.\d+)?)', text)
+    usd_match = _USD_PREFIX_RE.search(text)
     if usd_match:
         result.amount_usd = float(usd_match.group(1))
         result.amount_mode = AmountMode.QUOTE_USD.value
     
     # Format 2: X$ (dollar sign after amount)
     if result.amount_usd is None:
-        usd_match = re.search(r'(\d+(?:\.\d+)?)\s*\$', text)
+        usd_match = _USD_SUFFIX_RE.search(text)
         if usd_match:
             result.amount_usd = float(usd_match.group(1))
             result.amount_mode = AmountMode.QUOTE_USD.value
     
     # Format 3: X USD or X usd (with or without space)
     if result.amount_usd is None:
-        usd_match = re.search(r'(\d+(?:\.\d+)?)\s*usd\b', text_lower)
+        usd_match = _USD_CODE_RE.search(text_lower)
         if usd_match:
             result.amount_usd = float(usd_match.group(1))
             result.amount_mode = AmountMode.QUOTE_USD.value
     
     # Format 4: X dollars or X dollar
     if result.amount_usd is None:
-        usd_match = re.search(r'(\d+(?:\.\d+)?)\s*dollars?\b', text_lower)
+        usd_match = _USD_WORD_RE.search(text_lower)
         if usd_match:
             result.amount_usd = float(usd_match.group(1))
             result.amount_mode = AmountMode.QUOTE_USD.value
 
     # Parse base-quantity amount for "sell/buy 0.5 BTC" style commands.
-    qty_match = re.search(
-        r'\b(?:buy|sell|close|exit|liquidate|rebalance|reduce)\s+(\d+(?:\.\d+)?)\s+([a-zA-Z]{2,10})\b',
-        text_lower,
-    )
+    qty_match = _QTY_RE.search(text_lower)
     if qty_match and result.amount_usd is None:
         result.amount_mode = AmountMode.QUANTITY.value
         result.amount_qty = float(qty_match.group(1))
 
     # === Detect asset class from keywords first ===
-    has_crypto_keyword = any(kw in text_lower for kw in CRYPTO_KEYWORDS)
-    has_stock_keyword = any(kw in text_lower for kw in STOCK_KEYWORDS)
+    has_crypto_keyword = features.has_any_lower("trade_crypto_keywords")
+    has_stock_keyword = features.has_any_lower("trade_stock_keywords")
 
     # === Parse asset/symbol and determine asset_class ===
-    found_crypto = None
-    found_stock = None
-
-    # Check crypto symbols (check longer names first to avoid partial matches)
-    for alias, symbol in sorted(CRYPTO_SYMBOLS.items(), key=lambda x: -len(x[0])):
-        # Use word boundary matching to avoid false positives
-        if re.search(rf'\b{re.escape(alias)}\b', text_lower):
-            found_crypto = symbol
-            break
-
-    # Check stock symbols (check longer names first)
-    for alias, symbol in sorted(STOCK_SYMBOLS.items(), key=lambda x: -len(x[0])):
-        if re.search(rf'\b{re.escape(alias)}\b', text_lower):
-            found_stock = symbol
-            break
+    # One word-bounded scan per symbol map; longer aliases win to avoid partial matches.
+    crypto_alias = best_alias(_CRYPTO_ALIAS_RE, _CRYPTO_ALIAS_RANK, text_lower)
+    stock_alias = best_alias(_STOCK_ALIAS_RE, _STOCK_ALIAS_RANK, text_lower)
+    found_crypto = CRYPTO_SYMBOLS[crypto_alias] if crypto_alias else None
+    found_stock = STOCK_SYMBOLS[stock_alias] if stock_alias else None
 
     # Detect portfolio-reference phrases (e.g., "my biggest position").
-    if re.search(r'\b(biggest position|largest holding|top holding|biggest holding|largest position)\b', text_lower):
+    if _PORTFOLIO_REF_RE.search(text_lower):
         result.is_portfolio_reference = True
         result.portfolio_ref_type = "largest_holding"
     elif (
         not result.is_most_profitable
-        and re.search(r'\b(biggest loser|down the most)\b', text_lower)
+        and _LOSER_RE.search(text_lower)
         and 'holding' in text_lower
     ):
         # Heuristic fallback: map "sell biggest loser in my holdings" to a
@@ -467,7 +505,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
 
     # === Determine execution mode ===
     # 1. Check for explicit paper/simulation keywords
-    if any(keyword in text_lower for keyword in ['paper', 'simulation', 'test trade']):
+    if features.has_any_lower("trade_paper_keywords"):
         result.mode = "PAPER"
     # 2. Check test environment
     elif detect_test_environment():
@@ -500,9 +538,9 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
     if result.asset is None and not result.is_most_profitable and not result.is_sell_last_purchase:
         # Extract candidate symbol tokens from the text
         # Look for uppercase words (2-10 chars) that could be tickers
-        _candidate_tokens = re.findall(r'\b([A-Z]{2,10})\b', text)
+        _candidate_tokens = _TICKER_TOKEN_RE.findall(text)
         # Also try the word after "of" (common in "sell $2 of MORPHO")
-        _of_match = re.search(r'\bof\s+(\w+)', text_lower)
+        _of_match = _OF_WORD_RE.search(text_lower)
         if _of_match:
             _candidate_tokens.insert(0, _of_match.group(1).upper())
 
@@ -528,7 +566,7 @@ def parse_trade_command(text: str) -> ParsedTradeCommand:
     # Enforce multi-asset semantics for "sell all holdings/everything/positions".
     # Keep single-asset semantics for "sell all of <symbol>" when an asset is explicitly identified.
     if multi_holdings_sell:
-        explicit_single_asset = bool(re.search(r'\b(?:sell|close|exit|liquidate)\s+(?:all|full|entire)\s+of\s+([a-zA-Z0-9_-]+)\b', text_lower))
+        explicit_single_asset = bool(_SINGLE_ASSET_ALL_RE.search(text_lower))
         if not explicit_single_asset:
             result.asset = None
             result.venue_symbol = None
@@ -568,12 +606,12 @@ def parse_trade_commands(text: str) -> List[ParsedTradeCommand]:
 
     # First split on explicit separators.
     chunks: List[str] = []
-    for part in re.split(r'\s*;\s*|\s+\bthen\b\s+', raw, flags=re.IGNORECASE):
+    for part in _CHUNK_SPLIT_RE.split(raw):
         part = part.strip()
         if not part:
             continue
         # Secondary split on "and" only when it looks like separate order phrases.
-        subparts = re.split(r'\s+\band\b\s+', part, flags=re.IGNORECASE)
+        subparts = _AND_SPLIT_RE.split(part)
         chunks.extend([s.strip() for s in subparts if s.strip()])
 
     if not chunks:
@@ -585,10 +623,10 @@ def parse_trade_commands(text: str) -> List[ParsedTradeCommand]:
     for chunk in chunks:
         chunk_lower = chunk.lower()
         has_side = bool(
-            re.search(r'\b(buy|sell|close|exit|liquidate|rebalance|reduce|invest|dump|rotate|cut)\b', chunk_lower)
+            _CHUNK_SIDE_RE.search(chunk_lower)
             or ('pick up' in chunk_lower)
             or ('get rid of' in chunk_lower)
-            or bool(re.search(r'\bput\s+\$?\d+(?:\.\d+)?\s+into\b', chunk_lower))
+            or bool(_PUT_INTO_RE.search(chunk_lower))
         )
         if not has_side and current_side:
             chunk = f"{current_side} {chunk}"
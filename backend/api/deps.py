@@ -4,10 +4,20 @@ from fastapi import Depends, HTTPException, status, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from backend.core.security import decode_access_token
 from backend.core.config import get_settings
+from backend.db.connect import set_current_tenant
 
 security = HTTPBearer(auto_error=False)
 
 
+def _bind_tenant(user: dict) -> dict:
+    """Route this request's DB connections to the user's tenant (matters only with TENANT_SHARDING).
+
+    ``TenantContextMiddleware`` resets the binding when the request ends.
+    """
+    set_current_tenant(user["tenant_id"])
+    return user
+
+
 async def get_current_user(
     x_dev_tenant: Optional[str] = Header(None, alias="X-Dev-Tenant"),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -26,21 +36,21 @@ async def get_current_user(
     
     # Test auth bypass (pytest only)
     if settings.test_auth_bypass:
-        return {
+        return _bind_tenant({
             "tenant_id": "t_default",
             "user_id": "test-user",
             "role": "admin",
             "email": "test@test.com"
-        }
+        })
     
     # Dev mode fallback: allow X-Dev-Tenant header (NOT for security, convenience only)
     if not settings.enable_dev_auth and settings.api_secret_key == "dev-secret-key-change-in-production" and x_dev_tenant:
-        return {
+        return _bind_tenant({
             "tenant_id": x_dev_tenant,
             "user_id": "dev-user",
             "role": "admin",
             "email": "dev@local"
-        }
+        })
     
     # Dev mode fallback: allow ?tenant=... query parameter for SSE (EventSource
     # cannot send custom headers).  Same security check as X-Dev-Tenant.
@@ -48,12 +58,12 @@ async def get_current_user(
         if request and not x_dev_tenant:
             qs_tenant = request.query_params.get("tenant")
             if qs_tenant:
-                return {
+                return _bind_tenant({
                     "tenant_id": qs_tenant,
                     "user_id": "dev-user",
                     "role": "admin",
                     "email": "dev@local"
-                }
+                })
     
     # JWT auth (required for security)
     if not credentials:
@@ -88,12 +98,12 @@ async def get_current_user(
         request.state.tenant_id = tenant_id
         request.state.role = role
     
-    return {
+    return _bind_tenant({
         "tenant_id": tenant_id,
         "user_id": user_id,
         "role": role,
         "email": email
-    }
+    })
 
 
 def require_role(allowed_roles: List[str]):
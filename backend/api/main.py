@@ -9,8 +9,10 @@ from fastapi.responses import Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from backend.core.logging import setup_logging, get_logger
 from backend.db.connect import init_db
+from backend.db import query_stats
 from backend.api.routes import runs, approvals, portfolio, orders, ops, market, policies, agent, commands, trace, analytics, chat, evals, analytics_pnl, analytics_slippage, analytics_risk, conversations, telemetry, news, confirmations, prometheus, trade_tickets, debug
 from backend.api.auth import router as auth_router
+from backend.api.middleware.tenant_context import TenantContextMiddleware
 
 # Thread/async-safe request ID propagation via contextvars
 _request_id_ctx: contextvars.ContextVar[str] = contextvars.ContextVar('request_id', default='')
@@ -42,6 +44,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
         # Set request_id in contextvar (async-safe, no global mutation)
         token = _request_id_ctx.set(request_id)
+        query_token = query_stats.open_scope(f"{request.method} {request.url.path}")
 
         try:
             response = await call_next(request)
@@ -97,6 +100,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
                 headers={"X-Request-ID": request_id},
             )
         finally:
+            query_stats.close_scope(query_token)
             _request_id_ctx.reset(token)
 
 _enable_otel = os.getenv("ENABLE_OTEL", "0").lower() in ("1", "true", "yes")
@@ -340,6 +344,9 @@ async def exception_group_handler(request: Request, exc: ExceptionGroup):
     return await global_exception_handler(request, exc)
 
 
+# Tenant binding reset (innermost: added first, wraps the router directly)
+app.add_middleware(TenantContextMiddleware)
+
 # Request ID middleware (must be first)
 app.add_middleware(RequestIDMiddleware)
 
@@ -516,11 +523,18 @@ async def startup_product_catalog():
 
 @app.on_event("startup")
 async def startup_news_ingest():
-    """Auto-ingest news on startup so headlines are available for the first trade."""
+    """Start scheduled news ingestion (or ingest once) so headlines are available for the first trade."""
     import asyncio
     import threading
 
     def _bg_ingest():
+        try:
+            # Bring the retrieval index up to date with pre-existing rows
+            from backend.services.retrieval_index import backfill_news, sync_policy_documents
+            sync_policy_documents()
+            backfill_news()
+        except Exception as e:
+            logger.warning("Retrieval index backfill failed (non-fatal): %s", str(e)[:200])
         try:
             from backend.db.connect import get_conn
             with get_conn() as conn:
@@ -531,6 +545,12 @@ async def startup_news_ingest():
             if enabled == 0:
                 logger.info("Startup news ingest: no enabled sources, skipping")
                 return
+            from backend.core.config import get_settings
+            if get_settings().news_scheduler_enabled:
+                # First tick ingests every source that has never been fetched
+                from backend.services.news_scheduler import get_news_scheduler
+                get_news_scheduler().start()
+                return
             from backend.services.news_ingestion import NewsIngestionService
             svc = NewsIngestionService()
             # ingest_all is async, so run it in a fresh event loop
@@ -543,9 +563,55 @@ async def startup_news_ingest():
     thread.start()
 
 
+@app.on_event("startup")
+async def startup_retention():
+    """Start the periodic archival of expired audit / event rows."""
+    from backend.core.config import get_settings
+    from backend.core.test_utils import is_pytest
+    if is_pytest() or not get_settings().retention_enabled:
+        return
+    from backend.db.retention import start_retention_worker
+    start_retention_worker()
+
+
+@app.on_event("startup")
+async def startup_loop_watchdog():
+    """Watch the request loop and the shared background loop for stalls."""
+    import asyncio
+    from backend.core.config import get_settings
+    from backend.core.test_utils import is_pytest
+    if is_pytest() or not get_settings().loop_watchdog_enabled:
+        return
+    from backend.core.background_loop import get_background_loop
+    from backend.core.loop_watchdog import watch
+    watch(asyncio.get_running_loop(), "main")
+    watch(get_background_loop().loop, "background")
+
+
+@app.on_event("startup")
+async def startup_runtime_metrics():
+    """Count outbound HTTP for /metrics and, with several workers, sample runtime metrics periodically."""
+    from backend.core.test_utils import is_pytest
+    if is_pytest():
+        return
+    from backend.api.routes.prometheus import start_runtime_sampler
+    from backend.core.profiling import install_http_hooks
+    install_http_hooks()
+    start_runtime_sampler()
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean shutdown: close OpenTelemetry tracer provider."""
+    """Clean shutdown: stop the background schedulers and close OpenTelemetry tracer provider."""
+    from backend.services import news_scheduler
+    from backend.db.retention import stop_retention_worker
+    from backend.core.loop_watchdog import stop_watchdogs
+    from backend.api.routes.prometheus import shutdown_metrics
+    if news_scheduler._scheduler is not None:
+        news_scheduler._scheduler.stop()
+    stop_retention_worker()
+    stop_watchdogs()
+    shutdown_metrics()
     try:
         from opentelemetry import trace
         from opentelemetry.sdk.trace import TracerProvider
@@ -1,15 +1,16 @@
 """Rate limiting middleware."""
 import time
-from typing import Dict, Tuple
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from backend.core.cache import TTLCache
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 # In-memory rate limiter (in production, use Redis or similar)
-_rate_limit_store: Dict[str, Tuple[int, float]] = {}
+# {key: (requests, window_start)}; entries expire with their window.
+_rate_limit_store = TTLCache("rate_limit", maxsize=50000, ttl=60)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -107,6 +108,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
         
         # Increment counter
-        _rate_limit_store[key] = (requests + 1, last_reset)
+        _rate_limit_store.set(key, (requests + 1, last_reset), ttl=window_seconds - (now - last_reset))
         
         return await call_next(request)
@@ -1,21 +1,21 @@
 """SSE connection tracking and limits."""
-from typing import Dict
-from collections import defaultdict
 import time
+from backend.core.cache import TTLCache
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Track SSE connections per user
-# Structure: {user_key: {connection_id: (run_id, timestamp)}}
-_sse_connections: Dict[str, Dict[str, tuple]] = defaultdict(dict)
-
 # Max concurrent SSE connections per user
 MAX_SSE_CONNECTIONS_PER_USER = 3
 
 # Idle timeout (seconds) - prune stale connections
 SSE_IDLE_TIMEOUT = 300  # 5 minutes
 
+# Track SSE connections per user
+# Structure: {user_key: {connection_id: (run_id, timestamp)}}
+# Users with no new connection for SSE_IDLE_TIMEOUT expire as a whole.
+_sse_connections = TTLCache("sse_connections", maxsize=10000, ttl=SSE_IDLE_TIMEOUT)
+
 
 def track_sse_connection(user_key: str, connection_id: str, run_id: str) -> bool:
     """
@@ -24,7 +24,7 @@ def track_sse_connection(user_key: str, connection_id: str, run_id: str) -> bool
     Returns:
         True if connection allowed, False if limit exceeded
     """
-    connections = _sse_connections[user_key]
+    connections = _sse_connections.get(user_key) or {}
 
     # Prune connections older than SSE_IDLE_TIMEOUT
     now = time.time()
@@ -38,18 +38,25 @@ def track_sse_connection(user_key: str, connection_id: str, run_id: str) -> bool
         return False
 
     connections[connection_id] = (run_id, now)
+    _sse_connections.set(user_key, connections)
     return True
 
 
 def untrack_sse_connection(user_key: str, connection_id: str):
     """Remove SSE connection tracking."""
-    if user_key in _sse_connections and connection_id in _sse_connections[user_key]:
-        del _sse_connections[user_key][connection_id]
+    connections = _sse_connections.get(user_key)
+    if connections and connection_id in connections:
+        del connections[connection_id]
         # Clean up empty user entries
-        if not _sse_connections[user_key]:
-            del _sse_connections[user_key]
+        if not connections:
+            _sse_connections.pop(user_key)
 
 
 def get_sse_connection_count(user_key: str) -> int:
     """Get number of active SSE connections for a user."""
-    return len(_sse_connections.get(user_key, {}))
+    return len(_sse_connections.get(user_key) or {})
+
+
+def get_total_sse_connections() -> int:
+    """Number of tracked SSE connections across all users."""
+    return sum(len(connections) for connections in _sse_connections.values())
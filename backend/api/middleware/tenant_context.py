@@ -0,0 +1,27 @@
+"""Per-request DB tenant binding."""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.db.connect import get_current_tenant, reset_current_tenant, set_current_tenant
+
+
+class TenantContextMiddleware:
+    """Undo the auth dependency's ``set_current_tenant`` when the request ends.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``: the app runs
+    in this context, so the reset covers the endpoint and any streamed body,
+    and nothing scheduled later from this context inherits the tenant. Must
+    be the innermost middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = set_current_tenant(get_current_tenant())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_current_tenant(token)
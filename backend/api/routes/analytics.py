@@ -27,7 +27,10 @@ async def get_performance(
             "total_pnl": ...,
             "total_returns": ...,
             "win_rate": ...,
-            "avg_trade_size": ...
+            "avg_trade_size": ...,
+            "realized_pnl": ...,
+            "unrealized_pnl": ...,
+            "max_drawdown_pct": ...
         },
         "trades": [...]
     }
@@ -45,117 +48,89 @@ async def get_performance(
     
     cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
     
+    # Daily buckets are maintained incrementally by the PnL ledger
+    from backend.services.pnl_ledger import get_daily, get_ledger_state, sync_ledger, unrealized_pnl
+    sync_ledger(tenant_id)
+    buckets = get_daily(tenant_id, cutoff_date[:10])
+    if not buckets:
+        return {
+            "daily_pnl": [],
+            "summary": {
+                "total_pnl": 0.0,
+                "total_returns": 0.0,
+                "win_rate": 0.0,
+                "avg_trade_size": 0.0,
+                "trades_count": 0
+            },
+            "trades": []
+        }
+    
+    # Calculate daily PnL (simplified: end - start)
+    daily_pnl = []
+    for bucket in buckets:
+        if not bucket["snapshots_count"]:
+            continue
+        start_value, end_value = bucket["start_value"], bucket["end_value"]
+        pnl = end_value - start_value if start_value else 0.0
+        daily_pnl.append({
+            "date": bucket["day"],
+            "pnl": pnl,
+            "returns": pnl / start_value if start_value and start_value > 0 else 0.0,
+            "trades_count": bucket["trades_count"],
+            "start_value": start_value,
+            "end_value": end_value,
+            "realized_pnl": bucket["realized_pnl"],
+            "max_drawdown_pct": bucket["max_drawdown_pct"],
+        })
+    
+    # Calculate summary
+    total_pnl = sum(d["pnl"] for d in daily_pnl)
+    total_returns = sum(d["returns"] for d in daily_pnl) / len(daily_pnl) if daily_pnl else 0.0
+    trades_count = sum(b["trades_count"] for b in buckets)
+    traded_notional = sum(b["traded_notional"] for b in buckets)
+    avg_trade_size = traded_notional / trades_count if trades_count > 0 else 0.0
+    
+    # Win rate (simplified: based on positive returns)
+    winning_days = sum(1 for d in daily_pnl if d["returns"] > 0)
+    win_rate = winning_days / len(daily_pnl) if daily_pnl else 0.0
+    
+    # Build trades list (last 100 trades)
     with get_conn() as conn:
         cursor = conn.cursor()
-        
-        # Get completed runs in window
         cursor.execute(
             """
-            SELECT run_id, created_at, completed_at, status, execution_mode
-            FROM runs
-            WHERE tenant_id = ? AND status = 'COMPLETED' AND created_at >= ?
-            ORDER BY created_at DESC
-            """,
-            (tenant_id, cutoff_date)
-        )
-        runs = cursor.fetchall()
-        
-        # Get orders from these runs
-        run_ids = [r["run_id"] for r in runs]
-        if not run_ids:
-            return {
-                "daily_pnl": [],
-                "summary": {
-                    "total_pnl": 0.0,
-                    "total_returns": 0.0,
-                    "win_rate": 0.0,
-                    "avg_trade_size": 0.0,
-                    "trades_count": 0
-                },
-                "trades": []
-            }
-        
-        placeholders = ",".join("?" * len(run_ids))
-        cursor.execute(
-            f"""
             SELECT order_id, run_id, symbol, side, notional_usd, created_at
             FROM orders
-            WHERE run_id IN ({placeholders}) AND status = 'FILLED'
-            ORDER BY created_at DESC
+            WHERE tenant_id = ? AND status = 'FILLED' AND created_at >= ?
+            ORDER BY created_at DESC LIMIT 100
             """,
-            run_ids
+            (tenant_id, cutoff_date[:10])
         )
         orders = cursor.fetchall()
-        
-        # Get portfolio snapshots for PnL calculation
-        cursor.execute(
-            f"""
-            SELECT run_id, ts, total_value_usd
-            FROM portfolio_snapshots
-            WHERE run_id IN ({placeholders})
-            ORDER BY ts ASC
-            """,
-            run_ids
-        )
-        snapshots = cursor.fetchall()
-        
-        # Group by date
-        daily_data = {}
-        for snapshot in snapshots:
-            date_str = snapshot["ts"][:10]  # YYYY-MM-DD
-            if date_str not in daily_data:
-                daily_data[date_str] = {
-                    "date": date_str,
-                    "pnl": 0.0,
-                    "returns": 0.0,
-                    "trades_count": 0,
-                    "start_value": snapshot["total_value_usd"],
-                    "end_value": snapshot["total_value_usd"]
-                }
-            daily_data[date_str]["end_value"] = snapshot["total_value_usd"]
-        
-        # Calculate daily PnL (simplified: end - start)
-        daily_pnl = []
-        for date_str in sorted(daily_data.keys()):
-            day = daily_data[date_str]
-            if day.get("start_value"):
-                day["pnl"] = day["end_value"] - day["start_value"]
-                day["returns"] = day["pnl"] / day["start_value"] if day["start_value"] > 0 else 0.0
-            
-            # Count trades for this date
-            day["trades_count"] = sum(1 for o in orders if o["created_at"][:10] == date_str)
-            daily_pnl.append(day)
-        
-        # Calculate summary
-        total_pnl = sum(d["pnl"] for d in daily_pnl)
-        total_returns = sum(d["returns"] for d in daily_pnl) / len(daily_pnl) if daily_pnl else 0.0
-        trades_count = len(orders)
-        avg_trade_size = sum(float(o["notional_usd"]) for o in orders) / trades_count if trades_count > 0 else 0.0
-        
-        # Win rate (simplified: based on positive returns)
-        winning_days = sum(1 for d in daily_pnl if d["returns"] > 0)
-        win_rate = winning_days / len(daily_pnl) if daily_pnl else 0.0
-        
-        # Build trades list
-        trades = []
-        for order in orders[:100]:  # Last 100 trades
-            trades.append({
-                "order_id": order["order_id"],
-                "run_id": order["run_id"],
-                "symbol": order["symbol"],
-                "side": order["side"],
-                "notional_usd": float(order["notional_usd"]),
-                "created_at": order["created_at"]
-            })
-        
-        return {
-            "daily_pnl": daily_pnl,
-            "summary": {
-                "total_pnl": total_pnl,
-                "total_returns": total_returns,
-                "win_rate": win_rate,
-                "avg_trade_size": avg_trade_size,
-                "trades_count": trades_count
-            },
-            "trades": trades
+    trades = [
+        {
+            "order_id": order["order_id"],
+            "run_id": order["run_id"],
+            "symbol": order["symbol"],
+            "side": order["side"],
+            "notional_usd": float(order["notional_usd"]),
+            "created_at": order["created_at"]
         }
+        for order in orders
+    ]
+    
+    state = get_ledger_state(tenant_id) or {}
+    return {
+        "daily_pnl": daily_pnl,
+        "summary": {
+            "total_pnl": total_pnl,
+            "total_returns": total_returns,
+            "win_rate": win_rate,
+            "avg_trade_size": avg_trade_size,
+            "trades_count": trades_count,
+            "realized_pnl": sum(b["realized_pnl"] for b in buckets),
+            "unrealized_pnl": unrealized_pnl(tenant_id),
+            "max_drawdown_pct": state.get("max_drawdown_pct", 0.0),
+        },
+        "trades": trades
+    }
@@ -9,6 +9,9 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Positions are priced from the local price history when it has a price this recent
+RISK_MAX_PRICE_AGE_SECONDS = 300
+
 
 @router.get("/risk")
 async def get_risk(
@@ -26,9 +29,11 @@ async def get_risk(
             "top_asset_pct": 50.0,
             "top_3_assets_pct": 80.0
         },
-        "drawdown": [
-            {"ts": "...", "peak_value": 1000.0, "current_value": 950.0, "drawdown_pct": 5.0}
-        ]
+        "drawdown": [  # one point per day, from the PnL ledger
+            {"ts": "...", "peak_value": 1000.0, "current_value": 950.0, "drawdown_pct": 5.0,
+             "max_drawdown_pct": 7.5}
+        ],
+        "max_drawdown_pct": 7.5
     }
     """
     tenant_id = user["tenant_id"]
@@ -57,60 +62,54 @@ async def get_risk(
         
         positions = json.loads(snapshot_row["positions_json"])
         total_value = float(snapshot_row["total_value_usd"])
-        
-        # Get current prices for positions
-        from backend.providers.coinbase_market_data import CoinbaseMarketDataProvider
-        market_data_provider = CoinbaseMarketDataProvider()
-        
-        exposure_by_asset = []
-        for symbol, qty in positions.items():
-            try:
+    
+    # Price positions from the local price history; only missing ones hit the network
+    from backend.services.price_history import get_price_history
+    known_prices = get_price_history().latest(positions, max_age_seconds=RISK_MAX_PRICE_AGE_SECONDS)
+    market_data_provider = None
+    
+    exposure_by_asset = []
+    for symbol, qty in positions.items():
+        try:
+            price = known_prices.get(symbol)
+            if price is None:
+                if market_data_provider is None:
+                    from backend.providers.coinbase_market_data import CoinbaseMarketDataProvider
+                    market_data_provider = CoinbaseMarketDataProvider()
                 price = market_data_provider.get_price(f"{symbol}-USD" if "-" not in symbol else symbol)
-                asset_value = float(qty) * price
-                exposure_by_asset.append({
-                    "asset": symbol,
-                    "quantity": float(qty),
-                    "price": price,
-                    "total_value": asset_value,
-                    "percentage": (asset_value / total_value * 100) if total_value > 0 else 0.0
-                })
-            except Exception:
-                pass
-        
-        # Sort by value descending
-        exposure_by_asset.sort(key=lambda x: x["total_value"], reverse=True)
-        
-        # Concentration metrics
-        top_asset_pct = exposure_by_asset[0]["percentage"] if exposure_by_asset else 0.0
-        top_3_assets_pct = sum(e["percentage"] for e in exposure_by_asset[:3])
-        
-        # Drawdown calculation
-        cursor.execute(
-            """
-            SELECT total_value_usd, ts
-            FROM portfolio_snapshots
-            WHERE tenant_id = ?
-            ORDER BY ts ASC
-            """,
-            (tenant_id,)
-        )
-        snapshots = cursor.fetchall()
-        
-        drawdown = []
-        peak_value = 0.0
-        for snapshot in snapshots:
-            current_value = float(snapshot["total_value_usd"])
-            if current_value > peak_value:
-                peak_value = current_value
-            
-            drawdown_pct = ((peak_value - current_value) / peak_value * 100) if peak_value > 0 else 0.0
-            
-            drawdown.append({
-                "ts": snapshot["ts"],
-                "peak_value": peak_value,
-                "current_value": current_value,
-                "drawdown_pct": drawdown_pct
+            asset_value = float(qty) * price
+            exposure_by_asset.append({
+                "asset": symbol,
+                "quantity": float(qty),
+                "price": price,
+                "total_value": asset_value,
+                "percentage": (asset_value / total_value * 100) if total_value > 0 else 0.0
             })
+        except Exception:
+            pass
+    
+    # Sort by value descending
+    exposure_by_asset.sort(key=lambda x: x["total_value"], reverse=True)
+    
+    # Concentration metrics
+    top_asset_pct = exposure_by_asset[0]["percentage"] if exposure_by_asset else 0.0
+    top_3_assets_pct = sum(e["percentage"] for e in exposure_by_asset[:3])
+    
+    # Drawdown from the ledger: one point per day (value and peak at the day's last snapshot)
+    from backend.services.pnl_ledger import get_daily, get_ledger_state, sync_ledger
+    sync_ledger(tenant_id)
+    drawdown = [
+        {
+            "ts": day["last_ts"],
+            "peak_value": day["peak_value"],
+            "current_value": day["end_value"],
+            "drawdown_pct": day["drawdown_pct"],
+            "max_drawdown_pct": day["max_drawdown_pct"],
+        }
+        for day in get_daily(tenant_id)
+        if day["snapshots_count"]
+    ]
+    state = get_ledger_state(tenant_id) or {}
     
     return {
         "exposure_by_asset": exposure_by_asset,
@@ -118,6 +117,7 @@ async def get_risk(
             "top_asset_pct": top_asset_pct,
             "top_3_assets_pct": top_3_assets_pct
         },
-        "drawdown": drawdown
+        "drawdown": drawdown,
+        "max_drawdown_pct": state.get("max_drawdown_pct", 0.0),
     }
 
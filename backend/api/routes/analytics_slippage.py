@@ -114,20 +114,11 @@ async def get_slippage(
         # Get expected price from signals/research or use market data at order time
         expected_price = expected_prices.get(symbol)
         if not expected_price:
-            # Fallback: use price from market_candles at order creation time
-            cursor.execute(
-                """
-                SELECT close FROM market_candles
-                WHERE symbol = ? AND start_time <= ? AND end_time >= ?
-                ORDER BY ts DESC LIMIT 1
-                """,
-                (symbol, order["created_at"], order["created_at"])
-            )
-            price_row = cursor.fetchone()
-            if price_row:
-                expected_price = float(price_row["close"])
-            else:
-                # If no candles, assume no slippage (expected = actual)
+            # Fallback: last known market price at order creation time
+            from backend.services.price_history import get_price_history
+            expected_price = get_price_history().price_at(symbol, order["created_at"], max_age_seconds=3600)
+            if not expected_price:
+                # If no recent price, assume no slippage (expected = actual)
                 expected_price = avg_fill_price
         
         # Calculate slippage in basis points (1 bp = 0.01%)
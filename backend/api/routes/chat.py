@@ -34,10 +34,10 @@ def _safe_json_loads(s, default=None):
 router = APIRouter()
 
 
-def _fetch_executable_state(tenant_id: str):
-    from backend.services.executable_state import fetch_executable_state
+async def _fetch_executable_state(tenant_id: str, refresh: bool = False):
+    from backend.services.executable_state import get_executable_state
 
-    return fetch_executable_state(tenant_id)
+    return await get_executable_state(tenant_id, refresh=refresh)
 
 
 def _build_product_catalog(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
@@ -772,7 +772,7 @@ async def _chat_command_impl(
                 from backend.services.trade_preflight import run_preflight as repreflight
                 from backend.services.asset_resolver import resolve_from_executable_state, RESOLUTION_OK
                 from backend.agents.trade_parser import ParsedTradeCommand
-                next_exec_state = _fetch_executable_state(tenant_id)
+                next_exec_state = await _fetch_executable_state(tenant_id)
                 next_catalog = _build_product_catalog(list((getattr(next_exec_state, "balances", {}) or {}).keys()))
                 repf_cmds = [ParsedTradeCommand(
                     side=next_action.get("side", "buy"),
@@ -956,9 +956,8 @@ async def _chat_command_impl(
     # STEP 4: Handle TRADE_EXECUTION intent
     if intent == IntentType.TRADE_EXECUTION:
         from backend.agents.trade_parser import parse_trade_commands, AmountMode
-        from backend.services.trade_preflight import run_preflight
         from backend.db.repo.trade_confirmations_repo import TradeConfirmationsRepo
-        from backend.services.pre_confirm_insight import generate_insight
+        from backend.services.pre_confirm_insight import generate_insight, schedule_prewarm
         from backend.services.asset_selection_engine import select_asset, selection_result_to_dict
         from backend.services.relative_asset_selector import select_relative_asset
         from backend.services.asset_resolver import (
@@ -976,6 +975,9 @@ async def _chat_command_impl(
             request_id,
             news_enabled,
         )
+        if news_enabled:
+            # Warm insights for the tenant's usual trades while this command is parsed and preflighted
+            schedule_prewarm(tenant_id)
         parsed_commands = parse_trade_commands(text)
         if DEBUG_INTENT:
             for _pc in parsed_commands:
@@ -999,7 +1001,7 @@ async def _chat_command_impl(
                 "narrative_structured": build_narrative_structured(no_parse_content),
             })
 
-        executable_state = _fetch_executable_state(tenant_id)
+        executable_state = await _fetch_executable_state(tenant_id)
         state_symbols = list((getattr(executable_state, "balances", {}) or {}).keys())
         product_catalog = _build_product_catalog(state_symbols)
 
@@ -1102,7 +1104,7 @@ async def _chat_command_impl(
             if _state_mismatch_assets:
                 _refresh_reason.append(f"qty_mismatch assets={_state_mismatch_assets}")
             logger.info("state_coherence_refresh: %s — refreshing balances", " | ".join(_refresh_reason))
-            executable_state = _fetch_executable_state(tenant_id)
+            executable_state = await _fetch_executable_state(tenant_id, refresh=True)
             state_symbols = list((getattr(executable_state, "balances", {}) or {}).keys())
             product_catalog = _build_product_catalog(state_symbols)
             _forced_refresh = True
@@ -1121,7 +1123,28 @@ async def _chat_command_impl(
         blocked_suggestions: List[str] = []
         adjustment_messages: List[str] = []
 
-        from backend.services.trade_preflight import HUMAN_MESSAGES as PREFLIGHT_MESSAGES
+        from backend.services.trade_preflight import HUMAN_MESSAGES as PREFLIGHT_MESSAGES, run_preflights
+        from backend.services.market_data import get_prices
+        from backend.core.symbols import to_base
+
+        # Shared inputs, resolved once per command: one concurrent price fetch
+        # for every named asset and every balance (portfolio total below).
+        _balance_symbols = list((getattr(executable_state, "balances", {}) or {}).keys())
+        prices = await get_prices(
+            [p.asset for p in parsed_commands if p.asset] + _balance_symbols
+        )
+
+        async def _leg_price(symbol: str) -> Optional[float]:
+            # Assets chosen by the selectors were not known up front
+            base = to_base(symbol)
+            if base not in prices:
+                prices.update(await get_prices([base]))
+            return prices.get(base)
+
+        # Legs that passed resolution, preflighted together after the loop.
+        # Each remembers where its blocked message (if any) belongs in
+        # blocked_messages, so messages stay in command order.
+        pending_legs: List[Dict[str, Any]] = []
 
         for parsed in parsed_commands:
             selected_result_dict = None
@@ -1339,13 +1362,9 @@ async def _chat_command_impl(
             elif not _has_usd and _is_sell_all and _has_qty:
                 # SELL ALL with qty but no USD price — proceed; USD is display-only.
                 # Best-effort price lookup (non-blocking):
-                try:
-                    from backend.services.market_data import get_price as _get_price_fallback
-                    _px = float(_get_price_fallback(parsed.asset))
-                    if _px > 0:
-                        parsed.amount_usd = float(parsed.amount_qty) * _px
-                except Exception:
-                    pass
+                _px = await _leg_price(parsed.asset)
+                if _px:
+                    parsed.amount_usd = float(parsed.amount_qty) * _px
                 # If price still unavailable, amount_usd stays None — UI shows "≈ unavailable"
                 # Do NOT block here
 
@@ -1361,33 +1380,43 @@ async def _chat_command_impl(
                 "product_check_artifact": f"run:pending#product_{parsed.asset}",
                 "preflight_artifact": f"run:pending#preflight_{parsed.asset}",
             }
+            _price = await _leg_price(parsed.asset)
             available_usd = None
-            if (parsed.side or "").lower() == "sell" and resolution and resolution.executable_qty:
-                try:
-                    from backend.services.market_data import get_price
-
-                    _price = float(get_price(parsed.asset))
-                    if _price > 0:
-                        available_usd = float(resolution.executable_qty) * _price
-                except Exception:
-                    available_usd = None
+            if (parsed.side or "").lower() == "sell" and resolution and resolution.executable_qty and _price:
+                available_usd = float(resolution.executable_qty) * _price
+
+            pending_legs.append({
+                "parsed": parsed,
+                "resolution": resolution,
+                "selected_result_dict": selected_result_dict,
+                "blocked_at": len(blocked_messages),
+                "preflight_kwargs": dict(
+                    tenant_id=tenant_id,
+                    side=parsed.side,
+                    asset=parsed.asset,
+                    amount_usd=float(parsed.amount_usd or 0.0),
+                    asset_class=parsed.asset_class,
+                    mode=parsed.mode,
+                    executable_qty=(resolution.executable_qty if resolution else None),
+                    hold_qty=(resolution.hold_qty if resolution else None),
+                    available_usd=available_usd,
+                    requested_qty=(float(parsed.amount_qty) if getattr(parsed, "amount_qty", None) is not None else None),
+                    sell_all_requested=((parsed.side or "").lower() == "sell" and parsed.amount_mode == AmountMode.ALL.value),
+                    product_flags=(resolution.product_flags if resolution else None),
+                    artifacts=artifact_refs,
+                    executable_state=executable_state,
+                    price=_price,
+                ),
+            })
 
-            preflight = await run_preflight(
-                tenant_id=tenant_id,
-                side=parsed.side,
-                asset=parsed.asset,
-                amount_usd=float(parsed.amount_usd or 0.0),
-                asset_class=parsed.asset_class,
-                mode=parsed.mode,
-                executable_qty=(resolution.executable_qty if resolution else None),
-                hold_qty=(resolution.hold_qty if resolution else None),
-                available_usd=available_usd,
-                requested_qty=(float(parsed.amount_qty) if getattr(parsed, "amount_qty", None) is not None else None),
-                sell_all_requested=((parsed.side or "").lower() == "sell" and parsed.amount_mode == AmountMode.ALL.value),
-                product_flags=(resolution.product_flags if resolution else None),
-                artifacts=artifact_refs,
-                executable_state=executable_state,
-            )
+        # Per-leg checks (cash, preview, minimums) run concurrently within a
+        # budget; results come back in command order.
+        preflights = await run_preflights([leg["preflight_kwargs"] for leg in pending_legs])
+        _inserted = 0
+        for leg, preflight in zip(pending_legs, preflights):
+            parsed = leg["parsed"]
+            resolution = leg["resolution"]
+            selected_result_dict = leg["selected_result_dict"]
             if DEBUG_TRADE_DIAGNOSTICS:
                 _pf_reason = getattr(preflight.reason_code, "value", None) if preflight.reason_code else None
                 logger.debug(
@@ -1405,7 +1434,8 @@ async def _chat_command_impl(
                 if preflight.fixes:
                     base_msg = f"{base_msg} Options: {', '.join(preflight.fixes)}."
                     blocked_suggestions.extend([str(f) for f in preflight.fixes if f])
-                blocked_messages.append(base_msg)
+                blocked_messages.insert(leg["blocked_at"] + _inserted, base_msg)
+                _inserted += 1
                 continue
 
             if preflight.requires_adjustment and preflight.adjusted_amount_usd is not None:
@@ -1448,15 +1478,11 @@ async def _chat_command_impl(
         _portfolio_total_usd = 0.0
         try:
             _balances = getattr(executable_state, "balances", {}) or {}
-            from backend.services.market_data import get_price
             for _sym, _bal in _balances.items():
                 _qty = float(getattr(_bal, "available_qty", 0) or 0)
-                try:
-                    _p = get_price(_sym)
-                    if _p:
-                        _portfolio_total_usd += _qty * float(_p)
-                except Exception:
-                    pass
+                _p = prices.get(to_base(_sym))
+                if _p:
+                    _portfolio_total_usd += _qty * float(_p)
         except Exception:
             pass
 
@@ -1550,11 +1576,13 @@ async def _chat_command_impl(
                 tenant_id=tenant_id,
                 execution_mode=settings.execution_mode_default,
                 actions=_tc_actions,
+                executable_state=executable_state,
             )
             _trade_context_snapshot = {
                 "tenant_id": _trade_ctx.tenant_id,
                 "execution_mode": _trade_ctx.execution_mode,
                 "built_at": _trade_ctx.built_at,
+                "state_version": _trade_ctx.state_version,
                 "balances": {
                     k: {"available_qty": v.available_qty, "hold_qty": v.hold_qty}
                     for k, v in _trade_ctx.executable_balances.items()
@@ -1617,6 +1645,7 @@ async def _chat_command_impl(
             "sequential": len(valid_actions) > 1,
             "trade_context": _trade_context_snapshot,
             "diagnostics": _staging_diag,
+            "executable_state_version": getattr(executable_state, "version", None),
         }
 
         if conversation_id:
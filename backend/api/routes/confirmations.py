@@ -24,6 +24,8 @@ def _run_in_thread(run_id: str):
         # asyncio.run() creates a fresh event loop, runs the coroutine, and
         # cleans up.  This avoids "This event loop is already running" errors
         # that occur with manual new_event_loop() + run_until_complete().
+        # Events emitted on this loop reach SSE subscribers on the API loop
+        # through event_pubsub's thread-safe handoff.
         asyncio.run(execute_run(run_id=run_id))
         # S2: Audit log on successful completion
         logger.info("TRADE_EXEC_DONE: run=%s result=SUCCESS", run_id)
@@ -540,8 +542,10 @@ async def _confirm_trade_impl(confirmation_id: str, tenant_id: str, user_id: str
     )
 
     # 10. Start background execution AFTER response is fully built
+    # The thread runs in a copy of this context so it keeps the request's tenant routing
+    import contextvars
     import threading
-    thread = threading.Thread(target=_run_in_thread, args=(run_id,), daemon=True)
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(_run_in_thread, run_id), daemon=True)
     thread.start()
 
     return response_dict
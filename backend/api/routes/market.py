@@ -1,4 +1,5 @@
 """Market data API routes (candles + price)."""
+import asyncio
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -8,7 +9,15 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from backend.api.deps import require_viewer
 from backend.core.logging import get_logger
 from backend.db.connect import get_conn
+from backend.services.candle_rollups import (
+    DEFAULT_TARGET_POINTS,
+    get_chart_candles,
+    interval_seconds,
+    lttb,
+    record_candles,
+)
 from backend.services.market_data import get_price, MarketDataError
+from backend.services.price_history import to_epoch
 
 logger = get_logger(__name__)
 
@@ -37,8 +46,13 @@ async def get_candles(
     symbol: str = Query(..., description="Product ID, e.g. BTC-USD"),
     time_range: str = Query("24H", alias="range", description="1H, 24H, 7D, or 30D"),
     run_id: Optional[str] = Query(None),
+    points: int = Query(DEFAULT_TARGET_POINTS, ge=10, le=2000, description="Target number of chart points"),
 ):
-    """Return candles for a symbol within a time range, plus trade markers if run_id supplied."""
+    """Return candles for a symbol within a time range, plus trade markers if run_id supplied.
+
+    Candles come from the rollup table at the coarsest resolution that fits
+    the range, downsampled (LTTB) to about ``points`` points.
+    """
     cfg = RANGE_CONFIG.get(time_range.upper())
     if not cfg:
         raise HTTPException(status_code=400, detail=f"Invalid range '{time_range}'. Use 1H, 24H, 7D, or 30D.")
@@ -49,62 +63,37 @@ async def get_candles(
     range_end_iso = now.isoformat()
     interval = cfg["interval"]
 
-    candles = []
-    source = "market_candles_table"
-
-    with get_conn() as conn:
-        cursor = conn.cursor()
-
-        # Normalize symbol for DB lookup (may be stored as BTC-USD or BTC)
-        sym_variants = [symbol]
-        base = symbol.split("-")[0] if "-" in symbol else symbol
-        if "-" not in symbol:
-            sym_variants.append(f"{symbol}-USD")
-        sym_variants.append(base)
-
-        placeholders = ",".join(["?"] * len(sym_variants))
-        cursor.execute(
-            f"""SELECT id, symbol, interval, start_time, end_time, open, high, low, close, volume
-                FROM market_candles
-                WHERE symbol IN ({placeholders})
-                  AND start_time >= ?
-                ORDER BY start_time ASC
-                LIMIT 500""",
-            (*sym_variants, range_start_iso),
-        )
-        rows = cursor.fetchall()
-        for r in rows:
-            candles.append({
-                "ts": r["start_time"],
-                "open": float(r["open"]),
-                "high": float(r["high"]),
-                "low": float(r["low"]),
-                "close": float(r["close"]),
-                "volume": float(r["volume"] or 0),
-            })
+    source = "candle_rollups"
+    candles, plan = await asyncio.to_thread(get_chart_candles, symbol, range_start, now, points)
 
     if len(candles) < 5:
         try:
             from backend.providers.coinbase_market_data import CoinbaseMarketDataProvider
             provider = CoinbaseMarketDataProvider()
-            live_candles = provider.get_candles(
+            live_candles = await asyncio.to_thread(
+                provider.get_candles,
                 symbol=symbol,
-                interval=interval.lower() if interval.lower() in ("1h", "24h", "7d") else interval,
+                interval=interval,
                 start_time=range_start_iso,
                 end_time=range_end_iso,
             )
-            candles = [
-                {
-                    "ts": c.get("start_time") or c.get("time") or c.get("t", ""),
+            # Keep them so the next load of this range is a local read
+            await asyncio.to_thread(record_candles, symbol, interval, live_candles)
+            rows = []
+            for c in live_candles:
+                ts = c.get("start_time") or c.get("time") or c.get("t")
+                if not ts:
+                    continue
+                rows.append({
+                    "ts": ts,
                     "open": float(c.get("open", c.get("o", 0))),
                     "high": float(c.get("high", c.get("h", 0))),
                     "low": float(c.get("low", c.get("l", 0))),
                     "close": float(c.get("close", c.get("c", 0))),
                     "volume": float(c.get("volume", c.get("v", 0))),
-                }
-                for c in live_candles
-            ]
-            source = "coinbase_public"
+                })
+            downsampled = lttb(rows, points, x=lambda c: to_epoch(c["ts"]), y=lambda c: c["close"])
+            candles, source = downsampled, "coinbase_public"
         except Exception as e:
             logger.warning("Coinbase candle fallback failed for %s: %s", symbol, str(e)[:200])
 
@@ -133,6 +122,8 @@ async def get_candles(
             "range_start": range_start_iso,
             "range_end": range_end_iso,
             "source": source,
+            "resolution_seconds": plan["resolution"] if source == "candle_rollups" else interval_seconds(interval),
+            "rows_read": plan["rows_read"],
             "last_updated_at": last_updated,
         },
     }
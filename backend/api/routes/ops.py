@@ -1,10 +1,11 @@
 """Operations API routes."""
-from fastapi import APIRouter, Depends
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
 import json
 import sqlite3
 from pathlib import Path
-from backend.api.deps import get_current_user
+from backend.api.deps import get_current_user, require_admin
 from backend.db.connect import get_conn
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
@@ -426,3 +427,76 @@ async def coinbase_status(user: dict = Depends(get_current_user)):
         status["error"] = str(e)
         
     return status
+
+
+@router.get("/caches")
+async def list_caches(user: dict = Depends(get_current_user)):
+    """Per-cache entries, approximate bytes, hits, misses and evictions."""
+    from backend.core.cache import cache_stats
+    return {"caches": cache_stats()}
+
+
+@router.post("/caches/{name}/flush")
+async def flush_named_cache(name: str, user: dict = Depends(require_admin)):
+    """Drop every entry of one in-process cache (admin only)."""
+    from backend.core.cache import flush_cache
+    flushed = flush_cache(name)
+    if flushed is None:
+        raise HTTPException(status_code=404, detail=f"Unknown cache: {name}")
+    logger.info("Cache %s flushed by %s (%d entries)", name, user.get("user_id"), flushed)
+    return {"cache": name, "flushed": flushed}
+
+
+@router.get("/queries")
+async def query_stats_report(limit: int = 50, user: dict = Depends(require_admin)):
+    """Slow-query log, statement shapes by total time and duration histograms (admin only)."""
+    from backend.db import query_stats
+    return {
+        "slow_queries": query_stats.slow_queries(),
+        "top_statements": query_stats.top_statements(limit),
+        "histograms": query_stats.histograms(),
+    }
+
+
+@router.get("/loop")
+async def event_loop_report(limit: int = 20, user: dict = Depends(get_current_user)):
+    """Event-loop lag per watched loop and the functions that blocked it most."""
+    from backend.core.loop_watchdog import loop_stats, offenders
+    return {"loops": loop_stats(), "offenders": offenders(limit)}
+
+
+@router.get("/retention")
+async def retention_status(user: dict = Depends(get_current_user)):
+    """Retention policies, archive files and the last archival run."""
+    from backend.db.retention import retention_status as _status
+    return await asyncio.to_thread(_status)
+
+
+@router.post("/retention/run")
+async def run_retention_now(user: dict = Depends(require_admin)):
+    """Archive expired rows now (admin only); runs in small batches off the event loop."""
+    from backend.db.retention import run_retention
+    report = await asyncio.to_thread(run_retention)
+    logger.info("Retention run by %s archived %d rows", user.get("user_id"), report["archived"])
+    return report
+
+
+@router.get("/shards")
+async def list_tenant_shards(user: dict = Depends(require_admin)):
+    """Tenant shard files (TENANT_SHARDING) with their sizes (admin only)."""
+    from backend.db.sharding import list_shards
+    return {"enabled": get_settings().tenant_sharding, "shards": await asyncio.to_thread(list_shards)}
+
+
+@router.post("/shards/{tenant_id}/migrate")
+async def migrate_tenant_shard(tenant_id: str, user: dict = Depends(require_admin)):
+    """Move a tenant's rows from the canonical database into its shard (admin only, once per tenant)."""
+    if not get_settings().tenant_sharding:
+        raise HTTPException(status_code=409, detail="TENANT_SHARDING is off; the moved rows would not be visible")
+    from backend.db.sharding import migrate_tenant
+    try:
+        moved = await asyncio.to_thread(migrate_tenant, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info("Tenant %s moved into its shard by %s", tenant_id, user.get("user_id"))
+    return {"tenant_id": tenant_id, "moved": moved, "rows": sum(moved.values())}
@@ -6,10 +6,22 @@ from backend.api.deps import get_current_user
 from backend.db.connect import get_conn
 from backend.core.ids import new_id
 from backend.core.time import now_iso
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 
+def _sync_policy_index() -> None:
+    """Refresh the policy documents in the retrieval index after a policy write."""
+    try:
+        from backend.services.retrieval_index import sync_policy_documents
+        sync_policy_documents()
+    except Exception as e:
+        logger.warning("Policy index sync failed (non-fatal): %s", str(e)[:200])
+
+
 class PolicyCreate(BaseModel):
     name: str
     policy_json: dict
@@ -70,6 +82,7 @@ async def create_policy(
                     (json.dumps(policy.policy_json), version, policy_id, tenant_id)
                 )
                 conn.commit()
+                _sync_policy_index()
                 return {"policy_id": policy_id, "status": "updated", "version": version}
         
         # Insert new policy
@@ -82,6 +95,7 @@ async def create_policy(
                 (policy_id, tenant_id, policy.name, version, json.dumps(policy.policy_json), now_iso())
             )
             conn.commit()
+            _sync_policy_index()
             return {"policy_id": policy_id, "status": "created", "version": version}
         except Exception as e:
             # Handle UNIQUE constraint violation (tenant_id, name, version)
@@ -3,9 +3,28 @@
 This module avoids heavyweight metric registry initialization at import time.
 All Prometheus objects are initialized lazily on first use so backend startup
 cannot be blocked by metrics setup.
+
+Multi-worker deployments (``uvicorn --workers N``) must set
+``PROMETHEUS_MULTIPROC_DIR`` in the environment of every worker, before the
+process starts. prometheus_client then keeps metric values in per-process
+files in that directory and ``/metrics`` aggregates all of them, so any worker
+answers a scrape with the totals of every worker. Files of a previous server
+run are removed when the first worker starts; a worker marks its live gauges
+dead on shutdown.
+
+Runtime state that lives in each process (caches, DB connections, event bus,
+SSE connections, outbound HTTP, in-flight runs) is copied into ordinary
+gauges and counters by ``sample_runtime``. In multiprocess mode a per-worker
+thread samples every ``RUNTIME_SAMPLE_SECONDS``, so workers that are not
+scraped still report, and scrapes serve its last values; otherwise each scrape
+samples. Sampling queries the database, so scrapes sample and render in a
+worker thread, off the event loop.
 """
+import asyncio
+import os
+import threading
 from threading import Lock
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, Response
 
@@ -35,12 +54,108 @@ CONFIRMATION_CONFIRM_TOTAL: Any = None
 CONFIRMATION_EXPIRED_TOTAL: Any = None
 CONFIRMATION_CANCELLED_TOTAL: Any = None
 REPLAY_DETERMINISM_FAILURES_TOTAL: Any = None
+EVENT_BUS_DROPPED_TOTAL: Any = None
+EVENT_BUS_DELIVERY_LAG_SECONDS: Any = None
+DB_QUERY_DURATION_SECONDS: Any = None
+EVENT_LOOP_LAG_SECONDS: Any = None
+EVENT_LOOP_STALLS_TOTAL: Any = None
 SERVICE_INFO: Any = None
+# Runtime gauges/counters fed by sample_runtime(), by name
+RUNTIME: Dict[str, Any] = {}
 CONTENT_TYPE_LATEST: str = "text/plain; version=0.0.4; charset=utf-8"
 REGISTRY: Any = None
 generate_latest: Any = None
 
 
+RUNTIME_SAMPLE_SECONDS = 5.0
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Shared metric directory when running in prometheus_client multiprocess mode."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OverflowError):
+        return pid > 0
+    return True
+
+
+def clear_stale_metric_files(directory: str) -> int:
+    """Delete the metric files of a previous server run.
+
+    Counter files of workers that exited must survive while the server is
+    running (their counts are part of the totals), so files are only removed
+    when no other live process owns any file, i.e. this is the first worker
+    of a fresh start. Returns the number of files removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    lock_file = open(os.path.join(directory, ".cleanup.lock"), "w")
+    try:
+        try:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except ImportError:  # pragma: no cover - non-POSIX
+            pass
+        files = [f for f in os.listdir(directory) if f.endswith(".db")]
+        owners = {}
+        for name in files:
+            pid = name[:-3].rsplit("_", 1)[-1]
+            owners[name] = int(pid) if pid.isdigit() else None
+        me = os.getpid()
+        if any(pid not in (None, me) and _pid_alive(pid) for pid in owners.values()):
+            return 0
+        removed = 0
+        for name, pid in owners.items():
+            if pid != me:
+                try:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        if removed:
+            logger.info("Removed %d stale Prometheus metric files from %s", removed, directory)
+        return removed
+    finally:
+        lock_file.close()
+
+
+def _build_runtime_metrics(Counter, Gauge) -> Dict[str, Any]:
+    live = {"multiprocess_mode": "livesum"}
+    return {
+        "cache_entries": Gauge("cache_entries", "Entries held by an in-process cache", ["cache"], **live),
+        "cache_bytes": Gauge("cache_bytes", "Approximate bytes held by an in-process cache", ["cache"], **live),
+        "cache_hit_ratio": Gauge(
+            "cache_hit_ratio", "Hits / (hits + misses) of an in-process cache, per worker", ["cache"],
+            multiprocess_mode="liveall",
+        ),
+        **{
+            f"cache_{field}": Counter(f"cache_{field}", f"In-process cache {field}", ["cache"])
+            for field in ("hits", "misses", "evictions", "expirations")
+        },
+        "db_connections_open": Gauge("db_connections_open", "Open SQLite connections", **live),
+        "db_connections_opened": Counter("db_connections_opened", "SQLite connections opened"),
+        "db_connect_seconds": Counter("db_connect_seconds", "Time spent opening SQLite connections"),
+        "db_slow_queries": Counter("db_slow_queries", "Statements over SQL_SLOW_QUERY_MS"),
+        "event_bus_subscribers": Gauge("event_bus_subscribers", "Run event SSE subscriptions", **live),
+        "event_bus_queue_depth": Gauge("event_bus_queue_depth", "Events queued for SSE subscribers", **live),
+        "sse_connections": Gauge("sse_connections", "Tracked SSE connections", **live),
+        "http_client_in_flight": Gauge(
+            "http_client_requests_in_flight", "Outbound HTTP requests in flight", ["host"], **live
+        ),
+        "http_client_requests": Counter("http_client_requests", "Outbound HTTP requests sent", ["host"]),
+        # Read from the shared database, so every worker sees the same numbers
+        "runs_in_flight": Gauge(
+            "runs_in_flight", "Runs not yet COMPLETED or FAILED, by status", ["status"],
+            multiprocess_mode="mostrecent",
+        ),
+    }
+
+
 def _ensure_metrics_ready() -> bool:
     """Initialize Prometheus collectors once; never crash callers."""
     global _metrics_ready, _metrics_failed
@@ -51,6 +166,8 @@ def _ensure_metrics_ready() -> bool:
     global RANKED_ASSETS_GAUGE, DROPPED_ASSETS_TOTAL
     global CONFIRMATION_CONFIRM_TOTAL, CONFIRMATION_EXPIRED_TOTAL, CONFIRMATION_CANCELLED_TOTAL
     global REPLAY_DETERMINISM_FAILURES_TOTAL, SERVICE_INFO
+    global EVENT_BUS_DROPPED_TOTAL, EVENT_BUS_DELIVERY_LAG_SECONDS
+    global DB_QUERY_DURATION_SECONDS, EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_STALLS_TOTAL, RUNTIME
     global CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 
     if _metrics_ready:
@@ -64,6 +181,10 @@ def _ensure_metrics_ready() -> bool:
         if _metrics_failed:
             return False
         try:
+            directory = multiprocess_dir()
+            if directory:
+                clear_stale_metric_files(directory)
+
             from prometheus_client import (
                 CONTENT_TYPE_LATEST as _CONTENT_TYPE_LATEST,
                 REGISTRY as _REGISTRY,
@@ -102,7 +223,11 @@ def _ensure_metrics_ready() -> bool:
             )
             COINBASE_429_TOTAL = Counter("coinbase_429_total", "Total Coinbase 429 (rate limit) responses")
             COINBASE_TIMEOUT_TOTAL = Counter("coinbase_timeout_total", "Total Coinbase timeout errors")
-            RANKED_ASSETS_GAUGE = Gauge("ranked_assets_count", "Number of assets successfully ranked in last research")
+            RANKED_ASSETS_GAUGE = Gauge(
+                "ranked_assets_count",
+                "Number of assets successfully ranked in last research",
+                multiprocess_mode="mostrecent",
+            )
             DROPPED_ASSETS_TOTAL = Counter(
                 "dropped_assets_total",
                 "Total assets dropped from ranking",
@@ -114,7 +239,39 @@ def _ensure_metrics_ready() -> bool:
             REPLAY_DETERMINISM_FAILURES_TOTAL = Counter(
                 "replay_determinism_failures_total", "Total replay determinism failures"
             )
-            SERVICE_INFO = Info("executivedesk_ai", "Service information")
+            EVENT_BUS_DROPPED_TOTAL = Counter(
+                "event_bus_dropped_total", "Run events dropped before reaching an SSE subscriber", ["reason"]
+            )
+            EVENT_BUS_DELIVERY_LAG_SECONDS = Histogram(
+                "event_bus_delivery_lag_seconds",
+                "Delay handing run events from a worker thread/loop to the subscriber loop",
+                buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+            )
+            from backend.core import loop_watchdog
+            from backend.db import query_stats
+
+            DB_QUERY_DURATION_SECONDS = Histogram(
+                "db_query_duration_seconds",
+                "SQLite statement execute time",
+                ["kind"],
+                buckets=list(query_stats.HISTOGRAM_BUCKETS),
+            )
+            EVENT_LOOP_LAG_SECONDS = Histogram(
+                "event_loop_lag_seconds",
+                "Event-loop heartbeat lateness",
+                ["loop"],
+                buckets=list(loop_watchdog.LAG_BUCKETS),
+            )
+            EVENT_LOOP_STALLS_TOTAL = Counter(
+                "event_loop_stalls_total", "Event-loop stalls over LOOP_STALL_THRESHOLD_MS", ["loop"]
+            )
+            RUNTIME = _build_runtime_metrics(Counter, Gauge)
+            # Info values are not shared between processes
+            SERVICE_INFO = None if directory else Info("executivedesk_ai", "Service information")
+
+            query_durations = {kind: DB_QUERY_DURATION_SECONDS.labels(kind=kind) for kind in query_stats.KINDS}
+            query_stats.set_observer(lambda kind, seconds: query_durations[kind].observe(seconds))
+            loop_watchdog.set_observer(_observe_loop_lag)
 
             CONTENT_TYPE_LATEST = _CONTENT_TYPE_LATEST
             REGISTRY = _REGISTRY
@@ -129,7 +286,7 @@ def _ensure_metrics_ready() -> bool:
 
 def initialize_service_info():
     """Initialize service info metric."""
-    if not _ensure_metrics_ready():
+    if not _ensure_metrics_ready() or SERVICE_INFO is None:
         return
     try:
         from backend.core.config import get_settings
@@ -247,6 +404,161 @@ def record_replay_determinism_failure():
     REPLAY_DETERMINISM_FAILURES_TOTAL.inc()
 
 
+def record_event_bus_dropped(reason: str):
+    """Record a run event dropped by the event bus."""
+    if not _ensure_metrics_ready():
+        return
+    EVENT_BUS_DROPPED_TOTAL.labels(reason=reason).inc()
+
+
+def record_event_bus_delivery_lag(seconds: float):
+    """Record cross-loop event delivery lag."""
+    if not _ensure_metrics_ready():
+        return
+    EVENT_BUS_DELIVERY_LAG_SECONDS.observe(seconds)
+
+
+def _observe_loop_lag(loop: str, seconds: float, stalled: bool) -> None:
+    EVENT_LOOP_LAG_SECONDS.labels(loop=loop).observe(seconds)
+    if stalled:
+        EVENT_LOOP_STALLS_TOTAL.labels(loop=loop).inc()
+
+
+# === RUNTIME SAMPLING ===
+
+_sample_lock = Lock()
+# Last value seen per (metric, labels) for counters fed from cumulative in-process totals
+_last_totals: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+_seen_run_statuses: set = set()
+_sampler: Optional[threading.Thread] = None
+_sampler_stop = threading.Event()
+
+
+def _advance(name: str, total: float, *labels: str) -> None:
+    """Increment counter ``name`` by how much ``total`` grew since the last sample."""
+    key = (name, labels)
+    delta = total - _last_totals.get(key, 0.0)
+    if delta < 0:  # the source was reset (e.g. a cache was replaced)
+        delta = total
+    _last_totals[key] = total
+    counter = RUNTIME[name].labels(*labels) if labels else RUNTIME[name]
+    if delta > 0:
+        counter.inc(delta)
+
+
+def _sample_caches() -> None:
+    from backend.core.cache import cache_stats
+
+    for stats in cache_stats():
+        name = stats["name"]
+        RUNTIME["cache_entries"].labels(name).set(stats["entries"])
+        RUNTIME["cache_bytes"].labels(name).set(stats["bytes"])
+        lookups = stats["hits"] + stats["misses"]
+        if lookups:
+            RUNTIME["cache_hit_ratio"].labels(name).set(stats["hits"] / lookups)
+        for field in ("hits", "misses", "evictions", "expirations"):
+            _advance(f"cache_{field}", stats[field], name)
+
+
+def _sample_db() -> None:
+    from backend.db import query_stats
+    from backend.db.connect import connection_stats
+
+    conns = connection_stats()
+    RUNTIME["db_connections_open"].set(conns["open"])
+    _advance("db_connections_opened", conns["opened"])
+    _advance("db_connect_seconds", conns["connect_seconds"])
+    _advance("db_slow_queries", query_stats.slow_query_total())
+
+
+def _sample_streams() -> None:
+    from backend.api.middleware.sse_tracker import get_total_sse_connections
+    from backend.core.profiling import http_client_stats
+    from backend.orchestrator.event_pubsub import event_pubsub
+
+    bus = event_pubsub.stats()
+    RUNTIME["event_bus_subscribers"].set(bus["subscriptions"])
+    RUNTIME["event_bus_queue_depth"].set(bus["queued"])
+    RUNTIME["sse_connections"].set(get_total_sse_connections())
+    for host, stats in http_client_stats().items():
+        RUNTIME["http_client_in_flight"].labels(host).set(stats["in_flight"])
+        _advance("http_client_requests", stats["requests"], host)
+
+
+def _sample_runs() -> None:
+    from backend.db.sharding import query_all
+    from backend.orchestrator.state_machine import TERMINAL_RUN_STATUSES
+
+    terminal = sorted(s.value for s in TERMINAL_RUN_STATUSES)
+    rows = query_all(
+        f"SELECT status, COUNT(*) AS n FROM runs WHERE status NOT IN ({', '.join('?' * len(terminal))}) GROUP BY status",
+        terminal,
+    )
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + row["n"]
+    for status in _seen_run_statuses - set(counts):
+        RUNTIME["runs_in_flight"].labels(status).set(0)
+    for status, n in counts.items():
+        RUNTIME["runs_in_flight"].labels(status).set(n)
+    _seen_run_statuses.update(counts)
+
+
+def sample_runtime() -> None:
+    """Copy this process's runtime state into the runtime gauges and counters."""
+    if not _ensure_metrics_ready():
+        return
+    with _sample_lock:
+        for sample in (_sample_caches, _sample_db, _sample_streams, _sample_runs):
+            try:
+                sample()
+            except Exception as e:
+                logger.debug("Runtime metrics sample %s failed: %s", sample.__name__, str(e)[:200])
+
+
+def start_runtime_sampler(interval_seconds: float = RUNTIME_SAMPLE_SECONDS) -> None:
+    """Sample runtime metrics periodically (multiprocess mode only; otherwise scrapes sample)."""
+    global _sampler
+    if not multiprocess_dir() or (_sampler is not None and _sampler.is_alive()):
+        return
+    _sampler_stop.clear()
+
+    def _loop():
+        while not _sampler_stop.wait(interval_seconds):
+            sample_runtime()
+
+    _sampler = threading.Thread(target=_loop, name="metrics-sampler", daemon=True)
+    _sampler.start()
+
+
+def shutdown_metrics() -> None:
+    """Stop the sampler and, in multiprocess mode, drop this worker's live gauges."""
+    _sampler_stop.set()
+    if multiprocess_dir():
+        try:
+            from prometheus_client import multiprocess
+            multiprocess.mark_process_dead(os.getpid())
+        except Exception as e:
+            logger.warning("Failed to mark metrics process dead: %s", str(e)[:200])
+
+
+def _scrape() -> bytes:
+    """Sample (unless the sampler thread keeps values fresh) and render; blocking."""
+    if _sampler is None or not _sampler.is_alive():
+        sample_runtime()
+    return generate_latest(_scrape_registry())
+
+
+def _scrape_registry():
+    if not multiprocess_dir():
+        return REGISTRY
+    from prometheus_client import CollectorRegistry, multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
 # === ENDPOINT ===
 
 @router.get("/metrics")
@@ -264,9 +576,9 @@ async def metrics():
             )
         # Initialize service info if not done
         initialize_service_info()
-        
-        # Generate metrics
-        output = generate_latest(REGISTRY)
+
+        # Generate metrics (every worker's files in multiprocess mode)
+        output = await asyncio.to_thread(_scrape)
         return Response(content=output, media_type=CONTENT_TYPE_LATEST)
     except Exception as e:
         logger.error(f"Failed to generate metrics: {e}")
@@ -320,11 +632,14 @@ async def metrics_json(user: dict = Depends(require_viewer)):
             """)
             confirmation_stats = {row["status"]: row["cnt"] for row in cursor.fetchall()}
             
+            from backend.orchestrator.event_pubsub import event_pubsub
+
             return {
                 "run_counts": run_counts,
                 "avg_run_duration_seconds": avg_durations,
                 "node_failures": node_failures,
-                "confirmation_stats": confirmation_stats
+                "confirmation_stats": confirmation_stats,
+                "event_bus": event_pubsub.stats()
             }
     except Exception as e:
         logger.error(f"Failed to generate JSON metrics: {e}")
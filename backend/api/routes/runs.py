@@ -408,9 +408,81 @@ async def _get_run_detail_impl(run_id: str, tenant_id: str, request_id: str, req
     return response
 
 
+def _require_run_for_tenant(run_id: str, tenant_id: str) -> None:
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT run_id FROM runs WHERE run_id = ? AND tenant_id = ?", (run_id, tenant_id)
+        ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+
+@router.get("/{run_id}/events/snapshot")
+async def get_run_events_snapshot(
+    run_id: str,
+    compact: bool = True,
+    after: Optional[str] = None,
+    user: dict = Depends(require_viewer),
+):
+    """Run history as a single JSON document (compacted by default).
+
+    Meant for reconnecting clients: fetch the snapshot, then open the SSE
+    stream with ``after=<cursor>`` to receive only newer events.
+    """
+    from backend.orchestrator.event_replay import replay_snapshot
+
+    _require_run_for_tenant(run_id, user["tenant_id"])
+    body = await asyncio.to_thread(replay_snapshot, run_id, compact, after)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/{run_id}/profile")
+async def get_run_profile(run_id: str, user: dict = Depends(require_viewer)):
+    """Per-node time breakdown (DB, HTTP by provider, LLM, JSON, sleep, loop blocked)."""
+    _require_run_for_tenant(run_id, user["tenant_id"])
+    with get_conn() as conn:
+        row = conn.execute(
+            """SELECT artifact_json FROM run_artifacts
+               WHERE run_id = ? AND artifact_type = 'run_profile'
+               ORDER BY created_at DESC LIMIT 1""",
+            (run_id,),
+        ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Run profile not found")
+    return json.loads(row["artifact_json"])
+
+
+@router.get("/{run_id}/events/{event_id}")
+async def get_run_event_payload(run_id: str, event_id: str, user: dict = Depends(require_viewer)):
+    """Full payload of one event (resolves ``payload_ref`` from compacted replay)."""
+    from backend.orchestrator.event_replay import get_event_payload
+
+    _require_run_for_tenant(run_id, user["tenant_id"])
+    payload = get_event_payload(run_id, event_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return Response(content=payload, media_type="application/json")
+
+
 @router.get("/{run_id}/events")
-async def stream_run_events(run_id: str, user: dict = Depends(require_viewer), request: Request = None):
-    """Stream run events via SSE."""
+async def stream_run_events(
+    run_id: str,
+    user: dict = Depends(require_viewer),
+    request: Request = None,
+    compact: bool = False,
+    after: Optional[str] = None,
+):
+    """Stream run events via SSE.
+
+    History is replayed in chunks before live events. ``compact=true`` drops
+    superseded events, stubs large payloads and adds ``id:`` lines so
+    ``EventSource`` reconnects resume via ``Last-Event-ID``; ``after`` skips
+    history up to a replay cursor.
+    """
+    from backend.orchestrator.event_replay import iter_replay
+
+    if after is None and request is not None:
+        after = request.headers.get("last-event-id")
     tenant_id = user["tenant_id"]
     user_id = user["user_id"]
     
@@ -446,18 +518,14 @@ async def stream_run_events(run_id: str, user: dict = Depends(require_viewer), r
             raise HTTPException(status_code=404, detail="Run not found")
     
     async def event_generator():
-        # Replay historical events
-        with get_conn() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT event_type, payload_json, ts FROM run_events WHERE run_id = ? ORDER BY ts ASC",
-                (run_id,)
-            )
-            historical = cursor.fetchall()
-        
-        for event in historical:
-            payload = json.loads(event["payload_json"])
-            yield f"data: {json.dumps({'event_type': event['event_type'], 'payload': payload, 'ts': event['ts']})}\n\n"
+        # Replay historical events, one write per chunk
+        for events, _ in iter_replay(run_id, compact=compact, after=after):
+            if not events:
+                continue
+            if compact:
+                yield "".join(f"id: {cursor}\ndata: {text}\n\n" for cursor, text in events)
+            else:
+                yield "".join(f"data: {text}\n\n" for _, text in events)
         
         # Subscribe to live events
         queue = await event_pubsub.subscribe(run_id)
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from backend.api.deps import require_viewer
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -105,7 +106,7 @@ async def get_trace(run_id: str, user: dict = Depends(require_viewer)):
         candles_batches = []
         candles_by_symbol = {}
         for batch_row in cursor.fetchall():
-            candles = _safe_json_loads(batch_row["candles_json"], [])
+            candles = _safe_json_loads(blob_store.resolve(batch_row["candles_json"]), [])
             if isinstance(candles, list):
                 candles_by_symbol[str(batch_row["symbol"])] = candles
             candles_batches.append({
@@ -0,0 +1,10 @@
+"""Performance benchmarks: synthetic large-tenant dataset + in-process API load.
+
+Usage:
+    python -m backend.bench --db bench.db --out bench-results.json
+    python -m backend.bench --db bench.db --baseline bench-baseline.json --fail-on-regression
+
+See ``dataset`` (data generation), ``load`` (scenarios and load driver),
+``report`` (JSON results and baseline comparison) and ``stubs`` (offline
+market data).
+"""
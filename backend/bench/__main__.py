@@ -0,0 +1,84 @@
+"""CLI entry point: ``python -m backend.bench``."""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+from backend.bench import report as bench_report
+from backend.bench.dataset import DatasetSpec, build_dataset, use_database
+from backend.bench.stubs import install_stub_market_data
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic large-tenant API load benchmark")
+    parser.add_argument("--db", default="bench.db", help="Benchmark SQLite path (built if missing)")
+    parser.add_argument("--rebuild", action="store_true", help="Delete and regenerate the dataset")
+    parser.add_argument("--scale", type=float, default=1.0, help="Dataset scale factor (1.0 = 20k runs)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per scenario")
+    parser.add_argument("--scenarios", default="", help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--out", default="bench-results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed p95/throughput drift (fraction)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any scenario regressed")
+    parser.add_argument("--log-level", default="WARNING", help="App log level during the run")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    args = parser.parse_args(argv)
+
+    # Benchmarks always run PAPER against stubbed market data.
+    os.environ["TRADING_DISABLE_LIVE"] = "true"
+    os.environ["ENABLE_LIVE_TRADING"] = "false"
+    os.environ["EXECUTION_MODE_DEFAULT"] = "PAPER"
+    install_stub_market_data()
+
+    spec = DatasetSpec.scaled(args.scale)
+    if args.rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    if os.path.exists(args.db):
+        use_database(args.db)
+        dataset = {"db_path": os.path.abspath(args.db), "spec": None, "reused": True}
+    else:
+        dataset = build_dataset(args.db, spec)
+        print(f"Built dataset in {dataset['build_seconds']}s: {dataset['rows']}", file=sys.stderr)
+
+    from backend.api.main import app
+    from backend.bench.load import default_scenarios, run_load
+
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    scenarios = default_scenarios(spec)
+    if args.scenarios:
+        wanted = {s.strip() for s in args.scenarios.split(",") if s.strip()}
+        unknown = wanted - {s.name for s in scenarios}
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [s for s in scenarios if s.name in wanted]
+
+    results = asyncio.run(run_load(app, scenarios, requests=args.requests, concurrency=args.concurrency))
+    report = bench_report.build_report(
+        results, dataset,
+        {"requests_per_scenario": args.requests, "concurrency": args.concurrency, "scale": args.scale},
+    )
+    if args.baseline:
+        report["comparison"] = bench_report.compare(
+            report, bench_report.load_report(args.baseline), tolerance=args.tolerance
+        )
+    bench_report.write_report(report, args.out)
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print(bench_report.format_table(report))
+        print(f"\nReport written to {args.out}")
+
+    if args.fail_on_regression and report.get("comparison", {}).get("regressions"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
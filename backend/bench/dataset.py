@@ -0,0 +1,357 @@
+"""Synthetic large-tenant dataset for load benchmarks.
+
+Builds a production-shaped SQLite database: one dominant tenant owning most
+of the history plus a handful of small tenants, with runs fanned out into
+dag_nodes, run_events, tool_calls, eval_results, orders (with events and
+fills), portfolio snapshots, conversations/messages and news items with
+asset mentions. Data is deterministic for a given ``DatasetSpec`` and seed so
+benchmark runs are comparable.
+"""
+import json
+import os
+import random
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from backend.bench.stubs import BENCH_SYMBOLS
+
+BENCH_TENANT = "t_bench_large"
+
+NODE_NAMES = ["research", "signals", "risk", "proposal", "execution", "post_trade", "eval"]
+EVENT_TYPES = ["RUN_CREATED", "STEP_STARTED", "STEP_FINISHED", "TOOL_CALL", "ARTIFACT", "RUN_STATUS"]
+EVAL_NAMES = [
+    ("action_grounding", "grounding"),
+    ("budget_compliance", "safety"),
+    ("execution_quality", "execution"),
+    ("tool_reliability", "reliability"),
+    ("latency_slo", "performance"),
+    ("news_freshness", "evidence"),
+]
+COMMANDS = [
+    "Buy $10 of BTC",
+    "Sell $5 of ETH",
+    "Buy the most profitable crypto in the last 24h for $25",
+    "Analyze my portfolio",
+    "Buy $20 of SOL",
+]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Row counts for the synthetic dataset (per-run fan-outs are averages)."""
+    tenants: int = 5
+    runs: int = 20000
+    nodes_per_run: int = 5
+    events_per_run: int = 8
+    tool_calls_per_run: int = 3
+    evals_per_run: int = 4
+    order_every_n_runs: int = 2
+    news_items: int = 5000
+    conversations: int = 400
+    messages_per_conversation: int = 20
+    snapshots_per_tenant: int = 200
+    # Share of runs/conversations owned by BENCH_TENANT
+    large_tenant_share: float = 0.7
+
+    @classmethod
+    def scaled(cls, factor: float) -> "DatasetSpec":
+        """Scale every row count by ``factor`` (minimum 1)."""
+        base = cls()
+        return cls(
+            tenants=base.tenants,
+            runs=max(1, int(base.runs * factor)),
+            nodes_per_run=base.nodes_per_run,
+            events_per_run=base.events_per_run,
+            tool_calls_per_run=base.tool_calls_per_run,
+            evals_per_run=base.evals_per_run,
+            order_every_n_runs=base.order_every_n_runs,
+            news_items=max(1, int(base.news_items * factor)),
+            conversations=max(1, int(base.conversations * factor)),
+            messages_per_conversation=base.messages_per_conversation,
+            snapshots_per_tenant=max(1, int(base.snapshots_per_tenant * factor)),
+            large_tenant_share=base.large_tenant_share,
+        )
+
+
+def tenant_ids(spec: DatasetSpec) -> List[str]:
+    return [BENCH_TENANT] + [f"t_bench_{i:02d}" for i in range(1, spec.tenants)]
+
+
+def run_id(i: int) -> str:
+    return f"run_bench_{i:07d}"
+
+
+def conversation_id(i: int) -> str:
+    return f"conv_bench_{i:05d}"
+
+
+def _tenant_for(i: int, spec: DatasetSpec, tenants: Sequence[str]) -> str:
+    # Deterministic skew: the first ``large_tenant_share`` of every 100 rows
+    # belong to the large tenant, the rest round-robin over the others.
+    if len(tenants) == 1 or (i % 100) < spec.large_tenant_share * 100:
+        return tenants[0]
+    return tenants[1 + i % (len(tenants) - 1)]
+
+
+class _Clock:
+    """Maps row indexes to ISO timestamps ending at ``now``."""
+
+    def __init__(self, total: int, span: timedelta):
+        self.end = datetime.now(timezone.utc).replace(microsecond=0)
+        self.step = span / max(1, total)
+        self.total = total
+
+    def at(self, i: int, offset_s: float = 0.0) -> str:
+        ts = self.end - self.step * (self.total - i) + timedelta(seconds=offset_s)
+        return ts.isoformat().replace("+00:00", "Z")
+
+
+def use_database(db_path: str) -> None:
+    """Point the app at ``db_path`` and apply migrations."""
+    from backend.core.config import reset_settings
+    from backend.db.connect import _close_connections, init_db, reset_canonical_db_path
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(db_path)}"
+    reset_settings()
+    _close_connections()
+    reset_canonical_db_path()
+    init_db()
+
+
+def _insert(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: Iterator[Tuple]) -> int:
+    placeholders = ",".join("?" * len(columns))
+    cursor = conn.executemany(
+        f"INSERT OR IGNORE INTO {table} ({','.join(columns)}) VALUES ({placeholders})", rows
+    )
+    return cursor.rowcount
+
+
+def _runs(spec, tenants, clock, rng):
+    for i in range(spec.runs):
+        status = "FAILED" if i % 10 == 9 else "COMPLETED"
+        command = COMMANDS[i % len(COMMANDS)]
+        symbol = BENCH_SYMBOLS[i % len(BENCH_SYMBOLS)]
+        proposal = {"orders": [{"symbol": f"{symbol}-USD", "side": "BUY", "notional_usd": 10.0}]}
+        yield (
+            run_id(i), _tenant_for(i, spec, tenants), status, "PAPER",
+            clock.at(i), clock.at(i, 0.1), clock.at(i, 2.0 + rng.random() * 3),
+            json.dumps(proposal), f"trace_{i:07d}", command, "CRYPTO", "paper",
+            "{}", 1, "policy_blocked" if status == "FAILED" else None,
+        )
+
+
+def _dag_nodes(spec, clock):
+    for i in range(spec.runs):
+        for n in range(spec.nodes_per_run):
+            name = NODE_NAMES[n % len(NODE_NAMES)]
+            outputs = {"node": name, "summary": f"{name} completed", "items": list(range(n + 1))}
+            if name in ("signals", "proposal"):
+                # Shape read by the slippage analytics (expected price per symbol)
+                outputs.update(top_symbol=f"{BENCH_SYMBOLS[i % len(BENCH_SYMBOLS)]}-USD",
+                               last_price=round((100.0 + i % 997) * 0.999, 4))
+            yield (
+                f"node_{i:07d}_{n}", run_id(i), name, "agent", "COMPLETED",
+                clock.at(i, n * 0.4), clock.at(i, n * 0.4 + 0.3),
+                json.dumps({"run_id": run_id(i)}), json.dumps(outputs), None,
+            )
+
+
+def _run_events(spec, tenants, clock):
+    for i in range(spec.runs):
+        tenant = _tenant_for(i, spec, tenants)
+        for e in range(spec.events_per_run):
+            event_type = EVENT_TYPES[e % len(EVENT_TYPES)]
+            payload = {"step": NODE_NAMES[e % len(NODE_NAMES)], "seq": e}
+            yield (f"evt_{i:07d}_{e}", run_id(i), tenant, event_type, json.dumps(payload), clock.at(i, e * 0.25))
+
+
+def _tool_calls(spec, clock, rng):
+    for i in range(spec.runs):
+        for t in range(spec.tool_calls_per_run):
+            symbol = BENCH_SYMBOLS[(i + t) % len(BENCH_SYMBOLS)]
+            yield (
+                f"tc_{i:07d}_{t}", run_id(i), f"node_{i:07d}_{t % spec.nodes_per_run}",
+                "get_candles", "market_data", json.dumps({"symbol": f"{symbol}-USD"}),
+                json.dumps({"count": 24}), "SUCCESS", clock.at(i, t * 0.3),
+                int(20 + rng.random() * 200), 200, 1,
+            )
+
+
+def _eval_results(spec, tenants, clock, rng):
+    for i in range(spec.runs):
+        tenant = _tenant_for(i, spec, tenants)
+        for k in range(spec.evals_per_run):
+            name, category = EVAL_NAMES[(i + k) % len(EVAL_NAMES)]
+            score = round(0.5 + rng.random() * 0.5, 3)
+            yield (
+                f"eval_{i:07d}_{k}", run_id(i), tenant, name, score,
+                json.dumps([f"{name} check"]), clock.at(i, 3 + k * 0.1), "deterministic", category,
+            )
+
+
+def _orders(spec, tenants, clock, rng):
+    for i in range(0, spec.runs, spec.order_every_n_runs):
+        symbol = BENCH_SYMBOLS[i % len(BENCH_SYMBOLS)]
+        price = 100.0 + (i % 997)
+        notional = float(5 + i % 50)
+        qty = notional / price
+        side = "SELL" if i % 4 == 2 else "BUY"
+        yield (
+            f"ord_bench_{i:07d}", run_id(i), _tenant_for(i, spec, tenants), "PAPER", f"{symbol}-USD",
+            side, "MARKET", qty, notional, "FILLED", clock.at(i, 2.5), qty, price,
+            round(notional * 0.006, 4),
+        )
+
+
+def _order_events(spec, clock):
+    for i in range(0, spec.runs, spec.order_every_n_runs):
+        for e, event_type in enumerate(("SUBMITTED", "FILLED")):
+            yield (f"oe_{i:07d}_{e}", f"ord_bench_{i:07d}", event_type, json.dumps({"seq": e}), clock.at(i, 2.5 + e * 0.2))
+
+
+def _fills(spec, tenants, clock):
+    for i in range(0, spec.runs, spec.order_every_n_runs):
+        symbol = BENCH_SYMBOLS[i % len(BENCH_SYMBOLS)]
+        price = 100.0 + (i % 997)
+        notional = float(5 + i % 50)
+        yield (
+            f"fill_{i:07d}", f"ord_bench_{i:07d}", run_id(i), _tenant_for(i, spec, tenants),
+            f"{symbol}-USD", price, notional / price, round(notional * 0.006, 4), clock.at(i, 2.7),
+        )
+
+
+def _snapshots(spec, tenants, clock):
+    for t, tenant in enumerate(tenants):
+        for s in range(spec.snapshots_per_tenant):
+            positions = {sym: round(0.1 * (1 + (s + k) % 7), 6) for k, sym in enumerate(BENCH_SYMBOLS[:4])}
+            cash = 10000.0 - s
+            total = cash + sum(qty * (100.0 + k) for k, qty in enumerate(positions.values()))
+            idx = int(s * spec.runs / max(1, spec.snapshots_per_tenant))
+            yield (
+                f"snap_{t:02d}_{s:05d}", run_id(idx), tenant, json.dumps({"USD": cash}),
+                json.dumps(positions), round(total, 2), clock.at(idx, 3.0),
+            )
+
+
+def _conversations(spec, tenants, clock):
+    for c in range(spec.conversations):
+        idx = int(c * spec.runs / max(1, spec.conversations))
+        yield (conversation_id(c), _tenant_for(c, spec, tenants), f"Bench conversation {c}", clock.at(idx), clock.at(idx, 60))
+
+
+def _messages(spec, tenants, clock):
+    for c in range(spec.conversations):
+        tenant = _tenant_for(c, spec, tenants)
+        base = int(c * spec.runs / max(1, spec.conversations))
+        for m in range(spec.messages_per_conversation):
+            role = "user" if m % 2 == 0 else "assistant"
+            content = COMMANDS[(c + m) % len(COMMANDS)] if role == "user" else "Ready to execute 1 trade(s)."
+            run = run_id(min(spec.runs - 1, base + m // 2)) if role == "assistant" else None
+            yield (f"msg_{c:05d}_{m:03d}", conversation_id(c), tenant, role, content, run, "{}", clock.at(base, m * 5))
+
+
+def _news_items(spec, clock):
+    for n in range(spec.news_items):
+        symbol = BENCH_SYMBOLS[n % len(BENCH_SYMBOLS)]
+        url = f"https://news.example.com/{symbol.lower()}/{n}"
+        title = f"{symbol} {('rallies', 'slips', 'steadies', 'breaks out', 'consolidates')[n % 5]} as volume shifts ({n})"
+        yield (
+            f"news_bench_{n:06d}", "src_bench", clock.at(int(n * spec.runs / max(1, spec.news_items))),
+            url, url, title, f"Market commentary on {symbol} price action and flows.",
+            f"hash_{n:06d}", "en", "news.example.com",
+        )
+
+
+def _news_mentions(spec):
+    for n in range(spec.news_items):
+        primary = BENCH_SYMBOLS[n % len(BENCH_SYMBOLS)]
+        yield (f"news_bench_{n:06d}", primary, 0.9, "ticker")
+        if n % 3 == 0:
+            yield (f"news_bench_{n:06d}", BENCH_SYMBOLS[(n + 1) % len(BENCH_SYMBOLS)], 0.5, "keyword")
+
+
+def build_dataset(db_path: str, spec: DatasetSpec = DatasetSpec(), seed: int = 7, index_news: bool = True) -> Dict[str, object]:
+    """Create (or extend) the benchmark database at ``db_path``.
+
+    Returns row counts per table plus the spec and build time.
+    """
+    started = time.perf_counter()
+    use_database(db_path)
+    rng = random.Random(seed)
+    tenants = tenant_ids(spec)
+    clock = _Clock(spec.runs, timedelta(days=90))
+
+    counts: Dict[str, int] = {}
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        with conn:
+            counts["tenants"] = _insert(conn, "tenants", ("tenant_id", "name", "kill_switch_enabled"),
+                                        ((t, t, 0) for t in tenants))
+            _insert(conn, "news_sources", ("id", "name", "type", "url", "is_enabled", "weight"),
+                    iter([("src_bench", "Bench Wire", "rss", "https://news.example.com/rss", 1, 1.0)]))
+            counts["runs"] = _insert(conn, "runs", (
+                "run_id", "tenant_id", "status", "execution_mode", "created_at", "started_at",
+                "completed_at", "trade_proposal_json", "trace_id", "command_text", "asset_class",
+                "provider_name", "metadata_json", "news_enabled", "failure_code",
+            ), _runs(spec, tenants, clock, rng))
+            counts["dag_nodes"] = _insert(conn, "dag_nodes", (
+                "node_id", "run_id", "name", "node_type", "status", "started_at", "completed_at",
+                "inputs_json", "outputs_json", "error_json",
+            ), _dag_nodes(spec, clock))
+            counts["run_events"] = _insert(conn, "run_events", (
+                "id", "run_id", "tenant_id", "event_type", "payload_json", "ts",
+            ), _run_events(spec, tenants, clock))
+            counts["tool_calls"] = _insert(conn, "tool_calls", (
+                "id", "run_id", "node_id", "tool_name", "mcp_server", "request_json", "response_json",
+                "status", "ts", "latency_ms", "http_status", "attempt",
+            ), _tool_calls(spec, clock, rng))
+            counts["eval_results"] = _insert(conn, "eval_results", (
+                "eval_id", "run_id", "tenant_id", "eval_name", "score", "reasons_json", "ts",
+                "evaluator_type", "eval_category",
+            ), _eval_results(spec, tenants, clock, rng))
+            counts["orders"] = _insert(conn, "orders", (
+                "order_id", "run_id", "tenant_id", "provider", "symbol", "side", "order_type", "qty",
+                "notional_usd", "status", "created_at", "filled_qty", "avg_fill_price", "total_fees",
+            ), _orders(spec, tenants, clock, rng))
+            counts["order_events"] = _insert(conn, "order_events", (
+                "id", "order_id", "event_type", "payload_json", "ts",
+            ), _order_events(spec, clock))
+            counts["fills"] = _insert(conn, "fills", (
+                "fill_id", "order_id", "run_id", "tenant_id", "product_id", "price", "size", "fee", "filled_at",
+            ), _fills(spec, tenants, clock))
+            counts["portfolio_snapshots"] = _insert(conn, "portfolio_snapshots", (
+                "snapshot_id", "run_id", "tenant_id", "balances_json", "positions_json", "total_value_usd", "ts",
+            ), _snapshots(spec, tenants, clock))
+            counts["conversations"] = _insert(conn, "conversations", (
+                "conversation_id", "tenant_id", "title", "created_at", "updated_at",
+            ), _conversations(spec, tenants, clock))
+            counts["messages"] = _insert(conn, "messages", (
+                "message_id", "conversation_id", "tenant_id", "role", "content", "run_id", "metadata_json", "created_at",
+            ), _messages(spec, tenants, clock))
+            counts["news_items"] = _insert(conn, "news_items", (
+                "id", "source_id", "published_at", "url", "canonical_url", "title", "summary",
+                "content_hash", "lang", "domain",
+            ), _news_items(spec, clock))
+            counts["news_asset_mentions"] = _insert(conn, "news_asset_mentions", (
+                "item_id", "asset_symbol", "confidence", "method",
+            ), _news_mentions(spec))
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    if index_news:
+        from backend.services.retrieval_index import backfill_news
+        counts["retrieval_docs"] = backfill_news(limit=spec.news_items)
+
+    return {
+        "db_path": os.path.abspath(db_path),
+        "spec": asdict(spec),
+        "seed": seed,
+        "rows": counts,
+        "build_seconds": round(time.perf_counter() - started, 2),
+    }
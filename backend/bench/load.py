@@ -0,0 +1,173 @@
+"""In-process API load driver.
+
+Drives the FastAPI app through ``httpx.ASGITransport`` with N concurrent
+clients per scenario and records per-request latency. No server, socket or
+network hop is involved, so the numbers isolate application + SQLite cost.
+"""
+import asyncio
+import itertools
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from backend.bench.dataset import BENCH_TENANT, DatasetSpec, conversation_id, run_id
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One endpoint under load.
+
+    ``path`` and ``body`` are called with the request sequence number so each
+    request can target a different run/conversation.
+    """
+    name: str
+    method: str
+    path: Callable[[int], str]
+    body: Optional[Callable[[int], Dict[str, Any]]] = None
+    # Concurrency cap (e.g. SSE allows 3 connections per user)
+    max_concurrency: Optional[int] = None
+
+
+def _large_tenant_run(spec: DatasetSpec, with_orders: bool = False) -> Callable[[int], str]:
+    """Pick runs owned by BENCH_TENANT (index % 100 below the large-tenant share)."""
+    share = max(1, int(spec.large_tenant_share * 100))
+    every = spec.order_every_n_runs if with_orders else 1
+    owned = [i for i in range(min(spec.runs, 5000)) if i % 100 < share and i % every == 0] or [0]
+    return lambda n: run_id(owned[(n * 37) % len(owned)])
+
+
+def default_scenarios(spec: DatasetSpec) -> List[Scenario]:
+    """The hot endpoints: chat command (PAPER), run detail/SSE, evals, analytics, conversations."""
+    pick_run = _large_tenant_run(spec)
+    pick_traded_run = _large_tenant_run(spec, with_orders=True)
+    share = max(1, int(spec.large_tenant_share * 100))
+    owned_convs = [c for c in range(spec.conversations) if c % 100 < share] or [0]
+    trade_texts = ["Buy $10 of BTC", "Sell $5 of ETH", "Buy $20 of SOL", "Analyze my portfolio"]
+    return [
+        Scenario(
+            "chat_command_paper", "POST", lambda n: "/api/v1/chat/command",
+            body=lambda n: {"text": trade_texts[n % len(trade_texts)]},
+        ),
+        Scenario("run_detail", "GET", lambda n: f"/api/v1/runs/{pick_run(n)}"),
+        Scenario("run_events_sse", "GET", lambda n: f"/api/v1/runs/{pick_run(n)}/events", max_concurrency=3),
+        Scenario("run_list", "GET", lambda n: "/api/v1/runs"),
+        Scenario("evals_dashboard", "GET", lambda n: "/api/v1/evals/dashboard"),
+        Scenario("analytics_performance", "GET", lambda n: "/api/v1/analytics/performance"),
+        Scenario("analytics_pnl", "GET", lambda n: f"/api/v1/analytics/pnl?run_id={pick_traded_run(n)}"),
+        Scenario("analytics_slippage", "GET", lambda n: f"/api/v1/analytics/slippage?run_id={pick_traded_run(n)}"),
+        Scenario("analytics_risk", "GET", lambda n: "/api/v1/analytics/risk"),
+        Scenario("conversations_list", "GET", lambda n: "/api/v1/conversations"),
+        Scenario(
+            "conversation_messages", "GET",
+            lambda n: f"/api/v1/conversations/{conversation_id(owned_convs[n % len(owned_convs)])}/messages",
+        ),
+    ]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    concurrency: int
+    wall_seconds: float
+    latencies_ms: List[float] = field(repr=False, default_factory=list)
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "throughput_rps": round(self.requests / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "mean_ms": round(statistics.fmean(lat), 3) if lat else 0.0,
+            "p50_ms": round(percentile(lat, 50), 3),
+            "p95_ms": round(percentile(lat, 95), 3),
+            "p99_ms": round(percentile(lat, 99), 3),
+            "max_ms": round(lat[-1], 3) if lat else 0.0,
+            "status_counts": self.status_counts,
+        }
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    headers: Dict[str, str],
+) -> ScenarioResult:
+    """Issue ``requests`` calls for ``scenario`` from ``concurrency`` workers."""
+    workers = min(concurrency, scenario.max_concurrency or concurrency)
+    counter = itertools.count()
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            n = next(counter)
+            if n >= requests:
+                return
+            kwargs: Dict[str, Any] = {"headers": headers}
+            if scenario.body is not None:
+                kwargs["json"] = scenario.body(n)
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path(n), **kwargs)
+                await response.aread()
+                key = str(response.status_code)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception as exc:
+                key = type(exc).__name__
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+            status_counts[key] = status_counts.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return ScenarioResult(
+        name=scenario.name,
+        requests=requests,
+        errors=errors,
+        concurrency=workers,
+        wall_seconds=time.perf_counter() - started,
+        latencies_ms=latencies,
+        status_counts=status_counts,
+    )
+
+
+async def run_load(
+    app,
+    scenarios: Sequence[Scenario],
+    requests: int = 200,
+    concurrency: int = 8,
+    warmup: int = 5,
+    tenant_id: str = BENCH_TENANT,
+) -> Dict[str, Dict[str, Any]]:
+    """Run every scenario in sequence and return ``{name: summary}``."""
+    headers = {"X-Dev-Tenant": tenant_id}
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, Dict[str, Any]] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+        for scenario in scenarios:
+            if warmup:
+                await run_scenario(client, scenario, warmup, 1, headers)
+            result = await run_scenario(client, scenario, requests, concurrency, headers)
+            results[scenario.name] = result.summary()
+    return results
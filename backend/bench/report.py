@@ -0,0 +1,105 @@
+"""Benchmark result files and baseline comparison."""
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Latency metrics compared against the baseline (higher is worse)
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_report(scenarios: Dict[str, Dict[str, Any]], dataset: Dict[str, Any], settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **settings,
+        },
+        "dataset": dataset,
+        "scenarios": scenarios,
+    }
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def _change_pct(current: float, baseline: float) -> Optional[float]:
+    if not baseline:
+        return None
+    return round((current - baseline) / baseline * 100.0, 2)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.15) -> Dict[str, Any]:
+    """Compare two reports scenario by scenario.
+
+    A scenario regresses when its p95 latency grows by more than
+    ``tolerance`` (fraction) or its throughput drops by more than
+    ``tolerance``. Scenarios missing from either side are listed, not judged.
+    """
+    cur, base = current.get("scenarios", {}), baseline.get("scenarios", {})
+    rows: Dict[str, Any] = {}
+    regressions = []
+    for name in sorted(set(cur) & set(base)):
+        c, b = cur[name], base[name]
+        row = {
+            metric: {"baseline": b.get(metric, 0.0), "current": c.get(metric, 0.0),
+                     "change_pct": _change_pct(c.get(metric, 0.0), b.get(metric, 0.0))}
+            for metric in LATENCY_METRICS + ("throughput_rps",)
+        }
+        reasons = []
+        if b.get("p95_ms") and c.get("p95_ms", 0.0) > b["p95_ms"] * (1 + tolerance):
+            reasons.append("p95_ms")
+        if b.get("throughput_rps") and c.get("throughput_rps", 0.0) < b["throughput_rps"] * (1 - tolerance):
+            reasons.append("throughput_rps")
+        if c.get("errors", 0) > b.get("errors", 0):
+            reasons.append("errors")
+        row["regressed"] = bool(reasons)
+        row["reasons"] = reasons
+        if reasons:
+            regressions.append(name)
+        rows[name] = row
+    return {
+        "baseline_git_rev": baseline.get("meta", {}).get("git_rev"),
+        "tolerance": tolerance,
+        "regressions": regressions,
+        "only_in_current": sorted(set(cur) - set(base)),
+        "only_in_baseline": sorted(set(base) - set(cur)),
+        "scenarios": rows,
+    }
+
+
+def format_table(report: Dict[str, Any]) -> str:
+    """Human-readable summary (one line per scenario)."""
+    comparison = report.get("comparison", {}).get("scenarios", {})
+    lines = [f"{'scenario':<24} {'req':>5} {'err':>4} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}  vs baseline p95"]
+    for name, s in report["scenarios"].items():
+        delta = comparison.get(name, {}).get("p95_ms", {}).get("change_pct")
+        flag = "" if delta is None else f"{delta:+.1f}%" + (" REGRESSED" if comparison[name]["regressed"] else "")
+        lines.append(
+            f"{name:<24} {s['requests']:>5} {s['errors']:>4} {s['throughput_rps']:>9.1f} "
+            f"{s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f}  {flag}"
+        )
+    return "\n".join(lines)
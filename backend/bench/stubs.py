@@ -0,0 +1,163 @@
+"""Offline market data for benchmarks.
+
+The benchmark must not depend on Coinbase/Polygon credentials or network
+latency. ``install_stub_market_data`` does two things:
+
+- points the market data provider factory at ``StubMarketDataProvider``
+  (deterministic prices and candles per symbol);
+- gives every ``httpx`` client created without an explicit transport a
+  ``MockTransport`` that answers the Coinbase endpoints the app calls
+  directly (product catalog, product details, ticker, candles) and returns
+  404 for anything else, so news fetches and unknown hosts fail fast.
+
+It must run before ``backend.api.main`` is imported: the MCP market data
+server builds its provider at import time.
+"""
+import hashlib
+import math
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from backend.providers.market_data_base import MarketDataProvider
+
+BENCH_SYMBOLS = ["BTC", "ETH", "SOL", "DOGE", "ADA", "AVAX", "LINK", "MATIC", "DOT", "LTC"]
+
+_INTERVAL_SECONDS = {
+    "ONE_MINUTE": 60, "FIVE_MINUTE": 300, "FIFTEEN_MINUTE": 900,
+    "ONE_HOUR": 3600, "SIX_HOUR": 21600, "ONE_DAY": 86400,
+    "1h": 3600, "24h": 86400, "7d": 86400,
+}
+
+
+def _base_price(symbol: str) -> float:
+    digest = hashlib.sha256(symbol.upper().split("-")[0].encode()).digest()
+    return 1.0 + int.from_bytes(digest[:4], "big") % 50000
+
+
+class StubMarketDataProvider(MarketDataProvider):
+    """Deterministic prices and candles keyed by symbol."""
+
+    def get_candles(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        step = _INTERVAL_SECONDS.get(interval, 3600)
+        end = datetime.utcnow().replace(microsecond=0)
+        base = _base_price(symbol)
+        candles = []
+        for i in range(limit, 0, -1):
+            start = end - timedelta(seconds=step * i)
+            close = base * (1 + 0.02 * math.sin(i / 7.0))
+            candles.append({
+                "start_time": start.isoformat() + "Z",
+                "end_time": (start + timedelta(seconds=step)).isoformat() + "Z",
+                "open": close * 0.999,
+                "high": close * 1.004,
+                "low": close * 0.996,
+                "close": close,
+                "volume": 1000.0 + i,
+            })
+        return candles
+
+    def get_price(self, symbol: str) -> float:
+        return _base_price(symbol)
+
+
+_stub_provider = StubMarketDataProvider()
+
+
+def _product(product_id: str) -> Dict[str, Any]:
+    base, _, quote = product_id.partition("-")
+    return {
+        "id": product_id,
+        "base_currency": base,
+        "quote_currency": quote or "USD",
+        "base_min_size": "0.00000001",
+        "base_max_size": "1000000",
+        "quote_increment": "0.01",
+        "base_increment": "0.00000001",
+        "min_market_funds": "1",
+        "max_market_funds": "1000000",
+        "status": "online",
+        "trading_disabled": False,
+    }
+
+
+def _coinbase_handler(request: httpx.Request) -> httpx.Response:
+    """Answer the Coinbase endpoints used by the app from the stub provider."""
+    host = request.url.host
+    parts = request.url.path.strip("/").split("/")
+
+    if host == "api.exchange.coinbase.com" and parts[0] == "products":
+        if len(parts) == 1:
+            return httpx.Response(200, json=[_product(f"{s}-USD") for s in BENCH_SYMBOLS])
+        product_id = parts[1]
+        if len(parts) == 2:
+            return httpx.Response(200, json=_product(product_id))
+        if parts[2] == "ticker":
+            price = _stub_provider.get_price(product_id)
+            return httpx.Response(200, json={"price": f"{price:.2f}", "time": datetime.utcnow().isoformat() + "Z"})
+        if parts[2] == "candles":
+            granularity = int(request.url.params.get("granularity", 3600))
+            interval = next((k for k, v in _INTERVAL_SECONDS.items() if v == granularity), "ONE_HOUR")
+            candles = _stub_provider.get_candles(product_id, interval, limit=300)
+            rows = [
+                [int(datetime.fromisoformat(c["start_time"].rstrip("Z")).timestamp()),
+                 c["low"], c["high"], c["open"], c["close"], c["volume"]]
+                for c in reversed(candles)
+            ]
+            return httpx.Response(200, json=rows)
+
+    if host == "api.coinbase.com" and parts[:4] == ["api", "v3", "brokerage", "products"] and len(parts) == 5:
+        p = _product(parts[4])
+        return httpx.Response(200, json={"product": {
+            "product_id": p["id"],
+            "base_currency_id": p["base_currency"],
+            "quote_currency_id": p["quote_currency"],
+            "base_min_size": p["base_min_size"],
+            "quote_increment": p["quote_increment"],
+            "base_increment": p["base_increment"],
+            "min_market_funds": p["min_market_funds"],
+            "status": p["status"],
+        }})
+
+    return httpx.Response(404, json={"message": f"not stubbed: {host}{request.url.path}"})
+
+
+def install_stub_market_data() -> None:
+    """Route market data lookups and outbound HTTP in this process to the stubs."""
+    from backend.services import market_data_provider
+
+    def factory(asset_class: str = "CRYPTO") -> MarketDataProvider:
+        return _stub_provider
+
+    market_data_provider.get_market_data_provider = factory
+    # Modules that bound the factory at import time (when already loaded)
+    for name in ("backend.services.coinbase_market_data", "backend.services.market_data",
+                 "backend.mcp_servers.market_data_server"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.get_market_data_provider = factory
+            server = getattr(module, "market_data_server", None)
+            if server is not None:
+                server.provider = _stub_provider
+
+    transport = httpx.MockTransport(_coinbase_handler)
+    for cls in (httpx.Client, httpx.AsyncClient):
+        if getattr(cls.__init__, "_bench_stub", False):
+            continue
+        original = cls.__init__
+
+        def patched(self, *args, _original=original, **kwargs):
+            kwargs.setdefault("transport", transport)
+            _original(self, *args, **kwargs)
+
+        patched._bench_stub = True
+        cls.__init__ = patched
@@ -0,0 +1,93 @@
+"""Shared long-lived event loop for async work started from sync code.
+
+Sync helpers used to spin up a thread plus ``asyncio.run`` per call (one per
+recorded tool call). ``get_background_loop()`` returns a single daemon-thread
+loop instead; coroutines are submitted with ``submit`` (fire-and-forget,
+returns a ``concurrent.futures.Future``) or ``run`` (blocks for the result).
+
+Only cooperative work belongs here: a coroutine that blocks (sync HTTP,
+long SQLite transactions) stalls everything else on the loop.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _in_context(coro: Coroutine[Any, Any, Any], ctx: contextvars.Context) -> Any:
+    # Carry the submitter's context variables (e.g. the DB tenant in scope)
+    # into the task; the task has its own context, so this does not leak.
+    for var, value in ctx.items():
+        var.set(value)
+    return await coro
+
+
+class BackgroundLoop:
+    """An asyncio loop running forever on a daemon thread, started on first use."""
+
+    def __init__(self, name: str = "background-loop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self._ensure_started()
+        return self._loop
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self._name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule ``coro`` on the background loop; failures are logged."""
+        future = asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), self.loop)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the background loop and wait for its result."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from the background loop itself")
+        return asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), self.loop).result(timeout)
+
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.warning("Background task failed: %s", str(exc)[:200])
+
+
+_background_loop = BackgroundLoop()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Process-wide background loop."""
+    return _background_loop
@@ -0,0 +1,343 @@
+"""Bounded in-process caches and a registry that reports on them.
+
+Module-level dicts used as caches either never evicted or swept the whole
+dict on every write, and nothing reported how big they were, so RSS growth
+in long-running workers could not be traced to a cache. ``TTLCache`` is the
+shared primitive:
+
+- per-entry TTL (expired entries are dropped on access or when evicting);
+- LRU eviction by entry count and, optionally, by approximate byte size;
+- single-flight loading (``get_or_load`` / ``aget_or_load``): concurrent
+  misses for the same key share one loader call;
+- optional stale-while-revalidate (``stale_ttl`` / ``get_stale`` /
+  ``refresh_async``).
+
+Every cache registers itself by name; ``cache_stats`` feeds ``/metrics`` and
+the ops endpoints, and ``flush_cache`` clears one cache on demand.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of plain containers (dict/list/tuple/set)."""
+    size = sys.getsizeof(value)
+    if _depth >= 6:
+        return size
+    if isinstance(value, dict):
+        size += sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(v, _depth + 1) for v in value)
+    return size
+
+
+class _Flight:
+    """A load in progress for one key (thread waiters)."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _retrieve_exception(task: "asyncio.Task") -> None:
+    # A background load nobody awaited must not log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and optional byte budget.
+
+    Args:
+        name: Registry name (shown in metrics and used by the flush endpoint).
+        maxsize: Maximum number of entries.
+        ttl: Default time-to-live in seconds (``None`` = no expiry).
+        max_bytes: Approximate byte budget across entries (``None`` = unbounded).
+        sizeof: Size estimate for one value; summed into ``stats()["bytes"]`` for
+            every cache and enforced against ``max_bytes`` when that is set.
+        stale_ttl: Seconds an expired entry stays readable through ``get_stale``
+            (stale-while-revalidate); plain lookups treat it as a miss.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = approx_size,
+        register: bool = True,
+        stale_ttl: float = 0,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._lock = threading.RLock()
+        # key -> (value, expires_at or None, nbytes)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+        if register:
+            register_cache(self)
+
+    # -- internals (caller holds the lock) --------------------------------
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, nbytes = self._data.pop(key)
+        self._bytes -= nbytes
+
+    def _lookup(self, key: Hashable, now: float, allow_stale: bool = False) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                self._remove(key)
+                self.expirations += 1
+                return _MISSING
+            if not allow_stale:
+                return _MISSING
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, (_, expires_at, nbytes) = self._data.popitem(last=False)
+            self._bytes -= nbytes
+            if expires_at is not None and expires_at <= time.monotonic():
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    # -- mapping API ------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Tuple[Any, bool]:
+        """``(value, is_stale)``; expired entries within ``stale_ttl`` come back with ``is_stale=True``."""
+        with self._lock:
+            now = time.monotonic()
+            value = self._lookup(key, now, allow_stale=True)
+            if value is _MISSING:
+                self.misses += 1
+                return default, False
+            self.hits += 1
+            expires_at = self._data[key][1]
+            return value, expires_at is not None and expires_at <= now
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``; ``ttl`` overrides the cache default for this entry."""
+        ttl = self.ttl if ttl is None else ttl
+        nbytes = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = time.monotonic() + ttl if ttl is not None else None
+            self._data[key] = (value, expires_at, nbytes)
+            self._bytes += nbytes
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, time.monotonic(), allow_stale=True)
+            if value is _MISSING:
+                return default
+            self._remove(key)
+            return value
+
+    def clear(self) -> int:
+        """Drop every entry; returns how many were dropped."""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            self._bytes = 0
+            return count
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                k for k, (_, exp, _) in self._data.items() if exp is not None and exp + self.stale_ttl <= now
+            ]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key, time.monotonic()) is not _MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # -- single-flight loading ---------------------------------------------
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Cached value for ``key``, calling ``loader()`` once across threads on a miss."""
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = loader()
+            self.loads += 1
+            self.set(key, flight.value, ttl=ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> Any:
+        """Async ``get_or_load``: concurrent misses on one event loop await a single ``loader()``.
+
+        The load runs as its own task, so a caller that is cancelled (e.g. by a
+        timeout) does not cancel the load for the others.
+        """
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            task = self._start_async_load(key, loader, ttl)
+        return await asyncio.shield(task)
+
+    def refresh_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> "asyncio.Task":
+        """Start reloading ``key`` in the background (joins a load already in flight)."""
+        with self._lock:
+            return self._start_async_load(key, loader, ttl)
+
+    def _start_async_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]):
+        # Caller holds the lock. Tasks belong to one loop; a load in flight on
+        # another loop is not shared.
+        loop = asyncio.get_running_loop()
+        task = self._async_flights.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._async_load(key, loader, ttl))
+            task.add_done_callback(_retrieve_exception)
+            self._async_flights[key] = task
+        return task
+
+    async def _async_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        try:
+            value = await loader()
+            self.loads += 1
+            self.set(key, value, ttl=ttl)
+            return value
+        finally:
+            with self._lock:
+                if self._async_flights.get(key) is asyncio.current_task():
+                    del self._async_flights[key]
+
+    # -- reporting -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "maxsize": self.maxsize,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "loads": self.loads,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+_registry: Dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def register_cache(cache: TTLCache) -> TTLCache:
+    """Register ``cache`` under its name (a later cache with the same name replaces it)."""
+    with _registry_lock:
+        _registry[cache.name] = cache
+    return cache
+
+
+def get_cache(name: str) -> Optional[TTLCache]:
+    with _registry_lock:
+        return _registry.get(name)
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Stats of every registered cache, sorted by name."""
+    with _registry_lock:
+        caches = sorted(_registry.values(), key=lambda c: c.name)
+    return [c.stats() for c in caches]
+
+
+def flush_cache(name: str) -> Optional[int]:
+    """Clear the named cache; returns entries dropped, or ``None`` if no such cache."""
+    cache = get_cache(name)
+    return cache.clear() if cache is not None else None
@@ -19,6 +19,12 @@ class Settings(BaseSettings):
     # Database
     database_url: str = os.getenv("DATABASE_URL") or os.getenv("TEST_DATABASE_URL", "sqlite:///./enterprise.db")
     test_database_url: Optional[str] = os.getenv("TEST_DATABASE_URL")
+    # Per-tenant shard files (default directory: "shards" next to the database). A
+    # tenant's shard starts empty: its existing runs, orders, events and snapshots stay
+    # in the canonical database, out of view, until POST /ops/shards/{tenant_id}/migrate
+    # (sharding.migrate_tenant) moves them, once per tenant after turning this on.
+    tenant_sharding: bool = os.getenv("TENANT_SHARDING", "false").lower() == "true"
+    tenant_shard_dir: Optional[str] = os.getenv("TENANT_SHARD_DIR")
     
     # API
     api_secret_key: str = os.getenv("API_SECRET_KEY", "dev-secret-key-change-in-production")
@@ -107,6 +113,45 @@ class Settings(BaseSettings):
     pushover_app_token: Optional[str] = os.getenv("PUSHOVER_APP_TOKEN")
     pushover_user_key: Optional[str] = os.getenv("PUSHOVER_USER_KEY")
     
+    # News ingestion scheduler (per-source intervals override the default)
+    news_scheduler_enabled: bool = os.getenv("NEWS_SCHEDULER_ENABLED", "true").lower() == "true"
+    news_fetch_interval_seconds: int = int(os.getenv("NEWS_FETCH_INTERVAL_SECONDS", "900"))
+
+    # Logging: records are handed to a background writer thread through a bounded queue.
+    # LOG_DEBUG_SAMPLE keeps a fraction of DEBUG records per logger prefix, e.g.
+    # "backend.orchestrator.nodes=0.1,httpx=0.05".
+    log_async: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    log_debug_sample: str = os.getenv("LOG_DEBUG_SAMPLE", "")
+
+    # SQL instrumentation: statements slower than SQL_SLOW_QUERY_MS go to the slow-query
+    # log; a request or run repeating one statement shape SQL_REPEAT_WARN times logs a
+    # possible N+1 warning. 0 disables either.
+    sql_slow_query_ms: int = int(os.getenv("SQL_SLOW_QUERY_MS", "250"))
+    sql_repeat_warn: int = int(os.getenv("SQL_REPEAT_WARN", "25"))
+
+    # Event-loop watchdog: stalls longer than LOOP_STALL_THRESHOLD_MS are attributed to
+    # the blocking function (GET /ops/loop).
+    loop_watchdog_enabled: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+    loop_stall_threshold_ms: int = int(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+
+    # Research market data is shared across runs asking the same question (asset class,
+    # universe, lookback) within one RESEARCH_CACHE_BUCKET_SECONDS bucket.
+    research_cache_enabled: bool = os.getenv("RESEARCH_CACHE_ENABLED", "true").lower() == "true"
+    research_cache_bucket_seconds: int = int(os.getenv("RESEARCH_CACHE_BUCKET_SECONDS", "60"))
+
+    # Retention (opt-in): rows older than their table's window move to monthly archive
+    # files (default directory: "archive" next to the database). RETENTION_DAYS overrides
+    # windows per table, e.g. "run_events=60,news_fetch_log=7"; 0 keeps a table forever.
+    # Archived rows are only readable through retention.archive_reader (the <table>_all
+    # views): traces, replays and evals of runs older than a table's window no longer
+    # see that table's rows (run_events, tool_calls, market_candles_batches, ...).
+    retention_enabled: bool = os.getenv("RETENTION_ENABLED", "false").lower() == "true"
+    retention_archive_dir: Optional[str] = os.getenv("RETENTION_ARCHIVE_DIR")
+    retention_days: str = os.getenv("RETENTION_DAYS", "")
+    retention_interval_seconds: int = int(os.getenv("RETENTION_INTERVAL_SECONDS", "21600"))
+    retention_vacuum_pages: int = int(os.getenv("RETENTION_VACUUM_PAGES", "2000"))
+
     # OpenTelemetry
     service_name: str = os.getenv("SERVICE_NAME", "executivedesk-ai")
     service_version: str = os.getenv("SERVICE_VERSION", "0.1.0")
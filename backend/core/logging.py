@@ -3,13 +3,21 @@
 Provides JSON-formatted logs with:
 - Correlation IDs (run_id, trace_id, request_id, tenant_id)
 - Automatic secret redaction for API keys, private keys, tokens
+- A queue-backed pipeline: callers only redact and enqueue; JSON encoding and
+  the stdout write happen on a background listener thread
+- Sampling of high-volume DEBUG loggers (``LOG_DEBUG_SAMPLE``)
 """
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
+import queue
 import sys
 import json
 import re
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 # === SECRET REDACTION PATTERNS ===
 # These patterns match common secret formats and redact them from logs
@@ -60,10 +68,29 @@ SECRET_PATTERNS = [
 # Compiled patterns for performance
 _COMPILED_PATTERNS = [(re.compile(pattern), replacement) for pattern, replacement in SECRET_PATTERNS]
 
+# Substrings (casefolded) that every match of the pattern at the same index in
+# SECRET_PATTERNS contains. A pattern only runs when one of its triggers is in
+# the text, so ordinary log lines skip the regexes entirely.
+_PATTERN_TRIGGERS = [
+    ("private key",),
+    ("sk-",),
+    ("eyj",),
+    ("bearer", "token"),
+    ("passw", "pwd"),
+    ("apikeys",),
+    ("key", "secret"),
+    ("key", "secret"),
+]
+_ALL_TRIGGERS = tuple(sorted({t for triggers in _PATTERN_TRIGGERS for t in triggers}))
+
 
 def redact_secrets(text: str) -> str:
     """Redact secrets from text using pattern matching.
     
+    The text is scanned once for trigger substrings; only the patterns whose
+    triggers occur are applied (in their declared order, so precedence is
+    unchanged).
+    
     Args:
         text: Input text that may contain secrets
         
@@ -74,8 +101,12 @@ def redact_secrets(text: str) -> str:
         return text
     
     result = str(text)
-    for pattern, replacement in _COMPILED_PATTERNS:
-        result = pattern.sub(replacement, result)
+    folded = result.casefold()
+    if not any(t in folded for t in _ALL_TRIGGERS):
+        return result
+    for (pattern, replacement), triggers in zip(_COMPILED_PATTERNS, _PATTERN_TRIGGERS):
+        if any(t in folded for t in triggers):
+            result = pattern.sub(replacement, result)
     
     return result
 
@@ -95,6 +126,9 @@ class SecretRedactionFilter(logging.Filter):
         Returns:
             True (always allows the record through after redaction)
         """
+        if getattr(record, "secrets_redacted", False):
+            return True
+
         # Redact the message
         if record.msg:
             record.msg = redact_secrets(str(record.msg))
@@ -110,19 +144,81 @@ class SecretRedactionFilter(logging.Filter):
                     redact_secrets(str(arg)) if isinstance(arg, str) else arg 
                     for arg in record.args
                 )
-        
+
+        # A secret can straddle the format string and an argument
+        # ("api_key=%s"), so the merged message gets one pass of its own.
+        # Formatters reuse it instead of redacting again.
+        try:
+            message = record.getMessage()
+        except Exception:
+            # Bad format arguments surface in the handler's error reporting
+            return True
+        record.redacted_message = redact_secrets(message) if record.args else message
+        record.secrets_redacted = True
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records from selected loggers.
+    
+    ``rates`` maps a logger-name prefix to the fraction to keep (0.1 keeps
+    every tenth record). The longest matching prefix wins; records above
+    DEBUG and loggers without a rate are never sampled.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self._rates: List[Tuple[str, int, "itertools.count"]] = sorted(
+            ((prefix, _keep_every(rate), itertools.count()) for prefix, rate in rates.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.dropped = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self._rates:
+            return True
+        name = record.name
+        for prefix, every, counter in self._rates:
+            if name == prefix or name.startswith(prefix + "."):
+                if every and next(counter) % every == 0:
+                    return True
+                self.dropped += 1
+                return False
         return True
 
 
+def _keep_every(rate: float) -> int:
+    # Keep one record in N; 0 means drop them all
+    return max(1, round(1 / rate)) if rate > 0 else 0
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"prefix=rate,prefix=rate"`` (``LOG_DEBUG_SAMPLE``); bad entries are skipped."""
+    rates: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        prefix, sep, rate = item.partition("=")
+        if not sep or not prefix.strip():
+            continue
+        try:
+            rates[prefix.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
 class StructuredFormatter(logging.Formatter):
     """JSON formatter with correlation IDs and elapsed time tracking."""
     
     def format(self, record):
-        # Redact secrets from the message first
-        message = redact_secrets(record.getMessage())
+        # Redact secrets from the message first (unless SecretRedactionFilter already did)
+        message = getattr(record, "redacted_message", None)
+        if message is None:
+            message = redact_secrets(record.getMessage())
         
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Creation time, not write time: records may sit in the log queue
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat() + "Z",
             "level": record.levelname,
             "message": message,
             "module": record.module,
@@ -159,21 +255,99 @@ class StructuredFormatter(logging.Formatter):
             # Redact secrets from exception info
             exception_text = self.formatException(record.exc_info)
             log_data["exception"] = redact_secrets(exception_text)
+        elif record.exc_text:
+            # Rendered (and redacted) before the record was queued
+            log_data["exception"] = record.exc_text
             
         return json.dumps(log_data)
 
 
-def setup_logging(level: str = "INFO"):
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves JSON formatting to the listener thread.
+    
+    The stock ``prepare`` runs the full formatter on the calling thread. Here
+    the caller only merges the message (arguments may be mutated after the
+    call returns) and renders any traceback; ``StructuredFormatter`` runs when
+    the listener writes the record.
+    
+    When the queue is full, records below WARNING are dropped (and counted);
+    WARNING and above wait for room.
+    """
+    
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        message = getattr(record, "redacted_message", None)
+        record.msg = message if message is not None else redact_secrets(record.getMessage())
+        record.args = None
+        record.redacted_message = record.msg
+        if record.exc_info:
+            record.exc_text = redact_secrets(logging.Formatter().formatException(record.exc_info))
+        record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Blocking put: the stock put_nowait fails on a full bounded queue
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[_Listener] = None
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener (no-op if not running)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging(level: str = "INFO", async_logging: Optional[bool] = None):
     """Setup logging with secret redaction.
     
     Configures structured JSON logging with:
     - Secret redaction filter
     - Correlation ID support
     - Elapsed time tracking
+    - DEBUG sampling per ``LOG_DEBUG_SAMPLE``
+    
+    With ``async_logging`` (default: ``LOG_ASYNC``, off under pytest) the root
+    handler only enqueues; a ``QueueListener`` thread formats and writes to
+    stdout. It is stopped (and drained) at interpreter exit.
     """
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(StructuredFormatter())
+    from backend.core.config import get_settings
+    from backend.core.test_utils import is_pytest
+
+    settings = get_settings()
+    if async_logging is None:
+        async_logging = settings.log_async and not is_pytest()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(StructuredFormatter())
+
+    if async_logging:
+        handler: logging.Handler = _DeferredQueueHandler(queue.Queue(maxsize=max(settings.log_queue_size, 0)))
+    else:
+        handler = stream_handler
     
+    # Sampling first so dropped records are never redacted
+    sample_rates = parse_sample_rates(settings.log_debug_sample)
+    if sample_rates:
+        handler.addFilter(DebugSamplingFilter(sample_rates))
     # Add secret redaction filter
     handler.addFilter(SecretRedactionFilter())
     
@@ -184,6 +358,16 @@ def setup_logging(level: str = "INFO"):
     root_logger.handlers.clear()
     root_logger.addHandler(handler)
 
+    # The previous listener (if any) drains what was queued before the swap
+    stop_logging()
+    if async_logging:
+        global _listener
+        _listener = _Listener(handler.queue, stream_handler)
+        _listener.start()
+
+
+atexit.register(stop_logging)
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with secret redaction enabled.
@@ -0,0 +1,326 @@
+"""Event-loop stall watchdog with blocking-call attribution.
+
+Blocking work still runs inside coroutines in places (``time.sleep`` in
+nodes and providers, sync ``httpx.Client`` / OpenAI calls, ``feedparser``,
+SQLite everywhere), and while it runs nothing else on that loop does. The
+profile artifact shows how long a run's loop was blocked, not who blocked it.
+
+``watch(loop, name)`` puts a heartbeat task on the loop and a monitor thread
+beside it:
+
+- the heartbeat sleeps ``HEARTBEAT_SECONDS`` at a time and records how late
+  it woke up (``event_loop_lag_seconds``);
+- when the heartbeat is more than ``LOOP_STALL_THRESHOLD_MS`` overdue, the
+  monitor samples the loop thread's stack and attributes the stall to the
+  innermost application frame (skipping stdlib, site-packages and the
+  DB/profiling wrappers), e.g. ``backend.orchestrator.nodes.research_node:execute``;
+  the innermost frame overall (the library call that blocked) is kept as
+  the ``leaf``. The stall's length is added once the heartbeat runs again.
+
+``offenders()`` (``GET /ops/loop``) ranks the attributed functions by total
+stall time: the list of what to move off-loop first.
+
+``strict()`` is the opt-in test mode: known blocking calls made on a thread
+that is running an event loop raise ``BlockingCallError`` instead.
+"""
+import asyncio
+import os
+import sysconfig
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+HEARTBEAT_SECONDS = 0.05
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_OFFENDERS = 500
+UNATTRIBUTED = "<unattributed>"
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_LIBRARY_DIRS = tuple(
+    os.path.abspath(p) + os.sep
+    for p in {sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib", "purelib", "platlib")}
+)
+# Wrappers around the blocking call rather than its cause
+_WRAPPER_MODULES = frozenset({"backend.core.profiling", "backend.core.loop_watchdog", "backend.db.connect"})
+
+
+def _module_of(filename: str) -> Optional[str]:
+    """Dotted module name of an application source file, None for library code."""
+    path = os.path.abspath(filename)
+    if path.startswith(_LIBRARY_DIRS) or not path.startswith(_REPO_ROOT + os.sep) or not path.endswith(".py"):
+        return None
+    return os.path.relpath(path, _REPO_ROOT)[:-3].replace(os.sep, ".")
+
+
+def attribute(frame) -> Tuple[str, str, List[str]]:
+    """``(where, leaf, stack)`` for a sampled frame: responsible app function, blocking call, short stack."""
+    stack = traceback.extract_stack(frame)
+    if not stack:
+        return UNATTRIBUTED, UNATTRIBUTED, []
+    leaf_frame = stack[-1]
+    leaf = f"{_module_of(leaf_frame.filename) or os.path.basename(leaf_frame.filename)}:{leaf_frame.name}"
+    where = None
+    for fs in reversed(stack):
+        module = _module_of(fs.filename)
+        if module and module not in _WRAPPER_MODULES:
+            where = f"{module}:{fs.name}"
+            break
+    lines = [f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}" for fs in stack[-8:]]
+    return where or leaf, leaf, lines
+
+
+# ---------------------------------------------------------------------------
+# Watchdog
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+# Optional fn(loop_name, lag_seconds, stalled) per heartbeat (the Prometheus metrics)
+_observer: Optional[Callable[[str, float, bool], None]] = None
+# where -> {"stalls", "seconds", "max_seconds", "leaves", "loops", "stack", "last_seen"}
+_offenders: Dict[str, Dict[str, Any]] = {}
+
+
+def set_observer(observer: Optional[Callable[[str, float, bool], None]]) -> None:
+    global _observer
+    _observer = observer
+
+
+def _charge(where: str, leaf: Optional[str], loop_name: str, seconds: float, stack: Optional[List[str]]) -> None:
+    with _lock:
+        entry = _offenders.get(where)
+        if entry is None:
+            if len(_offenders) >= MAX_OFFENDERS:
+                where = UNATTRIBUTED
+                entry = _offenders.get(where)
+            if entry is None:
+                entry = _offenders[where] = {
+                    "stalls": 0, "seconds": 0.0, "max_seconds": 0.0, "leaves": {}, "loops": {},
+                    "stack": [], "last_seen": 0.0,
+                }
+        entry["stalls"] += 1
+        entry["seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+        if leaf:
+            entry["leaves"][leaf] = entry["leaves"].get(leaf, 0) + 1
+        entry["loops"][loop_name] = entry["loops"].get(loop_name, 0) + 1
+        if stack:
+            entry["stack"] = stack
+        entry["last_seen"] = time.time()
+
+
+class LoopWatchdog:
+    """Heartbeat task on ``loop`` plus a monitor thread that samples it when it stalls."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, name: str, threshold_seconds: float):
+        self.loop = loop
+        self.name = name
+        self.threshold = threshold_seconds
+        self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self.lag_sum = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._thread_id: Optional[int] = None
+        # Attribution sampled for the stall in progress: (where, leaf, stack)
+        self._sample: Optional[Tuple[str, str, List[str]]] = None
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        def _start_heartbeat():
+            self._task = self.loop.create_task(self._heartbeat())
+
+        self.loop.call_soon_threadsafe(_start_heartbeat)
+        self._monitor = threading.Thread(target=self._watch, name=f"loop-watchdog-{self.name}", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._task.cancel)
+
+    def _observe(self, lag: float) -> None:
+        slot = len(LAG_BUCKETS)
+        for i, bound in enumerate(LAG_BUCKETS):
+            if lag <= bound:
+                slot = i
+                break
+        with _lock:
+            self.buckets[slot] += 1
+            self.lag_sum += lag
+            self.max_lag = max(self.max_lag, lag)
+
+    async def _heartbeat(self) -> None:
+        self._thread_id = threading.get_ident()
+        while not self._stop.is_set():
+            self._beat = started = time.monotonic()
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            lag = max(0.0, time.monotonic() - started - HEARTBEAT_SECONDS)
+            self._observe(lag)
+            if _observer is not None:
+                _observer(self.name, lag, lag >= self.threshold)
+            if lag >= self.threshold:
+                sample, self._sample = self._sample, None
+                where, leaf, stack = sample or (UNATTRIBUTED, None, None)
+                self.stalls += 1
+                _charge(where, leaf, self.name, lag, stack)
+                logger.warning("Event loop %s blocked for %.0f ms by %s", self.name, lag * 1000, where)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS / 2):
+            overdue = time.monotonic() - self._beat - HEARTBEAT_SECONDS
+            if overdue < self.threshold or self._sample is not None or self._thread_id is None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._sample = attribute(frame)
+
+    def stats(self) -> Dict[str, Any]:
+        with _lock:
+            running, cumulative = 0, []
+            for bound, n in zip([str(b) for b in LAG_BUCKETS] + ["+Inf"], self.buckets):
+                running += n
+                cumulative.append((bound, running))
+            return {
+                "loop": self.name,
+                "threshold_ms": round(self.threshold * 1000, 1),
+                "stalls": self.stalls,
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "buckets": cumulative,
+                "sum": self.lag_sum,
+                "count": running,
+            }
+
+
+_watchdogs: Dict[str, LoopWatchdog] = {}
+
+
+def watch(loop: asyncio.AbstractEventLoop, name: str, threshold_seconds: Optional[float] = None) -> LoopWatchdog:
+    """Start watching ``loop`` under ``name`` (idempotent per name)."""
+    if threshold_seconds is None:
+        from backend.core.config import get_settings
+        threshold_seconds = get_settings().loop_stall_threshold_ms / 1000
+    with _lock:
+        existing = _watchdogs.get(name)
+        if existing is not None and existing.loop is loop and not existing._stop.is_set():
+            return existing
+    if existing is not None:
+        existing.stop()
+    watchdog = LoopWatchdog(loop, name, threshold_seconds)
+    with _lock:
+        _watchdogs[name] = watchdog
+    watchdog.start()
+    return watchdog
+
+
+def stop_watchdogs() -> None:
+    with _lock:
+        watchdogs = list(_watchdogs.values())
+        _watchdogs.clear()
+    for watchdog in watchdogs:
+        watchdog.stop()
+
+
+def loop_stats() -> List[Dict[str, Any]]:
+    with _lock:
+        watchdogs = list(_watchdogs.values())
+    return [w.stats() for w in watchdogs]
+
+
+def offenders(limit: int = 20) -> List[Dict[str, Any]]:
+    """Attributed functions by total stall time."""
+    with _lock:
+        items = sorted(_offenders.items(), key=lambda item: -item[1]["seconds"])[:limit]
+        return [
+            {
+                "where": where,
+                "stalls": e["stalls"],
+                "total_ms": round(e["seconds"] * 1000, 1),
+                "max_ms": round(e["max_seconds"] * 1000, 1),
+                "leaves": dict(sorted(e["leaves"].items(), key=lambda kv: -kv[1])[:5]),
+                "loops": dict(e["loops"]),
+                "stack": list(e["stack"]),
+                "last_seen": e["last_seen"],
+            }
+            for where, e in items
+        ]
+
+
+def reset_offenders() -> None:
+    """Clear the offenders table (for test isolation)."""
+    with _lock:
+        _offenders.clear()
+
+
+# ---------------------------------------------------------------------------
+# Strict mode
+# ---------------------------------------------------------------------------
+
+class BlockingCallError(RuntimeError):
+    """A blocking call was made on a thread running an event loop (strict mode)."""
+
+
+def _on_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _guard(name: str, func: Callable) -> Callable:
+    def guarded(*args, **kwargs):
+        if _on_loop_thread():
+            raise BlockingCallError(f"{name} called inside a coroutine; use asyncio.to_thread or an async client")
+        return func(*args, **kwargs)
+
+    guarded.__wrapped__ = func
+    return guarded
+
+
+def _blocking_targets() -> List[Tuple[Any, str, str]]:
+    """``(owner, attribute, label)`` of the blocking calls strict mode guards."""
+    targets: List[Tuple[Any, str, str]] = [(time, "sleep", "time.sleep")]
+    try:
+        import httpx
+        targets.append((httpx.Client, "send", "httpx.Client.send"))
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
+    try:
+        import requests
+        targets.append((requests.Session, "send", "requests.Session.send"))
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
+    try:
+        import feedparser
+        targets.append((feedparser, "parse", "feedparser.parse"))
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
+    return targets
+
+
+@contextmanager
+def strict() -> Iterator[None]:
+    """Make known blocking calls raise ``BlockingCallError`` when made inside a coroutine.
+
+    Calls from worker threads (``asyncio.to_thread``, executors) are unaffected.
+    Not thread-safe with respect to other code patching the same attributes.
+    """
+    patched = []
+    for owner, attr, label in _blocking_targets():
+        original = getattr(owner, attr)
+        setattr(owner, attr, _guard(label, original))
+        patched.append((owner, attr, original))
+    try:
+        yield
+    finally:
+        for owner, attr, original in reversed(patched):
+            setattr(owner, attr, original)
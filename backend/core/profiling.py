@@ -0,0 +1,298 @@
+"""Per-node time breakdown for runs.
+
+STEP_COMPLETED and ``record_node_latency`` give a node's wall time but not
+where it went. While a node runs, the runner makes a ``NodeProfile`` current
+(a context variable, so it follows ``asyncio.to_thread`` and tasks started by
+the node) and shared code paths add to it:
+
+- ``db``: SQLite statements, fetches and commits (connection factory in
+  ``backend.db.connect``);
+- ``http``: outbound HTTP by provider host, ``llm``: calls to LLM APIs
+  (hooks on ``httpx`` and ``requests`` sends, see ``install_http_hooks``);
+- ``json``: (de)serialization on the shared persistence paths (events, tool
+  calls, node outputs, artifacts, blobs) through ``dumps`` / ``loads``;
+- ``sleep``: rate-limit pauses and retry backoff (``sleep`` / ``asleep``);
+- ``loop_blocked``: event-loop lag seen by a probe task while the node runs.
+
+Categories are cumulative and can overlap (concurrent DB calls in threads,
+loop lag caused by another run), so they may sum to more than the wall time;
+``other_ms`` is whatever is left, floored at zero. When no profile is current
+every hook is a context-variable lookup.
+
+``RunProfiler`` collects the node profiles of one run; the runner persists
+``to_dict()`` as the ``run_profile`` artifact and the totals in
+``run_telemetry``.
+"""
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+CATEGORIES = ("db", "http", "llm", "json", "sleep", "loop_blocked")
+# Hosts whose calls count as LLM time rather than plain HTTP
+LLM_HOSTS = frozenset({"api.openai.com", "api.anthropic.com"})
+# Loop-lag probe: sample interval and the lag below which the loop counts as responsive
+PROBE_INTERVAL_SECONDS = 0.02
+PROBE_THRESHOLD_SECONDS = 0.005
+
+
+class NodeProfile:
+    """Time counters for one node execution."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall: Optional[float] = None
+        self.totals: Dict[str, float] = dict.fromkeys(CATEGORIES, 0.0)
+        self.counts: Dict[str, int] = dict.fromkeys(CATEGORIES, 0)
+        self.http_by_provider: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float, provider: Optional[str] = None) -> None:
+        if self.wall is not None:
+            return  # late work (e.g. a background write) after the node finished
+        with self._lock:
+            self.totals[category] += seconds
+            self.counts[category] += 1
+            if provider:
+                self.http_by_provider[provider] = self.http_by_provider.get(provider, 0.0) + seconds
+
+    def finish(self) -> None:
+        if self.wall is None:
+            self.wall = time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self.wall if self.wall is not None else time.perf_counter() - self.started
+        with self._lock:
+            breakdown = {f"{c}_ms": round(self.totals[c] * 1000, 1) for c in CATEGORIES}
+            return {
+                "node": self.name,
+                "wall_ms": round(wall * 1000, 1),
+                **breakdown,
+                "other_ms": round(max(0.0, wall - sum(self.totals.values())) * 1000, 1),
+                "counts": dict(self.counts),
+                "http_by_provider_ms": {p: round(s * 1000, 1) for p, s in sorted(self.http_by_provider.items())},
+            }
+
+
+_current: ContextVar[Optional[NodeProfile]] = ContextVar("node_profile", default=None)
+
+
+def current() -> Optional[NodeProfile]:
+    return _current.get()
+
+
+def add(category: str, seconds: float, provider: Optional[str] = None) -> None:
+    """Add ``seconds`` to the current node's ``category`` (no-op outside a profiled node)."""
+    profile = _current.get()
+    if profile is not None:
+        profile.add(category, seconds, provider)
+
+
+@contextmanager
+def measure(category: str, provider: Optional[str] = None) -> Iterator[None]:
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(category, time.perf_counter() - started, provider)
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """``json.dumps`` counted as ``json`` time."""
+    profile = _current.get()
+    if profile is None:
+        return json.dumps(obj, **kwargs)
+    started = time.perf_counter()
+    try:
+        return json.dumps(obj, **kwargs)
+    finally:
+        profile.add("json", time.perf_counter() - started)
+
+
+def loads(text: Any, **kwargs: Any) -> Any:
+    """``json.loads`` counted as ``json`` time."""
+    profile = _current.get()
+    if profile is None:
+        return json.loads(text, **kwargs)
+    started = time.perf_counter()
+    try:
+        return json.loads(text, **kwargs)
+    finally:
+        profile.add("json", time.perf_counter() - started)
+
+
+def sleep(seconds: float) -> None:
+    """``time.sleep`` for rate limits and backoff, counted as ``sleep`` time."""
+    add("sleep", max(0.0, seconds))
+    time.sleep(seconds)
+
+
+async def asleep(seconds: float) -> None:
+    """``asyncio.sleep`` for rate limits and backoff, counted as ``sleep`` time."""
+    add("sleep", max(0.0, seconds))
+    await asyncio.sleep(seconds)
+
+
+# ---------------------------------------------------------------------------
+# Outbound HTTP
+# ---------------------------------------------------------------------------
+
+def _host(url: Any) -> str:
+    return getattr(url, "host", None) or urlsplit(str(url)).hostname or "unknown"
+
+
+# Process-wide outbound request counters per host (exported as Prometheus metrics)
+_http_lock = threading.Lock()
+_http_in_flight: Dict[str, int] = {}
+_http_requests: Dict[str, int] = {}
+
+
+def _http_started(host: str) -> None:
+    with _http_lock:
+        _http_in_flight[host] = _http_in_flight.get(host, 0) + 1
+        _http_requests[host] = _http_requests.get(host, 0) + 1
+
+
+def _http_finished(host: str, seconds: float) -> None:
+    with _http_lock:
+        _http_in_flight[host] -= 1
+    profile = _current.get()
+    if profile is not None:
+        profile.add("llm" if host in LLM_HOSTS else "http", seconds, host)
+
+
+def http_client_stats() -> Dict[str, Dict[str, int]]:
+    """Per host: requests in flight now and requests sent since the hooks were installed."""
+    with _http_lock:
+        return {host: {"in_flight": _http_in_flight.get(host, 0), "requests": n} for host, n in _http_requests.items()}
+
+
+_http_hooks_installed = False
+
+
+def install_http_hooks() -> None:
+    """Count and time ``httpx`` and ``requests`` sends (idempotent)."""
+    global _http_hooks_installed
+    if _http_hooks_installed:
+        return
+    _http_hooks_installed = True
+
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - depends on environment
+        httpx = None
+    if httpx is not None:
+        sync_send = httpx.Client.send
+        async_send = httpx.AsyncClient.send
+
+        def send(self, request, *args, **kwargs):
+            host = _host(request.url)
+            _http_started(host)
+            started = time.perf_counter()
+            try:
+                return sync_send(self, request, *args, **kwargs)
+            finally:
+                _http_finished(host, time.perf_counter() - started)
+
+        async def asend(self, request, *args, **kwargs):
+            host = _host(request.url)
+            _http_started(host)
+            started = time.perf_counter()
+            try:
+                return await async_send(self, request, *args, **kwargs)
+            finally:
+                _http_finished(host, time.perf_counter() - started)
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+
+    try:
+        import requests
+    except ImportError:  # pragma: no cover - depends on environment
+        requests = None
+    if requests is not None:
+        session_send = requests.Session.send
+
+        def rsend(self, request, **kwargs):
+            host = _host(request.url)
+            _http_started(host)
+            started = time.perf_counter()
+            try:
+                return session_send(self, request, **kwargs)
+            finally:
+                _http_finished(host, time.perf_counter() - started)
+
+        requests.Session.send = rsend
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+class _LagProbe:
+    """Samples event-loop lag into ``profile`` while a node runs."""
+
+    def __init__(self, profile: NodeProfile, loop: asyncio.AbstractEventLoop):
+        self.profile = profile
+        self.loop = loop
+        self.expected = loop.time() + PROBE_INTERVAL_SECONDS
+
+    def _sample(self) -> None:
+        now = self.loop.time()
+        lag = now - self.expected
+        if lag > PROBE_THRESHOLD_SECONDS:
+            self.profile.add("loop_blocked", lag)
+        self.expected = now + PROBE_INTERVAL_SECONDS
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(max(0.0, self.expected - self.loop.time()))
+            self._sample()
+
+    def flush(self) -> None:
+        """Count a stall the probe has not woken up for yet (e.g. right before the node returned)."""
+        self._sample()
+
+
+class RunProfiler:
+    """Node profiles of one run, in execution order."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.nodes: List[NodeProfile] = []
+
+    @asynccontextmanager
+    async def node(self, name: str):
+        """Make a new ``NodeProfile`` current for the body and probe loop lag meanwhile."""
+        install_http_hooks()
+        profile = NodeProfile(name)
+        self.nodes.append(profile)
+        token = _current.set(profile)
+        probe = _LagProbe(profile, asyncio.get_running_loop())
+        task = probe.loop.create_task(probe.run())
+        try:
+            yield profile
+        finally:
+            task.cancel()
+            probe.flush()
+            profile.finish()
+            _current.reset(token)
+
+    def to_dict(self) -> Dict[str, Any]:
+        nodes = [p.to_dict() for p in self.nodes]
+        totals = {key: round(sum(n[key] for n in nodes), 1) for key in ("wall_ms", "other_ms")}
+        totals.update({f"{c}_ms": round(sum(n[f"{c}_ms"] for n in nodes), 1) for c in CATEGORIES})
+        providers: Dict[str, float] = {}
+        for n in nodes:
+            for provider, ms in n["http_by_provider_ms"].items():
+                providers[provider] = round(providers.get(provider, 0.0) + ms, 1)
+        return {"run_id": self.run_id, "nodes": nodes, "totals": totals, "http_by_provider_ms": providers}
@@ -6,6 +6,9 @@ from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# run_telemetry columns filled from the run_profile totals
+PROFILE_COLUMNS = ("db_ms", "http_ms", "llm_ms", "json_ms", "sleep_ms", "loop_blocked_ms")
+
 
 def create_or_update_run_telemetry(
     run_id: str,
@@ -19,9 +22,14 @@ def create_or_update_run_telemetry(
     last_error: Optional[str] = None,
     tokens_in: Optional[int] = None,
     tokens_out: Optional[int] = None,
-    trace_id: Optional[str] = None
+    trace_id: Optional[str] = None,
+    profile: Optional[dict] = None
 ):
-    """Create or update run telemetry record."""
+    """Create or update run telemetry record.
+
+    ``profile`` is the totals of the run_profile artifact (``db_ms``,
+    ``http_ms``, ...); when given it fills the matching columns.
+    """
     try:
         with get_conn() as conn:
             cursor = conn.cursor()
@@ -66,6 +74,11 @@ def create_or_update_run_telemetry(
                      tool_calls_count, sse_events_count, error_count, last_error,
                      tokens_in, tokens_out, trace_id, now, now)
                 )
+            if profile:
+                cursor.execute(
+                    f"UPDATE run_telemetry SET {', '.join(f'{c} = ?' for c in PROFILE_COLUMNS)} WHERE run_id = ?",
+                    (*(profile.get(c) for c in PROFILE_COLUMNS), run_id)
+                )
             conn.commit()
     except Exception as e:
         logger.warning(f"Failed to persist telemetry for run {run_id}: {e}")
@@ -1,7 +1,7 @@
 """Tool call recording helper for audit trail."""
-import json
 import asyncio
 from backend.db.connect import get_conn
+from backend.core import profiling
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.orchestrator.event_emitter import emit_event as _emit_event
@@ -101,8 +101,8 @@ async def record_tool_call(
             """,
             (
                 tool_call_id, run_id, node_id, tool_name, mcp_server,
-                json.dumps(safe_request),
-                json.dumps(safe_response) if safe_response else None,
+                profiling.dumps(safe_request),
+                profiling.dumps(safe_response) if safe_response else None,
                 status,
                 latency_ms, error_text, http_status, attempt, now_iso()
             )
@@ -178,8 +178,8 @@ def record_tool_call_sync(
             """,
             (
                 tool_call_id, run_id, node_id, tool_name, mcp_server,
-                json.dumps(safe_request),
-                json.dumps(safe_response) if safe_response else None,
+                profiling.dumps(safe_request),
+                profiling.dumps(safe_response) if safe_response else None,
                 status,
                 latency_ms, error_text, http_status, attempt, now_iso()
             )
@@ -194,14 +194,9 @@ def record_tool_call_sync(
         # We are inside a running loop; schedule as a background task
         loop.create_task(_emit_tool_events(run_id, tool_call_id, tool_name, mcp_server, node_id, safe_request, safe_response, status, latency_ms, error_text, attempt, wait_time_seconds))
     except RuntimeError:
-        # No running loop; fire-and-forget in a new thread
-        import threading
-        def _bg():
-            try:
-                asyncio.run(_emit_tool_events(run_id, tool_call_id, tool_name, mcp_server, node_id, safe_request, safe_response, status, latency_ms, error_text, attempt, wait_time_seconds))
-            except Exception:
-                pass
-        threading.Thread(target=_bg, daemon=True).start()
+        # No running loop (worker thread); hand off to the shared background loop
+        from backend.core.background_loop import get_background_loop
+        get_background_loop().submit(_emit_tool_events(run_id, tool_call_id, tool_name, mcp_server, node_id, safe_request, safe_response, status, latency_ms, error_text, attempt, wait_time_seconds))
     
     return tool_call_id
 
@@ -0,0 +1,150 @@
+"""Content-addressed, compressed storage for large JSON payloads.
+
+Candle series were stored verbatim in ``market_candles_batches.candles_json``
+for every run (and again when a run is replayed), which made that table the
+bulk of the database and of every WAL checkpoint. ``put_json`` stores a
+payload once in ``blobs`` keyed by its sha256, compressed with zstd when
+``zstandard`` is installed and zlib otherwise, and returns a short
+``blob:<hash>`` reference to keep in the row instead.
+
+Readers go through ``resolve`` / ``load_json``. Values that are not
+references (rows written before migration 035, small payloads kept inline)
+pass through unchanged, so callers never need to know which form a row has.
+Decompressed payloads are cached by hash; blobs are immutable.
+"""
+import hashlib
+import json
+import sqlite3
+import zlib
+from functools import lru_cache
+from typing import Any, Optional
+
+from backend.core import profiling
+from backend.db.connect import get_conn
+
+REF_PREFIX = "blob:"
+# Payloads smaller than this stay inline; a blob row costs more than it saves
+INLINE_MAX_BYTES = 1024
+
+try:  # optional dependency
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on environment
+    _zstd = None
+
+DEFAULT_CODEC = "zstd" if _zstd is not None else "zlib"
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=6).compress(raw)
+    if codec == "zlib":
+        return zlib.compress(raw, 6)
+    return raw
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("blob was written with zstd but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return bytes(data)
+
+
+def put_text(text: str, conn: Optional[sqlite3.Connection] = None, codec: str = DEFAULT_CODEC) -> str:
+    """Store ``text`` (deduplicated by content) and return its reference.
+
+    Pass ``conn`` to write inside the caller's transaction; the caller commits.
+    """
+    raw = text.encode("utf-8")
+    blob_hash = hashlib.sha256(raw).hexdigest()
+    data = _compress(raw, codec)
+    if len(data) >= len(raw):
+        codec, data = "raw", raw
+    params = (blob_hash, codec, len(raw), len(data), data)
+    sql = """INSERT OR IGNORE INTO blobs (blob_hash, codec, raw_size, stored_size, data)
+             VALUES (?, ?, ?, ?, ?)"""
+    if conn is not None:
+        conn.execute(sql, params)
+    else:
+        with get_conn() as own:
+            own.execute(sql, params)
+            own.commit()
+    return REF_PREFIX + blob_hash
+
+
+def put_json(obj: Any, conn: Optional[sqlite3.Connection] = None, inline_max: int = INLINE_MAX_BYTES) -> str:
+    """Serialize ``obj``; return the JSON itself if small, else a blob reference.
+
+    The return value is what goes into the ``*_json`` column.
+    """
+    text = obj if isinstance(obj, str) else profiling.dumps(obj)
+    if len(text) < inline_max:
+        return text
+    return put_text(text, conn=conn)
+
+
+@lru_cache(maxsize=256)
+def _read_blob(blob_hash: str) -> str:
+    # Raises instead of returning None so misses are not cached
+    with get_conn() as conn:
+        row = conn.execute("SELECT codec, data FROM blobs WHERE blob_hash = ?", (blob_hash,)).fetchone()
+    if row is None:
+        raise KeyError(blob_hash)
+    return _decompress(row["data"], row["codec"]).decode("utf-8")
+
+
+def resolve(value: Any) -> Any:
+    """Return the JSON text behind ``value`` (a reference or inline JSON).
+
+    Missing blobs resolve to ``None`` so callers fall back to their defaults.
+    """
+    if not is_ref(value):
+        return value
+    try:
+        return _read_blob(value[len(REF_PREFIX):])
+    except KeyError:
+        return None
+
+
+def load_json(value: Any, default: Any = None) -> Any:
+    """``json.loads`` for a column value that may be a blob reference."""
+    text = resolve(value)
+    if not text:
+        return default
+    try:
+        return profiling.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return default
+
+
+def externalize_candle_batches(batch_size: int = 500) -> int:
+    """Move inline ``candles_json`` payloads written before migration 035 into blobs.
+
+    Returns the number of rows converted. Run ``VACUUM`` afterwards to return
+    the freed pages to the filesystem.
+    """
+    converted = 0
+    with get_conn() as conn:
+        while True:
+            rows = conn.execute(
+                """SELECT batch_id, candles_json FROM market_candles_batches
+                   WHERE candles_json NOT LIKE 'blob:%' AND length(candles_json) >= ?
+                   LIMIT ?""",
+                (INLINE_MAX_BYTES, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                ref = put_text(row["candles_json"], conn=conn)
+                conn.execute(
+                    "UPDATE market_candles_batches SET candles_json = ? WHERE batch_id = ?", (ref, row["batch_id"])
+                )
+            conn.commit()
+            converted += len(rows)
+    return converted
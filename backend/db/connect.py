@@ -3,11 +3,15 @@ import sqlite3
 import os
 import time
 import random
+import threading
 from pathlib import Path
 from contextlib import contextmanager
+from contextvars import ContextVar, Token
 from typing import Generator, Optional
+from backend.core import profiling
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
+from backend.db import query_stats
 
 logger = get_logger(__name__)
 
@@ -55,33 +59,199 @@ def _parse_db_url(url: str) -> str:
         return url
 
 
-@contextmanager
-def get_conn() -> Generator[sqlite3.Connection, None, None]:
-    """Get database connection context manager."""
-    global _CANONICAL_DB_PATH
+class _ProfiledCursor(sqlite3.Cursor):
+    """Cursor that records its statements (``query_stats``) and counts them as ``db`` time in the run profile."""
 
-    db_path = get_canonical_db_path()
+    _query: Optional[query_stats.QueryRecord] = None
 
-    # Assert path stability within a process (INV-5).
-    settings = get_settings()
-    current_resolved = os.path.abspath(_parse_db_url(settings.database_url))
-    if current_resolved != db_path:
-        logger.critical(
-            "DB_PATH_DRIFT: canonical=%s current=%s — settings or CWD changed mid-process",
-            db_path, current_resolved,
-        )
+    def _executed(self, sql: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        profiling.add("db", elapsed)
+        self._query = query_stats.record(sql, elapsed, self.rowcount)
+
+    def _fetched(self, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        profiling.add("db", elapsed)
+        if self._query is not None:
+            query_stats.add_fetch(self._query, rows, elapsed)
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._executed(sql, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._executed(sql, started)
+
+    def executescript(self, sql_script):
+        # Scripts are migrations and maintenance, not request traffic: profiled, not logged
+        with profiling.measure("db"):
+            return super().executescript(sql_script)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(0 if row is None else 1, started)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), started)
+        return rows
+
+
+# Process-wide connection counters (exported as Prometheus metrics)
+_conn_lock = threading.Lock()
+_conn_stats = {"open": 0, "opened": 0, "connect_seconds": 0.0}
+
+
+def connection_stats() -> dict:
+    """Connections currently open, opened since startup and total seconds spent opening them."""
+    with _conn_lock:
+        return dict(_conn_stats)
+
+
+class _ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors (including the implicit ones of ``execute``) are ``_ProfiledCursor``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._counted = True
+        with _conn_lock:
+            _conn_stats["open"] += 1
+            _conn_stats["opened"] += 1
+
+    def _release(self) -> None:
+        if getattr(self, "_counted", False):
+            self._counted = False
+            with _conn_lock:
+                _conn_stats["open"] -= 1
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._release()
 
+    def __del__(self):
+        self._release()
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or _ProfiledCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        with profiling.measure("db"):
+            super().commit()
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    """Open ``db_path`` with the standard pragmas."""
     # Ensure directory exists
     db_dir = os.path.dirname(db_path)
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
-    
-    conn = sqlite3.connect(db_path, timeout=30)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, timeout=30, factory=_ProfiledConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode = WAL")
     conn.execute("PRAGMA busy_timeout = 30000")
     conn.execute("PRAGMA foreign_keys = ON")
-    
+    with _conn_lock:
+        _conn_stats["connect_seconds"] += time.perf_counter() - started
+    return conn
+
+
+# Tenant routing: with TENANT_SHARDING on, connections opened while a tenant
+# is in scope go to that tenant's shard (see backend.db.sharding).
+_current_tenant: ContextVar[Optional[str]] = ContextVar("db_tenant", default=None)
+
+
+def set_current_tenant(tenant_id: Optional[str]) -> Token:
+    """Route this context's connections to ``tenant_id``; returns a reset token."""
+    return _current_tenant.set(tenant_id)
+
+
+def reset_current_tenant(token: Token) -> None:
+    """Undo the ``set_current_tenant`` call that returned ``token``."""
+    try:
+        _current_tenant.reset(token)
+    except ValueError:  # token from another context (already discarded with it)
+        pass
+
+
+def get_current_tenant() -> Optional[str]:
+    return _current_tenant.get()
+
+
+@contextmanager
+def tenant_scope(tenant_id: Optional[str]) -> Generator[None, None, None]:
+    """Route connections opened inside the block to ``tenant_id``'s database."""
+    token = _current_tenant.set(tenant_id)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def current_db_path(tenant_id: Optional[str] = None) -> str:
+    """Database file ``get_conn(tenant_id)`` would open (the canonical DB unless sharded)."""
+    tenant_id = tenant_id or _current_tenant.get()
+    if tenant_id and get_settings().tenant_sharding:
+        from backend.db.sharding import ensure_shard
+        return ensure_shard(tenant_id)
+    return get_canonical_db_path()
+
+
+@contextmanager
+def get_conn(tenant_id: Optional[str] = None) -> Generator[sqlite3.Connection, None, None]:
+    """Get database connection context manager.
+
+    ``tenant_id`` (default: the tenant in scope) only matters with
+    TENANT_SHARDING on: the connection then opens the tenant's shard with the
+    global database attached, so global tables resolve there.
+    """
+    global _CANONICAL_DB_PATH
+
+    canonical = get_canonical_db_path()
+
+    # Assert path stability within a process (INV-5).
+    settings = get_settings()
+    current_resolved = os.path.abspath(_parse_db_url(settings.database_url))
+    if current_resolved != canonical:
+        logger.critical(
+            "DB_PATH_DRIFT: canonical=%s current=%s — settings or CWD changed mid-process",
+            canonical, current_resolved,
+        )
+
+    db_path = current_db_path(tenant_id)
+    conn = _open(db_path)
+    if db_path != canonical:
+        from backend.db.sharding import GLOBAL_SCHEMA
+        conn.execute(f"ATTACH DATABASE ? AS {GLOBAL_SCHEMA}", (canonical,))
+
     try:
         yield conn
         conn.commit()
@@ -112,7 +282,7 @@ def get_conn_retry(max_retries: int = 3) -> Generator[sqlite3.Connection, None,
                 sleep_s = min(0.1 * (2 ** attempt) + random.uniform(0, 0.05), 2.0)
                 logger.warning("DB busy (attempt %d/%d), retrying in %.2fs: %s",
                                attempt + 1, max_retries, sleep_s, str(e)[:100])
-                time.sleep(sleep_s)
+                profiling.sleep(sleep_s)
                 continue
             raise
     if last_err:
@@ -232,6 +402,133 @@ def get_schema_status():
     return result
 
 
+def _missing_table(error_str: str) -> Optional[str]:
+    """Table name from a lowercased "no such table: x" error, else None."""
+    prefix = "no such table: "
+    if not error_str.startswith(prefix):
+        return None
+    return error_str[len(prefix):].strip().split(".")[-1]
+
+
+def _apply_migrations(conn: sqlite3.Connection, migrations_dir: Path, skip_tables: frozenset = frozenset()):
+    """Apply pending migrations on ``conn``; returns (migration_files, applied_migrations).
+
+    Statements failing with "no such table" for a table in ``skip_tables`` are
+    skipped (used for tenant shards, see backend.db.sharding).
+    """
+    # Get all SQL files in lexical order
+    migration_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith('.sql')])
+    
+    # Check which migrations have been applied
+    cursor = conn.cursor()
+    cursor.execute("SELECT filename FROM schema_migrations")
+    applied_migrations = {row["filename"] for row in cursor.fetchall()}
+    
+    # Helper function to check if a column exists
+    def column_exists(table_name: str, column_name: str) -> bool:
+        """Check if a column exists in a table."""
+        try:
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            columns = [row[1] for row in cursor.fetchall()]
+            return column_name in columns
+        except Exception:
+            return False
+    
+    # Apply migrations that haven't been applied yet
+    for migration_file in migration_files:
+        # For migration 008, check if all columns exist even if marked as applied
+        # This handles the case where migration was partially applied
+        if migration_file == "008_enhance_tool_calls.sql" and migration_file in applied_migrations:
+            # Check if provider_name column exists (it might be missing if migration failed partway)
+            if not column_exists("runs", "provider_name"):
+                logger.warning(f"Migration {migration_file} marked as applied but provider_name column missing, re-applying...")
+                # Remove from applied_migrations so it gets re-applied
+                applied_migrations.remove(migration_file)
+                # Also remove from database
+                cursor.execute("DELETE FROM schema_migrations WHERE filename = ?", (migration_file,))
+                conn.commit()
+            else:
+                logger.debug(f"Migration {migration_file} already applied, skipping")
+                continue
+        elif migration_file in applied_migrations:
+            logger.debug(f"Migration {migration_file} already applied, skipping")
+            continue
+        
+        migration_path = migrations_dir / migration_file
+        try:
+            with open(migration_path, "r") as f:
+                migration_sql = f.read()
+            
+            # Split SQL into individual statements and execute them one by one
+            # This allows us to skip duplicate column errors and continue with remaining statements
+            # Remove single-line comments and split by semicolon
+            lines = []
+            for line in migration_sql.split('\n'):
+                # Remove inline comments (-- style)
+                if '--' in line:
+                    line = line[:line.index('--')]
+                lines.append(line)
+            cleaned_sql = '\n'.join(lines)
+            # Split by semicolon and filter empty statements
+            statements = [s.strip() for s in cleaned_sql.split(';') if s.strip()]
+            
+            executed_count = 0
+            skipped_count = 0
+            
+            for statement in statements:
+                if not statement:
+                    continue
+                try:
+                    conn.execute(statement)
+                    executed_count += 1
+                except sqlite3.OperationalError as e:
+                    error_str = str(e).lower()
+                    # Skip duplicate column/index errors (idempotency)
+                    if "duplicate column" in error_str or "already exists" in error_str or "duplicate index" in error_str:
+                        logger.debug(f"Skipping statement in {migration_file} (already exists): {statement[:50]}...")
+                        skipped_count += 1
+                    elif _missing_table(error_str) in skip_tables:
+                        # Shards do not carry the global tables
+                        skipped_count += 1
+                    else:
+                        # Re-raise non-duplicate errors
+                        raise
+            
+            conn.commit()
+            
+            # Record migration
+            from backend.core.time import now_iso
+            cursor.execute(
+                "INSERT INTO schema_migrations (filename, applied_at) VALUES (?, ?)",
+                (migration_file, now_iso())
+            )
+            conn.commit()
+            
+            if skipped_count > 0:
+                logger.info(f"Applied migration: {migration_file} ({executed_count} statements executed, {skipped_count} skipped)")
+            else:
+                logger.info(f"Applied migration: {migration_file}")
+        except sqlite3.OperationalError as e:
+            error_str = str(e).lower()
+            if "duplicate column" in error_str or "already exists" in error_str:
+                # Migration partially applied (columns exist), mark as applied
+                logger.warning(f"Migration {migration_file} partially applied (some columns exist): {e}")
+                from backend.core.time import now_iso
+                cursor.execute(
+                    "INSERT OR IGNORE INTO schema_migrations (filename, applied_at) VALUES (?, ?)",
+                    (migration_file, now_iso())
+                )
+                conn.commit()
+            else:
+                logger.error(f"Failed to apply migration {migration_file}: {e}")
+                raise
+        except Exception as e:
+            logger.error(f"Failed to apply migration {migration_file}: {e}")
+            raise
+
+    return migration_files, applied_migrations
+
+
 def init_db():
     """Initialize database with migrations (idempotent).
 
@@ -262,112 +559,7 @@ def init_db():
         except Exception:
             pass  # Table might already exist
         
-        # Get all SQL files in lexical order
-        migration_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith('.sql')])
-        
-        # Check which migrations have been applied
-        cursor = conn.cursor()
-        cursor.execute("SELECT filename FROM schema_migrations")
-        applied_migrations = {row["filename"] for row in cursor.fetchall()}
-        
-        # Helper function to check if a column exists
-        def column_exists(table_name: str, column_name: str) -> bool:
-            """Check if a column exists in a table."""
-            try:
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = [row[1] for row in cursor.fetchall()]
-                return column_name in columns
-            except Exception:
-                return False
-        
-        # Apply migrations that haven't been applied yet
-        for migration_file in migration_files:
-            # For migration 008, check if all columns exist even if marked as applied
-            # This handles the case where migration was partially applied
-            if migration_file == "008_enhance_tool_calls.sql" and migration_file in applied_migrations:
-                # Check if provider_name column exists (it might be missing if migration failed partway)
-                if not column_exists("runs", "provider_name"):
-                    logger.warning(f"Migration {migration_file} marked as applied but provider_name column missing, re-applying...")
-                    # Remove from applied_migrations so it gets re-applied
-                    applied_migrations.remove(migration_file)
-                    # Also remove from database
-                    cursor.execute("DELETE FROM schema_migrations WHERE filename = ?", (migration_file,))
-                    conn.commit()
-                else:
-                    logger.debug(f"Migration {migration_file} already applied, skipping")
-                    continue
-            elif migration_file in applied_migrations:
-                logger.debug(f"Migration {migration_file} already applied, skipping")
-                continue
-            
-            migration_path = migrations_dir / migration_file
-            try:
-                with open(migration_path, "r") as f:
-                    migration_sql = f.read()
-                
-                # Split SQL into individual statements and execute them one by one
-                # This allows us to skip duplicate column errors and continue with remaining statements
-                # Remove single-line comments and split by semicolon
-                lines = []
-                for line in migration_sql.split('\n'):
-                    # Remove inline comments (-- style)
-                    if '--' in line:
-                        line = line[:line.index('--')]
-                    lines.append(line)
-                cleaned_sql = '\n'.join(lines)
-                # Split by semicolon and filter empty statements
-                statements = [s.strip() for s in cleaned_sql.split(';') if s.strip()]
-                
-                executed_count = 0
-                skipped_count = 0
-                
-                for statement in statements:
-                    if not statement:
-                        continue
-                    try:
-                        conn.execute(statement)
-                        executed_count += 1
-                    except sqlite3.OperationalError as e:
-                        error_str = str(e).lower()
-                        # Skip duplicate column/index errors (idempotency)
-                        if "duplicate column" in error_str or "already exists" in error_str or "duplicate index" in error_str:
-                            logger.debug(f"Skipping statement in {migration_file} (already exists): {statement[:50]}...")
-                            skipped_count += 1
-                        else:
-                            # Re-raise non-duplicate errors
-                            raise
-                
-                conn.commit()
-                
-                # Record migration
-                from backend.core.time import now_iso
-                cursor.execute(
-                    "INSERT INTO schema_migrations (filename, applied_at) VALUES (?, ?)",
-                    (migration_file, now_iso())
-                )
-                conn.commit()
-                
-                if skipped_count > 0:
-                    logger.info(f"Applied migration: {migration_file} ({executed_count} statements executed, {skipped_count} skipped)")
-                else:
-                    logger.info(f"Applied migration: {migration_file}")
-            except sqlite3.OperationalError as e:
-                error_str = str(e).lower()
-                if "duplicate column" in error_str or "already exists" in error_str:
-                    # Migration partially applied (columns exist), mark as applied
-                    logger.warning(f"Migration {migration_file} partially applied (some columns exist): {e}")
-                    from backend.core.time import now_iso
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO schema_migrations (filename, applied_at) VALUES (?, ?)",
-                        (migration_file, now_iso())
-                    )
-                    conn.commit()
-                else:
-                    logger.error(f"Failed to apply migration {migration_file}: {e}")
-                    raise
-            except Exception as e:
-                logger.error(f"Failed to apply migration {migration_file}: {e}")
-                raise
+        migration_files, applied_migrations = _apply_migrations(conn, migrations_dir)
 
     # Validate schema after all migrations applied
     schema_ok, missing = validate_schema()
@@ -0,0 +1,19 @@
+-- Migration 033: Local retrieval index (BM25 over news items + policy documents)
+-- The FTS5 virtual table (retrieval_fts) is created at runtime by
+-- backend.services.retrieval_index so builds without FTS5 still boot.
+
+CREATE TABLE IF NOT EXISTS retrieval_docs (
+    rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL UNIQUE,
+    doc_type TEXT NOT NULL, -- 'news', 'policy'
+    source_id TEXT,
+    url TEXT,
+    title TEXT NOT NULL,
+    body TEXT,
+    symbols TEXT, -- space-separated asset symbols (news mentions)
+    published_at TEXT NOT NULL,
+    content_hash TEXT,
+    indexed_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_retrieval_docs_type_published ON retrieval_docs(doc_type, published_at);
@@ -0,0 +1,46 @@
+-- Migration 034: Composite / covering indexes for hot queries
+-- Each index matches a query in backend/db/query_catalog.py; the plan
+-- regression suite (tests/test_query_plans.py) fails if one goes missing.
+
+-- PaperProvider._get_portfolio_state: WHERE tenant_id=? ORDER BY ts DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_tenant_ts ON portfolio_snapshots(tenant_id, ts);
+
+-- Runner resumability + node-output lookups: WHERE run_id=? AND name=?
+CREATE INDEX IF NOT EXISTS idx_dag_nodes_run_name ON dag_nodes(run_id, name);
+-- Run detail / status: WHERE run_id=? ORDER BY started_at
+CREATE INDEX IF NOT EXISTS idx_dag_nodes_run_started ON dag_nodes(run_id, started_at);
+
+-- Headline lookups: WHERE asset_symbol IN (...) JOIN news_items (covering)
+CREATE INDEX IF NOT EXISTS idx_news_asset_mentions_symbol_item ON news_asset_mentions(asset_symbol, item_id);
+
+-- Run list: WHERE tenant_id=? ORDER BY created_at DESC LIMIT 50
+CREATE INDEX IF NOT EXISTS idx_runs_tenant_created ON runs(tenant_id, created_at);
+
+-- Latest order for a run / tenant order history
+CREATE INDEX IF NOT EXISTS idx_orders_run_created ON orders(run_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_tenant_created ON orders(tenant_id, created_at);
+
+-- Order lifecycle timeline
+CREATE INDEX IF NOT EXISTS idx_order_events_order_ts ON order_events(order_id, ts);
+
+-- Conversation messages in order
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_created ON messages(conversation_id, created_at);
+
+-- Conversation list: WHERE tenant_id=? GROUP BY conversation_id
+CREATE INDEX IF NOT EXISTS idx_conversations_tenant_conv ON conversations(tenant_id, conversation_id);
+
+-- Tool-call evidence per run in time order
+CREATE INDEX IF NOT EXISTS idx_tool_calls_run_ts ON tool_calls(run_id, ts);
+
+-- Artifact lookups by type
+CREATE INDEX IF NOT EXISTS idx_run_artifacts_run_type ON run_artifacts(run_id, artifact_type);
+
+-- Eval details per run in order / dashboard per tenant over time
+CREATE INDEX IF NOT EXISTS idx_eval_results_run_ts ON eval_results(run_id, ts);
+CREATE INDEX IF NOT EXISTS idx_eval_results_tenant_ts ON eval_results(tenant_id, ts);
+
+-- Latest close fallback: WHERE symbol=? ORDER BY ts DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_market_candles_symbol_ts ON market_candles(symbol, ts);
+
+-- Candle batches per run, newest first
+CREATE INDEX IF NOT EXISTS idx_candles_batches_run_ts ON market_candles_batches(run_id, ts);
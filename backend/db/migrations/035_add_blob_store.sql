@@ -0,0 +1,12 @@
+-- Migration 035: Content-addressed blob store for large JSON payloads
+-- Rows that used to embed payloads (market_candles_batches.candles_json)
+-- now hold a "blob:<sha256>" reference; see backend.db.blob_store.
+
+CREATE TABLE IF NOT EXISTS blobs (
+    blob_hash TEXT PRIMARY KEY, -- sha256 of the uncompressed payload
+    codec TEXT NOT NULL, -- 'zstd', 'zlib' or 'raw'
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
@@ -0,0 +1,12 @@
+-- Migration 036: Per-source fetch state for scheduled news ingestion
+-- HTTP validators let the scheduler send conditional GETs; next_fetch_at is
+-- computed from fetch_interval_seconds and the source's news_fetch_log history.
+
+ALTER TABLE news_sources ADD COLUMN etag TEXT;
+ALTER TABLE news_sources ADD COLUMN last_modified TEXT;
+ALTER TABLE news_sources ADD COLUMN fetch_interval_seconds INTEGER;
+ALTER TABLE news_sources ADD COLUMN last_fetched_at TEXT;
+ALTER TABLE news_sources ADD COLUMN next_fetch_at TEXT;
+
+ALTER TABLE news_fetch_log ADD COLUMN source_id TEXT;
+CREATE INDEX IF NOT EXISTS idx_news_fetch_log_source_ts ON news_fetch_log(source_id, ts);
@@ -0,0 +1,10 @@
+-- Migration 037: Per-symbol price history (see backend.services.price_history)
+-- One row per base symbol and market-time second; ts is epoch seconds.
+
+CREATE TABLE IF NOT EXISTS price_history (
+    symbol TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    price REAL NOT NULL,
+    source TEXT, -- 'ticker' or 'candles'
+    PRIMARY KEY (symbol, ts)
+) WITHOUT ROWID;
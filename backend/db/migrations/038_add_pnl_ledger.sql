@@ -0,0 +1,48 @@
+-- Migration 038: Incremental PnL / drawdown ledger (see backend.services.pnl_ledger)
+-- Running totals per tenant plus one bucket per tenant and UTC day, maintained
+-- as snapshots are written and orders fill, so analytics read O(days) rows.
+
+CREATE TABLE IF NOT EXISTS pnl_ledger_state (
+    tenant_id TEXT PRIMARY KEY,
+    last_snapshot_rowid INTEGER NOT NULL DEFAULT 0, -- portfolio_snapshots applied so far
+    first_value REAL,
+    current_value REAL,
+    peak_value REAL NOT NULL DEFAULT 0,
+    drawdown_pct REAL NOT NULL DEFAULT 0,
+    max_drawdown_pct REAL NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    fees REAL NOT NULL DEFAULT 0,
+    trades_count INTEGER NOT NULL DEFAULT 0,
+    last_snapshot_ts TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pnl_daily (
+    tenant_id TEXT NOT NULL,
+    day TEXT NOT NULL, -- YYYY-MM-DD (UTC)
+    start_value REAL,
+    end_value REAL,
+    last_ts TEXT,
+    peak_value REAL, -- running peak at the end of the day
+    drawdown_pct REAL, -- drawdown at the end of the day
+    max_drawdown_pct REAL NOT NULL DEFAULT 0, -- worst drawdown seen during the day
+    snapshots_count INTEGER NOT NULL DEFAULT 0,
+    trades_count INTEGER NOT NULL DEFAULT 0,
+    traded_notional REAL NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    fees REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, day)
+) WITHOUT ROWID;
+
+-- Average-cost positions for realized / unrealized PnL
+CREATE TABLE IF NOT EXISTS pnl_positions (
+    tenant_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    qty REAL NOT NULL DEFAULT 0,
+    cost_basis REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, symbol)
+) WITHOUT ROWID;
+
+-- Filled orders not yet applied to the ledger
+ALTER TABLE orders ADD COLUMN ledger_applied INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_orders_ledger_pending ON orders(tenant_id, status, ledger_applied);
@@ -0,0 +1,17 @@
+-- Migration 039: Multi-resolution candles for charts (see backend.services.candle_rollups)
+-- One row per base symbol, resolution (seconds) and UTC-aligned bucket start
+-- (epoch seconds). Native rows come from candle writers; 4h / 1d rows are
+-- rolled up from 1h and never replace a native row.
+
+CREATE TABLE IF NOT EXISTS candle_rollups (
+    symbol TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL DEFAULT 0,
+    source TEXT NOT NULL DEFAULT 'native', -- 'native' or 'rollup'
+    PRIMARY KEY (symbol, resolution, bucket_start)
+) WITHOUT ROWID;
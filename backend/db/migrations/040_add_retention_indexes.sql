@@ -0,0 +1,9 @@
+-- Migration 040: Indexes for tiered retention (see backend.db.retention)
+-- Archival walks each table oldest-first by timestamp; these tables had no
+-- index leading with it. The candles_json index lets archival find blobs that
+-- no remaining batch references.
+
+CREATE INDEX IF NOT EXISTS idx_order_events_ts ON order_events(ts);
+CREATE INDEX IF NOT EXISTS idx_candles_batches_ts ON market_candles_batches(ts);
+CREATE INDEX IF NOT EXISTS idx_news_fetch_log_ts ON news_fetch_log(ts);
+CREATE INDEX IF NOT EXISTS idx_candles_batches_candles_json ON market_candles_batches(candles_json);
@@ -0,0 +1,30 @@
+-- Migration 041: Per-tenant SQLite shards (see backend.db.sharding)
+-- Registry of tenant shard files, kept in the global database.
+
+CREATE TABLE IF NOT EXISTS tenant_shards (
+    tenant_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+-- run_news_evidence links per-run (tenant) rows to news_items, which stay in
+-- the global database when sharding is on; SQLite cannot enforce a foreign
+-- key across database files, so the news_items reference is dropped.
+CREATE TABLE IF NOT EXISTS run_news_evidence_new (
+    run_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    cluster_id TEXT,
+    used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    role TEXT,
+    notes TEXT,
+    FOREIGN KEY(run_id) REFERENCES runs(run_id)
+);
+
+INSERT INTO run_news_evidence_new (run_id, item_id, cluster_id, used_at, role, notes)
+SELECT run_id, item_id, cluster_id, used_at, role, notes FROM run_news_evidence;
+
+DROP TABLE run_news_evidence;
+
+ALTER TABLE run_news_evidence_new RENAME TO run_news_evidence;
+
+CREATE INDEX IF NOT EXISTS idx_run_news_evidence_run_id ON run_news_evidence(run_id);
@@ -0,0 +1,9 @@
+-- Migration 042: Per-run time breakdown (see backend.core.profiling)
+-- Totals over all nodes of the run_profile artifact, in milliseconds.
+
+ALTER TABLE run_telemetry ADD COLUMN db_ms REAL;
+ALTER TABLE run_telemetry ADD COLUMN http_ms REAL;
+ALTER TABLE run_telemetry ADD COLUMN llm_ms REAL;
+ALTER TABLE run_telemetry ADD COLUMN json_ms REAL;
+ALTER TABLE run_telemetry ADD COLUMN sleep_ms REAL;
+ALTER TABLE run_telemetry ADD COLUMN loop_blocked_ms REAL;
@@ -0,0 +1,4 @@
+-- Migration 043: Index for price_history retention (see backend.db.retention)
+-- Archival walks the table oldest-first by ts; its primary key leads with symbol.
+
+CREATE INDEX IF NOT EXISTS idx_price_history_ts ON price_history(ts);
@@ -0,0 +1,5 @@
+-- Migration 044: Market-time index on market_candles (see backend.services.price_history)
+-- Price lookups before the in-memory window filter and order a symbol's
+-- candles by COALESCE(end_time, start_time); no existing index covered it.
+
+CREATE INDEX IF NOT EXISTS idx_market_candles_symbol_time ON market_candles(symbol, COALESCE(end_time, start_time));
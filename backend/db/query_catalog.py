@@ -0,0 +1,245 @@
+"""Catalog of hot SQL queries and EXPLAIN QUERY PLAN checks.
+
+Every query here runs on a latency-sensitive path (chat turn, run
+execution, SSE replay, dashboards). ``plan_violations`` reports full table
+scans (including full index walks) and temp B-trees so a dropped or mismatched index is caught in tests
+(tests/test_query_plans.py) before it reaches a production-sized database.
+"""
+import random
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A query shape plus representative parameters."""
+    name: str
+    sql: str
+    params: Tuple[Any, ...] = ()
+    # Tables a full scan is acceptable for (tiny lookup tables)
+    allow_scan: Tuple[str, ...] = ()
+    # ORDER BY over an aggregate cannot use an index
+    allow_temp_btree: bool = False
+    source: str = ""
+
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery(
+        "paper_portfolio_state",
+        """SELECT balances_json, positions_json, total_value_usd
+           FROM portfolio_snapshots WHERE tenant_id = ? ORDER BY ts DESC LIMIT 1""",
+        ("t_0001",),
+        source="providers/paper.py:_get_portfolio_state",
+    ),
+    HotQuery(
+        "runner_node_status",
+        "SELECT status FROM dag_nodes WHERE run_id = ? AND name = ?",
+        ("run_000001", "research"),
+        source="orchestrator/runner.py (resumability)",
+    ),
+    HotQuery(
+        "node_outputs_by_name",
+        "SELECT outputs_json FROM dag_nodes WHERE run_id = ? AND name = ?",
+        ("run_000001", "signals"),
+        source="orchestrator/nodes/*",
+    ),
+    HotQuery(
+        "run_nodes_ordered",
+        "SELECT * FROM dag_nodes WHERE run_id = ? ORDER BY started_at ASC",
+        ("run_000001",),
+        source="api/routes/runs.py",
+    ),
+    HotQuery(
+        "headlines_by_symbol",
+        """SELECT DISTINCT ni.title, ni.url, ni.published_at, ns.name as source_name
+           FROM news_items ni
+           JOIN news_asset_mentions nam ON ni.id = nam.item_id
+           LEFT JOIN news_sources ns ON ni.source_id = ns.id
+           WHERE nam.asset_symbol IN (?, ?)
+             AND ni.published_at >= ?
+           ORDER BY ni.published_at DESC
+           LIMIT 100""",
+        ("BTC", "BITCOIN", "2026-01-01T00:00:00"),
+        allow_temp_btree=True,  # DISTINCT + ORDER BY over the joined window
+        source="services/pre_confirm_insight.py:_fetch_headlines",
+    ),
+    HotQuery(
+        "news_brief_by_asset",
+        """SELECT i.*, m.confidence
+           FROM news_items i
+           JOIN news_asset_mentions m ON i.id = m.item_id
+           WHERE m.asset_symbol = ? AND i.published_at <= ? AND i.published_at > ?
+           ORDER BY i.published_at DESC
+           LIMIT 10""",
+        ("BTC", "2026-02-01T00:00:00", "2026-01-01T00:00:00"),
+        allow_temp_btree=True,
+        source="services/news_brief.py:create_brief",
+    ),
+    HotQuery(
+        "run_list",
+        """SELECT run_id, tenant_id, status, execution_mode, created_at, trace_id
+           FROM runs WHERE tenant_id = ? ORDER BY created_at DESC LIMIT 50""",
+        ("t_0001",),
+        source="api/routes/runs.py:list_runs",
+    ),
+    HotQuery(
+        "run_events_replay",
+        "SELECT id, event_type, payload_json, ts FROM run_events WHERE run_id = ? ORDER BY ts ASC",
+        ("run_000001",),
+        source="api/routes/runs.py:stream_run_events",
+    ),
+    HotQuery(
+        "latest_order_for_run",
+        "SELECT * FROM orders WHERE run_id = ? ORDER BY created_at DESC LIMIT 1",
+        ("run_000001",),
+        source="orchestrator/nodes/post_trade_node.py",
+    ),
+    HotQuery(
+        "order_timeline",
+        "SELECT * FROM order_events WHERE order_id = ? ORDER BY ts ASC",
+        ("ord_000001",),
+        source="api/routes/orders.py",
+    ),
+    HotQuery(
+        "conversation_messages",
+        "SELECT * FROM messages WHERE conversation_id = ? ORDER BY created_at ASC",
+        ("conv_00001",),
+        source="api/routes/conversations.py:get_messages",
+    ),
+    HotQuery(
+        "conversation_list",
+        """SELECT c.conversation_id, c.title, c.created_at, MAX(m.created_at) AS last_at
+           FROM conversations c
+           LEFT JOIN messages m ON c.conversation_id = m.conversation_id
+           WHERE c.tenant_id = ?
+           GROUP BY c.conversation_id
+           ORDER BY COALESCE(MAX(m.created_at), c.created_at) DESC
+           LIMIT 100""",
+        ("t_0001",),
+        allow_temp_btree=True,
+        source="api/routes/conversations.py:list_conversations",
+    ),
+    HotQuery(
+        "tool_calls_for_run",
+        "SELECT * FROM tool_calls WHERE run_id = ? ORDER BY ts ASC",
+        ("run_000001",),
+        source="api/routes/trace.py",
+    ),
+    HotQuery(
+        "artifact_by_type",
+        "SELECT artifact_json FROM run_artifacts WHERE run_id = ? AND artifact_type = ?",
+        ("run_000001", "news_brief"),
+        source="api/routes/runs.py",
+    ),
+    HotQuery(
+        "eval_results_for_run",
+        "SELECT * FROM eval_results WHERE run_id = ? ORDER BY ts ASC",
+        ("run_000001",),
+        source="api/routes/evals.py",
+    ),
+    HotQuery(
+        "latest_close",
+        "SELECT close FROM market_candles WHERE symbol = ? ORDER BY ts DESC LIMIT 1",
+        ("BTC-USD",),
+        source="orchestrator/nodes/post_trade_node.py",
+    ),
+    HotQuery(
+        "candle_batches_for_run",
+        "SELECT * FROM market_candles_batches WHERE run_id = ? ORDER BY ts DESC LIMIT 5",
+        ("run_000001",),
+        source="api/routes/runs.py",
+    ),
+]
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for ``sql``."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()
+    return [row[3] for row in rows]
+
+
+def plan_violations(conn: sqlite3.Connection, query: HotQuery) -> List[str]:
+    """Full scans / temp B-trees in ``query``'s plan that the catalog does not allow."""
+    violations = []
+    for detail in explain(conn, query.sql, query.params):
+        # "SCAN t USING INDEX i" walks the whole index; only SEARCH is keyed.
+        if detail.startswith("SCAN ") and "CONSTANT ROW" not in detail:
+            table = detail.split()[1]
+            if table not in query.allow_scan:
+                violations.append(detail)
+        elif "USE TEMP B-TREE" in detail and not query.allow_temp_btree:
+            violations.append(detail)
+    return violations
+
+
+# ---------------------------------------------------------------------------
+# Synthetic seeding (large-DB plan checks)
+# ---------------------------------------------------------------------------
+
+_SYMBOLS = ["BTC", "ETH", "SOL", "DOGE", "SHIB", "ADA"] + [f"SYM{k}" for k in range(34)]
+
+_KEY_GENERATORS = {
+    "tenant_id": lambda i, n: f"t_{i % max(1, n // 50):04d}",
+    "run_id": lambda i, n: f"run_{i % max(1, n // 4):06d}",
+    "conversation_id": lambda i, n: f"conv_{i % max(1, n // 10):05d}",
+    "order_id": lambda i, n: f"ord_{i % max(1, n // 3):06d}",
+    "item_id": lambda i, n: f"news_{i:06d}",
+    "asset_symbol": lambda i, n: _SYMBOLS[i % len(_SYMBOLS)],
+    "symbol": lambda i, n: f"SYM{i % 40}-USD",
+    "name": lambda i, n: ("research", "signals", "risk", "proposal", "execution")[i % 5],
+    "artifact_type": lambda i, n: ("news_brief", "plan", "decision_record")[i % 3],
+}
+
+
+def _synthetic_value(col_name: str, col_type: str, i: int, n: int, pk: bool) -> Any:
+    if pk:
+        return f"{col_name}_{i:08d}"
+    gen = _KEY_GENERATORS.get(col_name)
+    if gen:
+        return gen(i, n)
+    if col_name in ("ts", "created_at", "updated_at", "started_at", "completed_at", "published_at"):
+        return f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00"
+    col_type = (col_type or "").upper()
+    if "INT" in col_type or "BOOL" in col_type:
+        return i % 7
+    if "REAL" in col_type or "FLOA" in col_type or "NUM" in col_type:
+        return float(i % 1000) + 0.5
+    if col_name.endswith("_json"):
+        return "{}"
+    return f"{col_name}_{i % 97}"
+
+
+def seed_table(conn: sqlite3.Connection, table: str, rows: int, overrides: Optional[Dict[str, Any]] = None) -> int:
+    """Fill ``table`` with ``rows`` synthetic rows shaped by its live schema.
+
+    Key columns (tenant_id, run_id, symbol, ...) get realistic cardinality so
+    ANALYZE statistics resemble production. Foreign keys are not enforced.
+    """
+    cols = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not cols:
+        return 0
+    names = [c[1] for c in cols]
+    pk_cols = {c[1] for c in cols if c[5]}
+    single_pk = len(pk_cols) == 1
+    overrides = overrides or {}
+    rng = random.Random(table)
+    data = []
+    for i in range(rows):
+        row = []
+        for _, name, col_type, _notnull, _default, _pk in cols:
+            if name in overrides:
+                value = overrides[name]
+                row.append(value(i, rows) if callable(value) else value)
+            elif name == "id" and "INT" in (col_type or "").upper():
+                row.append(None)  # autoincrement
+            else:
+                row.append(_synthetic_value(name, col_type, i, rows, single_pk and name in pk_cols))
+        data.append(row)
+    rng.shuffle(data)
+    placeholders = ",".join("?" * len(names))
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {table} ({','.join(names)}) VALUES ({placeholders})", data
+    )
+    return rows
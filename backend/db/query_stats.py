@@ -0,0 +1,314 @@
+"""SQL statement instrumentation: query logs per request/run, slow queries, histograms.
+
+Every statement executed through ``get_conn`` connections (see
+``_ProfiledCursor`` in ``backend.db.connect``) is recorded with its
+normalized shape (literals and ``IN (...)`` lists collapsed, whitespace
+squeezed), duration and row count:
+
+- into the ``QueryLog`` of the current scope: the API middleware opens one
+  per request and the runner one per run (a context variable, so it follows
+  ``asyncio.to_thread`` and tasks). Closing a scope logs a warning when one
+  statement shape repeated ``SQL_REPEAT_WARN`` times, the usual sign of a
+  per-row follow-up query (N+1);
+- into ``capture()`` logs, which see statements from every thread (tests use
+  them through the ``query_budget`` fixture, since ``TestClient`` runs the app
+  in another thread);
+- into process-wide duration histograms by statement kind and per-shape
+  totals (``/metrics``, ``GET /ops/queries``), and a bounded slow-query log
+  for statements over ``SQL_SLOW_QUERY_MS``.
+
+A statement's duration covers ``execute`` plus the ``fetch*`` calls made on
+its cursor; rows are the rows fetched (or ``rowcount`` for DML). Histograms
+observe the ``execute`` call alone.
+"""
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+KINDS = ("select", "insert", "update", "delete", "other")
+HISTOGRAM_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+# Per-log statement records kept in full (counts keep going past this)
+MAX_RECORDS = 2000
+# Distinct shapes tracked process-wide; later shapes are folded into "<other>"
+MAX_SHAPES = 1000
+SLOW_LOG_SIZE = 200
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """Statement shape: literals become ``?``, ``IN`` lists ``(?, ...)``, whitespace one space."""
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?, ...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _setting(name: str, default: int) -> int:
+    # Instrumentation must never break a query or a request, whatever the settings object holds
+    from backend.core.config import get_settings
+
+    value = getattr(get_settings(), name, default)
+    return value if isinstance(value, (int, float)) else default
+
+
+def _kind(shape: str) -> str:
+    word = shape[:6].lower()
+    return word if word in KINDS else "other"
+
+
+class QueryRecord:
+    """One statement: shape, seconds (execute + fetches) and rows."""
+
+    __slots__ = ("sql", "seconds", "rows", "slow")
+
+    def __init__(self, sql: str, seconds: float, rows: int):
+        self.sql = sql
+        self.seconds = seconds
+        self.rows = rows
+        self.slow = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"sql": self.sql, "ms": round(self.seconds * 1000, 2), "rows": self.rows}
+
+
+class QueryLog:
+    """Statements recorded while a scope or capture was active."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.records: List[QueryRecord] = []
+        self.count = 0
+        self.shapes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, record: QueryRecord) -> None:
+        with self._lock:
+            self.count += 1
+            self.shapes[record.sql] = self.shapes.get(record.sql, 0) + 1
+            if len(self.records) < MAX_RECORDS:
+                self.records.append(record)
+
+    @property
+    def seconds(self) -> float:
+        return sum(r.seconds for r in self.records)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes executed at least ``threshold`` times, most repeated first."""
+        with self._lock:
+            hits = [(sql, n) for sql, n in self.shapes.items() if n >= threshold]
+        return sorted(hits, key=lambda item: -item[1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "count": self.count,
+            "ms": round(self.seconds * 1000, 2),
+            "rows": sum(r.rows for r in self.records),
+            "top": [{"sql": sql, "count": n} for sql, n in self.repeated(2)[:10]],
+        }
+
+
+def check_budget(log: QueryLog, max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> List[str]:
+    """Budget violations of ``log``: too many statements, or one shape more than ``max_repeats`` times."""
+    problems = []
+    if max_queries is not None and log.count > max_queries:
+        problems.append(f"{log.label}: {log.count} queries (budget {max_queries})")
+    if max_repeats is not None:
+        for sql, n in log.repeated(max_repeats + 1):
+            problems.append(f"{log.label}: {n}x {sql} (max repeats {max_repeats})")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# Scopes and captures
+# ---------------------------------------------------------------------------
+
+_scopes: ContextVar[Tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+_captures: Tuple[QueryLog, ...] = ()
+_captures_lock = threading.Lock()
+
+
+def current() -> Optional[QueryLog]:
+    """Innermost scope's log, if any."""
+    logs = _scopes.get()
+    return logs[-1] if logs else None
+
+
+def open_scope(label: str) -> Token:
+    """Start a query log for the current context (request, run); pass the token to ``close_scope``."""
+    return _scopes.set(_scopes.get() + (QueryLog(label),))
+
+
+def close_scope(token: Token) -> Optional[QueryLog]:
+    """End the scope opened with ``token``, warning about repeated statement shapes."""
+    log = current()
+    _scopes.reset(token)
+    if log is not None:
+        threshold = _setting("sql_repeat_warn", 25)
+        for sql, n in log.repeated(threshold)[:3] if threshold > 0 else ():
+            logger.warning("Repeated statement in %s (possible N+1): %dx %s", log.label, n, sql[:300])
+    return log
+
+
+@contextmanager
+def scope(label: str) -> Iterator[QueryLog]:
+    token = open_scope(label)
+    log = current()
+    try:
+        yield log
+    finally:
+        close_scope(token)
+
+
+@contextmanager
+def capture(label: str = "capture") -> Iterator[QueryLog]:
+    """Record every statement executed on any thread while the block runs."""
+    global _captures
+    log = QueryLog(label)
+    with _captures_lock:
+        _captures = _captures + (log,)
+    try:
+        yield log
+    finally:
+        with _captures_lock:
+            _captures = tuple(c for c in _captures if c is not log)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide stats
+# ---------------------------------------------------------------------------
+
+_stats_lock = threading.Lock()
+_buckets: Dict[str, List[int]] = {k: [0] * (len(HISTOGRAM_BUCKETS) + 1) for k in KINDS}
+_sums: Dict[str, float] = dict.fromkeys(KINDS, 0.0)
+# shape -> [count, seconds, max_seconds, rows]
+_shape_totals: Dict[str, List[float]] = {}
+# (record, scope label, unix time)
+_slow: Deque[Tuple[QueryRecord, Optional[str], float]] = deque(maxlen=SLOW_LOG_SIZE)
+_slow_total = 0
+
+
+# Optional fn(kind, seconds) per statement (the Prometheus histogram, see routes/prometheus.py)
+_observer: Optional[Callable[[str, float], None]] = None
+
+
+def set_observer(observer: Optional[Callable[[str, float], None]]) -> None:
+    global _observer
+    _observer = observer
+
+
+def _observe(shape: str, seconds: float) -> None:
+    kind = _kind(shape)
+    if _observer is not None:
+        _observer(kind, seconds)
+    slot = len(HISTOGRAM_BUCKETS)
+    for i, bound in enumerate(HISTOGRAM_BUCKETS):
+        if seconds <= bound:
+            slot = i
+            break
+    with _stats_lock:
+        _buckets[kind][slot] += 1
+        _sums[kind] += seconds
+        key = shape if shape in _shape_totals or len(_shape_totals) < MAX_SHAPES else "<other>"
+        totals = _shape_totals.setdefault(key, [0, 0.0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds)
+
+
+def _note_slow(record: QueryRecord) -> None:
+    global _slow_total
+    threshold_ms = _setting("sql_slow_query_ms", 250)
+    if record.slow or threshold_ms <= 0 or record.seconds * 1000 < threshold_ms:
+        return
+    record.slow = True
+    log = current()
+    label = log.label if log else None
+    with _stats_lock:
+        _slow.append((record, label, time.time()))
+        _slow_total += 1
+    logger.warning("Slow query (%.0f ms) in %s: %s", record.seconds * 1000, label, record.sql[:300])
+
+
+def record(sql: str, seconds: float, rows: int) -> QueryRecord:
+    """Record one executed statement; the cursor adds its fetches through ``add_fetch``."""
+    shape = normalize_sql(sql)
+    rec = QueryRecord(shape, seconds, max(rows, 0))
+    _observe(shape, seconds)
+    for log in _scopes.get():
+        log.add(rec)
+    for log in _captures:
+        log.add(rec)
+    _note_slow(rec)
+    return rec
+
+
+def add_fetch(rec: QueryRecord, rows: int, seconds: float) -> None:
+    rec.rows += rows
+    rec.seconds += seconds
+    with _stats_lock:
+        totals = _shape_totals.get(rec.sql) or _shape_totals.get("<other>")
+        if totals is not None:
+            totals[1] += seconds
+            totals[3] += rows
+    _note_slow(rec)
+
+
+def histograms() -> Dict[str, Dict[str, Any]]:
+    """Cumulative ``(le, count)`` buckets and sums per statement kind (Prometheus layout)."""
+    with _stats_lock:
+        result = {}
+        for kind in KINDS:
+            running, cumulative = 0, []
+            for bound, n in zip([str(b) for b in HISTOGRAM_BUCKETS] + ["+Inf"], _buckets[kind]):
+                running += n
+                cumulative.append((bound, running))
+            result[kind] = {"buckets": cumulative, "sum": _sums[kind], "count": running}
+        return result
+
+
+def slow_queries() -> List[Dict[str, Any]]:
+    """Recent slow statements, oldest first (rows and time include fetches made since)."""
+    with _stats_lock:
+        entries = list(_slow)
+    return [{**rec.to_dict(), "scope": label, "at": at} for rec, label, at in entries]
+
+
+def slow_query_total() -> int:
+    return _slow_total
+
+
+def top_statements(limit: int = 50) -> List[Dict[str, Any]]:
+    """Statement shapes by total time."""
+    with _stats_lock:
+        items = sorted(_shape_totals.items(), key=lambda item: -item[1][1])[:limit]
+    return [
+        {"sql": sql, "count": int(c), "total_ms": round(s * 1000, 2), "max_ms": round(m * 1000, 2), "rows": int(r)}
+        for sql, (c, s, m, r) in items
+    ]
+
+
+def reset_stats() -> None:
+    """Clear process-wide stats (for test isolation)."""
+    global _slow_total
+    with _stats_lock:
+        for kind in KINDS:
+            _buckets[kind] = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+            _sums[kind] = 0.0
+        _shape_totals.clear()
+        _slow.clear()
+        _slow_total = 0
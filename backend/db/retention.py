@@ -0,0 +1,563 @@
+"""Tiered retention: move old rows of high-volume tables into archive files.
+
+``run_events``, ``tool_calls``, ``audit_logs``, ``order_events``,
+``market_candles_batches``, ``news_fetch_log`` and ``price_history`` were append-only and never
+pruned, so the hot database kept growing and every endpoint paid for it in
+page-cache misses. Each table now has a ``RetentionPolicy``: rows older than
+``retain_days`` are moved into a per-month archive SQLite file
+(``<archive_dir>/<db name>-YYYY-MM.sqlite``) and deleted from the hot DB.
+
+- Archival runs in small batches (``BATCH_SIZE`` rows, one short
+  ``BEGIN IMMEDIATE`` transaction each), so writers are never locked out for
+  long. A batch is copied with ``INSERT OR IGNORE`` before it is deleted; the
+  main DB is in WAL mode, so a crash between the two leaves the rows in both
+  files and the next run finishes the move.
+- Large JSON columns are stored compressed in the archive (zstd when
+  installed, zlib otherwise). Candle payloads that live in ``blobs`` are
+  materialized into the archive row, and blobs no longer referenced by the
+  hot table are dropped.
+- ``archive_reader`` ATTACHes the archive files covering a time range and
+  defines a TEMP view ``<table>_all`` per table (hot rows UNION ALL archived
+  rows, decompressed), so historical queries read like ordinary ones.
+- After a run, freed pages are returned with ``PRAGMA incremental_vacuum``.
+  That needs ``auto_vacuum = INCREMENTAL``, which an existing database only
+  gets through a full ``VACUUM``: ``enable_incremental_vacuum`` does that once,
+  explicitly, since it rewrites the whole file.
+
+``start_retention_worker`` runs ``run_retention`` periodically on a daemon
+thread (started by the API on startup when ``RETENTION_ENABLED``, which is
+off by default). Run-scoped readers (traces, research replays, evals) query
+the hot tables only, so enabling it makes older runs lose their archived
+events, tool calls and candle batches outside ``archive_reader``.
+"""
+import glob
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from backend.core.logging import get_logger
+from backend.core.time import now_iso
+from backend.db import blob_store
+from backend.db.connect import current_db_path, get_canonical_db_path, get_conn, tenant_scope
+
+logger = get_logger(__name__)
+
+# Rows moved per transaction
+BATCH_SIZE = 500
+# SQLite allows 10 attached databases by default; keep one for callers
+MAX_ATTACHED = 9
+# Pause between batches so queued writers get the lock
+BATCH_PAUSE_SECONDS = 0.02
+
+_ARCHIVE_SCHEMA = "arch"
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+# Timestamps we can partition by month; anything else stays in the hot table
+_TS_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]*"
+# One-byte codec tag in front of each compressed value
+_CODEC_TAGS = {"zstd": b"Z", "zlib": b"z", "raw": b"r"}
+_TAG_CODECS = {tag: codec for codec, tag in _CODEC_TAGS.items()}
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long one table keeps rows in the hot database.
+
+    ``retain_days`` of 0 disables archival for the table. ``key_column`` may
+    name several columns (``"symbol,ts"``) for a composite primary key;
+    ``ts_epoch`` marks a ``ts_column`` of epoch seconds rather than ISO text.
+    ``compress_columns`` are stored compressed in the archive;
+    ``blob_columns`` may hold ``blob:`` references that are resolved before
+    archiving.
+    """
+
+    table: str
+    ts_column: str
+    key_column: str
+    retain_days: int
+    compress_columns: Tuple[str, ...] = ()
+    blob_columns: Tuple[str, ...] = ()
+    ts_epoch: bool = False
+
+    @property
+    def key_columns(self) -> Tuple[str, ...]:
+        return tuple(c.strip() for c in self.key_column.split(","))
+
+
+DEFAULT_POLICIES: Tuple[RetentionPolicy, ...] = (
+    RetentionPolicy("run_events", "ts", "id", 90, ("payload_json",)),
+    RetentionPolicy("tool_calls", "ts", "id", 30, ("request_json", "response_json")),
+    RetentionPolicy("audit_logs", "created_at", "id", 365, ("request_json",)),
+    RetentionPolicy("order_events", "ts", "id", 90, ("payload_json",)),
+    RetentionPolicy(
+        "market_candles_batches", "ts", "batch_id", 30,
+        ("candles_json", "query_params_json"), ("candles_json",),
+    ),
+    RetentionPolicy("news_fetch_log", "ts", "fetch_id", 14),
+    RetentionPolicy("price_history", "ts", "symbol,ts", 180, ts_epoch=True),
+)
+
+
+def parse_retention_days(spec: str) -> Dict[str, int]:
+    """Parse ``"table=days,..."``; malformed entries are ignored."""
+    days: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        table, sep, value = part.partition("=")
+        if not sep or not table.strip():
+            continue
+        try:
+            days[table.strip()] = max(0, int(value.strip()))
+        except ValueError:
+            continue
+    return days
+
+
+def get_policies() -> List[RetentionPolicy]:
+    """``DEFAULT_POLICIES`` with the ``RETENTION_DAYS`` overrides applied."""
+    from backend.core.config import get_settings
+
+    overrides = parse_retention_days(get_settings().retention_days)
+    return [
+        replace(p, retain_days=overrides[p.table]) if p.table in overrides else p
+        for p in DEFAULT_POLICIES
+    ]
+
+
+def get_archive_dir() -> str:
+    from backend.core.config import get_settings
+
+    configured = get_settings().retention_archive_dir
+    if configured:
+        return os.path.abspath(configured)
+    return os.path.join(os.path.dirname(get_canonical_db_path()), "archive")
+
+
+def _db_stem() -> str:
+    # Per database file: with tenant sharding each shard gets its own archives
+    return os.path.splitext(os.path.basename(current_db_path()))[0]
+
+
+def archive_path(month: str, archive_dir: Optional[str] = None) -> str:
+    """Archive file holding rows of ``month`` (``YYYY-MM``)."""
+    return os.path.join(archive_dir or get_archive_dir(), f"{_db_stem()}-{month}.sqlite")
+
+
+def list_archives(archive_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Archive files of this database, oldest month first."""
+    archive_dir = archive_dir or get_archive_dir()
+    prefix = _db_stem() + "-"
+    archives = []
+    for path in sorted(glob.glob(os.path.join(glob.escape(archive_dir), prefix + "*.sqlite"))):
+        month = os.path.basename(path)[len(prefix):-len(".sqlite")]
+        if _MONTH_RE.match(month):
+            archives.append({"month": month, "path": path, "bytes": os.path.getsize(path)})
+    return archives
+
+
+# ---------------------------------------------------------------------------
+# Column compression (SQL functions registered on the connection)
+# ---------------------------------------------------------------------------
+
+def _pack(value: Any) -> Any:
+    """Compress a text value for the archive; refs are resolved first."""
+    if value is None or not isinstance(value, str):
+        return value
+    if blob_store.is_ref(value):
+        resolved = blob_store.resolve(value)
+        if resolved is not None:
+            value = resolved
+    raw = value.encode("utf-8")
+    codec = blob_store.DEFAULT_CODEC
+    data = blob_store._compress(raw, codec)
+    if len(data) >= len(raw):
+        codec, data = "raw", raw
+    return _CODEC_TAGS[codec] + data
+
+
+def _unpack(value: Any) -> Any:
+    """Inverse of ``_pack``; values that were never packed pass through."""
+    if not isinstance(value, bytes) or not value:
+        return value
+    codec = _TAG_CODECS.get(value[:1])
+    if codec is None:
+        return value
+    return blob_store._decompress(value[1:], codec).decode("utf-8")
+
+
+def _register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("archive_pack", 1, _pack, deterministic=True)
+    conn.create_function("archive_unpack", 1, _unpack, deterministic=True)
+
+
+# ---------------------------------------------------------------------------
+# Archival
+# ---------------------------------------------------------------------------
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[Tuple[str, str]]:
+    return [(row[1], row[2]) for row in conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()]
+
+
+def _ensure_archive_table(conn: sqlite3.Connection, policy: RetentionPolicy) -> List[str]:
+    """Create (or widen) the archive copy of ``policy.table``; returns its columns."""
+    main_cols = _columns(conn, "main", policy.table)
+    existing = {name for name, _ in _columns(conn, _ARCHIVE_SCHEMA, policy.table)}
+
+    keys = policy.key_columns
+
+    def decl(name: str, col_type: str) -> str:
+        col_type = "BLOB" if name in policy.compress_columns else (col_type or "")
+        suffix = " PRIMARY KEY" if keys == (name,) else ""
+        return f"{name} {col_type}{suffix}".rstrip()
+
+    if not existing:
+        defs = [decl(n, t) for n, t in main_cols]
+        if len(keys) > 1:
+            defs.append(f"PRIMARY KEY ({', '.join(keys)})")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {_ARCHIVE_SCHEMA}.{policy.table} ({', '.join(defs)})")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_ARCHIVE_SCHEMA}.idx_{policy.table}_{policy.ts_column} "
+            f"ON {policy.table}({policy.ts_column})"
+        )
+    else:
+        # Columns added to the hot table by later migrations
+        for name, col_type in main_cols:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {_ARCHIVE_SCHEMA}.{policy.table} ADD COLUMN {decl(name, col_type)}")
+    return [name for name, _ in main_cols]
+
+
+def _attach(conn: sqlite3.Connection, path: str, schema: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn.execute("ATTACH DATABASE ? AS " + schema, (path,))
+
+
+def _detach(conn: sqlite3.Connection, schema: str) -> None:
+    conn.execute("DETACH DATABASE " + schema)
+
+
+def _drop_orphan_blobs(conn: sqlite3.Connection, policy: RetentionPolicy, refs: Iterable[str]) -> int:
+    dropped = 0
+    for ref in set(refs):
+        still_used = any(
+            conn.execute(f"SELECT 1 FROM main.{policy.table} WHERE {col} = ? LIMIT 1", (ref,)).fetchone()
+            for col in policy.blob_columns
+        )
+        if not still_used:
+            dropped += conn.execute(
+                "DELETE FROM blobs WHERE blob_hash = ?", (ref[len(blob_store.REF_PREFIX):],)
+            ).rowcount
+    return dropped
+
+
+def _key_filter(policy: RetentionPolicy, keys: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """``WHERE`` condition matching ``keys`` (tuples for a composite key) and its parameters."""
+    columns = policy.key_columns
+    if len(columns) == 1:
+        return f"{columns[0]} IN ({','.join('?' * len(keys))})", list(keys)
+    row = "(" + ",".join("?" * len(columns)) + ")"
+    params = [value for key in keys for value in key]
+    return f"({', '.join(columns)}) IN (VALUES {','.join([row] * len(keys))})", params
+
+
+def _move_batch(
+    conn: sqlite3.Connection, policy: RetentionPolicy, columns: Sequence[str], keys: Sequence[Any],
+    drop_blobs: bool = True,
+) -> Tuple[int, int]:
+    """Copy ``keys`` into the attached archive and delete them; returns (moved, blobs dropped)."""
+    where, params = _key_filter(policy, keys)
+    select_cols = ", ".join(f"archive_pack({c})" if c in policy.compress_columns else c for c in columns)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        refs: List[str] = []
+        for col in policy.blob_columns if drop_blobs else ():
+            refs.extend(
+                row[0] for row in conn.execute(
+                    f"SELECT {col} FROM main.{policy.table} WHERE {where} AND {col} LIKE 'blob:%'",
+                    params,
+                )
+            )
+        conn.execute(
+            f"INSERT OR IGNORE INTO {_ARCHIVE_SCHEMA}.{policy.table} ({', '.join(columns)}) "
+            f"SELECT {select_cols} FROM main.{policy.table} WHERE {where}",
+            params,
+        )
+        moved = conn.execute(f"DELETE FROM main.{policy.table} WHERE {where}", params).rowcount
+        dropped = _drop_orphan_blobs(conn, policy, refs) if refs else 0
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return moved, dropped
+
+
+def archive_table(
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+    archive_dir: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    max_batches: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Move rows of one table older than its window into monthly archives."""
+    result: Dict[str, Any] = {"table": policy.table, "archived": 0, "blobs_dropped": 0, "months": []}
+    if policy.retain_days <= 0:
+        return result
+    cutoff = ((now or datetime.now(timezone.utc)) - timedelta(days=policy.retain_days)).date().isoformat()
+    result["cutoff"] = cutoff
+    ts = policy.ts_column
+    if policy.ts_epoch:
+        bound: Any = int(datetime.fromisoformat(cutoff).replace(tzinfo=timezone.utc).timestamp())
+        month_expr, partitionable = f"strftime('%Y-%m', {ts}, 'unixepoch')", f"typeof({ts}) = 'integer'"
+    else:
+        bound, month_expr, partitionable = cutoff, f"substr({ts}, 1, 7)", f"{ts} GLOB '{_TS_GLOB}'"
+    key_select = ", ".join(f"{c} AS k{i}" for i, c in enumerate(policy.key_columns))
+    months: List[str] = []
+    batches = 0
+    # Shards share the global blobs table; a blob may still be used by another shard
+    from backend.core.config import get_settings
+    drop_blobs = not get_settings().tenant_sharding
+    with get_conn() as conn:
+        if not conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?", (policy.table,)
+        ).fetchone():
+            return result  # a global table, seen from a tenant shard
+        _register_functions(conn)
+        attached: Optional[str] = None
+        columns: List[str] = []
+        try:
+            while max_batches is None or batches < max_batches:
+                rows = conn.execute(
+                    f"""SELECT {key_select}, {month_expr} AS month
+                        FROM main.{policy.table}
+                        WHERE {ts} < ? AND {partitionable}
+                        ORDER BY {ts} LIMIT ?""",
+                    (bound, batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                by_month: Dict[str, List[Any]] = {}
+                for row in rows:
+                    key = tuple(row[:-1]) if len(row) > 2 else row[0]
+                    by_month.setdefault(row["month"], []).append(key)
+                for month, keys in by_month.items():
+                    if month != attached:
+                        if attached is not None:
+                            _detach(conn, _ARCHIVE_SCHEMA)
+                            attached = None
+                        _attach(conn, archive_path(month, archive_dir), _ARCHIVE_SCHEMA)
+                        attached = month
+                        columns = _ensure_archive_table(conn, policy)
+                        conn.commit()
+                        if month not in months:
+                            months.append(month)
+                    moved, dropped = _move_batch(conn, policy, columns, keys, drop_blobs)
+                    result["archived"] += moved
+                    result["blobs_dropped"] += dropped
+                batches += 1
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+        finally:
+            if attached is not None:
+                _detach(conn, _ARCHIVE_SCHEMA)
+    result["months"] = months
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Vacuum
+# ---------------------------------------------------------------------------
+
+def auto_vacuum_mode() -> int:
+    """``PRAGMA auto_vacuum`` of the hot DB (0 none, 1 full, 2 incremental)."""
+    with get_conn() as conn:
+        return int(conn.execute("PRAGMA auto_vacuum").fetchone()[0])
+
+
+def incremental_vacuum(pages: int) -> Dict[str, int]:
+    """Return up to ``pages`` free pages to the filesystem (incremental mode only)."""
+    with get_conn() as conn:
+        before = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+        if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2 or pages <= 0:
+            return {"freelist_before": before, "freed_pages": 0}
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        after = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+    return {"freelist_before": before, "freed_pages": before - after}
+
+
+def enable_incremental_vacuum() -> None:
+    """Switch the hot DB to ``auto_vacuum = INCREMENTAL``.
+
+    Rewrites the whole database with ``VACUUM`` and holds an exclusive lock
+    while doing so; run it during a maintenance window.
+    """
+    with get_conn() as conn:
+        if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) == 2:
+            return
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    logger.info("Database switched to incremental auto-vacuum")
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+_last_run: Optional[Dict[str, Any]] = None
+_run_lock = threading.Lock()
+
+
+def run_retention(
+    policies: Optional[Sequence[RetentionPolicy]] = None,
+    now: Optional[datetime] = None,
+    archive_dir: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    vacuum_pages: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Archive every table per its policy, then incrementally vacuum.
+
+    With tenant sharding every shard is visited after the global DB. Runs are
+    serialized; a table that fails is logged and reported, the others still run.
+    """
+    global _last_run
+    from backend.db.sharding import shard_tenants
+
+    if vacuum_pages is None:
+        from backend.core.config import get_settings
+        vacuum_pages = get_settings().retention_vacuum_pages
+    policies = list(policies) if policies is not None else get_policies()
+    with _run_lock:
+        started = time.monotonic()
+        report: Dict[str, Any] = {"started_at": now_iso(), "tables": [], "vacuum": None}
+        for tenant_id in shard_tenants():
+            with tenant_scope(tenant_id):
+                archived = 0
+                for policy in policies:
+                    try:
+                        result = archive_table(policy, now=now, archive_dir=archive_dir,
+                                               batch_size=batch_size, pause_seconds=pause_seconds)
+                    except Exception as e:
+                        logger.warning("Retention failed for %s: %s", policy.table, str(e)[:200])
+                        result = {"table": policy.table, "archived": 0, "error": str(e)[:200]}
+                    if tenant_id is not None:
+                        result["shard"] = tenant_id
+                    archived += result["archived"]
+                    report["tables"].append(result)
+                if archived:
+                    vacuum = incremental_vacuum(vacuum_pages)
+                    if tenant_id is None:
+                        report["vacuum"] = vacuum
+                    else:
+                        report.setdefault("shard_vacuum", {})[tenant_id] = vacuum
+        report["archived"] = sum(t["archived"] for t in report["tables"])
+        report["duration_ms"] = int((time.monotonic() - started) * 1000)
+        _last_run = report
+    if report["archived"]:
+        logger.info("Retention archived %d rows in %d ms", report["archived"], report["duration_ms"])
+    return report
+
+
+def last_run() -> Optional[Dict[str, Any]]:
+    return _last_run
+
+
+def retention_status(archive_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Policies, archive files and the last run (for the ops endpoint)."""
+    return {
+        "policies": [asdict(p) for p in get_policies()],
+        "archive_dir": archive_dir or get_archive_dir(),
+        "archives": list_archives(archive_dir),
+        "auto_vacuum": auto_vacuum_mode(),
+        "last_run": _last_run,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Historical reads
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def archive_reader(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    tables: Optional[Sequence[str]] = None,
+    archive_dir: Optional[str] = None,
+) -> Generator[sqlite3.Connection, None, None]:
+    """Connection with the archives for ``since``..``until`` attached.
+
+    ``since`` / ``until`` are ISO dates or timestamps (only the month
+    matters). For each table a TEMP view ``<table>_all`` returns hot and
+    archived rows with compressed columns decompressed. Raises ``ValueError``
+    if the range spans more archive files than can be attached at once.
+    """
+    policies = [p for p in DEFAULT_POLICIES if tables is None or p.table in tables]
+    archives = [
+        a for a in list_archives(archive_dir)
+        if (since is None or a["month"] >= since[:7]) and (until is None or a["month"] <= until[:7])
+    ]
+    if len(archives) > MAX_ATTACHED:
+        raise ValueError(
+            f"{len(archives)} archive months in range, at most {MAX_ATTACHED} can be attached; narrow the range"
+        )
+    with get_conn() as conn:
+        _register_functions(conn)
+        schemas = []
+        for archive in archives:
+            schema = "arch_" + archive["month"].replace("-", "_")
+            _attach(conn, archive["path"], schema)
+            schemas.append(schema)
+        for policy in policies:
+            columns = [name for name, _ in _columns(conn, "main", policy.table)]
+            selects = [f"SELECT {', '.join(columns)} FROM main.{policy.table}"]
+            for schema in schemas:
+                archived = {name for name, _ in _columns(conn, schema, policy.table)}
+                if not archived:
+                    continue
+                exprs = [
+                    (f"archive_unpack({c}) AS {c}" if c in policy.compress_columns else c)
+                    if c in archived else f"NULL AS {c}"
+                    for c in columns
+                ]
+                selects.append(f"SELECT {', '.join(exprs)} FROM {schema}.{policy.table}")
+            conn.execute(f"DROP VIEW IF EXISTS temp.{policy.table}_all")
+            conn.execute(f"CREATE TEMP VIEW {policy.table}_all AS {' UNION ALL '.join(selects)}")
+        yield conn
+
+
+# ---------------------------------------------------------------------------
+# Background worker
+# ---------------------------------------------------------------------------
+
+_worker: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def start_retention_worker(interval_seconds: Optional[float] = None) -> None:
+    """Run ``run_retention`` every ``interval_seconds`` on a daemon thread."""
+    global _worker
+    if interval_seconds is None:
+        from backend.core.config import get_settings
+        interval_seconds = get_settings().retention_interval_seconds
+    if _worker is not None and _worker.is_alive():
+        return
+    _stop.clear()
+
+    def _loop():
+        while not _stop.is_set():
+            try:
+                run_retention(pause_seconds=BATCH_PAUSE_SECONDS)
+            except Exception as e:
+                logger.warning("Retention run failed (non-fatal): %s", str(e)[:200])
+            _stop.wait(interval_seconds)
+
+    _worker = threading.Thread(target=_loop, name="retention", daemon=True)
+    _worker.start()
+
+
+def stop_retention_worker() -> None:
+    _stop.set()
@@ -0,0 +1,300 @@
+"""Optional per-tenant SQLite shards.
+
+With one database file every tenant's writes (runs, events, tool calls,
+audit logs) queue on a single WAL writer lock. With ``TENANT_SHARDING`` on,
+``get_conn`` routes connections opened while a tenant is in scope
+(``tenant_scope`` / the API auth dependency) to that tenant's own file, so
+write throughput grows with the number of tenants:
+
+- A shard holds the tenant-scoped tables (runs and everything hanging off
+  them, conversations, orders, audit logs, PnL ledger...). It is migrated
+  with the same migration files, then the ``GLOBAL_TABLES`` are dropped from
+  it; statements of later migrations that touch those tables are skipped.
+- Shard connections ATTACH the canonical database as ``global_db``. SQLite
+  resolves an unqualified table name to the first attached database that has
+  it, so queries on product_catalog, news, blobs etc. from tenant code keep
+  working unchanged, reads and writes alike.
+- ``tenants`` stays in both files: the shard keeps its own row so foreign
+  keys to it still hold.
+- Connections opened with no tenant in scope (background jobs, login) use the
+  global database, as before.
+
+Shards are created on first use and recorded in ``tenant_shards`` in the
+global database; ``query_all`` runs an admin query across the global DB and
+every shard.
+
+A new shard starts empty: a tenant's existing rows in the canonical database
+are not visible through it until ``migrate_tenant`` (``POST
+/ops/shards/{tenant_id}/migrate``) has moved them into the shard, once per
+tenant, after turning sharding on. Rows are found by ``tenant_id``, by
+foreign keys to tenant rows, or by ``_SOFT_REFERENCES`` (columns such as
+``notification_events.run_id`` that reference tenant rows without a
+declared foreign key).
+"""
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+GLOBAL_SCHEMA = "global_db"
+
+# Cross-tenant tables; they live only in the global database
+GLOBAL_TABLES = frozenset({
+    "blobs",
+    "candle_rollups",
+    "market_candles",
+    "news_asset_mentions",
+    "news_cluster_items",
+    "news_clusters",
+    "news_fetch_log",
+    "news_items",
+    "news_sources",
+    "price_history",
+    "product_catalog",
+    "product_details",
+    "retrieval_docs",
+    "retrieval_fts",
+    "tenant_shards",
+    "users",
+})
+
+# Columns referencing tenant-scoped tables without a declared foreign key:
+# table -> ((column, parent table, parent column), ...); a row matching any of them moves
+_SOFT_REFERENCES: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    "notification_events": (("run_id", "runs", "run_id"), ("conversation_id", "conversations", "conversation_id")),
+}
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+_lock = threading.Lock()
+# Shard paths already migrated in this process
+_ready: Dict[str, str] = {}
+
+
+def get_shard_dir() -> str:
+    from backend.core.config import get_settings
+    from backend.db.connect import get_canonical_db_path
+
+    configured = get_settings().tenant_shard_dir
+    if configured:
+        return os.path.abspath(configured)
+    return os.path.join(os.path.dirname(get_canonical_db_path()), "shards")
+
+
+def shard_path(tenant_id: str) -> str:
+    """Shard file of ``tenant_id`` (ids that are not filename-safe are hashed)."""
+    from backend.db.connect import get_canonical_db_path
+
+    stem = os.path.splitext(os.path.basename(get_canonical_db_path()))[0]
+    name = tenant_id if _SAFE_ID.match(tenant_id) else hashlib.sha256(tenant_id.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(get_shard_dir(), f"{stem}-{name}.db")
+
+
+def _migrate_shard(path: str, tenant_id: str) -> None:
+    from backend.db.connect import _apply_migrations, _open, get_canonical_db_path
+
+    conn = _open(path)
+    try:
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS schema_migrations (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   filename TEXT NOT NULL UNIQUE,
+                   applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+               )"""
+        )
+        _apply_migrations(conn, Path(__file__).parent / "migrations", skip_tables=GLOBAL_TABLES)
+        present = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        }
+        for table in sorted(GLOBAL_TABLES & present):
+            conn.execute(f"DROP TABLE {table}")
+        conn.commit()
+
+        conn.execute(f"ATTACH DATABASE ? AS {GLOBAL_SCHEMA}", (get_canonical_db_path(),))
+        conn.execute(
+            f"""INSERT OR IGNORE INTO main.tenants (tenant_id, name, kill_switch_enabled)
+                SELECT tenant_id, name, kill_switch_enabled FROM {GLOBAL_SCHEMA}.tenants WHERE tenant_id = ?""",
+            (tenant_id,),
+        )
+        conn.execute("INSERT OR IGNORE INTO main.tenants (tenant_id, name) VALUES (?, ?)", (tenant_id, tenant_id))
+        conn.execute(
+            f"INSERT OR IGNORE INTO {GLOBAL_SCHEMA}.tenant_shards (tenant_id, path) VALUES (?, ?)",
+            (tenant_id, path),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def ensure_shard(tenant_id: str) -> str:
+    """Path of ``tenant_id``'s shard, creating and migrating it on first use in this process."""
+    path = _ready.get(tenant_id)
+    if path is not None:
+        return path
+    with _lock:
+        path = _ready.get(tenant_id)
+        if path is None:
+            path = shard_path(tenant_id)
+            _migrate_shard(path, tenant_id)
+            _ready[tenant_id] = path
+            logger.info("Tenant shard ready: %s -> %s", tenant_id, path)
+    return path
+
+
+def reset_shards() -> None:
+    """Forget which shards were migrated (for test isolation)."""
+    with _lock:
+        _ready.clear()
+
+
+def list_shards() -> List[Dict[str, Any]]:
+    """Registered shards with their file sizes."""
+    from backend.db.connect import get_canonical_db_path, _open
+
+    conn = _open(get_canonical_db_path())
+    try:
+        rows = conn.execute("SELECT tenant_id, path, created_at FROM tenant_shards ORDER BY tenant_id").fetchall()
+    finally:
+        conn.close()
+    return [
+        {**dict(r), "bytes": os.path.getsize(r["path"]) if os.path.exists(r["path"]) else None}
+        for r in rows
+    ]
+
+
+def query_all(sql: str, params: Sequence[Any] = (), include_global: bool = True) -> List[Dict[str, Any]]:
+    """Run a read query on the global DB and every shard.
+
+    Each row comes back as a dict with a ``shard`` key (the tenant id, or
+    ``"global"``). Meant for admin reporting; ORDER BY / LIMIT apply per shard.
+    """
+    from backend.db.connect import get_canonical_db_path, _open
+
+    targets = [("global", get_canonical_db_path())] if include_global else []
+    targets += [(s["tenant_id"], s["path"]) for s in list_shards() if os.path.exists(s["path"])]
+    results: List[Dict[str, Any]] = []
+    for shard, path in targets:
+        conn = _open(path)
+        try:
+            if path != get_canonical_db_path():
+                conn.execute(f"ATTACH DATABASE ? AS {GLOBAL_SCHEMA}", (get_canonical_db_path(),))
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        results.extend({**dict(r), "shard": shard} for r in rows)
+    return results
+
+
+def _tenant_filters(conn, schema: str) -> List[Tuple[str, str]]:
+    """``(table, WHERE clause)`` selecting one tenant's rows (parameter: tenant id) in ``schema``.
+
+    Tables with a ``tenant_id`` column filter on it; other tables follow a
+    foreign key (or ``_SOFT_REFERENCES``) to a table that has a filter
+    (``run_id`` -> ``runs``...).
+    Parents come before their children. Tables with no path to a tenant
+    (and ``tenants`` itself) are left out.
+    """
+    tables = [
+        r[0] for r in conn.execute(
+            f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        if r[0] not in GLOBAL_TABLES and r[0] not in ("tenants", "schema_migrations")
+    ]
+    columns = {t: {c[1] for c in conn.execute(f"PRAGMA {schema}.table_info({t})").fetchall()} for t in tables}
+    fkeys = {t: conn.execute(f"PRAGMA {schema}.foreign_key_list({t})").fetchall() for t in tables}
+    filters: Dict[str, str] = {t: "tenant_id = ?" for t in tables if "tenant_id" in columns[t]}
+    ordered = sorted(filters)
+    changed = True
+    while changed:
+        changed = False
+        for table in tables:
+            if table in filters:
+                continue
+            for fk in fkeys[table]:
+                parent, column, parent_column = fk[2], fk[3], fk[4] or "rowid"
+                if parent in filters and parent != table:
+                    filters[table] = (
+                        f"{column} IN (SELECT {parent_column} FROM {schema}.{parent} WHERE {filters[parent]})"
+                    )
+                    ordered.append(table)
+                    changed = True
+                    break
+            soft = _SOFT_REFERENCES.get(table, ())
+            if table not in filters and soft and all(parent in filters for _, parent, _ in soft):
+                filters[table] = "(" + " OR ".join(
+                    f"{column} IN (SELECT {parent_column} FROM {schema}.{parent} WHERE {filters[parent]})"
+                    for column, parent, parent_column in soft
+                ) + ")"
+                ordered.append(table)
+                changed = True
+    return [(t, filters[t]) for t in ordered]
+
+
+def migrate_tenant(tenant_id: str) -> Dict[str, int]:
+    """Move ``tenant_id``'s rows from the canonical database into its shard.
+
+    One transaction: rows are copied and then deleted from the canonical
+    database. A row that conflicts with one already in the shard (same key,
+    or a unique constraint such as a policy's name and version written to the
+    shard first) rolls the whole move back with a ``ValueError`` naming the
+    table, so no row is deleted without its copy. Returns rows moved per table.
+    """
+    from backend.db.connect import _open, get_canonical_db_path
+
+    path = ensure_shard(tenant_id)
+    conn = _open(path)
+    try:
+        conn.execute(f"ATTACH DATABASE ? AS {GLOBAL_SCHEMA}", (get_canonical_db_path(),))
+        conn.execute("PRAGMA foreign_keys = OFF")
+        filters = _tenant_filters(conn, GLOBAL_SCHEMA)
+        moved: Dict[str, int] = {}
+        copied: List[Tuple[str, str]] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table, where in filters:
+                shard_columns = {c[1] for c in conn.execute(f"PRAGMA main.table_info({table})").fetchall()}
+                if not shard_columns:  # not part of the shard schema: the rows stay where they are
+                    continue
+                source_columns = [c[1] for c in conn.execute(f"PRAGMA {GLOBAL_SCHEMA}.table_info({table})").fetchall()]
+                cols = ", ".join(c for c in source_columns if c in shard_columns)
+                params = (tenant_id,) * where.count("?")
+                expected = conn.execute(
+                    f"SELECT COUNT(*) FROM {GLOBAL_SCHEMA}.{table} WHERE {where}", params
+                ).fetchone()[0]
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO main.{table} ({cols}) SELECT {cols} FROM {GLOBAL_SCHEMA}.{table} WHERE {where}",
+                    params,
+                )
+                if cursor.rowcount != expected:
+                    raise ValueError(
+                        f"{table}: {expected - cursor.rowcount} of {expected} rows conflict with rows "
+                        f"already in the shard of {tenant_id}; nothing was moved"
+                    )
+                moved[table] = cursor.rowcount
+                copied.append((table, where))
+            # Children first: their filters read the parent rows
+            for table, where in reversed(copied):
+                conn.execute(f"DELETE FROM {GLOBAL_SCHEMA}.{table} WHERE {where}", (tenant_id,) * where.count("?"))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    moved = {t: n for t, n in moved.items() if n}
+    logger.info("Moved tenant %s into its shard: %d rows (%s)", tenant_id, sum(moved.values()), moved)
+    return moved
+
+
+def shard_tenants() -> List[Optional[str]]:
+    """``None`` (the global DB) followed by every sharded tenant, for jobs that visit each database."""
+    from backend.core.config import get_settings
+
+    if not get_settings().tenant_sharding:
+        return [None]
+    return [None] + [s["tenant_id"] for s in list_shards()]
@@ -4,6 +4,7 @@ Validates that candle series covers the full requested window,
 has no gaps, and timestamps are properly ordered.
 """
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.logging import get_logger
 from backend.core.utils import _safe_json_loads
 
@@ -40,7 +41,7 @@ def evaluate_coinbase_data_integrity(run_id: str, tenant_id: str) -> dict:
 
     for row in rows:
         symbol = row["symbol"]
-        candles = _safe_json_loads(row["candles_json"], default=[])
+        candles = _safe_json_loads(blob_store.resolve(row["candles_json"]), default=[])
 
         if not candles:
             reasons.append(f"{symbol}: empty candle series")
@@ -6,6 +6,7 @@ in evidence from market data providers.
 import json
 from typing import Optional
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.logging import get_logger
 from backend.core.time import now_iso
 
@@ -158,7 +159,7 @@ def freshness_eval(run_id: str, tenant_id: str, max_stale_hours: int = 48) -> di
         stale_symbols = []
         
         for batch in batches:
-            candles = json.loads(batch["candles_json"])
+            candles = json.loads(blob_store.resolve(batch["candles_json"]) or "[]")
             if not candles:
                 continue
             
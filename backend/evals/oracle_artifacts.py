@@ -6,6 +6,7 @@ Computes deterministic ground-truth rankings from frozen evidence
 import json
 from typing import Optional
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.core.logging import get_logger
@@ -38,7 +39,7 @@ def compute_oracle_profit_ranking(run_id: str) -> Optional[dict]:
 
     for row in rows:
         symbol = row["symbol"]
-        candles = _safe_json_loads(row["candles_json"], default=[])
+        candles = _safe_json_loads(blob_store.resolve(row["candles_json"]), default=[])
         if not candles:
             continue
 
@@ -4,6 +4,7 @@ Checks that stored candle window matches the oracle-computed expected window
 derived from the intent's lookback period.
 """
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.logging import get_logger
 from backend.core.utils import _safe_json_loads
 from backend.evals.oracle_artifacts import compute_oracle_time_window
@@ -60,7 +61,7 @@ def evaluate_time_window_correctness(run_id: str, tenant_id: str) -> dict:
     actual_start = None
     actual_end = None
     for row in rows:
-        candles = _safe_json_loads(row["candles_json"], default=[])
+        candles = _safe_json_loads(blob_store.resolve(row["candles_json"]), default=[])
         if not candles:
             continue
         first_ts = _parse_ts(candles[0].get("start_time", candles[0].get("t")))
@@ -37,10 +37,15 @@ class BrokerMCPServer:
         side: str,
         notional_usd: float,
         qty: float = None,
-        client_order_id: str = None
+        client_order_id: str = None,
+        poll_until_filled: bool = True
     ) -> Dict[str, Any]:
         """
         Place an order via broker.
+
+        LIVE callers that track fills themselves (see
+        backend.services.order_tracker) pass ``poll_until_filled=False`` so the
+        placement returns as soon as the exchange accepts the order.
         
         Returns:
             {order_id: str, status: str, provider: str}
@@ -107,7 +112,8 @@ class BrokerMCPServer:
                     notional_usd=notional_usd,
                     qty=qty,
                     node_id=node_id,
-                    client_order_id=client_order_id
+                    client_order_id=client_order_id,
+                    poll_until_filled=poll_until_filled
                 )
             else:
                 # Paper provider doesn't need node_id/client_order_id
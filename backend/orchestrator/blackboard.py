@@ -0,0 +1,119 @@
+"""Per-run in-memory store of node outputs.
+
+Nodes used to fetch their predecessors' results with
+``SELECT outputs_json FROM dag_nodes WHERE run_id = ? AND name = ?`` and
+re-parse the whole JSON (research rankings, candle summaries) at every hop.
+While a run executes, the runner now keeps each node's result on the run's
+blackboard as soon as the node returns; ``dag_nodes.outputs_json`` is still
+written for audit, the UI and resumability.
+
+``node_outputs`` is the read API for nodes. It serves from memory while the
+run is open and falls back to ``dag_nodes`` otherwise (other runs, API
+routes, evals executed after the run). A resumed run rehydrates from the DB
+when it is opened, so skipped nodes are visible too.
+
+Outputs are shared objects: readers must treat them as read-only.
+"""
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from backend.db.connect import get_conn
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RunBlackboard:
+    """Node outputs for one run, keyed by node name."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self._outputs: Dict[str, Dict[str, Any]] = {}
+
+    def put(self, node_name: str, outputs: Dict[str, Any]) -> None:
+        self._outputs[node_name] = outputs
+
+    def get(self, node_name: str) -> Optional[Dict[str, Any]]:
+        outputs = self._outputs.get(node_name)
+        if outputs is None:
+            outputs = _load_outputs(self.run_id, node_name)
+            if outputs is not None:
+                self._outputs[node_name] = outputs
+        return outputs
+
+    def __contains__(self, node_name: str) -> bool:
+        return node_name in self._outputs
+
+    def rehydrate(self) -> int:
+        """Load outputs of nodes completed in an earlier attempt of this run."""
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT name, outputs_json FROM dag_nodes
+                   WHERE run_id = ? AND status = 'COMPLETED' AND outputs_json IS NOT NULL
+                   ORDER BY started_at ASC""",
+                (self.run_id,),
+            )
+            rows = cursor.fetchall()
+        for row in rows:  # later attempts overwrite earlier ones
+            try:
+                self._outputs[row["name"]] = json.loads(row["outputs_json"])
+            except (json.JSONDecodeError, TypeError):
+                logger.warning("Unreadable outputs for node %s in run %s", row["name"], self.run_id)
+        return len(self._outputs)
+
+
+_boards: Dict[str, RunBlackboard] = {}
+_lock = threading.Lock()
+
+
+def open_blackboard(run_id: str) -> RunBlackboard:
+    """Create (or return) the blackboard for a run being executed."""
+    with _lock:
+        board = _boards.get(run_id)
+        if board is None:
+            board = _boards[run_id] = RunBlackboard(run_id)
+        else:
+            return board
+    restored = board.rehydrate()
+    if restored:
+        logger.info("Blackboard for run %s rehydrated with %d node output(s)", run_id, restored)
+    return board
+
+
+def close_blackboard(run_id: str) -> None:
+    """Drop a run's blackboard once it stops executing."""
+    with _lock:
+        _boards.pop(run_id, None)
+
+
+def get_open_blackboard(run_id: str) -> Optional[RunBlackboard]:
+    with _lock:
+        return _boards.get(run_id)
+
+
+def node_outputs(run_id: str, node_name: str) -> Optional[Dict[str, Any]]:
+    """Latest outputs of ``node_name`` in ``run_id`` (memory first, then ``dag_nodes``)."""
+    board = get_open_blackboard(run_id)
+    if board is not None:
+        return board.get(node_name)
+    return _load_outputs(run_id, node_name)
+
+
+def _load_outputs(run_id: str, node_name: str) -> Optional[Dict[str, Any]]:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT outputs_json FROM dag_nodes
+               WHERE run_id = ? AND name = ?
+               ORDER BY started_at DESC LIMIT 1""",
+            (run_id, node_name),
+        )
+        row = cursor.fetchone()
+    if not row or not row["outputs_json"]:
+        return None
+    try:
+        return json.loads(row["outputs_json"])
+    except (json.JSONDecodeError, TypeError):
+        return None
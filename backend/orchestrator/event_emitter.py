@@ -1,6 +1,6 @@
 """Event emitter helper to avoid circular imports."""
-import json
 from backend.db.connect import get_conn
+from backend.core import profiling
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.orchestrator.event_pubsub import event_pubsub
@@ -27,7 +27,7 @@ async def emit_event(run_id: str, event_type: str, payload: dict, tenant_id: str
             INSERT INTO run_events (id, run_id, tenant_id, event_type, payload_json, ts)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (event_id, run_id, tenant_id, event_type, json.dumps(payload), ts)
+            (event_id, run_id, tenant_id, event_type, profiling.dumps(payload), ts)
         )
         conn.commit()
     
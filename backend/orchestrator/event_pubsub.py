@@ -1,52 +1,136 @@
-"""In-memory pubsub for SSE."""
-from typing import Dict, Any
+"""In-memory pubsub for SSE.
+
+Runs are not always executed on the API event loop: confirmed trades run in
+a worker thread on their own loop, and sync code paths (tool call recording,
+order polling) publish from helper threads. Each subscription therefore
+remembers the loop that owns its queue, and events published from any other
+thread or loop are handed over with ``loop.call_soon_threadsafe``.
+
+Subscriber queues are bounded; a slow or stuck consumer loses events rather
+than growing memory (the SSE endpoint replays from ``run_events`` on
+reconnect). Dropped and late deliveries are counted in ``stats()`` and
+exported to Prometheus.
+"""
+from typing import Dict, Any, List, Optional
 from collections import defaultdict
+from dataclasses import dataclass
 import asyncio
+import threading
+import time
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Per-subscriber buffer; SSE drains continuously, so this is only reached by a stuck client
+MAX_QUEUE_SIZE = 1000
+# Cross-loop handoffs slower than this count as late
+LATE_DELIVERY_SECONDS = 0.5
+
+
+@dataclass
+class _Subscription:
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+
+
+def _record_metric(name: str, *args) -> None:
+    try:
+        from backend.api.routes import prometheus
+        getattr(prometheus, name)(*args)
+    except Exception:
+        pass
+
 
 class EventPubSub:
-    """Simple in-memory pubsub."""
-    
-    def __init__(self):
-        self._queues: Dict[str, list] = defaultdict(list)
-        self._lock = asyncio.Lock()
-    
+    """Thread-safe in-memory pubsub; queues are always fed on their owning loop."""
+
+    def __init__(self, max_queue_size: int = MAX_QUEUE_SIZE):
+        self._subs: Dict[str, List[_Subscription]] = defaultdict(list)
+        # Plain lock: publish may run on any thread or loop
+        self._lock = threading.Lock()
+        self._max_queue_size = max_queue_size
+        self._stats = {"published": 0, "delivered": 0, "cross_loop": 0, "dropped": 0, "late": 0}
+
     async def subscribe(self, run_id: str) -> asyncio.Queue:
-        """Subscribe to events for a run."""
-        queue = asyncio.Queue()
-        async with self._lock:
-            self._queues[run_id].append(queue)
+        """Subscribe to events for a run (the queue belongs to the calling loop)."""
+        queue = asyncio.Queue(maxsize=self._max_queue_size)
+        with self._lock:
+            self._subs[run_id].append(_Subscription(queue, asyncio.get_running_loop()))
         return queue
-    
+
     async def publish(self, run_id: str, event: Dict[str, Any]):
         """Publish event to all subscribers."""
-        async with self._lock:
-            queues = self._queues[run_id].copy()
+        self.publish_threadsafe(run_id, event)
+
+    def publish_threadsafe(self, run_id: str, event: Dict[str, Any]) -> None:
+        """Publish from any thread, with or without a running event loop."""
+        with self._lock:
+            subs = list(self._subs.get(run_id, ()))
+            self._stats["published"] += 1
+        if not subs:
+            return
+
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
 
-        for queue in queues:
+        for sub in subs:
+            if sub.loop is current:
+                self._deliver(sub.queue, event, run_id, None)
+                continue
+            if sub.loop.is_closed():
+                self._count_drop("loop_closed", run_id)
+                continue
             try:
-                await queue.put(event)
-            except Exception as e:
-                logger.error(f"Error publishing to queue: {e}")
+                sub.loop.call_soon_threadsafe(self._deliver, sub.queue, event, run_id, time.monotonic())
+            except RuntimeError:
+                # Loop closed between the check and the call
+                self._count_drop("loop_closed", run_id)
+
+    def _deliver(self, queue: asyncio.Queue, event: Dict[str, Any], run_id: str, sent_at: Optional[float]) -> None:
+        """Put ``event`` on ``queue``; always runs on the queue's loop."""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._count_drop("queue_full", run_id)
+            return
+        lag = time.monotonic() - sent_at if sent_at is not None else 0.0
+        with self._lock:
+            self._stats["delivered"] += 1
+            if sent_at is not None:
+                self._stats["cross_loop"] += 1
+                if lag > LATE_DELIVERY_SECONDS:
+                    self._stats["late"] += 1
+        if sent_at is not None:
+            _record_metric("record_event_bus_delivery_lag", lag)
+
+    def _count_drop(self, reason: str, run_id: str) -> None:
+        with self._lock:
+            self._stats["dropped"] += 1
+        logger.warning("Event dropped for run %s: %s", run_id, reason)
+        _record_metric("record_event_bus_dropped", reason)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since startup plus the current subscription count and queued events."""
+        with self._lock:
+            subs = [sub for run_subs in self._subs.values() for sub in run_subs]
+            return dict(self._stats, subscriptions=len(subs), queued=sum(sub.queue.qsize() for sub in subs))
 
     async def unsubscribe(self, run_id: str, queue: asyncio.Queue):
         """Remove a specific queue subscription for a run."""
-        async with self._lock:
-            if run_id in self._queues:
-                try:
-                    self._queues[run_id].remove(queue)
-                except ValueError:
-                    pass
-                if not self._queues[run_id]:
-                    del self._queues[run_id]
+        with self._lock:
+            subs = self._subs.get(run_id)
+            if subs is None:
+                return
+            subs[:] = [s for s in subs if s.queue is not queue]
+            if not subs:
+                del self._subs[run_id]
 
     async def cleanup_run(self, run_id: str):
         """Remove all subscriptions for a completed run."""
-        async with self._lock:
-            self._queues.pop(run_id, None)
+        with self._lock:
+            self._subs.pop(run_id, None)
 
 
 event_pubsub = EventPubSub()
@@ -0,0 +1,185 @@
+"""Chunked, optionally compacted replay of ``run_events``.
+
+The SSE endpoint used to ``fetchall()`` a run's whole history and
+``json.loads`` / ``json.dumps`` every payload before yielding it. Replay now
+pages through ``run_events`` by ``(ts, rowid)`` and splices the stored
+``payload_json`` text into the frame as-is.
+
+Compacted replay (opt-in) drops events that a later event supersedes and
+replaces large payloads with a reference:
+
+- ``STEP_STARTED`` once the step has a ``STEP_COMPLETED`` / ``STEP_FINISHED`` /
+  ``STEP_FAILED``; ``STEP_FINISHED`` when a ``STEP_COMPLETED`` for the same
+  step exists (it is emitted as a duplicate for older clients);
+- ``NODE_STARTED`` once the node has a ``NODE_FINISHED``;
+- every ``RUN_STATUS`` except the last.
+
+A stripped payload keeps its short top-level scalars and gains
+``payload_ref`` (the event id, served by ``GET /runs/{run_id}/events/{id}``)
+and ``payload_bytes``. Replay cursors are ``"<ts>|<rowid>"`` strings.
+"""
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from backend.db.connect import get_conn
+
+CHUNK_SIZE = 200
+# Payloads above this many bytes are replaced by a reference in compacted replay
+INLINE_PAYLOAD_MAX = 2048
+# Scalars kept in a stripped payload
+STUB_SCALAR_MAX = 200
+
+_STEP_END_TYPES = ("STEP_COMPLETED", "STEP_FINISHED", "STEP_FAILED")
+
+
+def encode_cursor(ts: str, rowid: int) -> str:
+    return f"{ts}|{rowid}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Parse a replay cursor; malformed values replay from the start."""
+    if not cursor:
+        return None
+    ts, sep, rowid = cursor.rpartition("|")
+    if not sep or not rowid.isdigit():
+        return None
+    return ts, int(rowid)
+
+
+def iter_event_chunks(run_id: str, after: Optional[str] = None,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Yield a run's events in order, ``chunk_size`` rows per query.
+
+    Each row has ``rowid``, ``id``, ``event_type``, ``payload_json`` (unparsed),
+    ``payload_bytes`` and ``ts``. A connection is held only while a chunk is read.
+    """
+    position = decode_cursor(after)
+    while True:
+        with get_conn() as conn:
+            if position is None:
+                rows = conn.execute(
+                    """SELECT rowid, id, event_type, payload_json, length(payload_json) AS payload_bytes, ts
+                       FROM run_events WHERE run_id = ?
+                       ORDER BY ts ASC, rowid ASC LIMIT ?""",
+                    (run_id, chunk_size),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """SELECT rowid, id, event_type, payload_json, length(payload_json) AS payload_bytes, ts
+                       FROM run_events
+                       WHERE run_id = ? AND (ts > ? OR (ts = ? AND rowid > ?))
+                       ORDER BY ts ASC, rowid ASC LIMIT ?""",
+                    (run_id, position[0], position[0], position[1], chunk_size),
+                ).fetchall()
+        if not rows:
+            return
+        yield [dict(row) for row in rows]
+        if len(rows) < chunk_size:
+            return
+        position = (rows[-1]["ts"], rows[-1]["rowid"])
+
+
+def superseded_event_rowids(run_id: str) -> Set[int]:
+    """Rowids of events that compacted replay omits (see module docstring)."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            """SELECT rowid, event_type,
+                      json_extract(payload_json, '$.step_id') AS step_id,
+                      json_extract(payload_json, '$.node_id') AS node_id
+               FROM run_events
+               WHERE run_id = ? AND event_type IN
+                     ('STEP_STARTED', 'STEP_COMPLETED', 'STEP_FINISHED', 'STEP_FAILED',
+                      'NODE_STARTED', 'NODE_FINISHED', 'RUN_STATUS')
+               ORDER BY ts ASC, rowid ASC""",
+            (run_id,),
+        ).fetchall()
+
+    ended_steps: Set[str] = set()
+    completed_steps: Set[str] = set()
+    finished_nodes: Set[str] = set()
+    last_status: Optional[int] = None
+    for row in rows:
+        if row["event_type"] in _STEP_END_TYPES and row["step_id"]:
+            ended_steps.add(row["step_id"])
+            if row["event_type"] == "STEP_COMPLETED":
+                completed_steps.add(row["step_id"])
+        elif row["event_type"] == "NODE_FINISHED" and row["node_id"]:
+            finished_nodes.add(row["node_id"])
+
+    superseded: Set[int] = set()
+    for row in rows:
+        event_type = row["event_type"]
+        if event_type == "STEP_STARTED" and row["step_id"] in ended_steps:
+            superseded.add(row["rowid"])
+        elif event_type == "STEP_FINISHED" and row["step_id"] in completed_steps:
+            superseded.add(row["rowid"])
+        elif event_type == "NODE_STARTED" and row["node_id"] in finished_nodes:
+            superseded.add(row["rowid"])
+        elif event_type == "RUN_STATUS":
+            if last_status is not None:
+                superseded.add(last_status)
+            last_status = row["rowid"]
+    return superseded
+
+
+def payload_stub(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Short scalars of a large payload plus a reference to the full one."""
+    try:
+        payload = json.loads(row["payload_json"])
+    except (json.JSONDecodeError, TypeError):
+        payload = {}
+    stub = {}
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            if value is None or isinstance(value, (bool, int, float)):
+                stub[key] = value
+            elif isinstance(value, str) and len(value) <= STUB_SCALAR_MAX:
+                stub[key] = value
+    stub["payload_ref"] = row["id"]
+    stub["payload_bytes"] = row["payload_bytes"]
+    return stub
+
+
+def event_json(row: Dict[str, Any], compact: bool = False) -> str:
+    """JSON text of one replayed event; the stored payload is not re-encoded."""
+    if compact and (row["payload_bytes"] or 0) > INLINE_PAYLOAD_MAX:
+        payload = json.dumps(payload_stub(row))
+    else:
+        payload = row["payload_json"]
+    return (
+        f'{{"event_type": {json.dumps(row["event_type"])}, "payload": {payload}, '
+        f'"ts": {json.dumps(row["ts"])}}}'
+    )
+
+
+def iter_replay(run_id: str, compact: bool = False, after: Optional[str] = None,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[List[Tuple[str, str]], str]]:
+    """Yield ``([(cursor, event_json), ...], last_cursor)`` per chunk of history."""
+    skip = superseded_event_rowids(run_id) if compact else set()
+    for rows in iter_event_chunks(run_id, after=after, chunk_size=chunk_size):
+        events = [
+            (encode_cursor(row["ts"], row["rowid"]), event_json(row, compact))
+            for row in rows if row["rowid"] not in skip
+        ]
+        yield events, encode_cursor(rows[-1]["ts"], rows[-1]["rowid"])
+
+
+def replay_snapshot(run_id: str, compact: bool = True, after: Optional[str] = None) -> str:
+    """A run's (compacted) history as one JSON document: ``{"run_id", "events", "count", "cursor"}``."""
+    parts: List[str] = []
+    cursor = after
+    for events, cursor in iter_replay(run_id, compact=compact, after=after):
+        parts.extend(text for _, text in events)
+    return (
+        f'{{"run_id": {json.dumps(run_id)}, "events": [{", ".join(parts)}], '
+        f'"count": {len(parts)}, "cursor": {json.dumps(cursor)}}}'
+    )
+
+
+def get_event_payload(run_id: str, event_id: str) -> Optional[str]:
+    """Stored payload JSON of one event, for resolving ``payload_ref``."""
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT payload_json FROM run_events WHERE run_id = ? AND id = ?", (run_id, event_id)
+        ).fetchone()
+    return row["payload_json"] if row else None
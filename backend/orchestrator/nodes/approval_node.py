@@ -1,6 +1,7 @@
 """Approval node."""
 import json
 from backend.db.connect import get_conn
+from backend.orchestrator.blackboard import node_outputs
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.core.logging import get_logger
@@ -84,18 +85,10 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
 
         # 2. No existing approval record
         # Check policy_check output to see if approval is required
-        cursor.execute(
-            "SELECT outputs_json FROM dag_nodes WHERE run_id = ? AND name = 'policy_check' LIMIT 1",
-            (run_id,)
-        )
-        policy_row = cursor.fetchone()
+        policy_out = node_outputs(run_id, "policy_check")
         policy_decision = "ALLOWED"
-        if policy_row and policy_row["outputs_json"]:
-            try:
-                policy_out = json.loads(policy_row["outputs_json"])
-                policy_decision = policy_out.get("decision", "ALLOWED")
-            except Exception:
-                pass
+        if policy_out:
+            policy_decision = policy_out.get("decision", "ALLOWED")
 
         # Auto-approve if: PAPER mode, user pre-confirmed via chat, or policy says ALLOWED
         if execution_mode == "PAPER" or user_pre_confirmed or (execution_mode != "LIVE" and policy_decision == "ALLOWED"):
@@ -17,6 +17,53 @@ logger = get_logger(__name__)
 MIN_NOTIONAL_USD = 1.0
 
 
+async def _track_live_orders(
+    provider, placed_orders: dict, order_statuses: dict, run_id: str, node_id: str, tenant_id: str
+) -> None:
+    """Wait for all placed LIVE orders concurrently; emit ORDER_FILLED as each one fills.
+
+    Status transitions and fills are persisted (and fills streamed as
+    ORDER_FILL events) by the order tracker while it polls.
+    """
+    if not placed_orders:
+        return
+    from backend.services.order_tracker import TrackedOrder, track_orders
+
+    try:
+        results = await track_orders(provider, [
+            TrackedOrder(order_id=oid, tenant_id=tenant_id, run_id=run_id, node_id=node_id)
+            for oid in placed_orders
+        ])
+    except Exception as e:
+        logger.warning("Order tracking failed for run %s: %s", run_id, str(e)[:200])
+        return
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        placeholders = ",".join("?" * len(placed_orders))
+        cursor.execute(
+            f"SELECT order_id, status, filled_qty, avg_fill_price FROM orders WHERE order_id IN ({placeholders})",
+            tuple(placed_orders),
+        )
+        rows = {row["order_id"]: row for row in cursor.fetchall()}
+
+    for oid, order in placed_orders.items():
+        row = rows.get(oid)
+        status = str(row["status"]).upper() if row and row["status"] else results[oid].status
+        order_statuses[oid] = status
+        if status == "FILLED":
+            await emit_event(run_id, "ORDER_FILLED", {
+                "order_id": oid,
+                "symbol": order["symbol"],
+                "side": order["side"],
+                "notional_usd": order["notional_usd"],
+                "filled_qty": float(row["filled_qty"] or 0.0) if row else 0.0,
+                "avg_fill_price": float(row["avg_fill_price"] or 0.0) if row else 0.0,
+                "provider": "LIVE",
+                "message": "Order filled. You can also confirm in your Coinbase app.",
+            }, tenant_id=tenant_id)
+
+
 async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
     """Execute execution node."""
     # Get run execution mode, proposal, source_run_id, asset_class, and LOCKED product_id
@@ -313,10 +360,11 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
     # ── PRE-TRADE SNAPSHOT (idempotent) ──
     # Capture Coinbase-accurate balances before placing orders so charts get >=2 data points.
     try:
-        from backend.services.executable_state import fetch_executable_state
+        from backend.services.executable_state import get_executable_state
         from backend.services.market_data import get_price as _get_price_safe_exec
 
-        exec_state = fetch_executable_state(tenant_id)
+        # Fresh fetch at execution time; the LIVE gate below reuses this snapshot
+        exec_state = await get_executable_state(tenant_id, refresh=True)
         _snap_balances = {}
         _snap_positions = {}
         _snap_total = 0.0
@@ -370,7 +418,8 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         # before sending each order to the exchange.
         if execution_mode == "LIVE":
             try:
-                _preflight_state = fetch_executable_state(tenant_id)
+                from backend.services.executable_state import get_executable_state
+                _preflight_state = await get_executable_state(tenant_id)
             except Exception:
                 _preflight_state = None
 
@@ -450,6 +499,8 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                 )
 
         order_ids = []
+        # LIVE legs are placed without blocking on fills and tracked together below
+        placed_orders = {}
         for order in proposal.get("orders", []):
             client_order_id = new_id("client_")
             try:
@@ -461,10 +512,12 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                     side=order["side"],
                     notional_usd=order["notional_usd"],
                     qty=order.get("qty"),
-                    client_order_id=client_order_id
+                    client_order_id=client_order_id,
+                    poll_until_filled=execution_mode != "LIVE"
                 )
                 placed_order_id = result["order_id"]
                 order_ids.append(placed_order_id)
+                placed_orders[placed_order_id] = order
 
                 # Read back the canonical order status from DB after provider placement/polling.
                 with get_conn() as conn:
@@ -600,8 +653,17 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                         }))
                     )
                     conn.commit()
+                if execution_mode == "LIVE":
+                    await _track_live_orders(
+                        broker_server.provider, placed_orders, order_statuses, run_id, node_id, tenant_id
+                    )
                 raise structured_error
 
+        if execution_mode == "LIVE":
+            await _track_live_orders(
+                broker_server.provider, placed_orders, order_statuses, run_id, node_id, tenant_id
+            )
+
     # Emit ORDER_FILLED events (in PAPER mode orders are filled immediately)
     if execution_mode == "PAPER":
         with get_conn() as conn:
@@ -2,6 +2,7 @@ import json
 import re
 from datetime import datetime
 from backend.db.connect import get_conn
+from backend.orchestrator.blackboard import node_outputs
 from backend.core.ids import new_id
 from backend.core.logging import get_logger
 from backend.services.news_brief import NewsBriefService
@@ -193,19 +194,10 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         run_created_at_iso = run_row["created_at"]
 
         # Get signals output for candidate assets
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes
-            WHERE run_id = ? AND name = 'signals'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        signals_row = cursor.fetchone()
+        signals_output = node_outputs(run_id, "signals")
 
         candidates = []
-        if signals_row:
-            signals_output = json.loads(signals_row["outputs_json"])
+        if signals_output is not None:
             top_symbol = signals_output.get("top_symbol")
             if top_symbol:
                 candidates.append(top_symbol)
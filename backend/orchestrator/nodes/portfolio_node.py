@@ -231,6 +231,15 @@ async def _execute_live_analysis(
     if not accounts_data.get("accounts"):
         warnings.append("No accounts found in Coinbase response")
         return None
+
+    # Share this fetch with chat/preflight instead of them calling List Accounts
+    # again (only a complete listing; the executable state pages through all accounts)
+    if not accounts_data.get("has_next"):
+        try:
+            from backend.services.executable_state import prime_executable_state
+            prime_executable_state(tenant_id, accounts_data["accounts"])
+        except Exception as e:
+            logger.debug("Executable state prime skipped: %s", str(e)[:200])
     
     # 1b. Store holdings_raw artifact (sanitized) for debugging and replay
     import hashlib
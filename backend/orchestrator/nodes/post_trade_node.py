@@ -182,16 +182,11 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
             pos_price = market_data_provider.get_price(pos_symbol)
             total_value += pos_qty * pos_price
         except Exception:
-            # Fallback: use last known price from candles if available
-            with get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT close FROM market_candles WHERE symbol = ? ORDER BY ts DESC LIMIT 1",
-                    (pos_symbol,)
-                )
-                price_row = cursor.fetchone()
-                if price_row:
-                    total_value += pos_qty * float(price_row["close"])
+            # Fallback: last known price from the local price history
+            from backend.services.price_history import get_price_history
+            last_price = get_price_history().latest([pos_symbol]).get(pos_symbol)
+            if last_price:
+                total_value += pos_qty * last_price
     
     # Create portfolio snapshot
     snapshot_id = new_id("snap_")
@@ -207,6 +202,10 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         )
         conn.commit()
     
+    # Fold this run's snapshots and fills into the tenant's PnL ledger
+    from backend.services.pnl_ledger import sync_ledger_safe
+    sync_ledger_safe(tenant_id)
+    
     post_trade_output = {
         "snapshot_id": snapshot_id,
         "balances": balances,
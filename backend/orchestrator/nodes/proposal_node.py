@@ -1,6 +1,7 @@
 """Proposal node - builds trade proposal with chosen asset and rationale."""
 import json
 from backend.db.connect import get_conn
+from backend.orchestrator.blackboard import node_outputs
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.core.logging import get_logger
@@ -24,19 +25,9 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         locked_product_id = intent_row["locked_product_id"] if intent_row and "locked_product_id" in intent_row.keys() else None
         
         # Get signals (top symbol and return)
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes 
-            WHERE run_id = ? AND name = 'signals'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        signals_row = cursor.fetchone()
-        if not signals_row:
+        signals_output = node_outputs(run_id, "signals")
+        if signals_output is None:
             raise ValueError("Signals node outputs not found")
-        
-        signals_output = json.loads(signals_row["outputs_json"])
         top_symbol = signals_output.get("top_symbol")
         top_return = signals_output.get("top_return", 0.0)
 
@@ -51,36 +42,17 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
             top_symbol = locked_symbol
         
         # Get risk sizing
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes 
-            WHERE run_id = ? AND name = 'risk'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        risk_row = cursor.fetchone()
-        if not risk_row:
+        risk_output = node_outputs(run_id, "risk")
+        if risk_output is None:
             raise ValueError("Risk node outputs not found")
-        
-        risk_output = json.loads(risk_row["outputs_json"])
         final_notional = risk_output.get("final_notional", 10.0)
         
         # Get news (optional)
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes 
-            WHERE run_id = ? AND name = 'news'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        news_row = cursor.fetchone()
+        news_output = node_outputs(run_id, "news")
         sentiment_gate = {}
         news_blockers = []  # Backwards-compat: critical blockers only
         
-        if news_row:
-            news_output = json.loads(news_row["outputs_json"])
+        if news_output is not None:
             brief = news_output.get("brief", {})
             sentiment_gate = brief.get("sentiment_gate", {})
             # Only critical blockers are treated as hard blocks
@@ -120,7 +92,7 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                             f"Budget: ${final_notional:.2f} (with fee buffer)."
 
             # Indicate news / sentiment status in rationale
-            if not news_row:
+            if news_output is None:
                 rationale += " News analysis disabled."
             elif is_sentiment_gated:
                 gate_explanation = sentiment_gate.get("explanation", "Bearish sentiment detected")
@@ -181,22 +153,13 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
 
         # Create decision_table artifact (ALWAYS per spec)
         # Get rankings and drop reasons from research node
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes
-            WHERE run_id = ? AND name = 'research'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        research_row = cursor.fetchone()
+        research_output = node_outputs(run_id, "research")
         ranked_candidates = []
         dropped_symbols = {}
         granularity = "1h"
         staleness_note = None
 
-        if research_row:
-            research_output = json.loads(research_row["outputs_json"])
+        if research_output is not None:
             returns_by_symbol = research_output.get("returns_by_symbol", {})
             dropped_symbols = research_output.get("drop_reasons", {})
             granularity = research_output.get("granularity", "1h")
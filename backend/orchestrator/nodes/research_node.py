@@ -1,12 +1,18 @@
 """Research node - fetches market data and computes returns."""
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.core.tool_calls import record_tool_call_sync as record_tool_call
 from backend.services.coinbase_market_data import compute_return_24h
+from backend.services.candle_rollups import record_candles as record_rollup_candles
+from backend.services.price_history import get_price_history
+from backend.services import research_cache
+from backend.core import profiling
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -59,14 +65,20 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
     top_k = 5
 
     try:
+        from backend.services.retrieval_index import search as rag_search
+        rag_result = rag_search(rag_query, doc_types=["policy"], top_k=top_k)
+        # BM25 is unbounded; similarity is relative to the best hit (top hit = 1.0)
+        top_score = max((hit.score for hit in rag_result.hits), default=0.0) or 1.0
         rag_results = [
             {
-                "chunk_id": f"policy_chunk_{i+1}",
-                "text": f"Policy guideline {i+1}: Risk limits and execution safeguards for trading operations.",
+                "chunk_id": hit.doc_id,
+                "title": hit.title,
+                "text": hit.body,
                 "source": "internal_policy_docs",
-                "similarity": 0.85 - (i * 0.1)
+                "bm25_score": round(hit.score, 4),
+                "similarity": round(hit.score / top_score, 4),
             }
-            for i in range(min(top_k, 3))
+            for hit in rag_result.hits
         ]
 
         rag_latency_ms = int((time.time() - start_rag) * 1000)
@@ -80,7 +92,9 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
             response_json={
                 "chunks_count": len(rag_results),
                 "chunks": rag_results,
-                "query": rag_query
+                "query": rag_query,
+                "retrieval_backend": rag_result.backend,
+                "search_latency_ms": rag_result.latency_ms,
             },
             status="SUCCESS",
             latency_ms=rag_latency_ms
@@ -181,207 +195,129 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         conn.commit()
     logger.info(f"Persisted universe_snapshot: {len(universe)} products, filters={filters_applied}")
 
-    # Calculate time window with buffer to tolerate missing candles
-    end_time = datetime.utcnow()
-    buffer_hours = max(lookback_hours * 1.25, lookback_hours + 12)
-    start_time = end_time - timedelta(hours=buffer_hours)
-    start_iso = start_time.isoformat() + "Z"
-    end_iso = end_time.isoformat() + "Z"
-
-    # Minimum candles required: 75% of expected hourly candles, at least 2
+    # Fetch candles and compute returns; runs asking the same question share one fetch
     granularity = _select_granularity(lookback_hours)
     gran_label = _granularity_label(lookback_hours)
-    MIN_CANDLES = max(int(lookback_hours * 0.75), 2) if granularity == "ONE_HOUR" else 2
+    research_key = research_cache.research_key(asset_class, universe, lookback_hours, granularity)
+    shared, from_cache = await asyncio.to_thread(
+        research_cache.get_or_fetch,
+        research_key,
+        lambda: _fetch_market_data(asset_class, universe, lookback_hours),
+    )
+    start_iso, end_iso = shared["start_iso"], shared["end_iso"]
+    buffer_hours = shared["buffer_hours"]
+    MIN_CANDLES = shared["min_candles"]
+    mcp_server_name = "polygon_market_data" if asset_class == "STOCK" else "coinbase_market_data"
+
+    # API call statistics of this run (a shared result made no calls for it)
+    if from_cache:
+        api_call_stats = dict.fromkeys(shared["api_call_stats"], 0)
+        api_call_stats["cache_hits"] = len(universe)
+        shared_fetch = {"research_key": research_key, "fetched_at": shared["fetched_at"]}
+    else:
+        api_call_stats = dict(shared["api_call_stats"])
+        shared_fetch = None
 
-    # Fetch candles for each symbol in universe
-    candles_by_symbol = {}
+    # Record this run's evidence for each symbol
+    series_by_symbol = {}  # symbol -> outcome of the symbols that were ranked
     returns_by_symbol = {}
     citations = []
     drop_reasons = {}  # symbol -> reason
-    
-    # API call statistics tracking
-    api_call_stats = {
-        "calls": 0,
-        "retries": 0,
-        "rate_429s": 0,
-        "timeouts": 0,
-        "cache_hits": 0,
-        "successes": 0,
-        "failures": 0
-    }
 
-    # Get appropriate provider for asset class
-    if asset_class == "STOCK":
-        from backend.services.market_data_provider import get_market_data_provider
-        stock_provider = get_market_data_provider(asset_class="STOCK")
-        mcp_server_name = "polygon_market_data"
-    else:
-        mcp_server_name = "coinbase_market_data"
-        stock_provider = None
+    for symbol in universe:
+        outcome = shared["symbols"][symbol]
+        status = outcome["status"]
+        latency_ms = outcome["latency_ms"]
 
-    for idx, symbol in enumerate(universe):
-        # Rate limiting between API calls (Polygon has its own rate limiter)
-        if idx > 0 and asset_class != "STOCK":
-            time.sleep(RATE_LIMIT_SECONDS)
+        if status == "ok":
+            return_val = outcome["return_pct"]
+            series_by_symbol[symbol] = outcome
+            returns_by_symbol[symbol] = return_val
 
-        start_tool = time.time()
-        api_call_stats["calls"] += 1
-
-        try:
-            if asset_class == "STOCK":
-                # Use Polygon provider for stocks
-                # Map lookback to interval string for Polygon
-                if lookback_hours <= 24:
-                    interval = "24h"
-                elif lookback_hours <= 48:
-                    interval = "48h"
-                elif lookback_hours <= 168:
-                    interval = "1w"
-                else:
-                    interval = "30d"
-                candles = stock_provider.get_candles(
-                    symbol=symbol.replace("-USD", ""),  # Strip -USD suffix
-                    interval=interval
-                )
-            else:
-                # Use Coinbase for crypto
-                from backend.services.coinbase_market_data import get_candles as get_candles_wrapper
-                candles = get_candles_wrapper(
-                    product_id=symbol,
-                    start=start_iso,
-                    end=end_iso,
-                    granularity=granularity
-                )
-
-            latency_ms = int((time.time() - start_tool) * 1000)
-
-            if len(candles) >= MIN_CANDLES:
-                # Validate first price
-                first_open = float(candles[0]["open"])
-                if first_open <= 0:
-                    drop_reasons[symbol] = "invalid_price_zero_open"
-                    logger.warning(f"Dropping {symbol}: first open price is {first_open}")
-                    record_tool_call(
-                        run_id=run_id, node_id=node_id,
-                        tool_name="fetch_candles", mcp_server=mcp_server_name,
-                        request_json={"product_id": symbol},
-                        response_json={"error": "zero_open_price", "first_open": first_open},
-                        status="FAILED", latency_ms=latency_ms,
-                        error_text=f"Invalid first open price: {first_open}"
-                    )
-                    continue
-
-                # Compute return over the lookback window
-                return_val = compute_return_24h(candles)
-
-                candles_by_symbol[symbol] = candles
-                returns_by_symbol[symbol] = return_val
-
-                # Store candles in DB as evidence (batch insert)
-                with get_conn() as conn:
-                    cursor = conn.cursor()
-                    for candle in candles:
-                        candle_id = new_id("candle_")
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO market_candles (
-                                id, symbol, interval, start_time, end_time,
-                                open, high, low, close, volume, ts
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                candle_id, symbol, gran_label,
-                                candle["start_time"], candle["end_time"],
-                                candle["open"], candle["high"], candle["low"],
-                                candle["close"], candle.get("volume", 0.0), now_iso()
-                            )
-                        )
-                    conn.commit()
-
-                # Persist candles batch for evidence
-                with get_conn() as conn:
-                    cursor = conn.cursor()
-                    batch_id = new_id("batch_")
-                    cursor.execute(
-                        """
-                        INSERT INTO market_candles_batches (
-                            batch_id, run_id, node_id, symbol, window, candles_json, query_params_json, ts
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            batch_id, run_id, node_id, symbol, gran_label,
-                            json.dumps(candles),
-                            json.dumps({
-                                "start_time": start_iso,
-                                "end_time": end_iso,
-                                "granularity": granularity,
-                                "lookback_hours": lookback_hours,
-                                "buffer_hours": buffer_hours
-                            }),
-                            now_iso()
-                        )
+            # Persist candles batch for evidence (the series itself is stored once, by the fetch)
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                batch_id = new_id("batch_")
+                cursor.execute(
+                    """
+                    INSERT INTO market_candles_batches (
+                        batch_id, run_id, node_id, symbol, window, candles_json, query_params_json, ts
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        batch_id, run_id, node_id, symbol, gran_label,
+                        outcome["candles_json"],
+                        json.dumps({
+                            "start_time": start_iso,
+                            "end_time": end_iso,
+                            "granularity": granularity,
+                            "lookback_hours": lookback_hours,
+                            "buffer_hours": buffer_hours,
+                            "research_key": research_key
+                        }),
+                        now_iso()
                     )
-                    conn.commit()
-
-                api_call_stats["successes"] += 1
-                record_tool_call(
-                    run_id=run_id, node_id=node_id,
-                    tool_name="fetch_candles", mcp_server=mcp_server_name,
-                    request_json={
-                        "product_id": symbol, "start": start_iso, "end": end_iso,
-                        "granularity": granularity
-                    },
-                    response_json={
-                        "candles_count": len(candles),
-                        "return_pct": return_val,
-                        "first_price": candles[0]["open"],
-                        "last_price": candles[-1]["close"]
-                    },
-                    status="SUCCESS", latency_ms=latency_ms
-                )
-
-                citation_id = new_id("cite_")
-                citations.append({
-                    "citation_id": citation_id,
-                    "source_type": "market_data",
-                    "quote": f"{symbol} return: {return_val:.2%} over {lookback_hours}h",
-                    "url": f"market_candles://{symbol}",
-                    "evidence": {
-                        "symbol": symbol,
-                        "return_pct": return_val,
-                        "candles_count": len(candles),
-                        "window": f"{lookback_hours}h"
-                    }
-                })
-            else:
-                drop_reasons[symbol] = f"insufficient_candles_{len(candles)}_need_{MIN_CANDLES}"
-                logger.warning(f"Insufficient candles for {symbol}: {len(candles)} < {MIN_CANDLES}")
-
-                record_tool_call(
-                    run_id=run_id, node_id=node_id,
-                    tool_name="fetch_candles", mcp_server=mcp_server_name,
-                    request_json={"product_id": symbol, "start": start_iso, "end": end_iso},
-                    response_json={"error": f"Insufficient candles: {len(candles)}/{MIN_CANDLES}"},
-                    status="FAILED",
-                    latency_ms=int((time.time() - start_tool) * 1000),
-                    error_text=f"Insufficient candles: {len(candles)} < {MIN_CANDLES}"
                 )
+                conn.commit()
 
-        except Exception as e:
-            latency_ms = int((time.time() - start_tool) * 1000)
-            error_msg = str(e)
-            api_call_stats["failures"] += 1
-            
-            # Track specific error types
-            if "429" in error_msg or "rate" in error_msg.lower():
-                api_call_stats["rate_429s"] += 1
-                drop_reasons[symbol] = "rate_limited"
-            elif "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
-                api_call_stats["timeouts"] += 1
-                drop_reasons[symbol] = "timeout"
-            else:
-                drop_reasons[symbol] = f"api_error_{error_msg[:80]}"
+            response_json = {
+                "candles_count": outcome["candles_count"],
+                "return_pct": return_val,
+                "first_price": outcome["first_price"],
+                "last_price": outcome["last_price"]
+            }
+            if shared_fetch:
+                response_json["shared_fetch"] = shared_fetch
+            record_tool_call(
+                run_id=run_id, node_id=node_id,
+                tool_name="fetch_candles", mcp_server=mcp_server_name,
+                request_json={
+                    "product_id": symbol, "start": start_iso, "end": end_iso,
+                    "granularity": granularity
+                },
+                response_json=response_json,
+                status="SUCCESS", latency_ms=latency_ms
+            )
 
+            citation_id = new_id("cite_")
+            citations.append({
+                "citation_id": citation_id,
+                "source_type": "market_data",
+                "quote": f"{symbol} return: {return_val:.2%} over {lookback_hours}h",
+                "url": f"market_candles://{symbol}",
+                "evidence": {
+                    "symbol": symbol,
+                    "return_pct": return_val,
+                    "candles_count": outcome["candles_count"],
+                    "window": f"{lookback_hours}h"
+                }
+            })
+        elif status == "zero_open":
+            first_open = outcome["first_open"]
+            drop_reasons[symbol] = "invalid_price_zero_open"
+            record_tool_call(
+                run_id=run_id, node_id=node_id,
+                tool_name="fetch_candles", mcp_server=mcp_server_name,
+                request_json={"product_id": symbol},
+                response_json={"error": "zero_open_price", "first_open": first_open},
+                status="FAILED", latency_ms=latency_ms,
+                error_text=f"Invalid first open price: {first_open}"
+            )
+        elif status == "insufficient":
+            count = outcome["candles_count"]
+            drop_reasons[symbol] = f"insufficient_candles_{count}_need_{MIN_CANDLES}"
+            record_tool_call(
+                run_id=run_id, node_id=node_id,
+                tool_name="fetch_candles", mcp_server=mcp_server_name,
+                request_json={"product_id": symbol, "start": start_iso, "end": end_iso},
+                response_json={"error": f"Insufficient candles: {count}/{MIN_CANDLES}"},
+                status="FAILED",
+                latency_ms=latency_ms,
+                error_text=f"Insufficient candles: {count} < {MIN_CANDLES}"
+            )
+        else:
+            error_msg = outcome["error"]
+            drop_reasons[symbol] = outcome["drop_reason"]
             record_tool_call(
                 run_id=run_id, node_id=node_id,
                 tool_name="fetch_candles", mcp_server=mcp_server_name,
@@ -390,7 +326,6 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                 status="FAILED", latency_ms=latency_ms,
                 error_text=error_msg
             )
-            logger.error(f"Failed to fetch candles for {symbol}: {e}")
 
     # Persist research_debug artifact
     debug_artifact = {
@@ -405,6 +340,11 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         "dropped_count": len(drop_reasons),
         "drop_reasons": drop_reasons,
         "top_reasons_summary": _summarize_drop_reasons(drop_reasons),
+        "research_cache": {
+            "key": research_key,
+            "shared": from_cache,
+            "market_data_fetched_at": shared["fetched_at"]
+        },
         "fetched_at": now_iso()
     }
 
@@ -472,7 +412,7 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                 (retrieval_id, run_id, node_id, f"market_data_{lookback_hours}h", json.dumps({
                     "citations": citations,
                     "citation_ids": citation_ids,
-                    "candles_by_symbol": {sym: len(cs) for sym, cs in candles_by_symbol.items()},
+                    "candles_by_symbol": {sym: series["candles_count"] for sym, series in series_by_symbol.items()},
                     "returns_by_symbol": returns_by_symbol
                 }), now_iso())
             )
@@ -486,7 +426,7 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
             example = {
                 "asset": sym,
                 "reason": reason,
-                "candle_count": len(candles_by_symbol.get(sym, []))
+                "candle_count": series_by_symbol.get(sym, {}).get("candles_count", 0)
             }
             top_examples.append(example)
         
@@ -548,10 +488,10 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
             "product_id": sym,
             "base_symbol": sym.split("-")[0] if "-" in sym else sym,
             "return_48h": ret,  # Named return_48h for consistency even if lookback differs
-            "candles_count": len(candles_by_symbol[sym]),
-            "first_ts": candles_by_symbol[sym][0]["start_time"] if candles_by_symbol[sym] else None,
-            "last_ts": candles_by_symbol[sym][-1]["end_time"] if candles_by_symbol[sym] else None,
-            "last_price": float(candles_by_symbol[sym][-1]["close"]) if candles_by_symbol[sym] else None
+            "candles_count": series_by_symbol[sym]["candles_count"],
+            "first_ts": series_by_symbol[sym]["first_ts"],
+            "last_ts": series_by_symbol[sym]["last_ts"],
+            "last_price": float(series_by_symbol[sym]["last_price"])
         }
          for sym, ret in returns_by_symbol.items()],
         key=lambda x: x["return_48h"], reverse=True
@@ -575,13 +515,10 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         conn.commit()
 
     # Store research results in dag_nodes outputs_json
-    last_prices = {}
-    for sym, candles_list in candles_by_symbol.items():
-        if candles_list and len(candles_list) > 0:
-            last_prices[sym] = float(candles_list[-1]["close"])
+    last_prices = {sym: float(series["last_price"]) for sym, series in series_by_symbol.items()}
 
     research_output = {
-        "candles_by_symbol": {sym: len(cs) for sym, cs in candles_by_symbol.items()},
+        "candles_by_symbol": {sym: series["candles_count"] for sym, series in series_by_symbol.items()},
         "last_prices_by_symbol": last_prices,
         "returns_by_symbol": returns_by_symbol,
         "citations": citations,
@@ -614,6 +551,162 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
     return research_output
 
 
+def _fetch_market_data(asset_class: str, universe: list, lookback_hours: int) -> dict:
+    """Fetch candles for ``universe`` and compute returns.
+
+    Nothing here depends on the run, so runs can share the result (see
+    ``research_cache``). Candles go to the global market data tables and the
+    blob store; the result holds each symbol's outcome, including the
+    ``candles_json`` value that batch rows reference.
+    """
+    # Calculate time window with buffer to tolerate missing candles
+    end_time = datetime.utcnow()
+    buffer_hours = max(lookback_hours * 1.25, lookback_hours + 12)
+    start_time = end_time - timedelta(hours=buffer_hours)
+    start_iso = start_time.isoformat() + "Z"
+    end_iso = end_time.isoformat() + "Z"
+
+    # Minimum candles required: 75% of expected hourly candles, at least 2
+    granularity = _select_granularity(lookback_hours)
+    gran_label = _granularity_label(lookback_hours)
+    MIN_CANDLES = max(int(lookback_hours * 0.75), 2) if granularity == "ONE_HOUR" else 2
+
+    # API call statistics tracking
+    api_call_stats = {
+        "calls": 0,
+        "retries": 0,
+        "rate_429s": 0,
+        "timeouts": 0,
+        "cache_hits": 0,
+        "successes": 0,
+        "failures": 0
+    }
+
+    # Get appropriate provider for asset class
+    if asset_class == "STOCK":
+        from backend.services.market_data_provider import get_market_data_provider
+        stock_provider = get_market_data_provider(asset_class="STOCK")
+    else:
+        stock_provider = None
+
+    symbols = {}
+    for idx, symbol in enumerate(universe):
+        # Rate limiting between API calls (Polygon has its own rate limiter)
+        if idx > 0 and asset_class != "STOCK":
+            profiling.sleep(RATE_LIMIT_SECONDS)
+
+        start_tool = time.time()
+        api_call_stats["calls"] += 1
+
+        try:
+            if asset_class == "STOCK":
+                # Use Polygon provider for stocks
+                # Map lookback to interval string for Polygon
+                if lookback_hours <= 24:
+                    interval = "24h"
+                elif lookback_hours <= 48:
+                    interval = "48h"
+                elif lookback_hours <= 168:
+                    interval = "1w"
+                else:
+                    interval = "30d"
+                candles = stock_provider.get_candles(
+                    symbol=symbol.replace("-USD", ""),  # Strip -USD suffix
+                    interval=interval
+                )
+            else:
+                # Use Coinbase for crypto
+                from backend.services.coinbase_market_data import get_candles as get_candles_wrapper
+                candles = get_candles_wrapper(
+                    product_id=symbol,
+                    start=start_iso,
+                    end=end_iso,
+                    granularity=granularity
+                )
+
+            latency_ms = int((time.time() - start_tool) * 1000)
+
+            if len(candles) < MIN_CANDLES:
+                logger.warning(f"Insufficient candles for {symbol}: {len(candles)} < {MIN_CANDLES}")
+                symbols[symbol] = {"status": "insufficient", "latency_ms": latency_ms, "candles_count": len(candles)}
+                continue
+
+            # Validate first price
+            first_open = float(candles[0]["open"])
+            if first_open <= 0:
+                logger.warning(f"Dropping {symbol}: first open price is {first_open}")
+                symbols[symbol] = {"status": "zero_open", "latency_ms": latency_ms, "first_open": first_open}
+                continue
+
+            # Compute return over the lookback window
+            return_val = compute_return_24h(candles)
+
+            # Store candles in DB as evidence (batch insert)
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                for candle in candles:
+                    candle_id = new_id("candle_")
+                    cursor.execute(
+                        """
+                        INSERT OR IGNORE INTO market_candles (
+                            id, symbol, interval, start_time, end_time,
+                            open, high, low, close, volume, ts
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            candle_id, symbol, gran_label,
+                            candle["start_time"], candle["end_time"],
+                            candle["open"], candle["high"], candle["low"],
+                            candle["close"], candle.get("volume", 0.0), now_iso()
+                        )
+                    )
+                get_price_history().record_candles(symbol, candles, conn=conn)
+                record_rollup_candles(symbol, gran_label, candles, conn=conn)
+                candles_json = blob_store.put_json(candles, conn=conn)
+                conn.commit()
+
+            api_call_stats["successes"] += 1
+            symbols[symbol] = {
+                "status": "ok",
+                "latency_ms": latency_ms,
+                "candles_json": candles_json,
+                "candles_count": len(candles),
+                "return_pct": return_val,
+                "first_price": candles[0]["open"],
+                "last_price": candles[-1]["close"],
+                "first_ts": candles[0]["start_time"],
+                "last_ts": candles[-1]["end_time"],
+            }
+
+        except Exception as e:
+            latency_ms = int((time.time() - start_tool) * 1000)
+            error_msg = str(e)
+            api_call_stats["failures"] += 1
+
+            # Track specific error types
+            if "429" in error_msg or "rate" in error_msg.lower():
+                api_call_stats["rate_429s"] += 1
+                drop_reason = "rate_limited"
+            elif "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
+                api_call_stats["timeouts"] += 1
+                drop_reason = "timeout"
+            else:
+                drop_reason = f"api_error_{error_msg[:80]}"
+
+            symbols[symbol] = {"status": "error", "latency_ms": latency_ms, "error": error_msg, "drop_reason": drop_reason}
+            logger.error(f"Failed to fetch candles for {symbol}: {e}")
+
+    return {
+        "start_iso": start_iso,
+        "end_iso": end_iso,
+        "buffer_hours": buffer_hours,
+        "min_candles": MIN_CANDLES,
+        "api_call_stats": api_call_stats,
+        "symbols": symbols,
+        "fetched_at": now_iso(),
+    }
+
+
 def _summarize_drop_reasons(drop_reasons: dict) -> dict:
     """Summarize drop reasons into counts by category."""
     summary = {}
@@ -739,7 +832,8 @@ async def _replay_research(run_id: str, node_id: str, tenant_id: str, source_run
                    (batch_id, run_id, node_id, symbol, window, candles_json, query_params_json, ts)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
                 (batch_id, run_id, node_id, batch["symbol"], batch["window"],
-                 batch["candles_json"], batch["query_params_json"], now_iso())
+                 # References are copied as-is; legacy inline payloads move to the blob store
+                 blob_store.put_json(batch["candles_json"], conn=conn), batch["query_params_json"], now_iso())
             )
         
         # Copy rankings
@@ -1,6 +1,7 @@
 """Risk node - position sizing with budget enforcement."""
 import json
 from backend.db.connect import get_conn
+from backend.orchestrator.blackboard import node_outputs
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
 
@@ -23,19 +24,9 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
         budget_usd = intent.get("budget_usd") or intent.get("amount_usd") or 10.0
         
         # Get signals (top symbol)
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes 
-            WHERE run_id = ? AND name = 'signals'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        signals_row = cursor.fetchone()
-        if not signals_row:
+        signals_output = node_outputs(run_id, "signals")
+        if signals_output is None:
             raise ValueError("Signals node outputs not found")
-        
-        signals_output = json.loads(signals_row["outputs_json"])
         top_symbol = signals_output.get("top_symbol")
     
     # Enforce budget limits
@@ -1,6 +1,7 @@
 """Signals node - computes top movers and momentum."""
 import json
 from backend.db.connect import get_conn
+from backend.orchestrator.blackboard import node_outputs
 from backend.core.logging import get_logger
 from backend.core.ids import new_id
 from backend.core.time import now_iso
@@ -11,22 +12,9 @@ logger = get_logger(__name__)
 async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
     """Execute signals node - rank top movers from research results."""
     # Get research node outputs
-    with get_conn() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT outputs_json FROM dag_nodes
-            WHERE run_id = ? AND name = 'research'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (run_id,)
-        )
-        row = cursor.fetchone()
-
-        if not row or "outputs_json" not in row.keys() or not row["outputs_json"]:
-            raise ValueError("Research node outputs not found")
-
-        research_output = json.loads(row["outputs_json"])
+    research_output = node_outputs(run_id, "research")
+    if research_output is None:
+        raise ValueError("Research node outputs not found")
 
     returns_by_symbol = research_output.get("returns_by_symbol", {})
     lookback_hours = research_output.get("lookback_hours", 24)
@@ -2,9 +2,12 @@
 import json
 from datetime import datetime, timedelta
 from backend.db.connect import get_conn
+from backend.db import blob_store
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.services.strategy_engine import select_top_asset
+from backend.services.candle_rollups import record_candles as record_rollup_candles
+from backend.services.price_history import get_price_history
 from backend.mcp_servers.market_data_server import market_data_server
 from backend.core.logging import get_logger
 
@@ -117,6 +120,8 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                             )
                         )
                         candle_ids.append(candle_id)
+                    get_price_history().record_candles(symbol, candles, conn=conn)
+                    record_rollup_candles(symbol, granularity_label, candles, conn=conn)
                     conn.commit()
 
                 candle_ids_by_symbol[symbol] = candle_ids
@@ -223,7 +228,7 @@ async def execute(run_id: str, node_id: str, tenant_id: str) -> dict:
                     """,
                     (
                         batch_id, run_id, node_id, symbol, window,
-                        json.dumps(candles_by_symbol[symbol]),
+                        blob_store.put_json(candles_by_symbol[symbol], conn=conn),
                         json.dumps({
                             "start_time": start_time.isoformat() + "Z",
                             "end_time": end_time.isoformat() + "Z",
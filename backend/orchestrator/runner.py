@@ -1,12 +1,17 @@
 """Orchestrator runner."""
 import json
 import asyncio
+from typing import Optional
 from backend.db.connect import get_conn
+from backend.db import query_stats
+from backend.core import profiling
+from backend.core.profiling import RunProfiler
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.orchestrator.state_machine import RunStatus, NodeStatus, can_transition, TERMINAL_RUN_STATUSES
 from backend.orchestrator.event_pubsub import event_pubsub
 from backend.orchestrator.event_emitter import emit_event as _emit_event
+from backend.orchestrator.blackboard import open_blackboard, close_blackboard, get_open_blackboard
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -67,6 +72,9 @@ async def execute_run(run_id: str):
     timeout_seconds = settings.execution_timeout_seconds
     
     tenant_id = None
+    # Node outputs are handed between nodes in memory for the duration of the run
+    open_blackboard(run_id)
+    query_token = query_stats.open_scope(f"run {run_id}")
     
     try:
         # Wrap entire execution in asyncio timeout
@@ -102,6 +110,9 @@ async def execute_run(run_id: str):
             await _emit_event(run_id, "RUN_FAILED", {"error": "Execution timeout", "code": "EXECUTION_TIMEOUT"}, tenant_id=tenant_id)
         except Exception as e:
             logger.error(f"Failed to persist timeout artifacts for {run_id}: {e}")
+    finally:
+        query_stats.close_scope(query_token)
+        close_blackboard(run_id)
 
 
 async def _execute_run_with_span(run_id: str):
@@ -127,6 +138,21 @@ async def _execute_run_with_span(run_id: str):
         await _execute_run_body(run_id, None)
 
 
+def _persist_node_completion(node_id: str, result: dict):
+    """Mark a node COMPLETED with its outputs (audit trail and resumability)."""
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            UPDATE dag_nodes 
+            SET status = ?, completed_at = ?, outputs_json = ?
+            WHERE node_id = ?
+            """,
+            (NodeStatus.COMPLETED.value, now_iso(), profiling.dumps(result), node_id)
+        )
+        conn.commit()
+
+
 def _persist_artifact(run_id: str, step_name: str, artifact_type: str, data: dict):
     """Helper to persist a run artifact."""
     with get_conn() as conn:
@@ -134,11 +160,24 @@ def _persist_artifact(run_id: str, step_name: str, artifact_type: str, data: dic
         cursor.execute(
             """INSERT INTO run_artifacts (run_id, step_name, artifact_type, artifact_json, created_at)
                VALUES (?, ?, ?, ?, ?)""",
-            (run_id, step_name, artifact_type, json.dumps(data, default=str), now_iso())
+            (run_id, step_name, artifact_type, profiling.dumps(data, default=str), now_iso())
         )
         conn.commit()
 
 
+def _persist_run_profile(run_id: str, profiler: RunProfiler) -> Optional[dict]:
+    """Persist the run_profile artifact; returns its totals for run_telemetry."""
+    if not profiler.nodes:
+        return None
+    try:
+        profile = profiler.to_dict()
+        _persist_artifact(run_id, "profile", "run_profile", profile)
+        return profile["totals"]
+    except Exception as e:
+        logger.warning("run_profile artifact failed (non-fatal): %s", str(e)[:200])
+        return None
+
+
 def _create_trade_receipt(run_id: str, status: str, error: dict = None, error_code: str = None):
     """Create trade_receipt.json artifact for terminal trade states.
     
@@ -249,6 +288,7 @@ def _create_trade_receipt(run_id: str, status: str, error: dict = None, error_co
 async def _execute_run_body(run_id: str, span):
     """Execute run body with optional span."""
     tenant_id = None
+    profiler = RunProfiler(run_id)
     
     try:
         # Get run
@@ -599,25 +639,19 @@ async def _execute_run_body(run_id: str, span):
                 
                 await _emit_event(run_id, "NODE_STARTED", {"node_id": node_id, "node_name": node_name}, tenant_id=tenant_id)
                 
-                # Execute node
-                result = await node_func(run_id, node_id, tenant_id)
+                # Execute node (time breakdown goes to the run_profile artifact)
+                async with profiler.node(node_name):
+                    result = await node_func(run_id, node_id, tenant_id)
                 
                 # Extract evidence refs from result if present
                 evidence_refs = result.get("evidence_refs", [])
                 safe_summary = result.get("safe_summary", f"{step_name} completed successfully")
                 
-                # Update node
-                with get_conn() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        """
-                        UPDATE dag_nodes 
-                        SET status = ?, completed_at = ?, outputs_json = ?
-                        WHERE node_id = ?
-                        """,
-                        (NodeStatus.COMPLETED.value, now_iso(), json.dumps(result), node_id)
-                    )
-                    conn.commit()
+                # Publish outputs to downstream nodes, then persist them off the event loop
+                board = get_open_blackboard(run_id)
+                if board is not None:
+                    board.put(node_name, result)
+                await asyncio.to_thread(_persist_node_completion, node_id, result)
                 
                 # Emit STEP_FINISHED event (user-visible execution trace)
                 step_completed_ts = now_iso()
@@ -955,6 +989,8 @@ async def _execute_run_body(run_id: str, span):
         except Exception as prom_err:
             logger.debug(f"Prometheus metrics recording skipped: {prom_err}")
         
+        run_profile = _persist_run_profile(run_id, profiler)
+
         # Update telemetry with completion data
         try:
             from backend.core.telemetry_repo import create_or_update_run_telemetry
@@ -998,7 +1034,8 @@ async def _execute_run_body(run_id: str, span):
                 tool_calls_count=tool_calls_count,
                 sse_events_count=sse_events_count,
                 error_count=error_count,
-                trace_id=trace_id
+                trace_id=trace_id,
+                profile=run_profile,
             )
         except Exception as e:
             logger.warning(f"Failed to update telemetry for run {run_id}: {e}")
@@ -1034,6 +1071,8 @@ async def _execute_run_body(run_id: str, span):
             err_trace_id = None
             await _emit_event(run_id, "RUN_STATUS", {"status": RunStatus.FAILED.value, "error": str(e)}, tenant_id="t_default")
         
+        run_profile = _persist_run_profile(run_id, profiler)
+
         # Update telemetry with failure data
         try:
             from backend.core.telemetry_repo import create_or_update_run_telemetry
@@ -1077,7 +1116,8 @@ async def _execute_run_body(run_id: str, span):
                 sse_events_count=sse_events_count,
                 error_count=error_count,
                 last_error=str(e),
-                trace_id=err_trace_id
+                trace_id=err_trace_id,
+                profile=run_profile,
             )
         except Exception as e3:
             logger.warning(f"Failed to update telemetry for failed run {run_id}: {e3}")
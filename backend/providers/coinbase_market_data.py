@@ -13,6 +13,7 @@ import random
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from backend.providers.market_data_base import MarketDataProvider
+from backend.core import profiling
 from backend.core.logging import get_logger
 from backend.core.config import get_settings
 from backend.core.symbols import to_product_id
@@ -130,7 +131,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                             jitter = random.uniform(0, wait_time * 0.3)
                             total_wait = wait_time + jitter
                             logger.warning(f"Rate limited (429) for {symbol}, retrying in {total_wait:.2f}s")
-                            time.sleep(total_wait)
+                            profiling.sleep(total_wait)
                             continue
                         else:
                             raise ValueError(f"Rate limited (429) for {symbol} after {_effective_retries} retries")
@@ -140,7 +141,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                         if attempt < _effective_retries:
                             wait_time = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
                             logger.warning(f"Server error ({response.status_code}) for {symbol}, retrying in {wait_time:.2f}s")
-                            time.sleep(wait_time)
+                            profiling.sleep(wait_time)
                             continue
                         else:
                             logger.error(f"Coinbase API server error for {symbol}: {response.status_code} - {response.text}")
@@ -173,7 +174,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                 if attempt < _effective_retries:
                     wait_time = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
                     logger.warning(f"Timeout for {symbol}, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{_effective_retries})")
-                    time.sleep(wait_time)
+                    profiling.sleep(wait_time)
                     continue
                 else:
                     logger.error(f"Coinbase API timeout for {symbol} after {_effective_retries} retries")
@@ -219,7 +220,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                             wait_time = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
                             jitter = random.uniform(0, wait_time * 0.3)
                             logger.warning(f"Rate limited (429) for {symbol} price, retrying in {wait_time + jitter:.2f}s")
-                            time.sleep(wait_time + jitter)
+                            profiling.sleep(wait_time + jitter)
                             continue
                         else:
                             raise ValueError(f"Rate limited (429) for {symbol} price after {_effective_retries} retries")
@@ -229,7 +230,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                         if attempt < _effective_retries:
                             wait_time = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
                             logger.warning(f"Server error ({response.status_code}) for {symbol} price, retrying")
-                            time.sleep(wait_time)
+                            profiling.sleep(wait_time)
                             continue
                         else:
                             logger.error(f"Coinbase API server error for {symbol}: {response.status_code} - {response.text}")
@@ -244,7 +245,7 @@ class CoinbaseMarketDataProvider(MarketDataProvider):
                 if attempt < _effective_retries:
                     wait_time = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
                     logger.warning(f"Timeout for {symbol} price, retrying in {wait_time:.2f}s")
-                    time.sleep(wait_time)
+                    profiling.sleep(wait_time)
                     continue
                 else:
                     raise ValueError(f"Timeout getting price for {symbol} after {_effective_retries} retries")
@@ -7,6 +7,7 @@ from backend.providers.base import BrokerProvider
 from backend.db.connect import get_conn
 from backend.core.ids import new_id
 from backend.core.time import now_iso
+from backend.core import profiling
 from backend.core.logging import get_logger
 from backend.core.config import get_settings
 from backend.services.coinbase_auth import build_jwt
@@ -99,7 +100,7 @@ class CoinbaseProvider(BrokerProvider):
                         if attempt < max_attempts:
                             wait_time = backoff_seconds * (2 ** (attempt - 1))
                             logger.warning(f"Rate limited (429), retrying after {wait_time}s (attempt {attempt}/{max_attempts})")
-                            time.sleep(wait_time)
+                            profiling.sleep(wait_time)
                             continue
                     
                     response.raise_for_status()
@@ -138,7 +139,7 @@ class CoinbaseProvider(BrokerProvider):
                         )
                     raise
                 wait_time = backoff_seconds * (2 ** (attempt - 1))
-                time.sleep(wait_time)
+                profiling.sleep(wait_time)
         
         return None
     
@@ -151,91 +152,21 @@ class CoinbaseProvider(BrokerProvider):
         timeout_seconds: int = 30,
         poll_interval: float = 1.0
     ) -> Dict[str, Any]:
-        """Poll order status until terminal state (FILLED, CANCELED, REJECTED) or timeout."""
-        start_time = time.time()
-        last_status = None
-        consecutive_errors = 0
-        max_consecutive_errors = 5  # Give up early if we keep getting errors
-        
-        while time.time() - start_time < timeout_seconds:
-            try:
-                status_data = self._get_order_status(order_id, run_id, node_id)
-                if not status_data:
-                    consecutive_errors += 1
-                    if consecutive_errors >= max_consecutive_errors:
-                        logger.warning(f"Order {order_id} polling stopped after {consecutive_errors} consecutive errors")
-                        break
-                    time.sleep(poll_interval)
-                    continue
-                
-                # Reset error counter on successful response
-                consecutive_errors = 0
-                
-                order_status = status_data.get("status", "").upper()
-                last_status = order_status
-                
-                # Update order status in DB
-                with get_conn() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        """
-                        UPDATE orders 
-                        SET status = ?, status_updated_at = ?, status_reason = ?
-                        WHERE order_id = ?
-                        """,
-                        (
-                            order_status,
-                            now_iso(),
-                            status_data.get("reject_reason") or status_data.get("reason", ""),
-                            order_id
-                        )
-                    )
-                    
-                    # Emit status event
-                    event_id = new_id("evt_")
-                    cursor.execute(
-                        """
-                        INSERT INTO order_events (id, order_id, event_type, payload_json, ts)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (event_id, order_id, order_status, json.dumps(self._redact_sensitive(status_data)), now_iso())
-                    )
-                    conn.commit()
-                
-                # Terminal states
-                if order_status in ("FILLED", "CANCELED", "REJECTED", "EXPIRED"):
-                    # If filled, fetch and store fills
-                    if order_status == "FILLED":
-                        self._fetch_and_store_fills(order_id, run_id, tenant_id, node_id)
-                    return status_data
-                
-                time.sleep(poll_interval)
-            except Exception as e:
-                consecutive_errors += 1
-                logger.warning(f"Error polling order {order_id} (attempt {consecutive_errors}): {e}")
-                if consecutive_errors >= max_consecutive_errors:
-                    logger.warning(f"Order {order_id} polling stopped after {consecutive_errors} consecutive errors")
-                    break
-                time.sleep(poll_interval)
-        
-        # Timeout or too many errors - mark as SUBMITTED (order was placed, status unknown)
-        final_status = "TIMEOUT" if time.time() - start_time >= timeout_seconds else "POLL_FAILED"
-        logger.warning(f"Order {order_id} polling ended: {final_status} (last status: {last_status})")
-        with get_conn() as conn:
-            cursor = conn.cursor()
-            # Don't override to TIMEOUT if we already have a status
-            if last_status:
-                cursor.execute(
-                    "UPDATE orders SET status_updated_at = ?, status_reason = ? WHERE order_id = ?",
-                    (now_iso(), f"Polling ended: {final_status}", order_id)
-                )
-            else:
-                cursor.execute(
-                    "UPDATE orders SET status = ?, status_updated_at = ? WHERE order_id = ?",
-                    ("SUBMITTED", now_iso(), order_id)
-                )
-            conn.commit()
-        return {"status": last_status or "SUBMITTED", "order_id": order_id}
+        """Poll order status until terminal state (FILLED, CANCELED, REJECTED) or timeout.
+
+        Blocking wrapper around ``OrderTracker``; async callers should use
+        ``backend.services.order_tracker.track_orders`` to wait on several
+        orders at once. ``poll_interval`` caps the adaptive backoff.
+        """
+        from backend.services.order_tracker import TrackedOrder, track_order_blocking
+
+        result = track_order_blocking(
+            self,
+            TrackedOrder(order_id=order_id, tenant_id=tenant_id, run_id=run_id, node_id=node_id),
+            timeout_seconds=timeout_seconds,
+            max_interval=poll_interval,
+        )
+        return {"status": result.status, "order_id": order_id}
     
     def _fetch_and_store_fills(
         self,
@@ -244,56 +175,19 @@ class CoinbaseProvider(BrokerProvider):
         tenant_id: str,
         node_id: str = None
     ) -> List[Dict[str, Any]]:
-        """Fetch fills for an order and store them in DB."""
+        """Fetch fills for an order and store the ones not already recorded (by trade_id)."""
+        from backend.services.order_tracker import TrackedOrder, store_fills, stored_trade_ids
+
         fills = self.get_fills(order_id, run_id, node_id)
         
         if not fills:
             return []
         
-        # Compute aggregate metrics
-        total_size = 0.0
-        total_fees = 0.0
-        weighted_price_sum = 0.0
-        
-        with get_conn() as conn:
-            cursor = conn.cursor()
-            
-            for fill_data in fills:
-                fill_id = new_id("fill_")
-                price = float(fill_data.get("price", 0))
-                size = float(fill_data.get("size", 0))
-                fee = float(fill_data.get("commission", 0))
-                trade_id = fill_data.get("trade_id", "")
-                liquidity = fill_data.get("liquidity", "").upper()
-                
-                product_id = fill_data.get("product_id", "")
-                
-                cursor.execute(
-                    """
-                    INSERT INTO fills (
-                        fill_id, order_id, run_id, tenant_id, product_id,
-                        price, size, fee, trade_id, liquidity_indicator, filled_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (fill_id, order_id, run_id, tenant_id, product_id, price, size, fee, trade_id, liquidity, now_iso())
-                )
-                
-                total_size += size
-                total_fees += fee
-                weighted_price_sum += price * size
-            
-            # Update order with aggregate metrics
-            avg_fill_price = weighted_price_sum / total_size if total_size > 0 else 0.0
-            
-            cursor.execute(
-                """
-                UPDATE orders 
-                SET filled_qty = ?, avg_fill_price = ?, total_fees = ?
-                WHERE order_id = ?
-                """,
-                (total_size, avg_fill_price, total_fees, order_id)
-            )
-            conn.commit()
+        seen = stored_trade_ids(order_id)
+        new_fills = [f for f in fills if not f.get("trade_id") or f.get("trade_id") not in seen]
+        if new_fills:
+            # Inserts the new rows and recomputes filled_qty / avg_fill_price / total_fees
+            store_fills(TrackedOrder(order_id=order_id, tenant_id=tenant_id, run_id=run_id, node_id=node_id), new_fills)
         
         return fills
     
@@ -713,7 +607,7 @@ class CoinbaseProvider(BrokerProvider):
                         if attempt < max_retries:
                             wait_time = backoff_seconds * (2 ** (attempt - 1))
                             logger.warning(f"Rate limited (429), retrying after {wait_time}s (attempt {attempt}/{max_retries})")
-                            time.sleep(wait_time)
+                            profiling.sleep(wait_time)
                             attempt += 1
                             continue
                     
@@ -814,7 +708,7 @@ class CoinbaseProvider(BrokerProvider):
                 if e.response.status_code in (429, 502, 503, 504) and attempt < max_retries:
                     wait_time = backoff_seconds * (2 ** (attempt - 1))
                     logger.warning(f"Transient error {e.response.status_code}, retrying after {wait_time}s (attempt {attempt}/{max_retries})")
-                    time.sleep(wait_time)
+                    profiling.sleep(wait_time)
                     attempt += 1
                     continue
                 
@@ -880,7 +774,7 @@ class CoinbaseProvider(BrokerProvider):
                 if attempt >= max_retries:
                     raise
                 attempt += 1
-                time.sleep(backoff_seconds * (2 ** (attempt - 1)))
+                profiling.sleep(backoff_seconds * (2 ** (attempt - 1)))
         
         raise Exception(f"Order placement failed after {max_retries} attempts")
 
@@ -1316,7 +1210,8 @@ class CoinbaseProvider(BrokerProvider):
                 
                 return {
                     "accounts": accounts,
-                    "raw_account_count": len(data.get("accounts", []))
+                    "raw_account_count": len(data.get("accounts", [])),
+                    "has_next": bool(data.get("has_next")),
                 }
                 
         except Exception as e:
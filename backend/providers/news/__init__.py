@@ -1,4 +1,4 @@
-from .rss_provider import RSSProvider
+from .rss_provider import RSSProvider, FeedItems
 from .gdelt_provider import GDELTProvider
 
-__all__ = ["RSSProvider", "GDELTProvider"]
+__all__ = ["RSSProvider", "FeedItems", "GDELTProvider"]
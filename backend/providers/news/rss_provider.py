@@ -1,12 +1,74 @@
+import asyncio
+import multiprocessing
 import feedparser
 import httpx
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from email.utils import parsedate_to_datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# feedparser is pure Python and takes tens of ms on a large feed; parse in
+# worker processes so ingestion does not stall the event loop
+PARSE_WORKERS = 2
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+class FeedItems(list):
+    """Normalized items plus the HTTP validators of the response they came from.
+
+    ``not_modified`` is set when the server answered a conditional GET with 304.
+    """
+
+    def __init__(self, items=(), etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 not_modified: bool = False):
+        super().__init__(items)
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn: forking a process that runs threads and an event loop is unsafe
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _parse_pool
+
+
+def parse_feed(source_id: str, url: str, content: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Parse and normalize a feed document. Runs in a worker process.
+
+    Returns ``(items, bozo_message)``; entries that fail to normalize are skipped.
+    """
+    feed = feedparser.parse(content)
+    bozo = str(feed.bozo_exception) if feed.bozo else None
+    provider = RSSProvider()
+    items = []
+    for entry in feed.entries:
+        try:
+            normalized = provider._normalize_entry(source_id, entry, url)
+            if normalized:
+                items.append(normalized)
+        except Exception:
+            continue
+    return items, bozo
+
+
+async def parse_feed_off_loop(source_id: str, url: str, content: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """``parse_feed`` in the process pool, or a thread if processes are unavailable."""
+    global _parse_pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_parse_pool(), parse_feed, source_id, url, content)
+    except (BrokenProcessPool, OSError, NotImplementedError) as e:
+        logger.warning("Feed parse pool unavailable, parsing in a thread: %s", str(e)[:100])
+        _parse_pool = None
+        return await asyncio.to_thread(parse_feed, source_id, url, content)
+
 class RSSProvider:
     """
     Provider to fetch and normalize news from RSS/Atom feeds.
@@ -20,31 +82,38 @@ class RSSProvider:
             "User-Agent": "Mozilla/5.0 (compatible; AgenticTradingPlatform/1.0; +http://localhost)"
         }
 
-    async def fetch(self, source_id: str, url: str) -> List[Dict[str, Any]]:
+    async def fetch(self, source_id: str, url: str, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Fetch feed items from a URL.
-        Returns a list of normalized news items.
+        Returns a list of normalized news items (a ``FeedItems`` carrying the
+        response's ETag / Last-Modified). Pass the validators from the previous
+        fetch to make the request conditional; a 304 returns no items.
         Per-source error handling: one bad feed won't break all.
         """
-        items = []
+        # On failure keep the caller's validators so the next attempt stays conditional
+        items = FeedItems(etag=etag, last_modified=last_modified)
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
         try:
             async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                response = await client.get(url, headers=self.headers)
+                response = await client.get(url, headers=headers)
+                if response.status_code == 304:
+                    return FeedItems(etag=etag, last_modified=last_modified, not_modified=True)
                 response.raise_for_status()
                 content = response.text
 
-            feed = feedparser.parse(content)
-            
-            if feed.bozo:
-                logger.warning(f"RSS Parse warning for {url}: {feed.bozo_exception}")
-
-            for entry in feed.entries:
-                try:
-                    normalized = self._normalize_entry(source_id, entry, url)
-                    if normalized:
-                        items.append(normalized)
-                except Exception as entry_err:
-                    logger.debug("Skipping RSS entry from %s: %s", url, str(entry_err)[:100])
+            parsed, bozo = await parse_feed_off_loop(source_id, url, content)
+            if bozo:
+                logger.warning(f"RSS Parse warning for {url}: {bozo}")
+            items = FeedItems(
+                parsed,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
 
         except httpx.TimeoutException:
             logger.warning("RSS feed timeout for %s (non-fatal, skipping)", url)
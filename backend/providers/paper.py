@@ -6,10 +6,14 @@ from backend.db.connect import get_conn
 from backend.core.ids import new_id
 from backend.core.time import now_iso
 from backend.services.market_data import get_price
+from backend.services.price_history import get_price_history
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Held positions are valued from the local price history when it has a price this recent
+VALUATION_MAX_PRICE_AGE_SECONDS = 300
+
 
 class PaperProvider(BrokerProvider):
     """Paper trading provider — mirrors Coinbase single-order constraint."""
@@ -98,11 +102,14 @@ class PaperProvider(BrokerProvider):
                     if symbol in positions:
                         del positions[symbol]
             
-            # Calculate total value
+            # Calculate total value from recent local prices; fetch only what is missing
             total_value = balances.get("USD", 0.0)
+            known_prices = get_price_history().latest(positions, max_age_seconds=VALUATION_MAX_PRICE_AGE_SECONDS)
             for pos_symbol, pos_qty in positions.items():
                 try:
-                    pos_price = get_price(pos_symbol)
+                    pos_price = known_prices.get(pos_symbol)
+                    if pos_price is None:
+                        pos_price = get_price(pos_symbol)
                     total_value += pos_qty * pos_price
                 except Exception:
                     pass
@@ -9,13 +9,13 @@ Lookback interpretation for stocks (EOD data):
 - 1w  = 5 daily closes (trading days)
 """
 import httpx
-import time
 import threading
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from backend.providers.market_data_base import MarketDataProvider
 from backend.services.rate_limiter import get_polygon_rate_limiter
+from backend.core.cache import TTLCache
 from backend.core.logging import get_logger
 from backend.core.config import get_settings
 from backend.core.test_utils import is_pytest
@@ -27,6 +27,9 @@ logger = get_logger(__name__)
 POLYGON_BASE_URL = "https://api.polygon.io"
 REQUEST_TIMEOUT_SECONDS = 15.0
 CACHE_TTL_SECONDS = 3600  # 1 hour (EOD data doesn't change intraday)
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+_candles_cache = TTLCache("polygon_candles", maxsize=2048, ttl=CACHE_TTL_SECONDS, max_bytes=CACHE_MAX_BYTES)
 
 # Lookback interpretation: user's "24h/48h/1w" -> number of EOD closes needed
 LOOKBACK_TO_CLOSES = {
@@ -71,9 +74,8 @@ class PolygonMarketDataProvider(MarketDataProvider):
 
         self.rate_limiter = get_polygon_rate_limiter()
 
-        # In-memory cache: {cache_key: (data, timestamp)}
-        self._cache: Dict[str, Tuple[Any, float]] = {}
-        self._cache_lock = threading.Lock()
+        # In-memory cache, shared by provider instances (keys include the symbol and range)
+        self._cache = _candles_cache
 
         # Stats for observability
         self._stats = {
@@ -365,20 +367,15 @@ class PolygonMarketDataProvider(MarketDataProvider):
 
     def _get_cached(self, key: str) -> Optional[List]:
         """Get from in-memory cache."""
-        with self._cache_lock:
-            if key in self._cache:
-                data, cached_at = self._cache[key]
-                if time.time() - cached_at < CACHE_TTL_SECONDS:
-                    with self._stats_lock:
-                        self._stats["cache_hits"] += 1
-                    return data
-                del self._cache[key]
-        return None
+        data = self._cache.get(key)
+        if data is not None:
+            with self._stats_lock:
+                self._stats["cache_hits"] += 1
+        return data
 
     def _set_cached(self, key: str, data: List):
         """Store in in-memory cache."""
-        with self._cache_lock:
-            self._cache[key] = (data, time.time())
+        self._cache.set(key, data)
 
     def _get_db_cached(self, symbol: str, start: str, end: str) -> Optional[List]:
         """Get candles from DB cache (market_candles table)."""
@@ -430,6 +427,8 @@ class PolygonMarketDataProvider(MarketDataProvider):
                             c["open"], c["high"], c["low"], c["close"], c["volume"]
                         )
                     )
+                from backend.services.candle_rollups import record_candles
+                record_candles(symbol, "1d", candles, conn=conn)
                 conn.commit()
         except Exception as e:
             logger.debug(f"DB cache store failed: {e}")
@@ -0,0 +1,257 @@
+"""Multi-resolution candle rollups and chart downsampling.
+
+``GET /market/candles`` used to read up to 500 raw ``market_candles`` rows of
+any interval, so 1h and 1d candles were mixed and long ranges were cut off.
+Candles are now also kept in ``candle_rollups`` (migration 039), keyed by base
+symbol, resolution and UTC-aligned bucket:
+
+- candle writers call ``record_candles``, which stores the candles at their
+  native resolution and folds each touched bucket up the chain
+  1h -> 4h -> 1d (only the touched parent buckets are recomputed);
+- ``plan_resolutions`` picks the coarsest resolution that still gives a chart
+  about ``target_points / 2`` points over the range, with finer and then
+  coarser resolutions as fallbacks when a level has no data;
+- ``lttb`` (largest-triangle-three-buckets) thins the read down to the target
+  point count while keeping the shape of the close series.
+
+A chart load is normally one primary-key range read. Symbols written before
+the table existed are backfilled from ``market_candles`` on first read.
+"""
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from backend.core.logging import get_logger
+from backend.core.symbols import to_base
+from backend.db.connect import get_canonical_db_path, get_conn
+from backend.services.price_history import Timestamp, to_epoch
+
+logger = get_logger(__name__)
+
+MINUTE, FIVE_MINUTES, HOUR, FOUR_HOURS, DAY = 60, 300, 3600, 14400, 86400
+RESOLUTIONS = (MINUTE, FIVE_MINUTES, HOUR, FOUR_HOURS, DAY)
+
+# Resolution a bucket is folded into (1h -> 4h -> 1d)
+ROLLUP_PARENT = {HOUR: FOUR_HOURS, FOUR_HOURS: DAY}
+
+# Interval labels used by the candle writers (Coinbase granularities, short labels)
+_INTERVAL_SECONDS = {
+    "ONE_MINUTE": MINUTE, "1M": MINUTE,
+    "FIVE_MINUTE": FIVE_MINUTES, "5M": FIVE_MINUTES,
+    "ONE_HOUR": HOUR, "1H": HOUR,
+    "FOUR_HOUR": FOUR_HOURS, "4H": FOUR_HOURS,
+    "ONE_DAY": DAY, "1D": DAY, "24H": DAY,
+}
+
+DEFAULT_TARGET_POINTS = 300
+# Fewer rows than this at a resolution means "no usable data there"
+MIN_POINTS = 5
+
+_UPSERT_NATIVE_SQL = """
+    INSERT INTO candle_rollups (symbol, resolution, bucket_start, open, high, low, close, volume, source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'native')
+    ON CONFLICT(symbol, resolution, bucket_start) DO UPDATE SET
+        open = excluded.open, high = excluded.high, low = excluded.low, close = excluded.close,
+        volume = excluded.volume, source = 'native'
+"""
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO candle_rollups (symbol, resolution, bucket_start, open, high, low, close, volume, source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'rollup')
+    ON CONFLICT(symbol, resolution, bucket_start) DO UPDATE SET
+        open = excluded.open, high = excluded.high, low = excluded.low, close = excluded.close,
+        volume = excluded.volume
+    WHERE candle_rollups.source != 'native'
+"""
+
+
+def interval_seconds(interval: str) -> Optional[int]:
+    """Resolution in seconds for an interval label, or ``None`` if it is not kept."""
+    return _INTERVAL_SECONDS.get((interval or "").strip().upper())
+
+
+def _bucket(ts: int, resolution: int) -> int:
+    return ts - ts % resolution
+
+
+def _roll_up(conn, symbol: str, resolution: int, buckets: Set[int]) -> None:
+    parent = ROLLUP_PARENT.get(resolution)
+    while parent is not None and buckets:
+        parents = {_bucket(b, parent) for b in buckets}
+        for start in sorted(parents):
+            rows = conn.execute(
+                """SELECT open, high, low, close, volume FROM candle_rollups
+                   WHERE symbol = ? AND resolution = ? AND bucket_start >= ? AND bucket_start < ?
+                   ORDER BY bucket_start ASC""",
+                (symbol, resolution, start, start + parent),
+            ).fetchall()
+            if not rows:
+                continue
+            conn.execute(
+                _UPSERT_ROLLUP_SQL,
+                (
+                    symbol, parent, start, rows[0]["open"], max(r["high"] for r in rows),
+                    min(r["low"] for r in rows), rows[-1]["close"], sum(r["volume"] or 0.0 for r in rows),
+                ),
+            )
+        resolution, buckets, parent = parent, parents, ROLLUP_PARENT.get(parent)
+
+
+def record_candles(symbol: str, interval: str, candles: Sequence[dict], conn=None) -> int:
+    """Store candles at their native resolution and update the rollups above it.
+
+    Pass ``conn`` to write inside the caller's transaction (the caller
+    commits). Candles of an interval that is not kept (e.g. 15m) are ignored.
+    """
+    resolution = interval_seconds(interval)
+    if resolution is None:
+        return 0
+    base = to_base(symbol)
+    rows = []
+    for c in candles:
+        try:
+            rows.append((
+                base, resolution, _bucket(to_epoch(c["start_time"]), resolution),
+                float(c["open"]), float(c["high"]), float(c["low"]), float(c["close"]),
+                float(c.get("volume") or 0.0),
+            ))
+        except (KeyError, TypeError, ValueError):
+            continue  # incomplete candle or unparseable timestamp
+    if not rows:
+        return 0
+    if conn is not None:
+        _write(conn, base, resolution, rows)
+    else:
+        with get_conn() as own:
+            _write(own, base, resolution, rows)
+            own.commit()
+    return len(rows)
+
+
+def _write(conn, symbol: str, resolution: int, rows: List[tuple]) -> None:
+    conn.executemany(_UPSERT_NATIVE_SQL, rows)
+    _roll_up(conn, symbol, resolution, {r[2] for r in rows})
+
+
+_backfilled: Set[Tuple[str, str]] = set()
+_backfill_lock = threading.Lock()
+
+
+def backfill_from_market_candles(symbol: str) -> int:
+    """Load a symbol's existing ``market_candles`` rows into the rollups (once per database)."""
+    base = to_base(symbol)
+    key = (get_canonical_db_path(), base)
+    with _backfill_lock:
+        if key in _backfilled:
+            return 0
+        _backfilled.add(key)
+    by_interval: Dict[str, List[dict]] = {}
+    try:
+        with get_conn() as conn:
+            for row in conn.execute(
+                """SELECT interval, start_time, open, high, low, close, volume FROM market_candles
+                   WHERE symbol IN (?, ?) ORDER BY start_time ASC""",
+                (base, f"{base}-USD"),
+            ):
+                by_interval.setdefault(row["interval"], []).append(dict(row))
+            recorded = sum(record_candles(base, interval, rows, conn=conn) for interval, rows in by_interval.items())
+            conn.commit()
+    except Exception as e:
+        with _backfill_lock:
+            _backfilled.discard(key)
+        logger.warning("Candle rollup backfill failed for %s: %s", base, str(e)[:200])
+        return 0
+    return recorded
+
+
+def plan_resolutions(range_seconds: float, target_points: int = DEFAULT_TARGET_POINTS) -> List[int]:
+    """Resolutions to try for a range, best first.
+
+    The first is the coarsest one giving at least ``target_points / 2``
+    points (or the finest, for very short ranges); finer resolutions follow,
+    then coarser ones.
+    """
+    wanted = max(target_points // 2, 1)
+    fitting = [r for r in RESOLUTIONS if range_seconds / r >= wanted]
+    best = fitting[-1] if fitting else RESOLUTIONS[0]
+    i = RESOLUTIONS.index(best)
+    return [best, *reversed(RESOLUTIONS[:i]), *RESOLUTIONS[i + 1:]]
+
+
+def read_range(symbol: str, resolution: int, start: Timestamp, end: Timestamp) -> List[Dict[str, Any]]:
+    """Candles of one resolution with bucket start in ``[start, end]``, oldest first."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            """SELECT bucket_start, open, high, low, close, volume FROM candle_rollups
+               WHERE symbol = ? AND resolution = ? AND bucket_start BETWEEN ? AND ?
+               ORDER BY bucket_start ASC""",
+            (to_base(symbol), resolution, _bucket(to_epoch(start), resolution), to_epoch(end)),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def lttb(points: Sequence[Any], threshold: int, x=lambda p: p[0], y=lambda p: p[1]) -> List[Any]:
+    """Largest-triangle-three-buckets downsampling of ``points`` (sorted by ``x``).
+
+    Keeps the first and last points and, from each of ``threshold - 2``
+    buckets, the point forming the largest triangle with the previously kept
+    point and the average of the next bucket.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = sum(x(p) for p in points[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y(p) for p in points[next_start:next_end]) / (next_end - next_start)
+        ax, ay = x(points[a]), y(points[a])
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y(points[j]) - ay) - (ax - x(points[j])) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def get_chart_candles(
+    symbol: str, start: Timestamp, end: Timestamp, target_points: int = DEFAULT_TARGET_POINTS
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Chart candles for ``[start, end]``: planned resolution, downsampled to ``target_points``.
+
+    Returns ``(candles, plan)``; ``plan`` has the chosen ``resolution`` (or
+    ``None`` when there is no data) and the row count read before downsampling.
+    """
+    backfill_from_market_candles(symbol)
+    range_seconds = to_epoch(end) - to_epoch(start)
+    rows: List[Dict[str, Any]] = []
+    chosen = None
+    for resolution in plan_resolutions(range_seconds, target_points):
+        rows = read_range(symbol, resolution, start, end)
+        if len(rows) >= MIN_POINTS:
+            chosen = resolution
+            break
+    if chosen is None:
+        rows = []
+    sampled = lttb(rows, target_points, x=lambda r: r["bucket_start"], y=lambda r: r["close"])
+    candles = [
+        {
+            "ts": _iso(r["bucket_start"]), "open": r["open"], "high": r["high"], "low": r["low"],
+            "close": r["close"], "volume": r["volume"] or 0.0,
+        }
+        for r in sampled
+    ]
+    return candles, {"resolution": chosen, "rows_read": len(rows)}
+
@@ -8,13 +8,14 @@ Includes production hardening:
 import httpx
 import os
 import sys
-import time
 import random
 import threading
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from backend.services.market_data_provider import get_market_data_provider
+from backend.core.cache import TTLCache
+from backend.core import profiling
 from backend.core.logging import get_logger
 from backend.core.config import get_settings
 from backend.core.symbols import to_product_id
@@ -77,27 +78,20 @@ def reset_api_stats() -> None:
 
 
 # === TTL CACHE FOR PRODUCTS LIST ===
-_products_cache: Dict[str, Tuple[List[Dict], float]] = {}
-_products_cache_lock = threading.Lock()
+_products_cache = TTLCache("coinbase_products", maxsize=8, ttl=PRODUCTS_CACHE_TTL_SECONDS)
 
 
 def _get_cached_products(quote: str) -> Optional[List[Dict]]:
     """Get products from cache if not expired."""
-    with _products_cache_lock:
-        cache_key = f"products_{quote}"
-        if cache_key in _products_cache:
-            products, cached_at = _products_cache[cache_key]
-            if time.time() - cached_at < PRODUCTS_CACHE_TTL_SECONDS:
-                _api_stats.increment("cache_hits")
-                return products
-    return None
+    products = _products_cache.get(f"products_{quote}")
+    if products is not None:
+        _api_stats.increment("cache_hits")
+    return products
 
 
 def _set_cached_products(quote: str, products: List[Dict]) -> None:
     """Store products in cache."""
-    with _products_cache_lock:
-        cache_key = f"products_{quote}"
-        _products_cache[cache_key] = (products, time.time())
+    _products_cache.set(f"products_{quote}", products)
 
 
 # === RETRY WITH EXPONENTIAL BACKOFF ===
@@ -148,7 +142,7 @@ def _fetch_with_retry(
                         _api_stats.increment("retries")
                         wait_time = _calculate_backoff(attempt)
                         logger.warning(f"Rate limited (429) on {url}, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
-                        time.sleep(wait_time)
+                        profiling.sleep(wait_time)
                         continue
                     else:
                         _api_stats.increment("failures")
@@ -160,7 +154,7 @@ def _fetch_with_retry(
                         _api_stats.increment("retries")
                         wait_time = _calculate_backoff(attempt)
                         logger.warning(f"Server error ({response.status_code}) on {url}, retrying in {wait_time:.2f}s")
-                        time.sleep(wait_time)
+                        profiling.sleep(wait_time)
                         continue
                     else:
                         _api_stats.increment("failures")
@@ -179,7 +173,7 @@ def _fetch_with_retry(
                 _api_stats.increment("retries")
                 wait_time = _calculate_backoff(attempt)
                 logger.warning(f"Timeout on {url}, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
+                profiling.sleep(wait_time)
             else:
                 _api_stats.increment("failures")
                 raise
@@ -190,7 +184,7 @@ def _fetch_with_retry(
                 _api_stats.increment("retries")
                 wait_time = _calculate_backoff(attempt)
                 logger.warning(f"Connection error on {url}, retrying in {wait_time:.2f}s")
-                time.sleep(wait_time)
+                profiling.sleep(wait_time)
             else:
                 _api_stats.increment("failures")
                 raise
@@ -2,14 +2,25 @@
 
 This module fetches Coinbase account balances and derives executable quantities.
 It is the source of truth for SELL sizing and sellability checks.
+
+LIVE account snapshots are cached per tenant for a few seconds
+(``EXECUTABLE_STATE_TTL_SECONDS``), so one chat turn (parse, preflight,
+re-preflight, diagnostics) makes one accounts call. Concurrent requests share
+one fetch, our own fills and terminal orders invalidate the snapshot, and
+every fetched snapshot carries a ``version`` that preflight results and
+proposals record. ``get_executable_state`` is the async entry point;
+``fetch_executable_state`` serves synchronous callers from the same cache.
 """
 from __future__ import annotations
 
+import asyncio
+import itertools
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import httpx
 
+from backend.core.cache import TTLCache
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
 from backend.core.time import now_iso
@@ -18,6 +29,14 @@ from backend.providers.coinbase_provider import CoinbaseProvider
 
 logger = get_logger(__name__)
 
+EXECUTABLE_STATE_TTL_SECONDS = 10
+ACCOUNTS_URL = "https://api.coinbase.com"
+ACCOUNTS_PATH = "/api/v3/brokerage/accounts"
+ACCOUNTS_PAGE_LIMIT = 250  # API maximum; the default page (49) silently dropped accounts
+
+_snapshots = TTLCache("executable_state", maxsize=1024, ttl=EXECUTABLE_STATE_TTL_SECONDS)
+_versions = itertools.count(1)
+
 
 @dataclass
 class ExecutableBalance:
@@ -33,6 +52,8 @@ class ExecutableState:
     balances: Dict[str, ExecutableBalance]
     fetched_at: str
     source: str
+    # Increases with every fetch; preflight and proposals record which snapshot they used
+    version: int = 0
 
 
 def _as_float(value: Any) -> float:
@@ -42,52 +63,147 @@ def _as_float(value: Any) -> float:
         return 0.0
 
 
+def _accounts_params(cursor: Optional[str]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"limit": ACCOUNTS_PAGE_LIMIT}
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+
 def _fetch_coinbase_accounts() -> Dict[str, Any]:
+    """All accounts across pages (``{"accounts": [...]}``)."""
+    provider = CoinbaseProvider()
+    accounts: List[Dict[str, Any]] = []
+    cursor = None
+    with httpx.Client(base_url=ACCOUNTS_URL, timeout=8.0) as client:
+        while True:
+            resp = client.get(
+                ACCOUNTS_PATH, headers=provider._get_headers("GET", ACCOUNTS_PATH), params=_accounts_params(cursor)
+            )
+            resp.raise_for_status()
+            page = resp.json()
+            accounts.extend(page.get("accounts", []))
+            cursor = page.get("cursor")
+            if not page.get("has_next") or not cursor:
+                return {"accounts": accounts}
+
+
+async def _fetch_coinbase_accounts_async(transport: Optional[httpx.AsyncBaseTransport] = None) -> Dict[str, Any]:
+    """Async ``_fetch_coinbase_accounts``.
+
+    Pages are cursor-linked, so they are fetched in order; the event loop stays
+    free meanwhile, and concurrent callers share the fetch through the cache.
+    """
     provider = CoinbaseProvider()
-    path = "/api/v3/brokerage/accounts"
-    headers = provider._get_headers("GET", path)
-    with httpx.Client(timeout=8.0) as client:
-        resp = client.get(f"https://api.coinbase.com{path}", headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    accounts: List[Dict[str, Any]] = []
+    cursor = None
+    async with httpx.AsyncClient(base_url=ACCOUNTS_URL, timeout=8.0, transport=transport) as client:
+        while True:
+            resp = await client.get(
+                ACCOUNTS_PATH, headers=provider._get_headers("GET", ACCOUNTS_PATH), params=_accounts_params(cursor)
+            )
+            resp.raise_for_status()
+            page = resp.json()
+            accounts.extend(page.get("accounts", []))
+            cursor = page.get("cursor")
+            if not page.get("has_next") or not cursor:
+                return {"accounts": accounts}
+
+
+def _live_enabled() -> bool:
+    settings = get_settings()
+    return bool(settings.enable_live_trading and settings.coinbase_api_key_name and settings.coinbase_api_private_key)
 
 
-def fetch_executable_state(tenant_id: str) -> ExecutableState:
+def _balance_value(value: Any) -> Any:
+    # Raw API accounts nest amounts as {"value": ...}; get_accounts_detailed flattens them
+    return value.get("value") if isinstance(value, dict) else value
+
+
+def state_from_accounts(accounts: List[Dict[str, Any]], source: str = "coinbase_list_accounts") -> ExecutableState:
+    """Build a versioned ``ExecutableState`` from Coinbase account objects."""
+    balances: Dict[str, ExecutableBalance] = {}
+    for account in accounts:
+        currency = (account.get("currency") or "").upper().strip()
+        if not currency:
+            continue
+        balances[currency] = ExecutableBalance(
+            currency=currency,
+            available_qty=_as_float(_balance_value(account.get("available_balance"))),
+            hold_qty=_as_float(_balance_value(account.get("hold"))),
+            account_uuid=account.get("uuid"),
+            updated_at=account.get("updated_at"),
+        )
+    return ExecutableState(balances=balances, fetched_at=now_iso(), source=source, version=next(_versions))
+
+
+def _load_live_state() -> Optional[ExecutableState]:
+    try:
+        return state_from_accounts(_fetch_coinbase_accounts().get("accounts", []))
+    except Exception as exc:
+        logger.warning("Executable LIVE state fetch failed: %s", str(exc)[:240])
+        return None
+
+
+async def _load_live_state_async() -> Optional[ExecutableState]:
+    try:
+        payload = await _fetch_coinbase_accounts_async()
+        return state_from_accounts(payload.get("accounts", []))
+    except Exception as exc:
+        logger.warning("Executable LIVE state fetch failed: %s", str(exc)[:240])
+        return None
+
+
+def fetch_executable_state(tenant_id: str, refresh: bool = False) -> ExecutableState:
     """Fetch current executable balances.
 
-    LIVE: reads Coinbase List Accounts and derives:
+    LIVE: reads Coinbase List Accounts (all pages) and derives:
       - available_qty from available_balance.value
       - hold_qty from hold.value
+    and serves it from the per-tenant snapshot while fresh (``refresh=True``
+    forces a new fetch).
     FALLBACK: if LIVE fetch is unavailable, derive from latest snapshot.
     """
-    settings = get_settings()
-    fetched_at = now_iso()
+    if _live_enabled():
+        if refresh:
+            _snapshots.pop(tenant_id)
+        state = _snapshots.get_or_load(tenant_id, _load_live_state)
+        if state is not None:
+            return state
+        _snapshots.pop(tenant_id)
+    return _snapshot_fallback_state(tenant_id)
 
-    if settings.enable_live_trading and settings.coinbase_api_key_name and settings.coinbase_api_private_key:
-        try:
-            payload = _fetch_coinbase_accounts()
-            balances: Dict[str, ExecutableBalance] = {}
-            for account in payload.get("accounts", []):
-                currency = (account.get("currency") or "").upper().strip()
-                if not currency:
-                    continue
-                available_qty = _as_float((account.get("available_balance") or {}).get("value"))
-                hold_qty = _as_float((account.get("hold") or {}).get("value"))
-                balances[currency] = ExecutableBalance(
-                    currency=currency,
-                    available_qty=available_qty,
-                    hold_qty=hold_qty,
-                    account_uuid=account.get("uuid"),
-                    updated_at=account.get("updated_at"),
-                )
-            return ExecutableState(
-                balances=balances,
-                fetched_at=fetched_at,
-                source="coinbase_list_accounts",
-            )
-        except Exception as exc:
-            logger.warning("Executable LIVE state fetch failed: %s", str(exc)[:240])
 
+async def get_executable_state(tenant_id: str, refresh: bool = False) -> ExecutableState:
+    """Async ``fetch_executable_state``: never blocks the event loop."""
+    if _live_enabled():
+        if refresh:
+            _snapshots.pop(tenant_id)
+        state = await _snapshots.aget_or_load(tenant_id, _load_live_state_async)
+        if state is not None:
+            return state
+        _snapshots.pop(tenant_id)
+    return await asyncio.to_thread(_snapshot_fallback_state, tenant_id)
+
+
+def invalidate_executable_state(tenant_id: str) -> None:
+    """Drop the tenant's cached snapshot (call after our own orders fill or finish)."""
+    _snapshots.pop(tenant_id)
+
+
+def prime_executable_state(tenant_id: str, accounts: List[Dict[str, Any]]) -> ExecutableState:
+    """Cache a snapshot from accounts fetched elsewhere (e.g. the portfolio node)."""
+    state = state_from_accounts(accounts)
+    _snapshots.set(tenant_id, state)
+    return state
+
+
+def _snapshot_fallback_state(tenant_id: str) -> ExecutableState:
+    """Balances from the latest portfolio snapshot (paper mode / LIVE unavailable).
+
+    Not cached: it is one indexed read and must reflect snapshots written moments ago.
+    """
+    fetched_at = now_iso()
     # Snapshot fallback for compatibility/testing.
     snapshot_balances: Dict[str, ExecutableBalance] = {}
     try:
@@ -124,5 +240,6 @@ def fetch_executable_state(tenant_id: str) -> ExecutableState:
         balances=snapshot_balances,
         fetched_at=fetched_at,
         source="portfolio_snapshot_fallback",
+        version=next(_versions),
     )
 
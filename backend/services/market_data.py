@@ -1,4 +1,7 @@
 """Market data service - uses provider factory with symbol normalization."""
+import asyncio
+from typing import Dict, Iterable, Optional
+
 from backend.core.logging import get_logger
 from backend.services.market_data_provider import get_market_data_provider
 from backend.core.symbols import to_base
@@ -31,7 +34,38 @@ def get_price(symbol: str) -> float:
     
     try:
         # Use provider's get_price method (handles normalization internally)
-        return provider.get_price(symbol)
+        price = provider.get_price(symbol)
     except Exception as e:
         logger.error(f"Price fetch failed for {symbol} (base: {base}): {e}")
         raise MarketDataError(f"Failed to get price for {symbol}: {str(e)}")
+
+    # Feed the local price history (valuation and slippage fallbacks read it)
+    try:
+        from backend.services.price_history import TICKER_MIN_INTERVAL_SECONDS, get_price_history
+        get_price_history().record(symbol, price, defer=True, min_interval_seconds=TICKER_MIN_INTERVAL_SECONDS)
+    except Exception as e:
+        logger.debug("Price history record failed for %s: %s", symbol, str(e)[:100])
+    return price
+
+
+
+async def get_prices(symbols: Iterable[str], max_concurrency: int = 8) -> Dict[str, Optional[float]]:
+    """Prices for several symbols at once, keyed by base asset.
+
+    Each distinct base asset is fetched once (``get_price`` off the event
+    loop, a few at a time); symbols whose price cannot be fetched map to
+    ``None``.
+    """
+    bases = list(dict.fromkeys(to_base(s) for s in symbols if s))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(base: str) -> Optional[float]:
+        async with semaphore:
+            try:
+                price = float(await asyncio.to_thread(get_price, base))
+            except Exception:
+                return None
+        return price if price > 0 else None
+
+    prices = await asyncio.gather(*(_one(b) for b in bases))
+    return dict(zip(bases, prices))
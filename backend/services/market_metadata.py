@@ -6,7 +6,6 @@ Provides robust product metadata fetching from Coinbase with:
 - Structured error reporting
 """
 import asyncio
-import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -14,6 +13,7 @@ from enum import Enum
 
 import httpx
 
+from backend.core import profiling
 from backend.core.logging import get_logger
 from backend.db.connect import get_conn
 from backend.core.time import now_iso
@@ -248,7 +248,7 @@ class MarketMetadataService:
                 if attempt > 0:
                     delay = 2 ** (attempt - 1)
                     logger.info(f"Retrying {product_id} fetch after {delay}s (attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(delay)
+                    await profiling.asleep(delay)
                 
                 async with httpx.AsyncClient(timeout=5.0) as client:
                     # Use provided headers or make unauthenticated request
@@ -458,7 +458,7 @@ class MarketMetadataService:
 
         for attempt in range(max_retries):
             if attempt > 0:
-                time.sleep(2 ** (attempt - 1))
+                profiling.sleep(2 ** (attempt - 1))
 
             try:
                 with httpx.Client(timeout=5.0) as client:
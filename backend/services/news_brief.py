@@ -4,6 +4,7 @@ from typing import List, Dict, Any
 from backend.db.connect import get_conn
 from backend.core.logging import get_logger
 from backend.core.ids import new_id
+from backend.services.retrieval_index import search_news_for_symbols
 
 logger = get_logger(__name__)
 
@@ -32,7 +33,12 @@ class NewsBriefService:
             cursor = conn.cursor()
             
             for asset in assets:
-                # Get relevant items
+                rows = self._indexed_rows(asset, since, ref_time.isoformat())
+                if rows:
+                    self._process_rows_into_brief(cursor, run_id, asset, rows, brief)
+                    continue
+
+                # Not indexed yet: fall back to the mentions join
                 cursor.execute(
                     """
                     SELECT i.*, m.confidence 
@@ -54,6 +60,16 @@ class NewsBriefService:
             
         return brief
 
+    def _indexed_rows(self, asset: str, since: str, until: str) -> List[Dict[str, Any]]:
+        """Latest indexed news rows for an asset inside the window (empty if none indexed)."""
+        try:
+            result = search_news_for_symbols([asset], since=since, until=until, limit=10)
+        except Exception as e:
+            logger.debug("Retrieval index lookup failed for %s: %s", asset, e)
+            return []
+        # published_at bounds: the legacy query is exclusive on the lower bound
+        return [h.to_dict() for h in result.hits if h.published_at > since]
+
     def create_brief_from_source(self, run_id: str, source_run_id: str) -> Dict[str, Any]:
         """
         Recreate a news brief using EXACTLY the evidence from a source run.
@@ -7,6 +7,7 @@ from backend.core.logging import get_logger
 from backend.core.ids import new_id
 from backend.providers.news import RSSProvider, GDELTProvider
 from backend.services.news_mapping import NewsMappingService
+from backend.services.retrieval_index import index_news_item
 
 logger = get_logger(__name__)
 
@@ -89,13 +90,17 @@ class NewsIngestionService:
         try:
             items = []
             if source_type == "rss":
-                items = await self.rss_provider.fetch(source_id, url)
+                # Conditional GET when the previous fetch returned validators
+                validators = {k: source[k] for k in ("etag", "last_modified") if source.get(k)}
+                items = await self.rss_provider.fetch(source_id, url, **validators)
             elif source_type == "gdelt":
                 items = await self.gdelt_provider.search(source_id, query=url)
 
             status_record["latency_ms"] = int((_time.time() - t0) * 1000)
 
-            if not items:
+            if getattr(items, "not_modified", False):
+                status_record["status"] = "not_modified"
+            elif not items:
                 status_record["status"] = "empty"
                 status_record["items_count"] = 0
             else:
@@ -109,21 +114,29 @@ class NewsIngestionService:
             status_record["error"] = str(e)[:200]
             logger.error("Ingestion error for %s: %s", source_name, str(e)[:200])
 
-        # Log to news_fetch_log table
+        # Log to news_fetch_log table and remember the feed's validators
         try:
             from backend.core.time import now_iso
+            ts = now_iso()
             with get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """INSERT INTO news_fetch_log
-                       (fetch_id, run_id, provider, status, items_count, latency_ms, error, ts)
-                       VALUES (?,?,?,?,?,?,?,?)""",
+                       (fetch_id, run_id, provider, source_id, status, items_count, latency_ms, error, ts)
+                       VALUES (?,?,?,?,?,?,?,?,?)""",
                     (
-                        new_id("nfl"), run_id, status_record["provider"],
+                        new_id("nfl"), run_id, status_record["provider"], source_id,
                         status_record["status"], status_record["items_count"],
-                        status_record["latency_ms"], status_record["error"], now_iso(),
+                        status_record["latency_ms"], status_record["error"], ts,
                     ),
                 )
+                if status_record["status"] == "error":
+                    cursor.execute("UPDATE news_sources SET last_fetched_at = ? WHERE id = ?", (ts, source_id))
+                else:
+                    cursor.execute(
+                        "UPDATE news_sources SET last_fetched_at = ?, etag = ?, last_modified = ? WHERE id = ?",
+                        (ts, getattr(items, "etag", None), getattr(items, "last_modified", None), source_id),
+                    )
                 conn.commit()
         except Exception:
             pass  # Non-critical logging
@@ -175,6 +188,16 @@ class NewsIngestionService:
                         (item_id, mention["asset_symbol"], mention["confidence"], mention["method"])
                     )
 
+                # Keep the retrieval index in step with news_items (same transaction)
+                try:
+                    index_news_item(
+                        conn,
+                        {**item, "id": item_id},
+                        [m["asset_symbol"] for m in mentions],
+                    )
+                except Exception as e:
+                    logger.warning("Retrieval indexing failed for %s (non-fatal): %s", item_id, str(e)[:200])
+
                 new_count += 1
             
             conn.commit()
@@ -0,0 +1,151 @@
+"""Scheduled, incremental news ingestion.
+
+News used to be ingested once at startup and then only on demand. The
+scheduler runs on its own background loop and, every tick, ingests the
+enabled sources whose ``next_fetch_at`` has passed. RSS sources are fetched
+with the ETag / Last-Modified validators stored on ``news_sources``, so an
+unchanged feed costs a 304 instead of a full download.
+
+The next fetch time comes from the source's ``fetch_interval_seconds`` (or
+the configured default) stretched by its recent ``news_fetch_log`` history:
+consecutive errors back off exponentially, and feeds that keep returning
+nothing new are polled progressively less often, up to 4x the base interval.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.core.background_loop import BackgroundLoop
+from backend.core.logging import get_logger
+from backend.db.connect import get_conn
+
+logger = get_logger(__name__)
+
+TICK_SECONDS = 30
+MIN_INTERVAL_SECONDS = 60
+MAX_INTERVAL_SECONDS = 6 * 3600
+# Statuses looked at when stretching the interval
+HISTORY_WINDOW = 8
+IDLE_STATUSES = ("not_modified", "empty")
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def next_interval(base_seconds: float, recent_statuses: Sequence[str]) -> float:
+    """Seconds until the next fetch, given the source's statuses newest first."""
+    base = max(MIN_INTERVAL_SECONDS, base_seconds)
+    errors = 0
+    for status in recent_statuses:
+        if status != "error":
+            break
+        errors += 1
+    if errors:
+        return min(base * 2 ** errors, MAX_INTERVAL_SECONDS)
+    idle = 0
+    for status in recent_statuses:
+        if status not in IDLE_STATUSES:
+            break
+        idle += 1
+    return min(base * (1 + 0.5 * idle), base * 4, MAX_INTERVAL_SECONDS)
+
+
+class NewsIngestionScheduler:
+    """Ingests due news sources periodically on a dedicated loop."""
+
+    def __init__(self, service=None, default_interval: Optional[int] = None, tick_seconds: float = TICK_SECONDS):
+        if service is None:
+            from backend.services.news_ingestion import NewsIngestionService
+            service = NewsIngestionService()
+        if default_interval is None:
+            from backend.core.config import get_settings
+            default_interval = get_settings().news_fetch_interval_seconds
+        self.service = service
+        self.default_interval = default_interval
+        self.tick_seconds = tick_seconds
+        self._loop = BackgroundLoop("news-ingest")
+        self._task = None
+        self._stopping = False
+
+    def due_sources(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        now_str = _iso(now or datetime.now(timezone.utc))
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT * FROM news_sources
+                   WHERE is_enabled = 1 AND (next_fetch_at IS NULL OR next_fetch_at <= ?)""",
+                (now_str,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Ingest every due source once and schedule its next fetch."""
+        sources = self.due_sources(now)
+        if not sources:
+            return {"total_new": 0, "provider_statuses": [], "sources_checked": 0}
+
+        results = await asyncio.gather(
+            *(self.service._ingest_source_with_status(source) for source in sources),
+            return_exceptions=True,
+        )
+        statuses = []
+        total_new = 0
+        for source, res in zip(sources, results):
+            if isinstance(res, Exception):
+                logger.error("Scheduled ingestion failed for %s: %s", source["id"], str(res)[:200])
+                res = {"source_id": source["id"], "status": "error", "items_count": 0, "error": str(res)[:200]}
+            statuses.append(res)
+            total_new += res.get("items_count", 0)
+            self._schedule_next(source, now)
+
+        if total_new:
+            await asyncio.to_thread(self.service._cluster_recent_items)
+            logger.info("Scheduled news ingestion added %d item(s) from %d source(s)", total_new, len(sources))
+        return {"total_new": total_new, "provider_statuses": statuses, "sources_checked": len(sources)}
+
+    def _schedule_next(self, source: Dict[str, Any], now: Optional[datetime] = None) -> str:
+        base = source.get("fetch_interval_seconds") or self.default_interval
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT status FROM news_fetch_log WHERE source_id = ? ORDER BY ts DESC LIMIT ?",
+                (source["id"], HISTORY_WINDOW),
+            )
+            history = [row["status"] for row in cursor.fetchall()]
+            delay = next_interval(base, history)
+            next_at = _iso((now or datetime.now(timezone.utc)) + timedelta(seconds=delay))
+            cursor.execute("UPDATE news_sources SET next_fetch_at = ? WHERE id = ?", (next_at, source["id"]))
+            conn.commit()
+        return next_at
+
+    async def _run_forever(self) -> None:
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning("News scheduler tick failed (non-fatal): %s", str(e)[:200])
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._task = self._loop.submit(self._run_forever())
+        logger.info("News ingestion scheduler started (default interval %ds)", self.default_interval)
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+_scheduler: Optional[NewsIngestionScheduler] = None
+
+
+def get_news_scheduler() -> NewsIngestionScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = NewsIngestionScheduler()
+    return _scheduler
@@ -0,0 +1,390 @@
+"""Async order lifecycle tracking for LIVE Coinbase orders.
+
+``CoinbaseProvider._poll_order_until_terminal`` used to block the calling
+thread with ``time.sleep`` for up to 30s per order, writing an
+``order_events`` row on every poll and fetching fills only after the order
+was terminal. Multi-leg runs serialized those waits.
+
+``OrderTracker`` watches any number of in-flight orders concurrently on the
+event loop:
+
+- poll intervals adapt: they reset to ``min_interval`` whenever the order
+  makes progress (status change or new fills) and back off geometrically up
+  to ``max_interval`` while it is idle;
+- ``orders`` / ``order_events`` are written only on an actual status
+  transition;
+- fills are fetched as soon as the exchange reports partial/complete fills,
+  deduplicated by ``trade_id``, stored, and pushed to ``event_pubsub`` as
+  ``ORDER_FILL`` events so SSE clients see them immediately.
+
+``CoinbaseOrderClient`` is the async HTTP side (same endpoints and JWT
+headers as the provider); tests point it at a local stand-in through an
+``httpx`` transport.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from backend.core.ids import new_id
+from backend.core import profiling
+from backend.core.logging import get_logger
+from backend.core.time import now_iso
+from backend.db.connect import get_conn
+from backend.orchestrator.state_machine import TERMINAL_ORDER_STATUSES
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = frozenset(s.value for s in TERMINAL_ORDER_STATUSES) | {"CANCELLED"}
+# Exchange states in which fills may already exist
+FILLING_STATUSES = frozenset({"PARTIALLY_FILLED", "FILLED"})
+
+Publish = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def _order_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Historical-order responses nest the order under ``order``; accept both shapes."""
+    nested = data.get("order")
+    return nested if isinstance(nested, dict) else data
+
+
+class CoinbaseOrderClient:
+    """Async client for the Coinbase order status and fills endpoints."""
+
+    HOST = "https://api.coinbase.com"
+    ORDER_PATH = "/api/v3/brokerage/orders/historical/{order_id}"
+    FILLS_PATH = "/api/v3/brokerage/orders/historical/fills"
+
+    def __init__(
+        self,
+        headers_fn: Callable[[str, str], Dict[str, str]],
+        base_url: str = HOST,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = 5.0,
+        max_attempts: int = 3,
+    ):
+        self._headers_fn = headers_fn
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout, transport=transport)
+        self._max_attempts = max_attempts
+
+    @classmethod
+    def for_provider(cls, provider, **kwargs) -> "CoinbaseOrderClient":
+        """Build a client that signs requests with ``provider``'s JWT credentials."""
+        return cls(provider._get_headers, **kwargs)
+
+    async def _get(self, path: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        for attempt in range(1, self._max_attempts + 1):
+            response = await self._client.get(path, headers=self._headers_fn("GET", path), params=params)
+            if response.status_code == 429 and attempt < self._max_attempts:
+                await profiling.asleep(0.5 * (2 ** (attempt - 1)))
+                continue
+            response.raise_for_status()
+            return response.json()
+        return {}
+
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        data = await self._get(self.ORDER_PATH.format(order_id=order_id))
+        return _order_payload(data) if data else None
+
+    async def get_fills(self, order_id: str) -> List[Dict[str, Any]]:
+        data = await self._get(self.FILLS_PATH, params={"order_id": order_id})
+        return list(data.get("fills", []))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+@dataclass
+class TrackedOrder:
+    """An order placed on the exchange that still needs a terminal status."""
+    order_id: str
+    tenant_id: str
+    run_id: Optional[str] = None
+    node_id: Optional[str] = None
+    # Status already persisted for this order (transitions are relative to it)
+    status: Optional[str] = "SUBMITTED"
+
+
+@dataclass
+class TrackResult:
+    order_id: str
+    status: str
+    transitions: List[str] = field(default_factory=list)
+    fills: List[Dict[str, Any]] = field(default_factory=list)
+    polls: int = 0
+    elapsed_s: float = 0.0
+    ended: str = "TERMINAL"  # TERMINAL | TIMEOUT | POLL_FAILED
+
+    @property
+    def terminal(self) -> bool:
+        return self.ended == "TERMINAL"
+
+
+class OrderTracker:
+    """Concurrently poll in-flight orders until they reach a terminal status."""
+
+    def __init__(
+        self,
+        client: CoinbaseOrderClient,
+        min_interval: float = 0.25,
+        max_interval: float = 2.0,
+        backoff: float = 1.6,
+        timeout_seconds: float = 30.0,
+        max_consecutive_errors: int = 5,
+        publish: Optional[Publish] = None,
+        redact: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.timeout_seconds = timeout_seconds
+        self.max_consecutive_errors = max_consecutive_errors
+        self._publish = publish
+        self._redact = redact or (lambda data: data)
+
+    async def track_many(self, orders: Iterable[TrackedOrder]) -> Dict[str, TrackResult]:
+        """Track all ``orders`` at once; the wall time is bounded by the slowest one."""
+        orders = list(orders)
+        results = await asyncio.gather(*(self.track(o) for o in orders))
+        return {r.order_id: r for r in results}
+
+    async def track(self, order: TrackedOrder) -> TrackResult:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout_seconds
+        result = TrackResult(order_id=order.order_id, status=(order.status or "SUBMITTED").upper())
+        seen_trade_ids = stored_trade_ids(order.order_id)
+        last_filled = None
+        interval = self.min_interval
+        errors = 0
+
+        while True:
+            progressed = False
+            try:
+                data = await self.client.get_order(order.order_id)
+            except Exception as e:
+                data = None
+                logger.warning("Error polling order %s: %s", order.order_id, str(e)[:200])
+
+            if not data:
+                errors += 1
+                if errors >= self.max_consecutive_errors:
+                    result.ended = "POLL_FAILED"
+                    break
+            else:
+                errors = 0
+                result.polls += 1
+                status = str(data.get("status") or "").upper()
+                if status and status != result.status:
+                    _record_transition(order.order_id, status, data, self._redact(data))
+                    result.transitions.append(status)
+                    result.status = status
+                    progressed = True
+                    await self._emit(order, "ORDER_STATUS", {"order_id": order.order_id, "status": status})
+
+                filled = data.get("filled_size")
+                if status in FILLING_STATUSES or (filled not in (None, "", "0") and filled != last_filled):
+                    new_fills = await self._collect_fills(order, seen_trade_ids)
+                    result.fills.extend(new_fills)
+                    progressed = progressed or bool(new_fills)
+                last_filled = filled
+
+                if status in TERMINAL_STATUSES:
+                    if status == "FILLED":
+                        _update_fill_aggregates(order.order_id)
+                    _invalidate_balances(order.tenant_id)  # holds are released either way
+                    break
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                result.ended = "TIMEOUT"
+                break
+            interval = self.min_interval if progressed else min(self.max_interval, interval * self.backoff)
+            await asyncio.sleep(min(interval, remaining))
+
+        result.elapsed_s = loop.time() - started
+        if not result.terminal:
+            logger.warning(
+                "Order %s tracking ended: %s (last status: %s)", order.order_id, result.ended, result.status
+            )
+            _record_tracking_end(order.order_id, result.ended, had_status=bool(result.transitions or result.polls))
+        return result
+
+    async def _collect_fills(self, order: TrackedOrder, seen_trade_ids: set) -> List[Dict[str, Any]]:
+        try:
+            fills = await self.client.get_fills(order.order_id)
+        except Exception as e:
+            logger.warning("Error fetching fills for %s: %s", order.order_id, str(e)[:200])
+            return []
+        new_fills = []
+        for fill in fills:
+            key = fill.get("trade_id") or fill.get("entry_id") or json.dumps(fill, sort_keys=True)
+            if key in seen_trade_ids:
+                continue
+            seen_trade_ids.add(key)
+            new_fills.append(fill)
+        if new_fills:
+            store_fills(order, new_fills)
+            for fill in new_fills:
+                await self._emit(order, "ORDER_FILL", {
+                    "order_id": order.order_id,
+                    "trade_id": fill.get("trade_id"),
+                    "product_id": fill.get("product_id"),
+                    "price": float(fill.get("price", 0) or 0),
+                    "size": float(fill.get("size", 0) or 0),
+                    "fee": float(fill.get("commission", 0) or 0),
+                })
+        return new_fills
+
+    async def _emit(self, order: TrackedOrder, event_type: str, payload: Dict[str, Any]) -> None:
+        if not self._publish or not order.run_id:
+            return
+        try:
+            await self._publish(order.run_id, {"event_type": event_type, "payload": payload, "ts": now_iso()})
+        except Exception as e:
+            logger.warning("Failed to publish %s for %s: %s", event_type, order.order_id, e)
+
+
+# ---------------------------------------------------------------------------
+# Persistence (one short transaction per transition / fill batch)
+# ---------------------------------------------------------------------------
+
+def stored_trade_ids(order_id: str) -> set:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT trade_id FROM fills WHERE order_id = ? AND trade_id IS NOT NULL", (order_id,))
+        return {row["trade_id"] for row in cursor.fetchall() if row["trade_id"]}
+
+
+def _record_transition(order_id: str, status: str, data: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    ts = now_iso()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE orders SET status = ?, status_updated_at = ?, status_reason = ? WHERE order_id = ?",
+            (status, ts, data.get("reject_reason") or data.get("reason", ""), order_id),
+        )
+        cursor.execute(
+            "INSERT INTO order_events (id, order_id, event_type, payload_json, ts) VALUES (?, ?, ?, ?, ?)",
+            (new_id("evt_"), order_id, status, json.dumps(payload), ts),
+        )
+        conn.commit()
+
+
+def store_fills(order: TrackedOrder, fills: List[Dict[str, Any]]) -> None:
+    ts = now_iso()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """INSERT INTO fills (
+                   fill_id, order_id, run_id, tenant_id, product_id,
+                   price, size, fee, trade_id, liquidity_indicator, filled_at
+               ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    new_id("fill_"), order.order_id, order.run_id, order.tenant_id,
+                    f.get("product_id", ""), float(f.get("price", 0) or 0), float(f.get("size", 0) or 0),
+                    float(f.get("commission", 0) or 0), f.get("trade_id", ""),
+                    str(f.get("liquidity_indicator") or f.get("liquidity") or "").upper(),
+                    f.get("trade_time") or ts,
+                )
+                for f in fills
+            ],
+        )
+        conn.commit()
+    _update_fill_aggregates(order.order_id)
+    _invalidate_balances(order.tenant_id)
+
+
+def _invalidate_balances(tenant_id: str) -> None:
+    """Our own fills change executable balances; drop the cached account snapshot."""
+    from backend.services.executable_state import invalidate_executable_state
+    invalidate_executable_state(tenant_id)
+
+
+def _update_fill_aggregates(order_id: str) -> None:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT SUM(size) AS qty, SUM(price * size) AS notional, SUM(fee) AS fees FROM fills WHERE order_id = ?",
+            (order_id,),
+        )
+        row = cursor.fetchone()
+        qty = float(row["qty"] or 0.0)
+        if qty <= 0:
+            return
+        cursor.execute(
+            "UPDATE orders SET filled_qty = ?, avg_fill_price = ?, total_fees = ? WHERE order_id = ?",
+            (qty, float(row["notional"] or 0.0) / qty, float(row["fees"] or 0.0), order_id),
+        )
+        conn.commit()
+
+
+def _record_tracking_end(order_id: str, ended: str, had_status: bool) -> None:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        if had_status:
+            cursor.execute(
+                "UPDATE orders SET status_updated_at = ?, status_reason = ? WHERE order_id = ?",
+                (now_iso(), f"Polling ended: {ended}", order_id),
+            )
+        else:
+            cursor.execute(
+                "UPDATE orders SET status = ?, status_updated_at = ? WHERE order_id = ?",
+                ("SUBMITTED", now_iso(), order_id),
+            )
+        conn.commit()
+
+
+# ---------------------------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------------------------
+
+async def track_orders(
+    provider,
+    orders: Iterable[TrackedOrder],
+    timeout_seconds: float = 30.0,
+    publish: Optional[Publish] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, TrackResult]:
+    """Track ``orders`` placed through ``provider`` concurrently (publishing to ``event_pubsub`` by default)."""
+    if publish is None:
+        from backend.orchestrator.event_pubsub import event_pubsub
+        publish = event_pubsub.publish
+    client = CoinbaseOrderClient.for_provider(provider, transport=transport)
+    try:
+        tracker = OrderTracker(
+            client, timeout_seconds=timeout_seconds, publish=publish, redact=provider._redact_sensitive
+        )
+        return await tracker.track_many(orders)
+    finally:
+        await client.aclose()
+
+
+def track_order_blocking(
+    provider, order: TrackedOrder, timeout_seconds: float = 30.0, max_interval: float = 2.0
+) -> TrackResult:
+    """Synchronous wrapper for callers outside the event loop (legacy provider path).
+
+    Runs the tracker on the shared background loop; ``event_pubsub`` hands
+    the published fills over to the SSE subscribers' loop.
+    """
+    from backend.core.background_loop import get_background_loop
+    from backend.orchestrator.event_pubsub import event_pubsub
+
+    async def _run():
+        client = CoinbaseOrderClient.for_provider(provider)
+        try:
+            tracker = OrderTracker(
+                client, max_interval=max_interval, timeout_seconds=timeout_seconds,
+                publish=event_pubsub.publish, redact=provider._redact_sensitive,
+            )
+            return await tracker.track(order)
+        finally:
+            await client.aclose()
+
+    return get_background_loop().run(_run())
@@ -0,0 +1,215 @@
+"""Incremental PnL and drawdown ledger.
+
+Analytics used to rebuild drawdown and daily PnL from every
+``portfolio_snapshots`` row (and every order) of a tenant on each request.
+The ledger folds new rows into running totals instead:
+
+- snapshots are applied in insertion order (``last_snapshot_rowid`` cursor),
+  updating the running peak, drawdown and the day's bucket in ``pnl_daily``;
+- filled orders with ``ledger_applied = 0`` are applied once, updating trade
+  counts, fees and average-cost positions (realized PnL on sells).
+
+``sync_ledger`` does the folding. The post-trade node calls it after writing
+its snapshot, and the analytics endpoints call it before reading, so a read
+only ever processes the rows written since the previous sync. Syncs take an
+immediate write lock, so concurrent syncs of the same tenant serialize.
+"""
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from backend.core.logging import get_logger
+from backend.core.symbols import to_base
+from backend.core.time import now_iso
+from backend.db.connect import get_conn
+
+logger = get_logger(__name__)
+
+# Rows folded per query while catching up on a large backlog
+SYNC_BATCH_SIZE = 1000
+
+
+def _drawdown_pct(peak: float, value: float) -> float:
+    return (peak - value) / peak * 100 if peak > 0 else 0.0
+
+
+def _load_state(cursor: sqlite3.Cursor, tenant_id: str) -> Dict[str, Any]:
+    cursor.execute("SELECT * FROM pnl_ledger_state WHERE tenant_id = ?", (tenant_id,))
+    row = cursor.fetchone()
+    if row:
+        return dict(row)
+    return {
+        "tenant_id": tenant_id, "last_snapshot_rowid": 0, "first_value": None, "current_value": None,
+        "peak_value": 0.0, "drawdown_pct": 0.0, "max_drawdown_pct": 0.0, "realized_pnl": 0.0,
+        "fees": 0.0, "trades_count": 0, "last_snapshot_ts": None,
+    }
+
+
+def _save_state(cursor: sqlite3.Cursor, state: Dict[str, Any]) -> None:
+    cursor.execute(
+        """INSERT OR REPLACE INTO pnl_ledger_state (
+               tenant_id, last_snapshot_rowid, first_value, current_value, peak_value, drawdown_pct,
+               max_drawdown_pct, realized_pnl, fees, trades_count, last_snapshot_ts, updated_at
+           ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            state["tenant_id"], state["last_snapshot_rowid"], state["first_value"], state["current_value"],
+            state["peak_value"], state["drawdown_pct"], state["max_drawdown_pct"], state["realized_pnl"],
+            state["fees"], state["trades_count"], state["last_snapshot_ts"], now_iso(),
+        ),
+    )
+
+
+def _ensure_day(cursor: sqlite3.Cursor, tenant_id: str, day: str) -> None:
+    cursor.execute("INSERT OR IGNORE INTO pnl_daily (tenant_id, day) VALUES (?, ?)", (tenant_id, day))
+
+
+def _apply_snapshots(cursor: sqlite3.Cursor, state: Dict[str, Any]) -> int:
+    applied = 0
+    while True:
+        cursor.execute(
+            """SELECT rowid, total_value_usd, ts FROM portfolio_snapshots
+               WHERE tenant_id = ? AND rowid > ? ORDER BY rowid ASC LIMIT ?""",
+            (state["tenant_id"], state["last_snapshot_rowid"], SYNC_BATCH_SIZE),
+        )
+        rows = cursor.fetchall()
+        for row in rows:
+            value = float(row["total_value_usd"] or 0.0)
+            ts = row["ts"] or now_iso()
+            if state["first_value"] is None:
+                state["first_value"] = value
+            state["peak_value"] = max(state["peak_value"], value)
+            drawdown = _drawdown_pct(state["peak_value"], value)
+            state.update(
+                current_value=value, drawdown_pct=drawdown, last_snapshot_rowid=row["rowid"],
+                max_drawdown_pct=max(state["max_drawdown_pct"], drawdown), last_snapshot_ts=ts,
+            )
+            day = ts[:10]
+            _ensure_day(cursor, state["tenant_id"], day)
+            cursor.execute(
+                """UPDATE pnl_daily SET
+                       start_value = COALESCE(start_value, ?), end_value = ?, last_ts = ?,
+                       peak_value = ?, drawdown_pct = ?, max_drawdown_pct = MAX(max_drawdown_pct, ?),
+                       snapshots_count = snapshots_count + 1
+                   WHERE tenant_id = ? AND day = ?""",
+                (value, value, ts, state["peak_value"], drawdown, drawdown, state["tenant_id"], day),
+            )
+        applied += len(rows)
+        if len(rows) < SYNC_BATCH_SIZE:
+            return applied
+
+
+def _apply_orders(cursor: sqlite3.Cursor, state: Dict[str, Any]) -> int:
+    tenant_id = state["tenant_id"]
+    applied = 0
+    while True:
+        cursor.execute(
+            """SELECT order_id, symbol, side, notional_usd, filled_qty, qty, avg_fill_price,
+                      total_fees, created_at
+               FROM orders
+               WHERE tenant_id = ? AND status = 'FILLED' AND ledger_applied = 0
+               ORDER BY COALESCE(status_updated_at, created_at) ASC LIMIT ?""",
+            (tenant_id, SYNC_BATCH_SIZE),
+        )
+        rows = cursor.fetchall()
+        for row in rows:
+            symbol = to_base(row["symbol"] or "")
+            notional = float(row["notional_usd"] or 0.0)
+            fees = float(row["total_fees"] or 0.0)
+            qty = float(row["filled_qty"] or row["qty"] or 0.0)
+            price = float(row["avg_fill_price"] or 0.0)
+            value = qty * price if qty and price else notional
+
+            cursor.execute(
+                "SELECT qty, cost_basis FROM pnl_positions WHERE tenant_id = ? AND symbol = ?",
+                (tenant_id, symbol),
+            )
+            pos = cursor.fetchone()
+            pos_qty, cost = (float(pos["qty"]), float(pos["cost_basis"])) if pos else (0.0, 0.0)
+            realized = 0.0
+            if (row["side"] or "").upper().endswith("SELL"):
+                sold = min(qty, pos_qty) if pos_qty > 0 else 0.0
+                avg_cost = cost / pos_qty if pos_qty > 0 else 0.0
+                realized = (value * (sold / qty) if qty else 0.0) - avg_cost * sold - fees
+                pos_qty, cost = pos_qty - sold, cost - avg_cost * sold
+            else:
+                pos_qty, cost = pos_qty + qty, cost + value + fees
+            cursor.execute(
+                """INSERT OR REPLACE INTO pnl_positions (tenant_id, symbol, qty, cost_basis)
+                   VALUES (?, ?, ?, ?)""",
+                (tenant_id, symbol, max(pos_qty, 0.0), max(cost, 0.0)),
+            )
+
+            day = (row["created_at"] or now_iso())[:10]
+            _ensure_day(cursor, tenant_id, day)
+            cursor.execute(
+                """UPDATE pnl_daily SET trades_count = trades_count + 1, traded_notional = traded_notional + ?,
+                       realized_pnl = realized_pnl + ?, fees = fees + ?
+                   WHERE tenant_id = ? AND day = ?""",
+                (notional, realized, fees, tenant_id, day),
+            )
+            cursor.execute("UPDATE orders SET ledger_applied = 1 WHERE order_id = ?", (row["order_id"],))
+            state["realized_pnl"] += realized
+            state["fees"] += fees
+            state["trades_count"] += 1
+        applied += len(rows)
+        if len(rows) < SYNC_BATCH_SIZE:
+            return applied
+
+
+def sync_ledger(tenant_id: str) -> Dict[str, int]:
+    """Fold snapshots and filled orders written since the last sync into the ledger."""
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            state = _load_state(cursor, tenant_id)
+            snapshots = _apply_snapshots(cursor, state)
+            orders = _apply_orders(cursor, state)
+            if snapshots or orders:
+                _save_state(cursor, state)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return {"snapshots": snapshots, "orders": orders}
+
+
+def sync_ledger_safe(tenant_id: str) -> None:
+    """``sync_ledger`` for hooks on the write path: failures are logged, not raised."""
+    try:
+        sync_ledger(tenant_id)
+    except Exception as e:
+        logger.warning("PnL ledger sync failed for %s (non-fatal): %s", tenant_id, str(e)[:200])
+
+
+def get_ledger_state(tenant_id: str) -> Optional[Dict[str, Any]]:
+    with get_conn() as conn:
+        row = conn.execute("SELECT * FROM pnl_ledger_state WHERE tenant_id = ?", (tenant_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def get_daily(tenant_id: str, since_day: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Daily buckets (oldest first), optionally from ``since_day`` (YYYY-MM-DD) on."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT * FROM pnl_daily WHERE tenant_id = ? AND day >= ? ORDER BY day ASC",
+            (tenant_id, since_day or ""),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_positions(tenant_id: str) -> Dict[str, Dict[str, float]]:
+    """Open average-cost positions: ``{symbol: {"qty", "cost_basis"}}``."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT symbol, qty, cost_basis FROM pnl_positions WHERE tenant_id = ? AND qty > 0", (tenant_id,)
+        ).fetchall()
+    return {r["symbol"]: {"qty": r["qty"], "cost_basis": r["cost_basis"]} for r in rows}
+
+
+def unrealized_pnl(tenant_id: str) -> float:
+    """Open positions marked at the latest local price; symbols without one are skipped."""
+    from backend.services.price_history import get_price_history
+
+    positions = get_positions(tenant_id)
+    prices = get_price_history().latest(positions)
+    return sum((p["qty"] * prices[s] - p["cost_basis"] for s, p in positions.items() if s in prices), 0.0)
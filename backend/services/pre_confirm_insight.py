@@ -10,13 +10,13 @@ import asyncio
 import json
 import os
 import re
-import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 from typing import Literal
 
+from backend.core.cache import TTLCache
 from backend.core.logging import get_logger
 from backend.services.news_evidence import (
     build_market_news_evidence,
@@ -53,11 +53,18 @@ class InsightSchema(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# In-memory TTL cache (60s)
+# In-memory TTL cache (60s, served stale for up to 2 more minutes while refreshing)
 # ---------------------------------------------------------------------------
 
-_insight_cache: Dict[str, Tuple[dict, float]] = {}
 CACHE_TTL = 60
+CACHE_STALE_TTL = 120
+_insight_cache = TTLCache(
+    "pre_confirm_insight", maxsize=512, ttl=CACHE_TTL, max_bytes=8 * 1024 * 1024, stale_ttl=CACHE_STALE_TTL
+)
+
+
+def _notional_bucket(notional_usd: float) -> float:
+    return round(notional_usd, -1) if notional_usd >= 10 else round(notional_usd, 0)
 
 
 def _cache_key(
@@ -67,27 +74,20 @@ def _cache_key(
     mode: str,
     news_enabled: bool,
     lookback_hours: int = 24,
+    asset_class: str = "CRYPTO",
 ) -> str:
-    notional_bucket = round(notional_usd, -1) if notional_usd >= 10 else round(notional_usd, 0)
-    return f"{symbol}:{side}:{notional_bucket}:{mode}:{news_enabled}:{lookback_hours}"
+    return (
+        f"{symbol.upper()}:{side.upper()}:{_notional_bucket(notional_usd)}:{mode.upper()}:"
+        f"{news_enabled}:{lookback_hours}:{asset_class.upper()}"
+    )
 
 
 def _cache_get(key: str) -> Optional[dict]:
-    if key in _insight_cache:
-        data, ts = _insight_cache[key]
-        if time.time() - ts < CACHE_TTL:
-            return data
-        del _insight_cache[key]
-    return None
+    return _insight_cache.get(key)
 
 
 def _cache_set(key: str, data: dict) -> None:
-    _insight_cache[key] = (data, time.time())
-    # Evict old entries to prevent memory leak
-    now = time.time()
-    stale = [k for k, (_, t) in _insight_cache.items() if now - t > CACHE_TTL * 3]
-    for k in stale:
-        _insight_cache.pop(k, None)
+    _insight_cache.set(key, data)
 
 
 # ---------------------------------------------------------------------------
@@ -169,6 +169,8 @@ async def _fetch_candles_fallback(symbol: str) -> List[dict]:
                                 now_iso(),
                             )
                         )
+                    from backend.services.candle_rollups import record_candles
+                    record_candles(symbol, "ONE_HOUR", candles, conn=conn)
                     conn.commit()
                     logger.info("Cached %d candles from Coinbase API for %s", len(candles), symbol)
             except Exception as cache_err:
@@ -407,6 +409,41 @@ def _analyze_headline_sentiment(headline: str) -> dict:
 # News headlines (DB query, 1.5s budget)
 # ---------------------------------------------------------------------------
 
+def _indexed_headline_rows(symbol_variants: List[str], cutoff: str) -> List[dict]:
+    """Headline rows from the retrieval index (empty when not indexed yet).
+
+    Items ingested before the index existed are picked up by the legacy
+    mentions join in ``_fetch_headlines``.
+    """
+    try:
+        from backend.services.retrieval_index import search_news_for_symbols
+        result = search_news_for_symbols(symbol_variants, since=cutoff, limit=100)
+        if not result.hits:
+            return []
+        source_ids = sorted({h.source_id for h in result.hits if h.source_id})
+        names: Dict[str, str] = {}
+        if source_ids:
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT id, name FROM news_sources WHERE id IN ({','.join('?' * len(source_ids))})",
+                    source_ids,
+                )
+                names = {r["id"]: r["name"] for r in cursor.fetchall()}
+        return [
+            {
+                "title": h.title,
+                "url": h.url,
+                "published_at": h.published_at,
+                "source_name": names.get(h.source_id),
+            }
+            for h in result.hits
+        ]
+    except Exception as e:
+        logger.debug("Retrieval index headline lookup failed, using mentions join: %s", e)
+        return []
+
+
 def _fetch_headlines(
     symbol: str,
     limit: int = 5,
@@ -434,22 +471,24 @@ def _fetch_headlines(
         meta["asset_queries"] = symbol_variants
         cutoff = (datetime.utcnow() - timedelta(hours=lookback_hours)).isoformat()
 
-        with get_conn() as conn:
-            cursor = conn.cursor()
-            placeholders = ",".join("?" * len(symbol_variants))
-            query = f"""
-                SELECT DISTINCT ni.title, ni.url, ni.published_at, ns.name as source_name
-                FROM news_items ni
-                JOIN news_asset_mentions nam ON ni.id = nam.item_id
-                LEFT JOIN news_sources ns ON ni.source_id = ns.id
-                WHERE nam.asset_symbol IN ({placeholders})
-                  AND ni.published_at >= ?
-                ORDER BY ni.published_at DESC
-                LIMIT 100
-            """
-            params = symbol_variants + [cutoff]
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+        rows = _indexed_headline_rows(symbol_variants, cutoff)
+        if not rows:
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                placeholders = ",".join("?" * len(symbol_variants))
+                query = f"""
+                    SELECT DISTINCT ni.title, ni.url, ni.published_at, ns.name as source_name
+                    FROM news_items ni
+                    JOIN news_asset_mentions nam ON ni.id = nam.item_id
+                    LEFT JOIN news_sources ns ON ni.source_id = ns.id
+                    WHERE nam.asset_symbol IN ({placeholders})
+                      AND ni.published_at >= ?
+                    ORDER BY ni.published_at DESC
+                    LIMIT 100
+                """
+                params = symbol_variants + [cutoff]
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
 
         deduped = []
         seen = set()
@@ -1306,6 +1345,89 @@ def _build_template_insight(facts: dict, request_id: str) -> dict:
 # Public API
 # ---------------------------------------------------------------------------
 
+async def _build_insight(
+    asset: str,
+    side: str,
+    notional_usd: float,
+    asset_class: str,
+    news_enabled: bool,
+    mode: str,
+    lookback_hours: int,
+) -> dict:
+    """Gather facts and build the insight (template, LLM-enhanced when available).
+
+    The result is shared through the cache, so it carries no request_id.
+    """
+    # Gather facts
+    price_data = await _fetch_price_data(asset)
+    headlines_fetch_failed = False
+    headlines_diagnostic = ""
+    market_headlines = []
+    news_meta = {}
+    if news_enabled:
+        headlines, market_headlines, headlines_fetch_failed, news_meta = _fetch_headlines(
+            asset,
+            lookback_hours=lookback_hours,
+        )
+        headlines_diagnostic = news_meta.get("asset_reason", "")
+    else:
+        headlines = []
+        market_headlines = []
+        headlines_diagnostic = "news toggle is OFF"
+        news_meta = {
+            "asset_queries": [],
+            "asset_status": "ok",
+            "asset_reason": "news toggle is OFF",
+            "fallback_queries": [],
+            "fallback_rationale": "",
+            "asset_category": "OTHER",
+            "fallback_status": "",
+            "fallback_reason": "",
+        }
+
+    facts = build_fact_pack(
+        asset, side, notional_usd, asset_class, price_data, headlines,
+        market_headlines=market_headlines,
+        mode=mode, news_enabled=news_enabled,
+        headlines_fetch_failed=headlines_fetch_failed,
+        headlines_diagnostic=headlines_diagnostic,
+        lookback_hours=lookback_hours,
+        asset_queries=news_meta.get("asset_queries", build_news_query_terms(asset)),
+        fallback_queries=news_meta.get("fallback_queries", []),
+        fallback_rationale=news_meta.get("fallback_rationale", ""),
+        asset_category=news_meta.get("asset_category", "UNKNOWN"),
+        asset_status=news_meta.get(
+            "asset_status",
+            ("error" if headlines_fetch_failed else ("empty" if news_enabled and len(headlines) == 0 else "ok")),
+        ),
+        market_status=news_meta.get("fallback_status", ""),
+        market_reason=news_meta.get("fallback_reason", ""),
+    )
+
+    # Build template insight (always works)
+    insight = _build_template_insight(facts, "")
+
+    # Attempt LLM enhancement (2s timeout, non-blocking)
+    if _is_llm_available():
+        try:
+            llm_result = await _llm_enhance_insight(facts, insight)
+            if llm_result:
+                insight["headline"] = llm_result["headline"]
+                insight["why_it_matters"] = llm_result["why_it_matters"]
+                if llm_result.get("key_facts"):
+                    insight["key_facts"] = llm_result["key_facts"]
+                insight["generated_by"] = "hybrid"
+        except Exception:
+            pass  # Keep template insight
+
+    return _ensure_news_contract(
+        insight,
+        asset=asset,
+        lookback_hours=lookback_hours,
+        news_enabled=news_enabled,
+    )
+
+
 async def generate_insight(
     asset: str,
     side: str,
@@ -1319,88 +1441,27 @@ async def generate_insight(
     """Generate a pre-confirm financial insight.
 
     Always returns a valid InsightSchema dict. Never raises.
-    Uses in-memory cache with 60s TTL.
+    Uses in-memory cache with 60s TTL. Concurrent requests for the same cache
+    key share one build, and an insight up to CACHE_STALE_TTL past expiry is
+    served at once while it is rebuilt in the background.
     """
     try:
-        # Check cache
-        ck = _cache_key(asset, side, notional_usd, mode, news_enabled, lookback_hours)
-        cached = _cache_get(ck)
-        if cached:
-            # Update request_id for this specific request
-            cached["request_id"] = request_id
-            return _ensure_news_contract(
-                cached,
-                asset=asset,
-                lookback_hours=lookback_hours,
-                news_enabled=news_enabled,
-            )
+        ck = _cache_key(asset, side, notional_usd, mode, news_enabled, lookback_hours, asset_class)
 
-        # Gather facts
-        price_data = await _fetch_price_data(asset)
-        headlines_fetch_failed = False
-        headlines_diagnostic = ""
-        market_headlines = []
-        news_meta = {}
-        if news_enabled:
-            headlines, market_headlines, headlines_fetch_failed, news_meta = _fetch_headlines(
-                asset,
-                lookback_hours=lookback_hours,
+        async def load() -> dict:
+            return await _build_insight(
+                asset, side, notional_usd, asset_class, news_enabled, mode, lookback_hours
             )
-            headlines_diagnostic = news_meta.get("asset_reason", "")
-        else:
-            headlines = []
-            market_headlines = []
-            headlines_diagnostic = "news toggle is OFF"
-            news_meta = {
-                "asset_queries": [],
-                "asset_status": "ok",
-                "asset_reason": "news toggle is OFF",
-                "fallback_queries": [],
-                "fallback_rationale": "",
-                "asset_category": "OTHER",
-                "fallback_status": "",
-                "fallback_reason": "",
-            }
-
-        facts = build_fact_pack(
-            asset, side, notional_usd, asset_class, price_data, headlines,
-            market_headlines=market_headlines,
-            mode=mode, news_enabled=news_enabled,
-            headlines_fetch_failed=headlines_fetch_failed,
-            headlines_diagnostic=headlines_diagnostic,
-            lookback_hours=lookback_hours,
-            asset_queries=news_meta.get("asset_queries", build_news_query_terms(asset)),
-            fallback_queries=news_meta.get("fallback_queries", []),
-            fallback_rationale=news_meta.get("fallback_rationale", ""),
-            asset_category=news_meta.get("asset_category", "UNKNOWN"),
-            asset_status=news_meta.get(
-                "asset_status",
-                ("error" if headlines_fetch_failed else ("empty" if news_enabled and len(headlines) == 0 else "ok")),
-            ),
-            market_status=news_meta.get("fallback_status", ""),
-            market_reason=news_meta.get("fallback_reason", ""),
-        )
 
-        # Build template insight (always works)
-        insight = _build_template_insight(facts, request_id)
+        insight, stale = _insight_cache.get_stale(ck)
+        if insight is None:
+            insight = await _insight_cache.aget_or_load(ck, load)
+        elif stale:
+            _insight_cache.refresh_async(ck, load)
 
-        # Attempt LLM enhancement (2s timeout, non-blocking)
-        if _is_llm_available():
-            try:
-                llm_result = await _llm_enhance_insight(facts, insight)
-                if llm_result:
-                    insight["headline"] = llm_result["headline"]
-                    insight["why_it_matters"] = llm_result["why_it_matters"]
-                    if llm_result.get("key_facts"):
-                        insight["key_facts"] = llm_result["key_facts"]
-                    insight["generated_by"] = "hybrid"
-            except Exception:
-                pass  # Keep template insight
-
-        # Cache and return
-        _cache_set(ck, insight)
+        # Callers annotate the result; never hand out the cached dict itself
         return _ensure_news_contract(
-            insight,
+            dict(insight, request_id=request_id),
             asset=asset,
             lookback_hours=lookback_hours,
             news_enabled=news_enabled,
@@ -1425,3 +1486,81 @@ async def generate_insight(
             lookback_hours=lookback_hours,
             news_enabled=news_enabled,
         )
+
+
+# ---------------------------------------------------------------------------
+# Prewarm for the tenant's most-traded symbols
+# ---------------------------------------------------------------------------
+
+PREWARM_TOP_N = 5
+PREWARM_LOOKBACK_DAYS = 30
+PREWARM_SCAN_LIMIT = 500
+# At most one prewarm per tenant per cache lifetime
+_prewarmed_tenants = TTLCache("pre_confirm_prewarm", maxsize=1024, ttl=CACHE_TTL)
+_prewarm_tasks: set = set()
+
+
+def _most_traded(tenant_id: str, limit: int = PREWARM_TOP_N) -> List[Tuple[str, str, float, str]]:
+    """Most frequent recent (asset, side, notional bucket, mode) combinations of a tenant's orders."""
+    from collections import Counter
+    from backend.core.symbols import to_base
+
+    cutoff = (datetime.utcnow() - timedelta(days=PREWARM_LOOKBACK_DAYS)).isoformat()
+    with get_conn() as conn:
+        rows = conn.execute(
+            """SELECT symbol, side, notional_usd, provider FROM orders
+               WHERE tenant_id = ? AND created_at >= ?
+               ORDER BY created_at DESC LIMIT ?""",
+            (tenant_id, cutoff, PREWARM_SCAN_LIMIT),
+        ).fetchall()
+    counts = Counter(
+        (
+            to_base(r["symbol"]),
+            (r["side"] or "BUY").upper(),
+            _notional_bucket(float(r["notional_usd"] or 0.0)),
+            "PAPER" if (r["provider"] or "").upper() == "PAPER" else "LIVE",
+        )
+        for r in rows if r["symbol"]
+    )
+    return [combo for combo, _ in counts.most_common(limit)]
+
+
+async def prewarm_insights(tenant_id: str, limit: int = PREWARM_TOP_N) -> int:
+    """Build (or refresh) insights for the tenant's most-traded combinations.
+
+    Uses the defaults the confirmation flow passes (news on, 24h lookback), so
+    the next confirm card for one of these trades is a cache hit. Returns how
+    many combinations were warmed.
+    """
+    combos = await asyncio.to_thread(_most_traded, tenant_id, limit)
+    await asyncio.gather(
+        *(
+            generate_insight(asset, side, notional, mode=mode, request_id="prewarm")
+            for asset, side, notional, mode in combos
+        ),
+        return_exceptions=True,
+    )
+    return len(combos)
+
+
+def schedule_prewarm(tenant_id: str) -> bool:
+    """Start a background prewarm for ``tenant_id`` unless one ran recently.
+
+    Must be called from a running event loop. Returns True if a prewarm started.
+    Disabled under pytest so request tests never spawn background builds.
+    """
+    from backend.core.test_utils import is_pytest
+
+    if is_pytest() or tenant_id in _prewarmed_tenants:
+        return False
+    _prewarmed_tenants.set(tenant_id, True)
+    task = asyncio.get_running_loop().create_task(prewarm_insights(tenant_id))
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_done)
+    return True
+
+
+def _prewarm_done(task: "asyncio.Task") -> None:
+    _prewarm_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Insight prewarm failed (non-fatal): %s", str(task.exception())[:200])
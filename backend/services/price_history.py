@@ -0,0 +1,367 @@
+"""Per-symbol price time series for local valuation and analytics.
+
+Paper valuation re-priced every held position over the network on each
+order, and post-trade / slippage fallbacks ran ``SELECT close FROM
+market_candles ... ORDER BY ts DESC LIMIT 1`` per symbol, where ``ts`` is the
+insert time rather than the market time. This store keeps, per base symbol,
+two parallel arrays (epoch seconds, price) sorted by market time, so
+``price_at``, ``latest`` and range slices are a bisect away.
+
+Points are persisted in ``price_history`` (migration 037), together with the
+closes already in ``market_candles``. Memory holds only the recent part of
+each series: the last ``MEMORY_WINDOW_SECONDS`` (at most
+``MAX_POINTS_PER_SYMBOL`` points), plus the latest point however old. A
+series is loaded lazily per symbol and trimmed as it grows; ``price_at`` and
+``range`` read from the database for times before its in-memory part.
+Feeds:
+
+- candle writers call ``record_candles`` (close at the candle's end time);
+- ``market_data.get_price`` calls ``record(..., defer=True)`` for the ticker
+  prices it fetches, at most one point per symbol per
+  ``TICKER_MIN_INTERVAL_SECONDS``. Deferred points are in memory at once and
+  written in batches from a worker thread, because callers may be inside a
+  write transaction of their own.
+
+Stores are kept per database path, so switching databases (tests, tenant
+shards) never serves another database's prices. ``price_history`` rows age
+out through its retention policy (``backend.db.retention``).
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from backend.core.logging import get_logger
+from backend.core.symbols import to_base
+from backend.db.connect import get_canonical_db_path, get_conn
+
+logger = get_logger(__name__)
+
+Timestamp = Union[int, float, str, datetime]
+
+# Recent part of each series kept in memory; older points are read from the database
+MEMORY_WINDOW_SECONDS = 7 * 86400
+MAX_POINTS_PER_SYMBOL = 50_000
+# Ticker prices recorded per symbol at most this often
+TICKER_MIN_INTERVAL_SECONDS = 30
+# Trim only once a series is this far past its bounds, so trimming stays amortized
+_TRIM_SLACK_SECONDS = 3600
+_TRIM_SLACK_POINTS = 5_000
+
+_UPSERT_SQL = "INSERT OR REPLACE INTO price_history (symbol, ts, price, source) VALUES (?, ?, ?, ?)"
+_CANDLE_TIME = "COALESCE(end_time, start_time)"
+
+
+def to_epoch(ts: Timestamp) -> int:
+    """Epoch seconds for an ISO-8601 string, datetime or number (naive = UTC)."""
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    if isinstance(ts, str):
+        text = ts.strip().replace("Z", "+00:00")
+        if " " in text and "T" not in text:
+            text = text.replace(" ", "T", 1)
+        ts = datetime.fromisoformat(text)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp())
+
+
+def _iso(epoch: int) -> str:
+    # Seconds precision: a candle time sorts below _iso(t + 1) iff it is at or before t
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class PriceSeries:
+    """Prices of one symbol, sorted by time; one price per second.
+
+    Holds every stored point at or after ``floor``; ``None`` means the whole
+    history is in memory.
+    """
+
+    __slots__ = ("ts", "px", "floor")
+
+    def __init__(self, floor: Optional[int] = None):
+        self.ts = array("q")
+        self.px = array("d")
+        self.floor = floor
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def insert(self, ts: int, price: float) -> None:
+        if not self.ts or ts > self.ts[-1]:  # common case: appending newer data
+            self.ts.append(ts)
+            self.px.append(price)
+            return
+        i = bisect_left(self.ts, ts)
+        if i < len(self.ts) and self.ts[i] == ts:
+            self.px[i] = price
+        else:
+            self.ts.insert(i, ts)
+            self.px.insert(i, price)
+
+    def point_at(self, ts: int) -> Optional[Tuple[int, float]]:
+        """Last point at or before ``ts``."""
+        i = bisect_right(self.ts, ts)
+        return (self.ts[i - 1], self.px[i - 1]) if i else None
+
+    def latest(self) -> Optional[Tuple[int, float]]:
+        return (self.ts[-1], self.px[-1]) if self.ts else None
+
+    def slice(self, start: int, end: int) -> Tuple[array, array]:
+        lo, hi = bisect_left(self.ts, start), bisect_right(self.ts, end)
+        return self.ts[lo:hi], self.px[lo:hi]
+
+    def trim(self, min_ts: int, max_points: int) -> int:
+        """Drop points before ``min_ts`` and beyond the newest ``max_points``; the latest point stays."""
+        drop = max(min(bisect_left(self.ts, min_ts), len(self.ts) - 1), len(self.ts) - max_points)
+        if drop <= 0:
+            return 0
+        del self.ts[:drop]
+        del self.px[:drop]
+        self.floor = self.ts[0]
+        return drop
+
+
+class PriceHistoryStore:
+    """Lazily loaded, write-through price series for one database."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._series: Dict[str, PriceSeries] = {}
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, int, float, str]] = []
+
+    def _get_series(self, symbol: str) -> PriceSeries:
+        base = to_base(symbol)
+        series = self._series.get(base)
+        if series is not None:
+            return series
+        loaded = self._load(base)
+        with self._lock:
+            return self._series.setdefault(base, loaded)
+
+    @staticmethod
+    def _load(base: str) -> PriceSeries:
+        series = PriceSeries()
+        try:
+            last = _db_point_at(base, None)
+            if last is None:
+                return series  # nothing stored yet: memory is the whole history
+            series.floor = min(int(time.time()) - MEMORY_WINDOW_SECONDS, last[0])
+            for ts, price in _db_points(base, series.floor, None):
+                series.ts.append(ts)
+                series.px.append(price)
+            series.trim(series.floor, MAX_POINTS_PER_SYMBOL)
+        except Exception as e:
+            logger.warning("Price history load failed for %s: %s", base, str(e)[:200])
+        return series
+
+    @staticmethod
+    def _maybe_trim(series: PriceSeries) -> None:
+        # Caller holds the lock
+        min_ts = int(time.time()) - MEMORY_WINDOW_SECONDS
+        if len(series) > MAX_POINTS_PER_SYMBOL + _TRIM_SLACK_POINTS or (
+            len(series) > 1 and series.ts[0] < min_ts - _TRIM_SLACK_SECONDS
+        ):
+            series.trim(min_ts, MAX_POINTS_PER_SYMBOL)
+
+    def record_points(self, symbol: str, points: Iterable[Tuple[Timestamp, float]], source: str,
+                      conn=None, defer: bool = False) -> int:
+        """Add ``(ts, price)`` points to memory and ``price_history``.
+
+        Pass ``conn`` to write inside the caller's transaction (the caller
+        commits), or ``defer=True`` to have them written later off-thread.
+        """
+        base = to_base(symbol)
+        rows = []
+        for ts, price in points:
+            try:
+                if price is None or float(price) <= 0:
+                    continue
+                rows.append((base, to_epoch(ts), float(price), source))
+            except (TypeError, ValueError):
+                continue  # unparseable timestamp or price
+        if not rows:
+            return 0
+        series = self._get_series(base)
+        with self._lock:
+            for _, ts, price, _ in rows:
+                if series.floor is None or ts >= series.floor:  # older points only go to the database
+                    series.insert(ts, price)
+            self._maybe_trim(series)
+        if defer:
+            with self._lock:
+                schedule = not self._pending
+                self._pending.extend(rows)
+            if schedule:
+                self._schedule_flush()
+        elif conn is not None:
+            conn.executemany(_UPSERT_SQL, rows)
+        else:
+            with get_conn() as own:
+                own.executemany(_UPSERT_SQL, rows)
+                own.commit()
+        return len(rows)
+
+    def record(self, symbol: str, price: float, ts: Optional[Timestamp] = None, source: str = "ticker",
+               conn=None, defer: bool = False, min_interval_seconds: Optional[float] = None) -> None:
+        """Record one price; with ``min_interval_seconds``, skipped if the symbol has a point that recent."""
+        if ts is None:
+            ts = datetime.now(timezone.utc)
+        if min_interval_seconds:
+            series = self._get_series(symbol)
+            try:
+                at = to_epoch(ts)
+            except (TypeError, ValueError):
+                return
+            with self._lock:
+                last = series.latest()
+            if last is not None and 0 <= at - last[0] < min_interval_seconds:
+                return
+        self.record_points(symbol, [(ts, price)], source, conn=conn, defer=defer)
+
+    def _schedule_flush(self) -> None:
+        import asyncio
+        from backend.core.background_loop import get_background_loop
+        get_background_loop().submit(asyncio.to_thread(self.flush))
+
+    def flush(self) -> int:
+        """Write deferred points; returns how many were written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        if self.db_path is not None and get_canonical_db_path() != self.db_path:
+            return 0  # the process moved to another database; these belong to the old one
+        with get_conn() as conn:
+            conn.executemany(_UPSERT_SQL, rows)
+            conn.commit()
+        return len(rows)
+
+    def record_candles(self, symbol: str, candles: Sequence[dict], conn=None) -> int:
+        """Record candle closes, timestamped at each candle's end time."""
+        points = [
+            (c.get("end_time") or c["start_time"], c.get("close"))
+            for c in candles if c.get("close") is not None
+        ]
+        return self.record_points(symbol, points, "candles", conn=conn)
+
+    def price_at(self, symbol: str, ts: Timestamp, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """Last known price of ``symbol`` at or before ``ts``.
+
+        With ``max_age_seconds``, prices older than that relative to ``ts`` count as unknown.
+        """
+        at = to_epoch(ts)
+        series = self._get_series(symbol)
+        with self._lock:
+            point = series.point_at(at)
+            in_memory = series.floor is None
+        if point is None and not in_memory:
+            point = _db_point_at(to_base(symbol), at)
+        if point is None or (max_age_seconds is not None and at - point[0] > max_age_seconds):
+            return None
+        return point[1]
+
+    def latest(self, symbols: Iterable[str], max_age_seconds: Optional[float] = None) -> Dict[str, float]:
+        """Most recent price per symbol (keys as given); unknown or stale symbols are omitted."""
+        now = datetime.now(timezone.utc).timestamp()
+        prices = {}
+        for symbol in symbols:
+            series = self._get_series(symbol)
+            with self._lock:
+                point = series.latest()
+            if point is None:
+                continue
+            if max_age_seconds is not None and now - point[0] > max_age_seconds:
+                continue
+            prices[symbol] = point[1]
+        return prices
+
+    def range(self, symbol: str, start: Timestamp, end: Timestamp) -> List[Tuple[int, float]]:
+        """``(epoch_seconds, price)`` points with ``start <= ts <= end``."""
+        start, end = to_epoch(start), to_epoch(end)
+        series = self._get_series(symbol)
+        with self._lock:
+            ts, px = series.slice(start, end)
+            floor = series.floor
+        if floor is None or start >= floor:
+            return list(zip(ts, px))
+        points = dict(_db_points(to_base(symbol), start, end))
+        points.update(zip(ts, px))  # deferred points may not be written yet
+        return sorted(points.items())
+
+
+def _db_points(base: str, start: int, end: Optional[int]) -> List[Tuple[int, float]]:
+    """Stored points of ``base`` with ``start <= ts <= end``, sorted by time."""
+    points: Dict[int, float] = {}
+    upper = f" AND {_CANDLE_TIME} < ?" if end is not None else ""
+    bounds = (_iso(start),) + ((_iso(end + 1),) if end is not None else ())
+    with get_conn() as conn:
+        for symbol in (base, f"{base}-USD"):
+            # Per symbol, so idx_market_candles_symbol_time serves the range
+            for row in conn.execute(
+                f"SELECT {_CANDLE_TIME} AS t, close FROM market_candles WHERE symbol = ? AND {_CANDLE_TIME} >= ?{upper}",
+                (symbol,) + bounds,
+            ):
+                _add_candle(points, row, start, end)
+        # Explicitly recorded points win over candle closes
+        for row in conn.execute(
+            "SELECT ts, price FROM price_history WHERE symbol = ? AND ts >= ? AND ts <= ?",
+            (base, start, end if end is not None else 2**62),
+        ):
+            points[row["ts"]] = row["price"]
+    return sorted(points.items())
+
+
+def _db_point_at(base: str, at: Optional[int]) -> Optional[Tuple[int, float]]:
+    """Last stored point of ``base`` at or before ``at`` (``None``: the latest)."""
+    points: Dict[int, float] = {}
+    upper = f" AND {_CANDLE_TIME} < ?" if at is not None else ""
+    bound = (_iso(at + 1),) if at is not None else ()
+    with get_conn() as conn:
+        for symbol in (base, f"{base}-USD"):
+            # Per symbol, so the newest candle is the first entry of idx_market_candles_symbol_time
+            for row in conn.execute(
+                f"SELECT {_CANDLE_TIME} AS t, close FROM market_candles "
+                f"WHERE symbol = ? AND close IS NOT NULL{upper} ORDER BY {_CANDLE_TIME} DESC LIMIT 1",
+                (symbol,) + bound,
+            ):
+                _add_candle(points, row, None, at)
+        row = conn.execute(
+            "SELECT ts, price FROM price_history WHERE symbol = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+            (base, at if at is not None else 2**62),
+        ).fetchone()
+        if row is not None:
+            points[row["ts"]] = row["price"]
+    if not points:
+        return None
+    ts = max(points)
+    return ts, points[ts]
+
+
+def _add_candle(points: Dict[int, float], row, start: Optional[int], end: Optional[int]) -> None:
+    if row["close"] is None:
+        return
+    try:
+        ts = to_epoch(row["t"])
+    except (TypeError, ValueError):
+        return
+    if (start is None or ts >= start) and (end is None or ts <= end):
+        points[ts] = float(row["close"])
+
+
+_stores: Dict[str, PriceHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_history() -> PriceHistoryStore:
+    """Price history store for the current database."""
+    path = get_canonical_db_path()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = PriceHistoryStore(path)
+        return store
@@ -5,6 +5,7 @@ Thread-safe implementation.
 """
 import time
 import threading
+from backend.core import profiling
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -60,7 +61,7 @@ class TokenBucketRateLimiter:
                 wait_logged = True
 
             # Sleep briefly before retry
-            time.sleep(0.5)
+            profiling.sleep(0.5)
 
         logger.warning(
             "Rate limiter: timeout after %ss (tokens=%.2f)",
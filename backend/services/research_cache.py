@@ -0,0 +1,79 @@
+"""Cross-run cache of research market data.
+
+Every run's research node listed products, fetched candles for the same ~40
+symbols and computed the same returns, so research load grew with the
+number of users rather than the number of distinct questions. Results are
+shared per ``research_key``: asset class, universe (as a set), lookback,
+granularity and a time bucket of ``RESEARCH_CACHE_BUCKET_SECONDS``.
+
+Concurrent runs with the same key share one fetch (``TTLCache`` single
+flight); later runs in the same bucket reuse the result. A result holds the
+per-symbol outcome (return, candle summary, latency, drop reason) and the
+``market_candles_batches.candles_json`` value of each series, a
+content-addressed blob reference, so every run still writes its own
+artifacts, tool calls and batch rows, all pointing at the one stored copy.
+The candle window is the leader's, which keeps each run's evidence
+consistent with the data it ranked.
+
+A result where no symbol succeeded is not kept, so a rate-limited fetch is
+retried by the next run.
+"""
+import hashlib
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from backend.core.cache import TTLCache
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_results = TTLCache("research_results", maxsize=256)
+
+
+def _settings() -> Tuple[bool, int]:
+    from backend.core.config import get_settings
+
+    settings = get_settings()
+    return settings.research_cache_enabled, settings.research_cache_bucket_seconds
+
+
+def universe_hash(universe: Iterable[str]) -> str:
+    """Order-independent hash of a universe."""
+    return hashlib.sha256("\n".join(sorted(set(universe))).encode("utf-8")).hexdigest()[:16]
+
+
+def research_key(
+    asset_class: str, universe: Iterable[str], lookback_hours: int, granularity: str, now: Optional[float] = None
+) -> str:
+    """Cache key for one research query in the current time bucket."""
+    _, bucket_seconds = _settings()
+    bucket = int((time.time() if now is None else now) // max(bucket_seconds, 1))
+    return f"{asset_class}:{universe_hash(universe)}:{lookback_hours}h:{granularity}:{bucket}"
+
+
+def get_or_fetch(key: str, fetch: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+    """``(result, shared)``: the result for ``key``, calling ``fetch()`` once across concurrent callers.
+
+    ``shared`` is True when this caller did not run ``fetch`` itself.
+    """
+    enabled, bucket_seconds = _settings()
+    if not enabled:
+        return fetch(), False
+
+    fetched = []
+
+    def _load():
+        fetched.append(True)
+        return fetch()
+
+    result = _results.get_or_load(key, _load, ttl=max(bucket_seconds, 1))
+    if fetched and not any(s["status"] == "ok" for s in result["symbols"].values()):
+        _results.pop(key)
+    if not fetched:
+        logger.info("Research served from shared result %s (fetched %s)", key, result.get("fetched_at"))
+    return result, not fetched
+
+
+def clear() -> int:
+    """Drop every cached result; returns entries dropped."""
+    return _results.clear()
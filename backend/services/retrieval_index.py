@@ -0,0 +1,452 @@
+"""Local full-text retrieval index with BM25 scoring.
+
+Indexes news items and internal policy documents into ``retrieval_docs``
+(metadata, migration 033) plus an SQLite FTS5 table ``retrieval_fts`` that is
+kept in sync by the writers (no triggers: the migration runner splits on
+``;``). News items are indexed incrementally by ``NewsIngestionService`` in
+the same transaction that inserts them; policy documents are derived from
+the live settings and re-indexed only when their text changes.
+
+When the SQLite build lacks FTS5 the index degrades to an in-process BM25
+over the time-window candidates, so callers never need to branch.
+"""
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from backend.core.logging import get_logger
+from backend.core.time import now_iso
+from backend.db.connect import get_conn
+
+logger = get_logger(__name__)
+
+FTS_TABLE = "retrieval_fts"
+
+# BM25 parameters (match SQLite FTS5 defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fallback scorer caps the candidate set it scans per query
+FALLBACK_CANDIDATE_LIMIT = 2000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_fts_available: Optional[bool] = None
+# (path, inode) of database files known to have the FTS table
+_indexed: Set[Tuple[str, int]] = set()
+
+
+@dataclass
+class RetrievalHit:
+    """One ranked document."""
+    doc_id: str
+    doc_type: str
+    title: str
+    body: str
+    published_at: str
+    score: float
+    source_id: Optional[str] = None
+    url: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.doc_id,
+            "doc_type": self.doc_type,
+            "title": self.title,
+            "body": self.body,
+            "published_at": self.published_at,
+            "score": round(self.score, 6),
+            "source_id": self.source_id,
+            "url": self.url,
+        }
+
+
+@dataclass
+class RetrievalResult:
+    """Search result plus the measured top-k latency."""
+    query: str
+    hits: List[RetrievalHit] = field(default_factory=list)
+    latency_ms: float = 0.0
+    backend: str = "fts5"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens (shared by the FTS query builder and fallback scorer)."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _fts_match_expr(terms: Sequence[str], column: Optional[str] = None) -> str:
+    quoted = " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+    if column:
+        return f"{column} : ({quoted})"
+    return quoted
+
+
+def _index_schema(conn: sqlite3.Connection) -> str:
+    """Schema holding ``retrieval_docs``: the attached global DB on a tenant shard, else main.
+
+    The FTS table must live next to it; an unqualified CREATE on a shard would
+    make an empty shard-local copy that hides the global one.
+    """
+    from backend.db.sharding import GLOBAL_SCHEMA
+
+    attached = {row[1] for row in conn.execute("PRAGMA database_list").fetchall()}
+    return GLOBAL_SCHEMA if GLOBAL_SCHEMA in attached else "main"
+
+
+def _database_key(conn: sqlite3.Connection, schema: str) -> Optional[Tuple[str, int]]:
+    """``(path, inode)`` of the file behind ``schema``; None for in-memory databases."""
+    path = next((row[2] for row in conn.execute("PRAGMA database_list").fetchall() if row[1] == schema), "")
+    try:
+        return (path, os.stat(path).st_ino) if path else None
+    except OSError:
+        return None
+
+
+def ensure_index(conn: sqlite3.Connection) -> bool:
+    """Create the FTS5 table if possible, once per database file. Returns True when FTS5 is usable."""
+    global _fts_available
+    schema = _index_schema(conn)
+    key = _database_key(conn, schema)
+    if key is not None and key in _indexed:
+        return True
+    try:
+        conn.execute(
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.{FTS_TABLE} USING fts5(
+                title, body, symbols, tokenize='porter unicode61'
+            )"""
+        )
+        _fts_available = True
+        if key is not None:
+            _indexed.add(key)
+    except sqlite3.OperationalError as e:
+        if _fts_available is not False:
+            logger.warning("FTS5 unavailable, retrieval falls back to in-process BM25: %s", e)
+        _fts_available = False
+    return bool(_fts_available)
+
+
+def index_document(
+    conn: sqlite3.Connection,
+    doc_id: str,
+    doc_type: str,
+    title: str,
+    body: str = "",
+    published_at: Optional[str] = None,
+    symbols: Iterable[str] = (),
+    source_id: Optional[str] = None,
+    url: Optional[str] = None,
+) -> bool:
+    """Insert or refresh one document on an open connection (caller commits).
+
+    Returns False when the stored copy already has identical content.
+    """
+    symbols_text = " ".join(sorted({s.upper() for s in symbols if s}))
+    content_hash = hashlib.sha256(
+        "\x1f".join([title or "", body or "", symbols_text]).encode()
+    ).hexdigest()[:32]
+    fts = ensure_index(conn)
+    schema = _index_schema(conn)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT rowid, content_hash FROM retrieval_docs WHERE doc_id = ?", (doc_id,)
+    )
+    existing = cursor.fetchone()
+    if existing and existing[1] == content_hash:
+        return False
+
+    published = published_at or now_iso()
+    if existing:
+        rowid = existing[0]
+        cursor.execute(
+            """UPDATE retrieval_docs
+               SET doc_type = ?, source_id = ?, url = ?, title = ?, body = ?, symbols = ?,
+                   published_at = ?, content_hash = ?, indexed_at = ?
+               WHERE rowid = ?""",
+            (doc_type, source_id, url, title, body, symbols_text, published,
+             content_hash, now_iso(), rowid),
+        )
+        if fts:
+            cursor.execute(f"DELETE FROM {schema}.{FTS_TABLE} WHERE rowid = ?", (rowid,))
+    else:
+        cursor.execute(
+            """INSERT INTO retrieval_docs
+               (doc_id, doc_type, source_id, url, title, body, symbols, published_at, content_hash, indexed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (doc_id, doc_type, source_id, url, title, body, symbols_text, published,
+             content_hash, now_iso()),
+        )
+        rowid = cursor.lastrowid
+    if fts:
+        cursor.execute(
+            f"INSERT INTO {schema}.{FTS_TABLE} (rowid, title, body, symbols) VALUES (?, ?, ?, ?)",
+            (rowid, title or "", body or "", symbols_text),
+        )
+    return True
+
+
+def index_news_item(conn: sqlite3.Connection, item: Dict[str, Any], symbols: Iterable[str] = ()) -> bool:
+    """Index a freshly ingested news item (dict with news_items columns)."""
+    return index_document(
+        conn,
+        doc_id=item["id"],
+        doc_type="news",
+        title=item.get("title") or "",
+        body=item.get("summary") or "",
+        published_at=item.get("published_at"),
+        symbols=symbols,
+        source_id=item.get("source_id"),
+        url=item.get("url"),
+    )
+
+
+def backfill_news(limit: int = 5000) -> int:
+    """Index news items that predate the retrieval index. Returns count indexed."""
+    count = 0
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """SELECT ni.id, ni.source_id, ni.url, ni.title, ni.summary, ni.published_at
+               FROM news_items ni
+               LEFT JOIN retrieval_docs rd ON rd.doc_id = ni.id
+               WHERE rd.doc_id IS NULL
+               ORDER BY ni.published_at DESC
+               LIMIT ?""",
+            (limit,),
+        )
+        rows = [dict(r) for r in cursor.fetchall()]
+        for item in rows:
+            cursor.execute(
+                "SELECT asset_symbol FROM news_asset_mentions WHERE item_id = ?", (item["id"],)
+            )
+            symbols = [r[0] for r in cursor.fetchall()]
+            if index_news_item(conn, item, symbols):
+                count += 1
+        conn.commit()
+    if count:
+        logger.info("Retrieval index backfill: indexed %d news items", count)
+    return count
+
+
+def policy_documents() -> List[Dict[str, str]]:
+    """Policy documents derived from the active settings (what the policy engine enforces)."""
+    from backend.core.config import get_settings
+    s = get_settings()
+    return [
+        {
+            "doc_id": "policy:kill_switch",
+            "title": "Kill switch",
+            "body": (
+                "When the global or tenant kill switch is enabled every trade proposal is blocked "
+                f"before any order is placed. Global kill switch enabled: {bool(s.kill_switch_enabled)}."
+            ),
+        },
+        {
+            "doc_id": "policy:symbol_allowlist",
+            "title": "Symbol allowlist",
+            "body": (
+                f"Orders are limited to allowlisted symbols: {s.symbol_allowlist}. "
+                "Assets auto-selected by the system after tradability preflight are exempt."
+            ),
+        },
+        {
+            "doc_id": "policy:notional_limits",
+            "title": "Per-order notional limit and risk constraints",
+            "body": (
+                f"Maximum notional per order is {s.max_notional_per_order_usd} USD. Orders at or above "
+                "80 percent of the limit require approval; budgets above twice the limit are blocked."
+            ),
+        },
+        {
+            "doc_id": "policy:trades_per_run",
+            "title": "Trades per run",
+            "body": f"A single run may place at most {s.max_trades_per_run} orders.",
+        },
+        {
+            "doc_id": "policy:citations",
+            "title": "Evidence citations",
+            "body": (
+                f"Research-driven proposals need at least {s.min_citations_required} citations "
+                "before execution; command-based runs skip the citation check."
+            ),
+        },
+        {
+            "doc_id": "policy:live_trading",
+            "title": "LIVE trading policy and execution safeguards",
+            "body": (
+                "LIVE trading mode requires approval and explicit confirmation. Trading risk "
+                f"constraints: live trading enabled={bool(s.enable_live_trading)}, "
+                f"live trading disabled override={bool(s.trading_disable_live)}."
+            ),
+        },
+    ]
+
+
+def sync_policy_documents() -> int:
+    """Upsert policy documents; only changed documents are re-indexed.
+
+    Run at startup and after policy writes, not per search.
+    """
+    changed = 0
+    with get_conn() as conn:
+        for doc in policy_documents():
+            if index_document(conn, doc["doc_id"], "policy", doc["title"], doc["body"],
+                              published_at="1970-01-01T00:00:00Z"):
+                changed += 1
+        conn.commit()
+    return changed
+
+
+def _window_clause(
+    doc_types: Optional[Sequence[str]], since: Optional[str], until: Optional[str]
+) -> tuple:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if doc_types:
+        clauses.append(f"d.doc_type IN ({','.join('?' * len(doc_types))})")
+        params.extend(doc_types)
+    if since:
+        clauses.append("d.published_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("d.published_at <= ?")
+        params.append(until)
+    return (" AND " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _row_to_hit(row: Any, score: float) -> RetrievalHit:
+    return RetrievalHit(
+        doc_id=row["doc_id"],
+        doc_type=row["doc_type"],
+        title=row["title"],
+        body=row["body"] or "",
+        published_at=row["published_at"],
+        score=score,
+        source_id=row["source_id"],
+        url=row["url"],
+    )
+
+
+def _bm25_fallback(
+    cursor: sqlite3.Cursor,
+    terms: List[str],
+    column: Optional[str],
+    where: str,
+    params: List[Any],
+    top_k: int,
+    order: str,
+) -> List[RetrievalHit]:
+    """In-process BM25 over the window's candidates (used when FTS5 is missing)."""
+    cursor.execute(
+        f"""SELECT d.* FROM retrieval_docs d WHERE 1=1{where}
+            ORDER BY d.published_at DESC LIMIT ?""",
+        params + [FALLBACK_CANDIDATE_LIMIT],
+    )
+    rows = cursor.fetchall()
+    docs = []
+    for row in rows:
+        if column == "symbols":
+            tokens = tokenize(row["symbols"] or "")
+        else:
+            tokens = tokenize(f"{row['title']} {row['body'] or ''} {row['symbols'] or ''}")
+        docs.append((row, tokens))
+    if not docs:
+        return []
+
+    n = len(docs)
+    avgdl = sum(len(t) for _, t in docs) / n or 1.0
+    unique_terms = list(dict.fromkeys(terms))
+    df = {t: sum(1 for _, toks in docs if t in toks) for t in unique_terms}
+    scored = []
+    for row, toks in docs:
+        tf: Dict[str, int] = {}
+        for tok in toks:
+            tf[tok] = tf.get(tok, 0) + 1
+        score = 0.0
+        for t in unique_terms:
+            f = tf.get(t, 0)
+            if not f:
+                continue
+            idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+            score += idf * f * (BM25_K1 + 1) / (f + BM25_K1 * (1 - BM25_B + BM25_B * len(toks) / avgdl))
+        if score > 0:
+            scored.append(_row_to_hit(row, score))
+    if order == "recency":
+        scored.sort(key=lambda h: h.published_at, reverse=True)
+    else:
+        scored.sort(key=lambda h: h.score, reverse=True)
+    return scored[:top_k]
+
+
+def search(
+    query: str,
+    doc_types: Optional[Sequence[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    top_k: int = 5,
+    column: Optional[str] = None,
+    order: str = "relevance",
+) -> RetrievalResult:
+    """BM25 search with optional doc-type and published_at window filters.
+
+    Args:
+        query: Free text; tokens are OR-ed.
+        column: Restrict matching to one FTS column ('title', 'body', 'symbols').
+        order: 'relevance' (BM25) or 'recency' (published_at DESC among matches).
+    """
+    t0 = time.perf_counter()
+    terms = tokenize(query)
+    result = RetrievalResult(query=query)
+    if not terms:
+        return result
+
+    where, params = _window_clause(doc_types, since, until)
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        if ensure_index(conn):
+            order_by = "d.published_at DESC" if order == "recency" else "score ASC"
+            cursor.execute(
+                f"""SELECT d.*, bm25({FTS_TABLE}) AS score
+                    FROM {_index_schema(conn)}.{FTS_TABLE}
+                    JOIN retrieval_docs d ON d.rowid = {FTS_TABLE}.rowid
+                    WHERE {FTS_TABLE} MATCH ?{where}
+                    ORDER BY {order_by}
+                    LIMIT ?""",
+                [_fts_match_expr(terms, column)] + params + [top_k],
+            )
+            # FTS5 bm25() is negative (lower is better); flip so higher is better.
+            result.hits = [_row_to_hit(r, -float(r["score"])) for r in cursor.fetchall()]
+        else:
+            result.backend = "python_bm25"
+            result.hits = _bm25_fallback(cursor, terms, column, where, params, top_k, order)
+
+    result.latency_ms = round((time.perf_counter() - t0) * 1000, 3)
+    logger.debug(
+        "retrieval search q=%r k=%d hits=%d latency_ms=%.3f backend=%s",
+        query[:80], top_k, len(result.hits), result.latency_ms, result.backend,
+    )
+    return result
+
+
+def search_news_for_symbols(
+    symbols: Sequence[str],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 100,
+) -> RetrievalResult:
+    """Most recent indexed news items mentioning any of ``symbols`` within the window."""
+    return search(
+        " ".join(symbols),
+        doc_types=["news"],
+        since=since,
+        until=until,
+        top_k=limit,
+        column="symbols",
+        order="recency",
+    )
@@ -91,6 +91,24 @@ MONTH_MAP = {
 }
 
 
+# Compiled once at import; parse_timeframe runs on every trade command.
+_UNIT = r'(min(?:ute)?s?|m|hours?|h|days?|d|weeks?|w|months?|mo|years?|y)'
+_RELATIVE_RE = re.compile(r'(?:last|past|previous)\s+(\d+)\s*' + _UNIT + r'\b')
+_RELATIVE_BARE_RE = re.compile(r'(\d+)\s*' + _UNIT + r'\s*(?:ago)?\b')
+_SINCE_WEEKDAY_RE = re.compile(r'since\s+(?:last\s+)?(\w+day|\w{3})\b')
+_SINCE_ISO_RE = re.compile(r'since\s+(\d{4})-(\d{1,2})-(\d{1,2})')
+_SINCE_MONTH_DAY_RE = re.compile(r'since\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?')
+_BETWEEN_MONTH_DAY_RE = re.compile(
+    r'between\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?\s+and\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?'
+)
+_FROM_TO_ISO_RE = re.compile(
+    r'(?:from\s+)?(\d{4})-(\d{1,2})-(\d{1,2})\s+(?:to|through|until)\s+(\d{4})-(\d{1,2})-(\d{1,2})'
+)
+_BETWEEN_ISO_RE = re.compile(
+    r'between\s+(\d{4})-(\d{1,2})-(\d{1,2})\s+and\s+(\d{4})-(\d{1,2})-(\d{1,2})'
+)
+
+
 def _get_granularity(hours: float) -> Granularity:
     """Determine optimal granularity based on time window."""
     if hours <= 1:
@@ -130,14 +148,13 @@ def _format_label(hours: float, start_dt: datetime, end_dt: datetime) -> str:
 
 def _parse_relative(text: str, now: datetime) -> Optional[Tuple[datetime, datetime, str, float]]:
     """Parse relative time expressions like 'last 10 minutes', 'past 24 hours'."""
+    text_lower = text.lower()
     # Pattern: [last|past|previous] X [unit]
-    pattern = r'(?:last|past|previous)\s+(\d+)\s*(min(?:ute)?s?|m|hours?|h|days?|d|weeks?|w|months?|mo|years?|y)\b'
-    match = re.search(pattern, text.lower())
+    match = _RELATIVE_RE.search(text_lower)
     
     if not match:
         # Try without prefix: "10 minutes ago", "24 hours"
-        pattern2 = r'(\d+)\s*(min(?:ute)?s?|m|hours?|h|days?|d|weeks?|w|months?|mo|years?|y)\s*(?:ago)?\b'
-        match = re.search(pattern2, text.lower())
+        match = _RELATIVE_BARE_RE.search(text_lower)
     
     if match:
         value = int(match.group(1))
@@ -189,7 +206,7 @@ def _parse_anchored(text: str, now: datetime) -> Optional[Tuple[datetime, dateti
         return (start, now, "QTD", hours)
     
     # Since weekday: "since Monday", "since last Tuesday"
-    since_weekday = re.search(r'since\s+(?:last\s+)?(\w+day|\w{3})\b', text_lower)
+    since_weekday = _SINCE_WEEKDAY_RE.search(text_lower)
     if since_weekday:
         day_name = since_weekday.group(1).lower()
         if day_name in WEEKDAY_MAP:
@@ -205,7 +222,7 @@ def _parse_anchored(text: str, now: datetime) -> Optional[Tuple[datetime, dateti
     
     # Since date: "since 2026-02-01", "since Feb 1", "since February 1"
     # ISO format
-    since_iso = re.search(r'since\s+(\d{4})-(\d{1,2})-(\d{1,2})', text_lower)
+    since_iso = _SINCE_ISO_RE.search(text_lower)
     if since_iso:
         try:
             year = int(since_iso.group(1))
@@ -218,7 +235,7 @@ def _parse_anchored(text: str, now: datetime) -> Optional[Tuple[datetime, dateti
             pass
     
     # Since month day: "since Feb 1", "since February 1st"
-    since_month_day = re.search(r'since\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?', text_lower)
+    since_month_day = _SINCE_MONTH_DAY_RE.search(text_lower)
     if since_month_day:
         month_name = since_month_day.group(1).lower()
         day = int(since_month_day.group(2))
@@ -243,10 +260,7 @@ def _parse_bounded(text: str, now: datetime) -> Optional[Tuple[datetime, datetim
     text_lower = text.lower()
     
     # Between pattern: "between Jan 2 and Feb 5"
-    between_pattern = re.search(
-        r'between\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?\s+and\s+(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?',
-        text_lower
-    )
+    between_pattern = _BETWEEN_MONTH_DAY_RE.search(text_lower)
     if between_pattern:
         start_month_name = between_pattern.group(1).lower()
         start_day = int(between_pattern.group(2))
@@ -276,10 +290,7 @@ def _parse_bounded(text: str, now: datetime) -> Optional[Tuple[datetime, datetim
                 pass
     
     # ISO date range: "from 2025-12-01 to 2025-12-08"
-    from_to_iso = re.search(
-        r'(?:from\s+)?(\d{4})-(\d{1,2})-(\d{1,2})\s+(?:to|through|until)\s+(\d{4})-(\d{1,2})-(\d{1,2})',
-        text_lower
-    )
+    from_to_iso = _FROM_TO_ISO_RE.search(text_lower)
     if from_to_iso:
         try:
             start = datetime(
@@ -302,10 +313,7 @@ def _parse_bounded(text: str, now: datetime) -> Optional[Tuple[datetime, datetim
             pass
     
     # Between ISO dates: "between 2025-12-01 and 2025-12-08"
-    between_iso = re.search(
-        r'between\s+(\d{4})-(\d{1,2})-(\d{1,2})\s+and\s+(\d{4})-(\d{1,2})-(\d{1,2})',
-        text_lower
-    )
+    between_iso = _BETWEEN_ISO_RE.search(text_lower)
     if between_iso:
         try:
             start = datetime(
@@ -67,6 +67,7 @@ class TradeContext:
     resolved_products: Dict[str, ResolvedProductRules] = field(default_factory=dict)
     market_prices: Dict[str, float] = field(default_factory=dict)
     built_at: str = ""
+    state_version: Optional[int] = None  # ExecutableState.version the balances came from
 
     def get_balance(self, currency: str) -> Optional[ExecutableBalance]:
         return self.executable_balances.get(currency.upper())
@@ -147,18 +148,22 @@ def build_trade_context(
     tenant_id: str,
     execution_mode: str,
     actions: List[TradeAction],
+    executable_state: Optional[Any] = None,
 ) -> TradeContext:
     """Build an immutable TradeContext for a set of trade actions.
 
-    1. Fetches ExecutableState once (authoritative for balances).
+    1. Fetches ExecutableState once (authoritative for balances), unless the
+       caller passes the snapshot its other decisions were based on.
     2. Resolves product rules for every referenced product.
     3. Fetches current market prices (display only).
     """
     # ---- 1. Executable balances (single fetch) ----
     balances: Dict[str, ExecutableBalance] = {}
+    state = executable_state
     try:
-        from backend.services.executable_state import fetch_executable_state
-        state = fetch_executable_state(tenant_id)
+        if state is None:
+            from backend.services.executable_state import fetch_executable_state
+            state = fetch_executable_state(tenant_id)
         for currency, bal in (state.balances or {}).items():
             balances[currency.upper()] = ExecutableBalance(
                 currency=currency.upper(),
@@ -202,4 +207,5 @@ def build_trade_context(
         resolved_products=resolved,
         market_prices=prices,
         built_at=now_iso(),
+        state_version=getattr(state, "version", None),
     )
@@ -12,8 +12,10 @@ Consolidates all pre-trade checks:
 All validation uses the SAME fee calculation to prevent discrepancies.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -27,6 +29,10 @@ COINBASE_FEE_RATE = 0.006  # 0.6%
 # product rules or blocks with PROVIDER_UNAVAILABLE.
 DEFAULT_MIN_NOTIONAL_USD = 1.0
 
+# Multi-leg commands: legs checked at once, and the wall-clock budget for all of them
+PREFLIGHT_MAX_CONCURRENCY = 4
+PREFLIGHT_BUDGET_SECONDS = 20.0
+
 
 class PreflightRejectReason(str, Enum):
     """Structured rejection reason codes."""
@@ -91,6 +97,9 @@ class PreflightResult:
     requires_auto_sell: bool = False
     auto_sell_proposal: Optional[Dict[str, Any]] = None
 
+    # ExecutableState.version this decision was made against (None = no live state)
+    state_version: Optional[int] = None
+
     @property
     def ok(self) -> bool:
         return self.valid
@@ -133,6 +142,7 @@ class PreflightResult:
             "adjusted_qty": self.adjusted_qty,
             "max_sellable_usd": self.max_sellable_usd,
             "requires_auto_sell": self.requires_auto_sell,
+            "state_version": self.state_version,
         }
         if self.auto_sell_proposal:
             d["auto_sell_proposal"] = self.auto_sell_proposal
@@ -289,6 +299,19 @@ async def check_cash_for_buy(
     return result
 
 
+def _records_state_version(fn):
+    """Stamp every result of ``fn`` (all return paths) with the executable_state version."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        result = await fn(*args, **kwargs)
+        state = kwargs.get("executable_state")
+        if state is not None and isinstance(result, PreflightResult):
+            result.state_version = getattr(state, "version", None)
+        return result
+    return wrapper
+
+
+@_records_state_version
 async def run_preflight(
     tenant_id: str,
     side: str,
@@ -304,6 +327,7 @@ async def run_preflight(
     product_flags: Optional[Dict[str, bool]] = None,
     artifacts: Optional[Dict[str, Optional[str]]] = None,
     executable_state=None,  # pass-through to check_cash_for_buy for live USD balance
+    price: Optional[float] = None,  # asset price resolved once by the caller (else fetched here)
 ) -> PreflightResult:
     """
     Run unified preflight validation for a trade.
@@ -484,6 +508,7 @@ async def run_preflight(
             requested_qty=effective_qty,
             executable_qty=float(executable_qty or 0.0) if executable_qty is not None else None,
             available_usd=float(available_usd) if available_usd is not None else None,
+            price=price,
         )
         if preview_available and not preview_valid:
             is_precision = any(
@@ -566,10 +591,13 @@ async def run_preflight(
     # Catches undersized sells before they reach the execution node,
     # preventing failures from metadata-derived minimums that passed preview.
     if side_upper == "SELL" and asset_class.upper() == "CRYPTO":
-        base_min_block = _check_sell_base_min_size(
+        # Metadata lookup is synchronous; keep it off the event loop
+        base_min_block = await asyncio.to_thread(
+            _check_sell_base_min_size,
             asset=asset_upper,
             amount_usd=effective_amount_usd,
             sell_all_requested=sell_all_requested,
+            price=price,
         )
         if base_min_block is not None:
             base_min_block.artifacts = artifacts or {}
@@ -583,6 +611,7 @@ def _check_sell_base_min_size(
     asset: str,
     amount_usd: float,
     sell_all_requested: bool = False,
+    price: Optional[float] = None,
 ) -> Optional[PreflightResult]:
     """Verify that the sell amount converts to at least base_min_size.
 
@@ -602,11 +631,11 @@ def _check_sell_base_min_size(
 
         product_id = f"{asset.upper()}-USD"
 
-        price = None
-        try:
-            price = float(get_price(asset))
-        except Exception:
-            pass
+        if not price:
+            try:
+                price = float(get_price(asset))
+            except Exception:
+                pass
         if not price or price <= 0:
             return None
 
@@ -685,6 +714,7 @@ def _build_preview_payload(
     requested_qty: Optional[float] = None,
     executable_qty: Optional[float] = None,
     available_usd: Optional[float] = None,
+    price: Optional[float] = None,
 ) -> Optional[Dict[str, Any]]:
     product_id = f"{asset.upper()}-USD"
     payload: Dict[str, Any] = {
@@ -705,7 +735,7 @@ def _build_preview_payload(
     else:
         try:
             from backend.services.market_data import get_price
-            px = float(get_price(asset))
+            px = float(price or get_price(asset))
             if px > 0:
                 base_size = float(amount_usd) / px
         except Exception:
@@ -725,6 +755,7 @@ async def _validate_via_coinbase_preview(
     requested_qty: Optional[float] = None,
     executable_qty: Optional[float] = None,
     available_usd: Optional[float] = None,
+    price: Optional[float] = None,
 ) -> Tuple[bool, bool, str, Optional[float]]:
     """
     Returns: (preview_available, preview_valid, message, min_notional_hint)
@@ -736,6 +767,7 @@ async def _validate_via_coinbase_preview(
         requested_qty=requested_qty,
         executable_qty=executable_qty,
         available_usd=available_usd,
+        price=price,
     )
     if not payload:
         return False, True, "preview unavailable", None
@@ -744,7 +776,7 @@ async def _validate_via_coinbase_preview(
         from backend.providers.coinbase_provider import CoinbaseProvider
 
         provider = CoinbaseProvider()
-        preview = provider.preview_order(payload)
+        preview = await asyncio.to_thread(provider.preview_order, payload)
 
         success = preview.get("success")
         error_msg = (
@@ -764,3 +796,58 @@ async def _validate_via_coinbase_preview(
     except Exception as e:
         logger.info("Coinbase preview unavailable, using metadata fallback: %s", str(e)[:200])
         return False, True, "preview unavailable", None
+
+
+async def run_preflights(
+    legs: Sequence[Dict[str, Any]],
+    budget_seconds: float = PREFLIGHT_BUDGET_SECONDS,
+    max_concurrency: int = PREFLIGHT_MAX_CONCURRENCY,
+) -> List[PreflightResult]:
+    """Run ``run_preflight(**leg)`` for every leg of a command concurrently.
+
+    Results come back in the order of ``legs``. A leg that raises, or that has
+    not finished when ``budget_seconds`` runs out, is reported as a blocked
+    result instead of failing the other legs.
+    """
+    if not legs:
+        return []
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(leg: Dict[str, Any]) -> PreflightResult:
+        async with semaphore:
+            return await run_preflight(**leg)
+
+    tasks = [asyncio.ensure_future(_one(leg)) for leg in legs]
+    _, pending = await asyncio.wait(tasks, timeout=budget_seconds)
+    for task in pending:
+        task.cancel()
+
+    results: List[PreflightResult] = []
+    for leg, task in zip(legs, tasks):
+        asset = leg.get("asset") or "this asset"
+        artifacts = leg.get("artifacts")
+        if task in pending:
+            logger.warning("Preflight for %s exceeded the %.0fs budget", asset, budget_seconds)
+            results.append(_blocked(
+                PreflightRejectReason.MARKET_UNAVAILABLE,
+                f"Checks for {asset} did not finish in time.",
+                "Retry in a moment.",
+                ["Retry"],
+                requested_usd=float(leg.get("amount_usd") or 0.0),
+                artifacts=artifacts,
+            ))
+        elif task.exception() is not None:
+            logger.warning("Preflight for %s failed: %s", asset, str(task.exception())[:200])
+            results.append(_blocked(
+                PreflightRejectReason.PROVIDER_ERROR,
+                f"Could not validate the {asset} order right now.",
+                "Retry in a moment.",
+                ["Retry"],
+                requested_usd=float(leg.get("amount_usd") or 0.0),
+                artifacts=artifacts,
+            ))
+        else:
+            results.append(task.result())
+            continue
+        results[-1].state_version = getattr(leg.get("executable_state"), "version", None)
+    return results
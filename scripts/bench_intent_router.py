@@ -0,0 +1,100 @@
+"""Micro-benchmark: intent classification and trade parsing front-end.
+
+Usage:
+    python scripts/bench_intent_router.py [--iterations 2000] [--json]
+
+Reports per-message latency for:
+    - classify_intent on a cold feature cache (every message re-extracted)
+    - classify_many on a warm cache (repeated messages share features)
+    - parse_trade_command on a cold cache (symbol resolution disabled)
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.agents.intent_router import classify_intent, classify_many  # noqa: E402
+from backend.agents.text_features import extract_features  # noqa: E402
+from backend.agents.trade_parser import parse_trade_command  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "Hi",
+    "What can you do?",
+    "Buy $10 of BTC",
+    "Sell half my ETH position",
+    "Buy the most profitable crypto in the last 24h for $25",
+    "Analyze my portfolio",
+    "How much SOL do I own?",
+    "Compare ETH vs BTC returns over the last 7 days",
+    "Who is the president of France?",
+    "Show me the latency of my last runs",
+    "sell my DOGE and SHIB, buy $50 ETH",
+    "What's the price of Bitcoin?",
+    "Put $20 into AAPL stock",
+    "Sell everything in my portfolio",
+    "What's my PNL since Monday?",
+]
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(iterations: int) -> dict:
+    n = len(SAMPLE_MESSAGES)
+
+    def classify_cold():
+        extract_features.cache_clear()
+        for msg in SAMPLE_MESSAGES:
+            classify_intent(msg)
+
+    def classify_warm():
+        classify_many(SAMPLE_MESSAGES)
+
+    def parse_cold():
+        extract_features.cache_clear()
+        for msg in SAMPLE_MESSAGES:
+            parse_trade_command(msg)
+
+    # Keep the benchmark offline: dynamic symbol resolution may hit the catalog/network.
+    with patch("backend.services.symbol_resolver.resolve", return_value=None), \
+         patch("backend.services.timeframe_parser.emit_timeframe_parse_telemetry"):
+        parse_iterations = max(1, iterations // 10)
+        parse_cold()  # warm imports
+        results = {
+            "messages": n,
+            "iterations": iterations,
+            "classify_cold_us": _time_per_call(classify_cold, iterations) / n * 1e6,
+            "classify_warm_us": _time_per_call(classify_warm, iterations) / n * 1e6,
+            "parse_cold_us": _time_per_call(parse_cold, parse_iterations) / n * 1e6,
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Emit JSON only")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Intent front-end benchmark ({results['messages']} messages x {results['iterations']} iterations)")
+    print(f"  classify_intent (cold cache): {results['classify_cold_us']:8.1f} us/message")
+    print(f"  classify_many   (warm cache): {results['classify_warm_us']:8.1f} us/message")
+    print(f"  parse_trade_command (cold):   {results['parse_cold_us']:8.1f} us/message")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -397,6 +397,43 @@ def bypass_auth():
     os.environ.pop("TEST_AUTH_BYPASS", None)
 
 
+# === QUERY BUDGETS ===
+
+@pytest.fixture
+def query_budget():
+    """Fail the test when a block exceeds its SQL budget.
+
+    Usage::
+
+        with query_budget(max_queries=12, max_repeats=2) as log:
+            client.get("/api/v1/runs/...")
+
+    ``max_repeats`` caps how often one statement shape (literals collapsed)
+    may run, which catches per-row follow-up queries (N+1). Statements from
+    every thread count, including the TestClient's app thread.
+    """
+    from contextlib import contextmanager
+    from backend.db import query_stats
+
+    @contextmanager
+    def budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None, label: str = "budget"):
+        with query_stats.capture(label) as log:
+            yield log
+        problems = query_stats.check_budget(log, max_queries, max_repeats)
+        if problems:
+            pytest.fail("Query budget exceeded:\n" + "\n".join(problems), pytrace=False)
+
+    return budget
+
+
+@pytest.fixture
+def strict_loop():
+    """Blocking calls (time.sleep, sync HTTP, feedparser) inside coroutines raise BlockingCallError."""
+    from backend.core.loop_watchdog import strict
+    with strict():
+        yield
+
+
 # === ASYNC TEST SUPPORT ===
 
 @pytest.fixture
@@ -430,3 +467,11 @@ def reset_products_cache():
     except:
         pass
     yield
+
+
+@pytest.fixture(autouse=True)
+def reset_research_cache():
+    """Reset shared research results before each test."""
+    from backend.services import research_cache
+    research_cache.clear()
+    yield
@@ -0,0 +1,83 @@
+"""Tests for the benchmark package (dataset generator, load driver, report comparison)."""
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+
+from backend.bench.dataset import BENCH_TENANT, DatasetSpec, build_dataset
+from backend.bench.load import Scenario, percentile, run_load
+from backend.bench.report import compare
+
+
+def test_build_dataset_is_coherent_and_skewed(test_db):
+    spec = DatasetSpec(runs=200, news_items=30, conversations=10, messages_per_conversation=4, snapshots_per_tenant=3)
+    info = build_dataset(test_db, spec, index_news=False)
+
+    rows = info["rows"]
+    assert rows["runs"] == 200
+    assert rows["dag_nodes"] == 200 * spec.nodes_per_run
+    assert rows["orders"] == 100
+
+    conn = sqlite3.connect(test_db)
+    try:
+        large = conn.execute("SELECT COUNT(*) FROM runs WHERE tenant_id = ?", (BENCH_TENANT,)).fetchone()[0]
+        assert large == 140
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM dag_nodes d LEFT JOIN runs r ON r.run_id = d.run_id WHERE r.run_id IS NULL"
+        ).fetchone()[0]
+        assert orphans == 0
+        # Order rows belong to the same tenant as their run
+        mismatched = conn.execute(
+            "SELECT COUNT(*) FROM orders o JOIN runs r ON r.run_id = o.run_id WHERE o.tenant_id != r.tenant_id"
+        ).fetchone()[0]
+        assert mismatched == 0
+    finally:
+        conn.close()
+
+
+def test_percentile_interpolates():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_load_records_latency_and_errors():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    scenarios = [
+        Scenario("ok", "GET", lambda n: "/ok"),
+        Scenario("missing", "GET", lambda n: "/missing"),
+    ]
+    results = await run_load(app, scenarios, requests=20, concurrency=4, warmup=0)
+
+    assert results["ok"]["requests"] == 20
+    assert results["ok"]["errors"] == 0
+    assert results["ok"]["p50_ms"] <= results["ok"]["p99_ms"]
+    assert results["missing"]["errors"] == 20
+    assert results["missing"]["status_counts"] == {"404": 20}
+
+
+def test_compare_flags_p95_and_throughput_regressions():
+    baseline = {"scenarios": {
+        "a": {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30, "throughput_rps": 100, "errors": 0},
+        "b": {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30, "throughput_rps": 100, "errors": 0},
+        "gone": {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": 1, "errors": 0},
+    }}
+    current = {"scenarios": {
+        "a": {"p50_ms": 11, "p95_ms": 21, "p99_ms": 31, "throughput_rps": 98, "errors": 0},
+        "b": {"p50_ms": 15, "p95_ms": 30, "p99_ms": 45, "throughput_rps": 70, "errors": 0},
+        "new": {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": 1, "errors": 0},
+    }}
+    result = compare(current, baseline, tolerance=0.15)
+
+    assert result["regressions"] == ["b"]
+    assert result["scenarios"]["b"]["reasons"] == ["p95_ms", "throughput_rps"]
+    assert result["scenarios"]["a"]["p95_ms"]["change_pct"] == 5.0
+    assert result["only_in_current"] == ["new"]
+    assert result["only_in_baseline"] == ["gone"]
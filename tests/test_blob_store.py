@@ -0,0 +1,72 @@
+"""Tests for the content-addressed blob store."""
+import json
+
+from backend.db import blob_store
+from backend.db.connect import get_conn
+
+
+def _candles(n, base=100.0):
+    return [
+        {"start_time": f"2026-01-01T{i % 24:02d}:00:00Z", "open": base + i, "high": base + i + 1,
+         "low": base + i - 1, "close": base + i + 0.5, "volume": 1000.0 + i}
+        for i in range(n)
+    ]
+
+
+def test_large_payload_stored_once_compressed(test_db):
+    candles = _candles(300)
+    ref = blob_store.put_json(candles)
+    assert blob_store.is_ref(ref)
+    assert blob_store.put_json(candles) == ref  # same content, same reference
+
+    with get_conn() as conn:
+        rows = conn.execute("SELECT codec, raw_size, stored_size FROM blobs").fetchall()
+    assert len(rows) == 1
+    assert rows[0]["codec"] in ("zstd", "zlib")
+    assert rows[0]["stored_size"] < rows[0]["raw_size"] / 2
+    assert blob_store.load_json(ref) == candles
+
+
+def test_small_and_legacy_values_pass_through(test_db):
+    assert blob_store.put_json([1, 2, 3]) == "[1, 2, 3]"
+    legacy = json.dumps(_candles(50))
+    assert blob_store.resolve(legacy) == legacy
+    assert blob_store.load_json(None, default=[]) == []
+    assert blob_store.load_json("blob:" + "0" * 64, default=[]) == []
+
+
+def test_externalize_candle_batches(test_db):
+    candles = _candles(200)
+    with get_conn() as conn:
+        conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES ('run_b', 't_default', 'COMPLETED')")
+        for i in range(3):  # three runs' worth of the same series
+            conn.execute(
+                """INSERT INTO market_candles_batches (batch_id, run_id, symbol, window, candles_json, query_params_json)
+                   VALUES (?, 'run_b', 'BTC-USD', '1h', ?, '{}')""",
+                (f"batch_{i}", json.dumps(candles)),
+            )
+        conn.commit()
+
+    assert blob_store.externalize_candle_batches() == 3
+    assert blob_store.externalize_candle_batches() == 0
+    with get_conn() as conn:
+        refs = {r["candles_json"] for r in conn.execute("SELECT candles_json FROM market_candles_batches")}
+        blob_count = conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert len(refs) == 1 and blob_store.is_ref(refs.pop())
+    assert blob_count == 1
+
+
+def test_evals_read_blob_references(test_db):
+    from backend.evals.coinbase_integrity import evaluate_coinbase_data_integrity
+
+    candles = _candles(24)
+    with get_conn() as conn:
+        conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES ('run_e', 't_default', 'COMPLETED')")
+        conn.execute(
+            """INSERT INTO market_candles_batches (batch_id, run_id, symbol, window, candles_json, query_params_json)
+               VALUES ('batch_e', 'run_e', 'BTC-USD', '1h', ?, '{}')""",
+            (blob_store.put_json(candles, conn=conn, inline_max=0),),
+        )
+        conn.commit()
+    result = evaluate_coinbase_data_integrity("run_e", "t_default")
+    assert result["details"]["symbols"]["BTC-USD"]["candle_count"] == 24
@@ -0,0 +1,91 @@
+"""Tests for the bounded TTL/LRU cache primitive and its registry."""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.cache import TTLCache, cache_stats, get_cache
+
+
+def test_lru_ttl_and_byte_budget():
+    cache = TTLCache("test_lru", maxsize=3, ttl=60, register=False)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # a is now most recently used
+    cache.set("d", "D")
+    assert "b" not in cache and len(cache) == 3
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("short", 1, ttl=-1)
+    assert cache.get("short") is None
+    assert cache.stats()["expirations"] == 1
+
+    sized = TTLCache("test_bytes", maxsize=100, max_bytes=100, sizeof=lambda v: v, register=False)
+    sized.set("x", 60)
+    sized.set("y", 30)
+    sized.set("z", 30)  # over budget: the oldest entry goes
+    assert "x" not in sized and sized.stats()["bytes"] == 60
+
+    # Caches without a budget still report their size
+    unbudgeted = TTLCache("test_unbudgeted", register=False)
+    unbudgeted.set("k", "v" * 1000)
+    assert unbudgeted.stats()["bytes"] >= 1000
+    unbudgeted.pop("k")
+    assert unbudgeted.stats()["bytes"] == 0
+
+
+def test_single_flight_threads():
+    cache = TTLCache("test_flight", ttl=60, register=False)
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["value"] * 5 and len(calls) == 1
+    assert cache.get_or_load("k", slow_loader) == "value" and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_async():
+    cache = TTLCache("test_aflight", ttl=60, register=False)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    assert await asyncio.gather(*(cache.aget_or_load("k", loader) for _ in range(5))) == [42] * 5
+    assert len(calls) == 1 and cache.stats()["loads"] == 1
+
+
+def test_registry_stats_and_flush_endpoint(test_db):
+    from backend.api.main import app
+    from backend.api.middleware import rate_limit, sse_tracker  # noqa: F401  (register their caches)
+    from backend.services.pre_confirm_insight import _cache_set
+
+    _cache_set("registry_key", {"headline": "cached"})
+    names = {s["name"] for s in cache_stats()}
+    assert {"pre_confirm_insight", "rate_limit", "sse_connections"} <= names
+
+    client = TestClient(app)
+    listed = client.get("/api/v1/ops/caches").json()["caches"]
+    assert any(c["name"] == "pre_confirm_insight" and c["entries"] >= 1 for c in listed)
+
+    resp = client.post("/api/v1/ops/caches/pre_confirm_insight/flush")
+    assert resp.status_code == 200 and resp.json()["flushed"] >= 1
+    assert len(get_cache("pre_confirm_insight")) == 0
+    assert client.post("/api/v1/ops/caches/no_such_cache/flush").status_code == 404
+
+    metrics = client.get("/api/v1/metrics").text
+    assert 'cache_hits_total{cache="pre_confirm_insight"}' in metrics
@@ -0,0 +1,113 @@
+"""Tests for multi-resolution candle rollups and chart downsampling."""
+import math
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from backend.db.connect import get_conn
+from backend.services import candle_rollups as cr
+
+DAY0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _hourly(n, start=DAY0, price=lambda i: 100.0 + i):
+    return [
+        {
+            "start_time": (start + timedelta(hours=i)).isoformat(),
+            "open": price(i), "high": price(i) + 1, "low": price(i) - 1, "close": price(i) + 0.5, "volume": 1.0,
+        }
+        for i in range(n)
+    ]
+
+
+def test_hourly_candles_roll_up_to_4h_and_1d(test_db):
+    assert cr.record_candles("BTC-USD", "ONE_HOUR", _hourly(30)) == 30
+    four_hour = cr.read_range("BTC", cr.FOUR_HOURS, DAY0, DAY0 + timedelta(days=2))
+    assert len(four_hour) == 8  # 7 full buckets + a partial one
+    assert four_hour[0] == {"bucket_start": int(DAY0.timestamp()), "open": 100.0, "high": 104.0,
+                            "low": 99.0, "close": 103.5, "volume": 4.0}
+    days = cr.read_range("BTC", cr.DAY, DAY0, DAY0 + timedelta(days=2))
+    assert [(d["open"], d["high"], d["low"], d["close"]) for d in days] == [
+        (100.0, 124.0, 99.0, 123.5), (124.0, 130.0, 123.0, 129.5),
+    ]
+
+    # Incremental: a later candle only updates its own parent buckets
+    cr.record_candles("BTC", "1h", _hourly(1, start=DAY0 + timedelta(hours=30), price=lambda i: 50.0))
+    days = cr.read_range("BTC", cr.DAY, DAY0, DAY0 + timedelta(days=2))
+    assert days[0]["close"] == 123.5 and days[1]["low"] == 49.0 and days[1]["close"] == 50.5
+
+    # Rollups never replace a native candle of the same resolution
+    cr.record_candles("BTC", "ONE_DAY", [{"start_time": DAY0.isoformat(), "open": 1, "high": 2, "low": 0.5, "close": 1.5}])
+    cr.record_candles("BTC", "1h", _hourly(1))
+    assert cr.read_range("BTC", cr.DAY, DAY0, DAY0)[0]["close"] == 1.5
+    assert cr.record_candles("BTC", "FIFTEEN_MINUTE", _hourly(2)) == 0
+
+
+def test_planner_prefers_coarsest_fitting_resolution():
+    assert cr.plan_resolutions(3600)[0] == cr.MINUTE
+    assert cr.plan_resolutions(86400)[0] == cr.FIVE_MINUTES
+    assert cr.plan_resolutions(7 * 86400)[0] == cr.HOUR
+    assert cr.plan_resolutions(30 * 86400) == [cr.FOUR_HOURS, cr.HOUR, cr.FIVE_MINUTES, cr.MINUTE, cr.DAY]
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    points = [(i, math.sin(i / 10.0) + (5.0 if i == 137 else 0.0)) for i in range(1000)]
+    sampled = cr.lttb(points, 50)
+    assert len(sampled) == 50
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (137, points[137][1]) in sampled
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+    assert cr.lttb(points[:10], 50) == points[:10]
+
+
+def test_candles_endpoint_reads_rollups(test_db, monkeypatch):
+    from backend.api.main import app
+
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = now - timedelta(days=29)
+    # Older rows in market_candles are backfilled on first read
+    with get_conn() as conn:
+        for c in _hourly(24 * 29, start=start):
+            conn.execute(
+                """INSERT INTO market_candles (id, symbol, interval, start_time, end_time, open, high, low, close, volume)
+                   VALUES (?, 'ETH-USD', '1h', ?, ?, ?, ?, ?, ?, ?)""",
+                ("c_" + c["start_time"], c["start_time"], c["start_time"], c["open"], c["high"], c["low"],
+                 c["close"], c["volume"]),
+            )
+        conn.commit()
+    monkeypatch.setattr(
+        "backend.providers.coinbase_market_data.CoinbaseMarketDataProvider.get_candles",
+        lambda *a, **k: (_ for _ in ()).throw(AssertionError("network fallback used")),
+    )
+
+    client = TestClient(app)
+    body = client.get("/api/v1/market/candles", params={"symbol": "ETH-USD", "range": "30D", "points": 100}).json()
+    assert body["meta"]["source"] == "candle_rollups"
+    assert body["meta"]["resolution_seconds"] == cr.FOUR_HOURS
+    assert body["meta"]["rows_read"] >= 170
+    assert len(body["candles"]) == 100
+    assert body["candles"][-1]["close"] == 100.0 + 24 * 29 - 1 + 0.5
+
+    body = client.get("/api/v1/market/candles", params={"symbol": "ETH", "range": "7D"}).json()
+    assert body["meta"]["resolution_seconds"] == cr.HOUR
+    assert 160 <= len(body["candles"]) <= 169
+
+
+def test_candles_endpoint_live_fallback(test_db, monkeypatch):
+    from backend.api.main import app
+
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=12)
+    live = _hourly(10, start=start) + [{"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0}]
+    provider = "backend.providers.coinbase_market_data.CoinbaseMarketDataProvider.get_candles"
+    monkeypatch.setattr(provider, lambda *a, **k: live)
+
+    client = TestClient(app)
+    body = client.get("/api/v1/market/candles", params={"symbol": "SOL-USD", "range": "24H"}).json()
+    assert body["meta"]["source"] == "coinbase_public"
+    assert len(body["candles"]) == 10  # the row with no timestamp is skipped
+
+    # A failed downsample leaves the rollup result, labelled as such
+    monkeypatch.setattr(provider, lambda *a, **k: [dict(c, start_time="not a time") for c in _hourly(20, start=start)])
+    body = client.get("/api/v1/market/candles", params={"symbol": "ADA-USD", "range": "24H", "points": 10}).json()
+    assert body["meta"]["source"] == "candle_rollups"
+    assert body["candles"] == []
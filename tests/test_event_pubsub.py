@@ -0,0 +1,94 @@
+"""Tests for cross-thread / cross-loop delivery in the SSE event bus."""
+import asyncio
+import threading
+
+import pytest
+
+from backend.core.background_loop import BackgroundLoop
+from backend.orchestrator.event_pubsub import EventPubSub
+
+
+def _event(n):
+    return {"event_type": "STEP", "payload": {"n": n}, "ts": "2026-01-01T00:00:00Z"}
+
+
+@pytest.mark.asyncio
+async def test_publish_from_thread_without_loop_reaches_subscriber():
+    bus = EventPubSub()
+    queue = await bus.subscribe("run_1")
+
+    thread = threading.Thread(target=lambda: [bus.publish_threadsafe("run_1", _event(i)) for i in range(3)])
+    thread.start()
+    thread.join()
+
+    received = [await asyncio.wait_for(queue.get(), timeout=1.0) for _ in range(3)]
+    assert [e["payload"]["n"] for e in received] == [0, 1, 2]
+    stats = bus.stats()
+    assert stats["cross_loop"] == 3 and stats["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_loop_reaches_subscriber():
+    """A run executed via asyncio.run() in a worker thread (confirmed trades) streams to SSE."""
+    bus = EventPubSub()
+    queue = await bus.subscribe("run_1")
+
+    async def run_on_worker_loop():
+        for i in range(5):
+            await bus.publish("run_1", _event(i))
+
+    thread = threading.Thread(target=lambda: asyncio.run(run_on_worker_loop()))
+    thread.start()
+    await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+    received = [await asyncio.wait_for(queue.get(), timeout=1.0) for _ in range(5)]
+    assert [e["payload"]["n"] for e in received] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_same_loop_publish_is_delivered_immediately():
+    bus = EventPubSub()
+    queue = await bus.subscribe("run_1")
+    await bus.publish("run_1", _event(1))
+    assert queue.get_nowait()["payload"]["n"] == 1
+    assert bus.stats()["cross_loop"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_closed_loop_count_as_dropped():
+    bus = EventPubSub(max_queue_size=2)
+    queue = await bus.subscribe("run_1")
+    for i in range(3):
+        await bus.publish("run_1", _event(i))
+    assert queue.qsize() == 2
+
+    # Subscriber whose loop has since gone away (e.g. a finished worker run)
+    async def subscribe_and_exit():
+        await bus.subscribe("run_2")
+    await asyncio.get_running_loop().run_in_executor(None, asyncio.run, subscribe_and_exit())
+    await bus.publish("run_2", _event(0))
+
+    assert bus.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_stops_delivery():
+    bus = EventPubSub()
+    queue = await bus.subscribe("run_1")
+    await bus.unsubscribe("run_1", queue)
+    await bus.publish("run_1", _event(1))
+    assert queue.empty()
+    assert bus.stats()["subscriptions"] == 0
+
+
+def test_background_loop_runs_coroutines_from_sync_code():
+    bg = BackgroundLoop(name="test-background-loop")
+
+    async def double(x):
+        await asyncio.sleep(0)
+        return 2 * x
+
+    assert bg.run(double(21), timeout=5) == 42
+    assert bg.submit(double(5)).result(timeout=5) == 10
+    # One loop thread serves every call
+    assert bg.loop.is_running()
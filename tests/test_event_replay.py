@@ -0,0 +1,62 @@
+"""Tests for chunked and compacted run_events replay."""
+import json
+
+from backend.db.connect import get_conn
+from backend.orchestrator import event_replay
+
+
+def _seed_events(run_id):
+    big_result = {"returns_by_symbol": {f"SYM{i}": i / 1000 for i in range(300)}}
+    step = {"step_id": "s1", "step_name": "research", "status": "completed"}
+    events = [
+        ("RUN_CREATED", {"run_id": run_id}),
+        ("RUN_STATUS", {"status": "RUNNING"}),
+        ("STEP_STARTED", {"step_id": "s1", "step_name": "research"}),
+        ("NODE_STARTED", {"node_id": "n1", "node_name": "research"}),
+        ("STEP_COMPLETED", step),
+        ("STEP_FINISHED", step),
+        ("NODE_FINISHED", {"node_id": "n1", "node_name": "research", "result": big_result}),
+        ("STEP_STARTED", {"step_id": "s2", "step_name": "signals"}),
+        ("RUN_STATUS", {"status": "COMPLETED"}),
+    ]
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, tenant_id, status) VALUES (?, 't_default', 'COMPLETED')", (run_id,)
+        )
+        for i, (event_type, payload) in enumerate(events):
+            conn.execute(
+                """INSERT INTO run_events (id, run_id, tenant_id, event_type, payload_json, ts)
+                   VALUES (?, ?, 't_default', ?, ?, ?)""",
+                (f"evt_{run_id}_{i}", run_id, event_type, json.dumps(payload), f"2026-01-01T00:00:{i:02d}Z"),
+            )
+        conn.commit()
+    return events
+
+
+def test_full_replay_is_chunked_and_passes_payloads_through(test_db):
+    events = _seed_events("run_rp1")
+    chunks = list(event_replay.iter_replay("run_rp1", chunk_size=4))
+    assert [len(c[0]) for c in chunks] == [4, 4, 1]
+
+    replayed = [json.loads(text) for chunk, _ in chunks for _, text in chunk]
+    assert [e["event_type"] for e in replayed] == [t for t, _ in events]
+    assert replayed[6]["payload"] == events[6][1]
+
+    # Resuming after a chunk's cursor returns only the rest
+    rest = [text for chunk, _ in event_replay.iter_replay("run_rp1", after=chunks[0][1]) for _, text in chunk]
+    assert len(rest) == 5
+
+
+def test_compacted_replay_drops_superseded_and_stubs_large(test_db):
+    _seed_events("run_rp2")
+    snapshot = json.loads(event_replay.replay_snapshot("run_rp2"))
+    types = [e["event_type"] for e in snapshot["events"]]
+    assert types == ["RUN_CREATED", "STEP_COMPLETED", "NODE_FINISHED", "STEP_STARTED", "RUN_STATUS"]
+    assert snapshot["events"][-1]["payload"] == {"status": "COMPLETED"}
+    assert snapshot["cursor"].endswith("|9")
+
+    stub = snapshot["events"][2]["payload"]
+    assert stub["node_name"] == "research" and "result" not in stub
+    full = json.loads(event_replay.get_event_payload("run_rp2", stub["payload_ref"]))
+    assert len(full["result"]["returns_by_symbol"]) == 300
+    assert stub["payload_bytes"] > event_replay.INLINE_PAYLOAD_MAX
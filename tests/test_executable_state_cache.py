@@ -0,0 +1,78 @@
+"""Tests for the cached, versioned executable-state service."""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.services import executable_state as es
+from backend.services.trade_preflight import run_preflight
+
+PAGES = {
+    None: {"accounts": [{"currency": "USD", "available_balance": {"value": "100"}, "hold": {"value": "0"}}],
+           "has_next": True, "cursor": "p2"},
+    "p2": {"accounts": [{"currency": "BTC", "available_balance": {"value": "0.5"}, "hold": {"value": "0.1"}}],
+           "has_next": False, "cursor": ""},
+}
+
+
+class _Signer:
+    def _get_headers(self, method, path):
+        return {"Authorization": "Bearer test"}
+
+
+@pytest.fixture
+def live_accounts(monkeypatch):
+    calls = []
+
+    async def fake_fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"accounts": PAGES[None]["accounts"] + PAGES["p2"]["accounts"]}
+
+    monkeypatch.setattr(es, "_live_enabled", lambda: True)
+    monkeypatch.setattr(es, "_fetch_coinbase_accounts_async", fake_fetch)
+    monkeypatch.setattr(es, "_fetch_coinbase_accounts", lambda: pytest.fail("sync fetch while cached"))
+    es._snapshots.clear()
+    yield calls
+    es._snapshots.clear()
+
+
+@pytest.mark.asyncio
+async def test_accounts_are_paged_through_cursor(monkeypatch):
+    seen = []
+
+    def handler(request):
+        cursor = request.url.params.get("cursor")
+        seen.append((request.url.params.get("limit"), cursor))
+        return httpx.Response(200, json=PAGES[cursor])
+
+    monkeypatch.setattr(es, "CoinbaseProvider", _Signer)
+    payload = await es._fetch_coinbase_accounts_async(transport=httpx.MockTransport(handler))
+    assert [a["currency"] for a in payload["accounts"]] == ["USD", "BTC"]
+    assert seen == [("250", None), ("250", "p2")]
+
+
+@pytest.mark.asyncio
+async def test_one_accounts_call_per_turn_and_invalidation(live_accounts):
+    states = await asyncio.gather(*(es.get_executable_state("t1") for _ in range(4)))
+    assert len(live_accounts) == 1
+    assert len({s.version for s in states}) == 1
+    assert states[0].balances["BTC"].hold_qty == pytest.approx(0.1)
+
+    # Synchronous callers in the same turn share the snapshot
+    assert es.fetch_executable_state("t1").version == states[0].version
+
+    es.invalidate_executable_state("t1")  # e.g. our own order filled
+    refreshed = await es.get_executable_state("t1")
+    assert len(live_accounts) == 2 and refreshed.version > states[0].version
+
+    forced = await es.get_executable_state("t1", refresh=True)
+    assert len(live_accounts) == 3 and forced.version > refreshed.version
+
+    preflight = await run_preflight(
+        tenant_id="t1", side="SELL", asset="BTC", amount_usd=5.0, mode="LIVE",
+        executable_qty=0.5, hold_qty=0.1,
+        product_flags={"is_disabled": False, "trading_disabled": False, "limit_only": False, "cancel_only": False},
+        executable_state=forced,
+    )
+    assert preflight.to_dict()["state_version"] == forced.version
@@ -19,6 +19,7 @@ REQUIRED_MODULES = [
     "backend.core.symbols",
     "backend.core.security",
     "backend.core.redaction",
+    "backend.core.background_loop",
     # State machine
     "backend.orchestrator.state_machine",
     "backend.orchestrator.runner",
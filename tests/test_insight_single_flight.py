@@ -0,0 +1,75 @@
+"""Tests for single-flight, stale-while-revalidate and prewarm of pre-confirm insights."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.db.connect import get_conn
+from backend.services import pre_confirm_insight as pci
+
+NEWS_META = {"asset_queries": ["BTC"], "asset_status": "ok", "asset_reason": "", "asset_category": "MAJOR"}
+
+
+@pytest.fixture
+def fake_sources():
+    pci._insight_cache.clear()
+    calls = []
+
+    async def fake_price(asset):
+        calls.append(asset)
+        await asyncio.sleep(0.05)
+        return {"price": 50000.0 + len(calls), "change_24h_pct": 1.0, "price_source": "test"}
+
+    with patch.object(pci, "_fetch_price_data", side_effect=fake_price), \
+         patch.object(pci, "_fetch_headlines", return_value=([], [], False, NEWS_META)), \
+         patch.object(pci, "_is_llm_available", return_value=False):
+        yield calls
+    pci._insight_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_build(fake_sources):
+    results = await asyncio.gather(
+        *(pci.generate_insight("BTC", "BUY", 101.0, request_id=f"req_{i}") for i in range(5)),
+        pci.generate_insight("btc", "buy", 99.0, request_id="req_case"),  # same bucket, other casing
+    )
+    assert len(fake_sources) == 1
+    assert [r["request_id"] for r in results] == [f"req_{i}" for i in range(5)] + ["req_case"]
+    # Each caller gets its own dict
+    results[0]["current_step_asset"] = "BTC"
+    assert "current_step_asset" not in results[1]
+
+
+@pytest.mark.asyncio
+async def test_stale_insight_served_while_refreshing(fake_sources):
+    first = await pci.generate_insight("BTC", "BUY", 100.0, request_id="r1")
+    ck = pci._cache_key("BTC", "BUY", 100.0, "PAPER", True, 24, "CRYPTO")
+    cached = pci._insight_cache.get(ck)
+    pci._insight_cache.set(ck, cached, ttl=-1)  # expired, but within the stale window
+
+    second = await pci.generate_insight("BTC", "BUY", 100.0, request_id="r2")
+    assert second["headline"] == first["headline"] and len(fake_sources) == 1
+
+    await asyncio.sleep(0.2)  # background refresh completes
+    assert len(fake_sources) == 2
+    fresh, stale = pci._insight_cache.get_stale(ck)
+    assert fresh is not None and not stale
+
+
+@pytest.mark.asyncio
+async def test_prewarm_builds_most_traded(test_db, fake_sources):
+    with get_conn() as conn:
+        conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES ('run_pw', 't_default', 'COMPLETED')")
+        for i, (symbol, notional) in enumerate([("BTC-USD", 50.0)] * 3 + [("ETH-USD", 20.0)] * 2 + [("SOL-USD", 5.0)]):
+            conn.execute(
+                """INSERT INTO orders (order_id, run_id, tenant_id, provider, symbol, side, order_type,
+                                       notional_usd, status, created_at)
+                   VALUES (?, 'run_pw', 't_default', 'PAPER', ?, 'BUY', 'MARKET', ?, 'FILLED', datetime('now'))""",
+                (f"o_pw_{i}", symbol, notional),
+            )
+        conn.commit()
+
+    assert await pci.prewarm_insights("t_default", limit=2) == 2
+    assert sorted(fake_sources) == ["BTC", "ETH"]
+    await pci.generate_insight("ETH", "BUY", 20.0, request_id="after_prewarm")
+    assert len(fake_sources) == 2
@@ -169,3 +169,31 @@ class TestEdgeCases:
     def test_mixed_intent(self):
         # Should prioritize trade execution if buy/sell present
         assert classify_intent("Buy BTC and analyze volatility") == IntentType.TRADE_EXECUTION
+
+
+class TestCompiledFrontEnd:
+    """Test the shared single-pass feature extraction."""
+    
+    def test_automaton_matches_substring_semantics(self):
+        from backend.agents.text_features import KeywordAutomaton
+        keywords = ["he", "she", "his", "hers", "market order", "order"]
+        automaton = KeywordAutomaton(keywords)
+        for text in ["ushers", "place a market order now", "nothing here", "hishe"]:
+            assert automaton.find(text) == {kw for kw in keywords if kw in text}
+    
+    def test_features_are_shared_per_text(self):
+        from backend.agents.text_features import extract_features
+        assert extract_features("Buy $10 of BTC") is extract_features("Buy $10 of BTC")
+        features = extract_features("  Sell   my ETH  ")
+        assert features.normalized == "sell my eth"
+        assert features.has_any("trade_execution")
+    
+    def test_classify_many_preserves_order(self):
+        from backend.agents.intent_router import classify_many
+        texts = ["Hi", "Buy $10 of BTC", "Show my portfolio", "", "Hi"]
+        assert classify_many(texts) == [classify_intent(t) for t in texts]
+    
+    def test_longest_alias_wins(self):
+        from backend.agents.trade_parser import parse_trade_command
+        assert parse_trade_command("Buy $10 of internet computer").asset == "ICP"
+        assert parse_trade_command("Buy $10 of bank of america stock").asset == "BAC"
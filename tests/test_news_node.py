@@ -10,13 +10,18 @@ def mock_conn():
         m.return_value.__enter__.return_value = mock_db
         yield mock_db
 
+@pytest.fixture
+def mock_signals():
+    with patch("backend.orchestrator.nodes.news_node.node_outputs", return_value={"top_symbol": "BTC"}) as m:
+        yield m
+
 @pytest.fixture
 def mock_news_service():
     with patch("backend.orchestrator.nodes.news_node.news_service") as m:
         yield m
 
 @pytest.mark.asyncio
-async def test_news_node_paper_mode(mock_conn, mock_news_service):
+async def test_news_node_paper_mode(mock_conn, mock_signals, mock_news_service):
     # Setup
     cursor = mock_conn.cursor.return_value
     
@@ -24,7 +29,6 @@ async def test_news_node_paper_mode(mock_conn, mock_news_service):
     cursor.fetchone.side_effect = [
         {"news_enabled": 1},  # news_enabled check
         {"execution_mode": "PAPER", "source_run_id": None, "created_at": "2024-01-01T10:00:00Z"}, # run details
-        {"outputs_json": json.dumps({"top_symbol": "BTC"})} # signals
     ]
     
     # 2. Mock create_brief
@@ -37,6 +41,7 @@ async def test_news_node_paper_mode(mock_conn, mock_news_service):
     mock_news_service.create_brief.assert_called_once()
     args, kwargs = mock_news_service.create_brief.call_args
     assert "BTC" in args[1] # candidates
+    mock_signals.assert_called_once_with("run_1", "signals")
     
     # Verify artifact storage
     assert cursor.execute.call_count >= 2 # select run, select signals, insert artifact
@@ -44,7 +49,7 @@ async def test_news_node_paper_mode(mock_conn, mock_news_service):
     assert insert_call
 
 @pytest.mark.asyncio
-async def test_news_node_replay_mode(mock_conn, mock_news_service):
+async def test_news_node_replay_mode(mock_conn, mock_signals, mock_news_service):
     # Setup
     cursor = mock_conn.cursor.return_value
     
@@ -52,7 +57,6 @@ async def test_news_node_replay_mode(mock_conn, mock_news_service):
     cursor.fetchone.side_effect = [
         {"news_enabled": 1},  # news_enabled check
         {"execution_mode": "REPLAY", "source_run_id": "source_1", "created_at": "2024-01-01T10:00:00Z"},
-        {"outputs_json": json.dumps({"top_symbol": "BTC"})}
     ]
     
     # 2. Mock create_brief_from_source
@@ -0,0 +1,92 @@
+"""Tests for scheduled, conditional news ingestion."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from backend.db.connect import get_conn
+from backend.providers.news import FeedItems, RSSProvider
+from backend.services.news_ingestion import NewsIngestionService
+from backend.services.news_scheduler import NewsIngestionScheduler, next_interval
+
+FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>Bitcoin climbs</title><link>http://feed.test/1</link>
+<pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate><description>BTC up</description></item>
+</channel></rss>"""
+
+
+def test_next_interval_backs_off():
+    assert next_interval(600, ["ok", "error"]) == 600
+    assert next_interval(600, ["error", "error", "ok"]) == 2400
+    assert next_interval(600, ["error"] * 20) == 6 * 3600
+    assert next_interval(600, ["not_modified", "empty", "ok"]) == 1200
+    assert next_interval(600, ["not_modified"] * 8) == 2400
+    assert next_interval(5, []) == 60
+
+
+@pytest.mark.asyncio
+async def test_rss_fetch_uses_validators():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=FEED, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 12:00:00 GMT"})
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    provider = RSSProvider()
+    with patch("backend.providers.news.rss_provider.httpx.AsyncClient", side_effect=client_factory):
+        first = await provider.fetch("src_test", "http://feed.test/rss")
+        second = await provider.fetch("src_test", "http://feed.test/rss", etag=first.etag,
+                                      last_modified=first.last_modified)
+
+    assert [item["title"] for item in first] == ["Bitcoin climbs"]
+    assert first.etag == '"v1"' and not first.not_modified
+    assert second.not_modified and list(second) == []
+    assert second.etag == '"v1"'
+    assert seen == [None, '"v1"']
+
+
+@pytest.mark.asyncio
+async def test_scheduler_stores_validators_and_schedules(test_db):
+    with get_conn() as conn:
+        conn.execute("UPDATE news_sources SET is_enabled = 0")
+        conn.execute(
+            "INSERT INTO news_sources (id, name, type, url, is_enabled, fetch_interval_seconds) VALUES (?, ?, ?, ?, 1, ?)",
+            ("src_test", "Test", "rss", "http://feed.test/rss", 600),
+        )
+        conn.commit()
+
+    service = NewsIngestionService()
+    service.rss_provider = AsyncMock()
+    service.rss_provider.fetch.return_value = FeedItems(etag='"v1"', last_modified="Mon, 01 Jan 2024 12:00:00 GMT")
+    scheduler = NewsIngestionScheduler(service=service)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    result = await scheduler.run_once(now)
+    assert result["sources_checked"] == 1
+    service.rss_provider.fetch.assert_called_once_with("src_test", "http://feed.test/rss")
+
+    with get_conn() as conn:
+        row = dict(conn.execute("SELECT * FROM news_sources WHERE id = 'src_test'").fetchone())
+        log = conn.execute("SELECT status FROM news_fetch_log WHERE source_id = 'src_test'").fetchall()
+    assert row["etag"] == '"v1"'
+    assert row["next_fetch_at"] == "2026-01-01T00:15:00Z"  # one idle fetch stretches 600s by half
+    assert [r["status"] for r in log] == ["empty"]
+
+    # Not due yet
+    assert scheduler.due_sources(now + timedelta(minutes=5)) == []
+
+    service.rss_provider.fetch.reset_mock()
+    service.rss_provider.fetch.return_value = FeedItems(etag='"v1"', not_modified=True)
+    await scheduler.run_once(now + timedelta(minutes=15))
+    service.rss_provider.fetch.assert_called_once_with(
+        "src_test", "http://feed.test/rss", etag='"v1"', last_modified="Mon, 01 Jan 2024 12:00:00 GMT"
+    )
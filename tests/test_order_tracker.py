@@ -0,0 +1,154 @@
+"""Tests for the async order tracker against a local stand-in for the Coinbase order endpoints."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.core.ids import new_id
+from backend.core.time import now_iso
+from backend.db.connect import get_conn
+from backend.services.order_tracker import CoinbaseOrderClient, OrderTracker, TrackedOrder
+
+
+class FakeExchange:
+    """Orders move OPEN -> PARTIALLY_FILLED -> FILLED over successive polls.
+
+    ``script`` lists the status returned per poll (the last entry repeats).
+    A fill is added whenever the status is PARTIALLY_FILLED or FILLED, one
+    per distinct step, so fills appear incrementally.
+    """
+
+    def __init__(self, scripts, latency=0.0):
+        self.scripts = scripts
+        self.latency = latency
+        self.polls = {oid: 0 for oid in scripts}
+        self.fills = {oid: [] for oid in scripts}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        path = request.url.path
+        if path.endswith("/historical/fills"):
+            oid = request.url.params["order_id"]
+            return httpx.Response(200, json={"fills": self.fills[oid]})
+        oid = path.rsplit("/", 1)[-1]
+        script = self.scripts[oid]
+        step = min(self.polls[oid], len(script) - 1)
+        self.polls[oid] += 1
+        status = script[step]
+        if status in ("PARTIALLY_FILLED", "FILLED") and len(self.fills[oid]) <= step:
+            self.fills[oid].append({
+                "trade_id": f"{oid}-t{step}", "product_id": "BTC-USD",
+                "price": "50000", "size": "0.0001", "commission": "0.01", "liquidity_indicator": "TAKER",
+            })
+        filled = sum(float(f["size"]) for f in self.fills[oid])
+        return httpx.Response(200, json={"order": {"order_id": oid, "status": status, "filled_size": str(filled)}})
+
+    def client(self):
+        return CoinbaseOrderClient(lambda m, p: {}, transport=httpx.MockTransport(self.handler))
+
+
+def _seed_orders(n):
+    run_id = new_id("run_")
+    order_ids = [new_id("ord_") for _ in range(n)]
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT INTO runs (run_id, tenant_id, status, execution_mode, created_at) VALUES (?, ?, ?, ?, ?)",
+            (run_id, "t_default", "RUNNING", "LIVE", now_iso()),
+        )
+        for oid in order_ids:
+            conn.execute(
+                """INSERT INTO orders (order_id, run_id, tenant_id, provider, symbol, side, order_type,
+                                       notional_usd, status, created_at)
+                   VALUES (?, ?, 't_default', 'COINBASE', 'BTC-USD', 'BUY', 'MARKET', 10.0, 'SUBMITTED', ?)""",
+                (oid, run_id, now_iso()),
+            )
+        conn.commit()
+    return run_id, order_ids
+
+
+def _tracker(exchange, **kwargs):
+    kwargs.setdefault("min_interval", 0.01)
+    kwargs.setdefault("max_interval", 0.05)
+    return OrderTracker(exchange.client(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_track_many_polls_orders_concurrently(test_db):
+    run_id, order_ids = _seed_orders(5)
+    script = ["OPEN", "OPEN", "PARTIALLY_FILLED", "FILLED"]
+    exchange = FakeExchange({oid: script for oid in order_ids}, latency=0.05)
+    tracker = _tracker(exchange)
+
+    started = time.perf_counter()
+    results = await tracker.track_many(
+        TrackedOrder(order_id=oid, tenant_id="t_default", run_id=run_id) for oid in order_ids
+    )
+    elapsed = time.perf_counter() - started
+
+    assert all(r.status == "FILLED" and r.terminal for r in results.values())
+    # Serial polling would take >= 5 orders x 4 polls x 50ms latency
+    assert elapsed < 0.5, elapsed
+
+
+@pytest.mark.asyncio
+async def test_transitions_written_only_on_status_change(test_db):
+    run_id, (oid,) = _seed_orders(1)
+    exchange = FakeExchange({oid: ["OPEN"] * 5 + ["PARTIALLY_FILLED", "FILLED"]})
+    result = await _tracker(exchange).track(TrackedOrder(order_id=oid, tenant_id="t_default", run_id=run_id))
+
+    assert result.polls == 7
+    assert result.transitions == ["OPEN", "PARTIALLY_FILLED", "FILLED"]
+    with get_conn() as conn:
+        events = [r["event_type"] for r in conn.execute(
+            "SELECT event_type FROM order_events WHERE order_id = ? ORDER BY ts", (oid,)
+        )]
+        order = conn.execute("SELECT * FROM orders WHERE order_id = ?", (oid,)).fetchone()
+    assert events == ["OPEN", "PARTIALLY_FILLED", "FILLED"]
+    assert order["status"] == "FILLED"
+
+
+@pytest.mark.asyncio
+async def test_fills_deduplicated_stored_and_published(test_db):
+    run_id, (oid,) = _seed_orders(1)
+    exchange = FakeExchange({oid: ["OPEN", "PARTIALLY_FILLED", "PARTIALLY_FILLED", "FILLED"]})
+    published = []
+
+    async def publish(rid, event):
+        published.append((rid, event))
+
+    tracker = _tracker(exchange, publish=publish)
+    result = await tracker.track(TrackedOrder(order_id=oid, tenant_id="t_default", run_id=run_id))
+
+    # Fills list is re-fetched on every filling poll; each trade is stored once
+    assert len(result.fills) == 3
+    with get_conn() as conn:
+        fills = conn.execute("SELECT trade_id FROM fills WHERE order_id = ?", (oid,)).fetchall()
+        order = conn.execute("SELECT filled_qty, avg_fill_price, total_fees FROM orders WHERE order_id = ?",
+                             (oid,)).fetchone()
+    assert sorted(f["trade_id"] for f in fills) == [f"{oid}-t1", f"{oid}-t2", f"{oid}-t3"]
+    assert order["filled_qty"] == pytest.approx(0.0003)
+    assert order["avg_fill_price"] == pytest.approx(50000.0)
+    assert order["total_fees"] == pytest.approx(0.03)
+
+    fill_events = [e for rid, e in published if e["event_type"] == "ORDER_FILL"]
+    assert [e["payload"]["trade_id"] for e in fill_events] == [f"{oid}-t1", f"{oid}-t2", f"{oid}-t3"]
+    assert all(rid == run_id for rid, _ in published)
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_last_known_status(test_db):
+    run_id, (oid,) = _seed_orders(1)
+    exchange = FakeExchange({oid: ["OPEN"]})
+    tracker = _tracker(exchange, timeout_seconds=0.2)
+    result = await tracker.track(TrackedOrder(order_id=oid, tenant_id="t_default", run_id=run_id))
+
+    assert result.ended == "TIMEOUT"
+    assert result.status == "OPEN"
+    # Backoff kicks in while the order is idle
+    assert result.polls < 0.2 / 0.01
+    with get_conn() as conn:
+        order = conn.execute("SELECT status, status_reason FROM orders WHERE order_id = ?", (oid,)).fetchone()
+    assert order["status"] == "OPEN"
+    assert order["status_reason"] == "Polling ended: TIMEOUT"
@@ -0,0 +1,79 @@
+"""Tests for the incremental PnL / drawdown ledger."""
+import pytest
+
+from backend.db.connect import get_conn
+from backend.services import pnl_ledger
+
+TENANT = "t_default"
+
+
+def _snapshot(snapshot_id, value, ts):
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO portfolio_snapshots (snapshot_id, tenant_id, balances_json, positions_json, total_value_usd, ts)
+               VALUES (?, ?, '{}', '{}', ?, ?)""",
+            (snapshot_id, TENANT, value, ts),
+        )
+        conn.commit()
+
+
+def _order(order_id, side, qty, price, created_at, fees=0.0, status="FILLED"):
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, tenant_id, status) VALUES ('run_ledger', ?, 'COMPLETED')", (TENANT,)
+        )
+        conn.execute(
+            """INSERT INTO orders (order_id, run_id, tenant_id, provider, symbol, side, order_type, qty,
+                                   notional_usd, status, created_at, filled_qty, avg_fill_price, total_fees)
+               VALUES (?, 'run_ledger', ?, 'PAPER', 'BTC-USD', ?, 'MARKET', ?, ?, ?, ?, ?, ?, ?)""",
+            (order_id, TENANT, side, qty, qty * price, status, created_at, qty, price, fees),
+        )
+        conn.commit()
+
+
+def test_drawdown_and_daily_buckets(test_db):
+    _snapshot("s1", 100.0, "2026-03-01T09:00:00Z")
+    _snapshot("s2", 120.0, "2026-03-01T12:00:00Z")
+    _snapshot("s3", 90.0, "2026-03-01T18:00:00Z")
+    _snapshot("s4", 108.0, "2026-03-02T10:00:00Z")
+
+    assert pnl_ledger.sync_ledger(TENANT) == {"snapshots": 4, "orders": 0}
+    days = pnl_ledger.get_daily(TENANT)
+    assert [d["day"] for d in days] == ["2026-03-01", "2026-03-02"]
+    assert days[0]["start_value"] == 100.0 and days[0]["end_value"] == 90.0
+    assert days[0]["max_drawdown_pct"] == pytest.approx(25.0)
+    assert days[1]["peak_value"] == 120.0 and days[1]["drawdown_pct"] == pytest.approx(10.0)
+
+    # Only new rows are folded on the next sync
+    assert pnl_ledger.sync_ledger(TENANT) == {"snapshots": 0, "orders": 0}
+    _snapshot("s5", 130.0, "2026-03-02T20:00:00Z")
+    assert pnl_ledger.sync_ledger(TENANT)["snapshots"] == 1
+    state = pnl_ledger.get_ledger_state(TENANT)
+    assert state["peak_value"] == 130.0
+    assert state["drawdown_pct"] == 0.0
+    assert state["max_drawdown_pct"] == pytest.approx(25.0)
+
+
+def test_fills_update_positions_and_realized_pnl(test_db):
+    _order("o1", "BUY", 1.0, 100.0, "2026-03-01T09:00:00Z", fees=1.0)
+    _order("o2", "BUY", 1.0, 120.0, "2026-03-01T10:00:00Z", fees=1.0)
+    _order("o3", "BUY", 5.0, 100.0, "2026-03-01T11:00:00Z", status="OPEN")
+
+    assert pnl_ledger.sync_ledger(TENANT)["orders"] == 2
+    assert pnl_ledger.get_positions(TENANT) == {"BTC": {"qty": 2.0, "cost_basis": 222.0}}
+
+    _order("o4", "SELL", 1.0, 150.0, "2026-03-02T09:00:00Z", fees=2.0)
+    assert pnl_ledger.sync_ledger(TENANT)["orders"] == 1
+    days = pnl_ledger.get_daily(TENANT)
+    assert [d["trades_count"] for d in days] == [2, 1]
+    # 150 proceeds - 111 average cost - 2 fees
+    assert days[1]["realized_pnl"] == pytest.approx(37.0)
+    assert pnl_ledger.get_ledger_state(TENANT)["realized_pnl"] == pytest.approx(37.0)
+    assert pnl_ledger.get_positions(TENANT)["BTC"]["qty"] == pytest.approx(1.0)
+
+    # The open order is applied once it fills
+    with get_conn() as conn:
+        conn.execute("UPDATE orders SET status = 'FILLED' WHERE order_id = 'o3'")
+        conn.commit()
+    assert pnl_ledger.sync_ledger(TENANT)["orders"] == 1
+    assert pnl_ledger.get_positions(TENANT)["BTC"]["qty"] == pytest.approx(6.0)
@@ -417,12 +417,11 @@ class TestInsightCache:
         assert result["headline"] == "cached"
 
     def test_cache_miss_after_eviction(self):
-        import time
         from backend.services.pre_confirm_insight import _cache_set, _cache_get, _insight_cache
 
         _cache_set("old_key", {"headline": "old"})
         # Manually expire
-        _insight_cache["old_key"] = ({"headline": "old"}, time.time() - 999)
+        _insight_cache.set("old_key", {"headline": "old"}, ttl=-1)
 
         result = _cache_get("old_key")
         assert result is None
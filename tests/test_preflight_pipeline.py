@@ -0,0 +1,77 @@
+"""Tests for concurrent multi-leg preflight and shared price resolution."""
+import asyncio
+import time
+
+import pytest
+
+from backend.services import market_data, trade_preflight
+from backend.services.trade_preflight import PreflightRejectReason, PreflightResult, run_preflights
+
+
+@pytest.mark.asyncio
+async def test_legs_run_concurrently_and_keep_command_order(monkeypatch):
+    running, peak = 0, 0
+
+    async def fake_preflight(**leg):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(leg["delay"])
+        running -= 1
+        if leg["asset"] == "BAD":
+            raise RuntimeError("preview exploded")
+        return PreflightResult(valid=True, requested_usd=leg["amount_usd"])
+
+    monkeypatch.setattr(trade_preflight, "run_preflight", fake_preflight)
+    legs = [
+        {"asset": "DOGE", "amount_usd": 1.0, "delay": 0.15},
+        {"asset": "SHIB", "amount_usd": 2.0, "delay": 0.05},
+        {"asset": "BAD", "amount_usd": 3.0, "delay": 0.0},
+        {"asset": "ETH", "amount_usd": 4.0, "delay": 0.1},
+        {"asset": "SLOW", "amount_usd": 5.0, "delay": 5.0},
+    ]
+
+    started = time.monotonic()
+    results = await run_preflights(legs, budget_seconds=0.5, max_concurrency=5)
+    assert time.monotonic() - started < 1.0
+    assert peak == 5
+
+    assert [r.requested_usd for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert [r.valid for r in results] == [True, True, False, True, False]
+    assert results[2].reason_code == PreflightRejectReason.PROVIDER_ERROR
+    assert results[4].reason_code == PreflightRejectReason.MARKET_UNAVAILABLE
+    assert "SLOW" in results[4].user_message
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(monkeypatch):
+    running, peak = 0, 0
+
+    async def fake_preflight(**leg):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return PreflightResult(valid=True)
+
+    monkeypatch.setattr(trade_preflight, "run_preflight", fake_preflight)
+    results = await run_preflights([{"asset": str(i)} for i in range(9)], max_concurrency=3)
+    assert len(results) == 9 and peak == 3
+    assert await run_preflights([]) == []
+
+
+@pytest.mark.asyncio
+async def test_prices_fetched_once_per_base_asset(monkeypatch):
+    calls = []
+
+    def fake_get_price(symbol):
+        calls.append(symbol)
+        if symbol == "NOPE":
+            raise market_data.MarketDataError("no price")
+        return {"BTC": 65000.0, "ETH": 3000.0}[symbol]
+
+    monkeypatch.setattr(market_data, "get_price", fake_get_price)
+    prices = await market_data.get_prices(["BTC", "btc-usd", "ETH", "BTC-USD", "NOPE", ""])
+    assert prices == {"BTC": 65000.0, "ETH": 3000.0, "NOPE": None}
+    assert sorted(calls) == ["BTC", "ETH", "NOPE"]
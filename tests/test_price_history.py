@@ -0,0 +1,76 @@
+"""Tests for the per-symbol price history store."""
+import time
+
+from backend.db.connect import get_conn
+from backend.services.price_history import PriceHistoryStore, get_price_history, to_epoch
+
+
+def test_price_at_latest_and_range(test_db):
+    store = get_price_history()
+    candles = [
+        {"start_time": f"2026-01-01T{h:02d}:00:00Z", "end_time": f"2026-01-01T{h + 1:02d}:00:00Z", "close": 100.0 + h}
+        for h in range(5)
+    ]
+    assert store.record_candles("BTC-USD", candles) == 5
+    store.record("BTC", 110.5, ts="2026-01-01T05:30:00Z")
+
+    assert store.price_at("BTC", "2026-01-01T00:59:59Z") is None
+    assert store.price_at("BTC-USD", "2026-01-01T03:30:00Z") == 102.0
+    assert store.price_at("BTC", "2026-01-01T09:00:00Z") == 110.5
+    assert store.price_at("BTC", "2026-01-01T09:00:00Z", max_age_seconds=3600) is None
+    assert store.latest(["BTC-USD", "ETH"]) == {"BTC-USD": 110.5}
+    assert store.latest(["BTC"], max_age_seconds=60) == {}
+    assert [p for _, p in store.range("BTC", "2026-01-01T02:00:00Z", "2026-01-01T04:00:00Z")] == [101.0, 102.0, 103.0]
+
+    # Out-of-order insert keeps the series sorted
+    store.record("BTC", 99.0, ts="2026-01-01T00:30:00Z")
+    assert store.price_at("BTC", "2026-01-01T00:45:00Z") == 99.0
+
+
+def test_loads_persisted_points_and_candles(test_db):
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO market_candles (id, symbol, interval, start_time, end_time, open, high, low, close, volume)
+               VALUES ('c1', 'ETH-USD', '1h', '2026-02-01T00:00:00Z', '2026-02-01T01:00:00Z', 1, 1, 1, 2000.0, 0)"""
+        )
+        conn.commit()
+    get_price_history().record("ETH", 2100.0, ts="2026-02-01T02:00:00Z")
+
+    deferred = get_price_history()
+    deferred.record("SOL", 150.0, ts="2026-02-01T02:00:00Z", defer=True)
+    deferred.flush()
+
+    fresh = PriceHistoryStore()  # as after a restart
+    assert fresh.price_at("ETH", "2026-02-01T01:30:00Z") == 2000.0
+    assert fresh.price_at("ETH", "2026-02-01T03:00:00Z") == 2100.0
+    assert fresh.latest(["SOL"]) == {"SOL": 150.0}
+    assert to_epoch("2026-02-01 02:00:00") == to_epoch("2026-02-01T02:00:00Z")
+
+
+def test_memory_holds_a_bounded_recent_window(test_db, monkeypatch):
+    from backend.services import price_history
+
+    monkeypatch.setattr(price_history, "MAX_POINTS_PER_SYMBOL", 10)
+    monkeypatch.setattr(price_history, "_TRIM_SLACK_POINTS", 5)
+    now = int(time.time())
+    store = PriceHistoryStore()
+    store.record_points("BTC", [(now - 3600 + i * 60, 100.0 + i) for i in range(30)], "candles")
+
+    series = store._get_series("BTC")
+    assert len(series) <= 15 and series.floor is not None
+    # Older points are read from the database
+    assert store.price_at("BTC", now - 3600 + 90) == 101.0
+    assert [p for _, p in store.range("BTC", now - 3600, now - 3600 + 120)] == [100.0, 101.0, 102.0]
+    assert len(store.range("BTC", now - 3600, now)) == 30
+
+    # A restart loads at most the window too
+    fresh = PriceHistoryStore()
+    assert fresh.price_at("BTC", now - 3600) == 100.0
+    assert len(fresh._get_series("BTC")) == 10
+
+
+def test_ticker_points_are_thinned(test_db):
+    store = PriceHistoryStore()
+    for second in range(0, 90, 5):
+        store.record("SOL", 150.0 + second, ts=1_800_000_000 + second, min_interval_seconds=30)
+    assert [p for _, p in store.range("SOL", 1_800_000_000, 1_800_000_100)] == [150.0, 180.0, 210.0]
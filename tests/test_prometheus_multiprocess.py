@@ -0,0 +1,110 @@
+"""Tests for multiprocess Prometheus aggregation and the runtime collectors."""
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from backend.api.routes import prometheus
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import sys
+from backend.api.routes import prometheus
+prometheus.record_run_success("test", 0.5)
+prometheus.sample_runtime()
+print("ready", flush=True)
+sys.stdin.readline()
+"""
+
+
+def _worker(metrics_dir):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(metrics_dir), PYTHONPATH=REPO_ROOT)
+    proc = subprocess.Popen(
+        [sys.executable, "-c", WORKER], cwd=REPO_ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    assert proc.stdout.readline().strip() == "ready"
+    return proc
+
+
+def _stop(proc):
+    proc.communicate("\n", timeout=60)
+
+
+def _aggregate(metrics_dir):
+    from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(metrics_dir))
+    return generate_latest(registry).decode()
+
+
+def test_workers_are_aggregated_in_multiprocess_mode(tmp_path):
+    first = _worker(tmp_path)
+    try:
+        # Workers that exit while another is alive keep their counts in the totals
+        for _ in range(2):
+            _stop(_worker(tmp_path))
+        output = _aggregate(tmp_path)
+    finally:
+        _stop(first)
+
+    assert 'run_success_total{mode="test"} 3.0' in output
+    assert 'run_duration_seconds_count{mode="test"} 3.0' in output
+    # One gauge series per metric, not one per worker
+    assert "db_connections_open " in output and 'db_connections_open{pid=' not in output
+
+
+def test_stale_metric_files_are_cleared_only_on_a_fresh_start(tmp_path):
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead_pid = int(dead.stdout)
+    (tmp_path / f"counter_{dead_pid}.db").write_bytes(b"")
+
+    # A live worker's files keep everything in place (its counts are part of the totals)
+    live = tmp_path / f"gauge_livesum_{os.getppid()}.db"
+    live.write_bytes(b"")
+    assert prometheus.clear_stale_metric_files(str(tmp_path)) == 0
+
+    live.unlink()
+    assert prometheus.clear_stale_metric_files(str(tmp_path)) == 1
+    assert not any(tmp_path.glob("*.db"))
+
+
+def test_metrics_endpoint_exports_runtime_collectors(test_db):
+    from backend.api.main import app
+
+    with TestClient(app) as client:
+        client.get("/api/v1/runs", headers={"X-Dev-Tenant": "t_default"})
+        text = client.get("/api/v1/metrics").text
+
+    for name in (
+        "db_query_duration_seconds_bucket",
+        "db_connections_open",
+        "db_connections_opened_total",
+        "event_bus_subscribers",
+        "event_bus_queue_depth",
+        "sse_connections",
+    ):
+        assert name in text, name
+
+
+def test_metrics_endpoint_samples_off_the_event_loop(test_db, monkeypatch):
+    import asyncio
+
+    from backend.api.main import app
+
+    sampled_on_loop = []
+
+    def sample():
+        try:
+            asyncio.get_running_loop()
+            sampled_on_loop.append(True)
+        except RuntimeError:
+            sampled_on_loop.append(False)
+
+    monkeypatch.setattr(prometheus, "sample_runtime", sample)
+    with TestClient(app) as client:
+        assert client.get("/api/v1/metrics").status_code == 200
+
+    assert sampled_on_loop == [False]
@@ -0,0 +1,84 @@
+"""Query-plan regression suite for the hot SQL catalog.
+
+Seeds a production-shaped database, runs ANALYZE, and asserts that every
+query in backend.db.query_catalog.HOT_QUERIES is served by an index
+(no full scans, no unexpected temp B-trees).
+"""
+import sqlite3
+
+import pytest
+
+from backend.db.query_catalog import HOT_QUERIES, explain, plan_violations, seed_table
+
+SEED_ROWS = {
+    "runs": 4000,
+    "dag_nodes": 16000,
+    "run_events": 20000,
+    "tool_calls": 12000,
+    "orders": 3000,
+    "order_events": 6000,
+    "portfolio_snapshots": 8000,
+    "eval_results": 12000,
+    "news_items": 5000,
+    "news_asset_mentions": 8000,
+    "conversations": 1000,
+    "messages": 10000,
+    "run_artifacts": 6000,
+    "market_candles": 10000,
+    "market_candles_batches": 4000,
+}
+
+
+@pytest.fixture(scope="module")
+def seeded_conn(tmp_path_factory):
+    import os
+    from backend.core.config import reset_settings
+    from backend.db.connect import init_db, reset_canonical_db_path
+
+    db_path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    old_url = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    reset_settings()
+    reset_canonical_db_path()
+    try:
+        init_db()
+        conn = sqlite3.connect(db_path)
+        for table, rows in SEED_ROWS.items():
+            seed_table(conn, table, rows)
+        conn.commit()
+        conn.execute("ANALYZE")
+        yield conn
+        conn.close()
+    finally:
+        if old_url is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = old_url
+        reset_settings()
+        reset_canonical_db_path()
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES, ids=[q.name for q in HOT_QUERIES])
+def test_hot_query_uses_index(seeded_conn, query):
+    violations = plan_violations(seeded_conn, query)
+    assert not violations, (
+        f"{query.name} ({query.source}) plan regressed: {violations}\n"
+        f"full plan: {explain(seeded_conn, query.sql, query.params)}"
+    )
+
+
+def test_violation_detected_without_index(seeded_conn):
+    """Guard the checker itself: dropping an index must surface a violation."""
+    query = next(q for q in HOT_QUERIES if q.name == "paper_portfolio_state")
+    db_path = seeded_conn.execute("PRAGMA database_list").fetchone()[2]
+    # Fresh connection with manual transactions: the module-level connection's
+    # statement cache would otherwise keep serving the pre-DROP plan.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        conn.execute("DROP INDEX idx_portfolio_snapshots_tenant_ts")
+        conn.execute("DROP INDEX idx_portfolio_snapshots_tenant_id")
+        assert plan_violations(conn, query)
+    finally:
+        conn.execute("ROLLBACK")
+        conn.close()
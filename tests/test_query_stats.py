@@ -0,0 +1,67 @@
+"""Tests for SQL statement instrumentation and query budgets."""
+from fastapi.testclient import TestClient
+
+from backend.db import query_stats
+from backend.db.connect import get_conn
+
+HEAVY_SQL = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 300000) SELECT SUM(x) FROM n"
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    shape = query_stats.normalize_sql(
+        "SELECT *\n  FROM runs WHERE tenant_id = 't_1' AND n > 10 AND id IN (?, ?,?) AND t_2.x = 1.5"
+    )
+    assert shape == "SELECT * FROM runs WHERE tenant_id = ? AND n > ? AND id IN (?, ...) AND t_2.x = ?"
+
+
+def test_scope_records_shapes_rows_and_repeats(test_db):
+    with get_conn() as conn:
+        for i in range(3):
+            conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES (?, 't_default', 'COMPLETED')", (f"r{i}",))
+        conn.commit()
+
+    with query_stats.scope("test") as log:
+        with get_conn() as conn:
+            rows = conn.execute("SELECT run_id FROM runs WHERE run_id LIKE 'r%'").fetchall()
+            for row in rows:
+                conn.execute(f"SELECT status FROM runs WHERE run_id = '{row['run_id']}'").fetchone()
+    assert query_stats.current() is None
+
+    shapes = {r.sql: r for r in log.records}
+    assert shapes["SELECT run_id FROM runs WHERE run_id LIKE ?"].rows == 3
+    assert log.repeated(3) == [("SELECT status FROM runs WHERE run_id = ?", 3)]
+    assert query_stats.check_budget(log, max_queries=100, max_repeats=2) == [
+        "test: 3x SELECT status FROM runs WHERE run_id = ? (max repeats 2)"
+    ]
+    assert query_stats.check_budget(log, max_repeats=3) == []
+
+
+def test_slow_queries_and_histograms(test_db, monkeypatch):
+    from backend.core.config import get_settings
+
+    query_stats.reset_stats()
+    monkeypatch.setattr(get_settings(), "sql_slow_query_ms", 1)
+    with get_conn() as conn:
+        conn.execute(HEAVY_SQL).fetchone()
+
+    [slow] = [q for q in query_stats.slow_queries() if q["sql"].startswith("WITH RECURSIVE")]
+    assert slow["rows"] == 1 and slow["ms"] >= 1
+    assert query_stats.histograms()["other"]["count"] >= 1
+    assert query_stats.top_statements(1)[0]["sql"].startswith("WITH RECURSIVE")
+
+    from backend.api.main import app
+
+    body = TestClient(app).get("/api/v1/ops/queries", headers={"X-Dev-Tenant": "t_default"}).json()
+    assert any(q["sql"].startswith("WITH RECURSIVE") for q in body["slow_queries"])
+    assert body["histograms"]["select"]["buckets"][-1][0] == "+Inf"
+
+
+def test_run_detail_endpoint_stays_within_budget(test_db, query_budget):
+    from backend.api.main import app
+    from tests.conftest import make_run
+
+    run_id = make_run()
+    client = TestClient(app)
+    with query_budget(max_queries=15, max_repeats=2) as log:
+        assert client.get(f"/api/v1/runs/{run_id}", headers={"X-Dev-Tenant": "t_default"}).status_code == 200
+    assert log.count > 0
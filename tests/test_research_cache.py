@@ -0,0 +1,107 @@
+"""Tests for the cross-run research result cache."""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from backend.db.connect import get_conn
+from backend.orchestrator.nodes import research_node
+from backend.services import research_cache
+from tests.conftest import make_run
+
+UNIVERSE = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+
+def _candles(product_id, **_):
+    start = datetime(2026, 1, 1)
+    base = {"BTC-USD": 100.0, "ETH-USD": 50.0, "SOL-USD": 10.0}[product_id]
+    return [
+        {
+            "start_time": (start + timedelta(hours=i)).isoformat() + "Z",
+            "end_time": (start + timedelta(hours=i + 1)).isoformat() + "Z",
+            "open": base + i, "high": base + i + 1, "low": base + i - 1, "close": base + i + 0.5, "volume": 1.0,
+        }
+        for i in range(24)
+    ]
+
+
+def _slow_candles(product_id, **kwargs):
+    time.sleep(0.05)  # keep the first fetch in flight while the other runs arrive
+    return _candles(product_id, **kwargs)
+
+
+def _research_run(intent):
+    """A run with its research node; returns ``(run_id, node_id)``."""
+    run_id = make_run(intent=intent)
+    node_id = f"node_{run_id}"
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO dag_nodes (node_id, run_id, name, node_type, status, started_at)
+               VALUES (?, ?, 'research', 'research', 'RUNNING', datetime('now'))""",
+            (node_id, run_id),
+        )
+        conn.commit()
+    return run_id, node_id
+
+
+def _batches(run_id):
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT symbol, candles_json FROM market_candles_batches WHERE run_id = ? ORDER BY symbol", (run_id,)
+        ).fetchall()
+    return [(r["symbol"], r["candles_json"]) for r in rows]
+
+
+def _tool_calls(run_id):
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT response_json FROM tool_calls WHERE run_id = ? AND tool_name = 'fetch_candles'", (run_id,)
+        ).fetchall()
+    return [json.loads(r["response_json"]) for r in rows]
+
+
+def test_identical_research_is_fetched_once_and_recorded_per_run(test_db, monkeypatch):
+    monkeypatch.setattr(research_node, "RATE_LIMIT_SECONDS", 0)
+    # All three runs in one time bucket, however long they take
+    monkeypatch.setattr(research_cache, "time", SimpleNamespace(time=lambda: 1_800_000_000.0))
+    intent = {"objective": "MOST_PROFITABLE", "universe": UNIVERSE, "lookback_hours": 24}
+    # The same universe in another order is the same question
+    nodes = [_research_run(intent), _research_run(intent), _research_run(dict(intent, universe=UNIVERSE[::-1]))]
+    runs = [run_id for run_id, _ in nodes]
+
+    async def research_all():
+        return await asyncio.gather(*(research_node.execute(run_id, node_id, "t_default") for run_id, node_id in nodes))
+
+    with patch("backend.services.coinbase_market_data.get_candles", side_effect=_slow_candles) as get_candles:
+        outputs = asyncio.run(research_all())
+
+    assert get_candles.call_count == len(UNIVERSE)
+    assert all(o["returns_by_symbol"] == outputs[0]["returns_by_symbol"] for o in outputs)
+
+    # Each run has its own batch rows and tool calls, referencing the one stored series per symbol
+    batches = [_batches(run_id) for run_id in runs]
+    assert [symbol for symbol, _ in batches[0]] == sorted(UNIVERSE)
+    assert batches[0] == batches[1] == batches[2]
+    assert all(ref.startswith("blob:") for _, ref in batches[0])
+    calls = [_tool_calls(run_id) for run_id in runs]
+    assert all(len(c) == len(UNIVERSE) for c in calls)
+    assert sum(all("shared_fetch" in call for call in c) for c in calls) == 2
+
+
+def test_failed_research_is_not_shared(test_db, monkeypatch):
+    monkeypatch.setattr(research_node, "RATE_LIMIT_SECONDS", 0)
+    intent = {"objective": "MOST_PROFITABLE", "universe": UNIVERSE, "lookback_hours": 24}
+
+    with patch("backend.services.coinbase_market_data.get_candles", side_effect=RuntimeError("429 Too Many Requests")):
+        with pytest.raises(ValueError, match="no valid rankings"):
+            asyncio.run(research_node.execute(*_research_run(intent), "t_default"))
+
+    with patch("backend.services.coinbase_market_data.get_candles", side_effect=_candles) as get_candles:
+        output = asyncio.run(research_node.execute(*_research_run(intent), "t_default"))
+
+    assert get_candles.call_count == len(UNIVERSE)
+    assert set(output["returns_by_symbol"]) == set(UNIVERSE)
@@ -0,0 +1,139 @@
+"""Tests for tiered retention and archival."""
+import json
+import os
+from datetime import datetime, timezone
+
+from backend.db import blob_store, retention
+from backend.db.connect import get_conn
+
+TENANT = "t_default"
+NOW = datetime(2026, 6, 15, tzinfo=timezone.utc)
+
+
+def _seed_run():
+    with get_conn() as conn:
+        conn.execute("INSERT OR IGNORE INTO runs (run_id, tenant_id, status) VALUES ('run_old', ?, 'COMPLETED')", (TENANT,))
+        conn.commit()
+
+
+def _event(event_id, ts, payload):
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT INTO run_events (id, run_id, tenant_id, event_type, payload_json, ts) VALUES (?, 'run_old', ?, 'X', ?, ?)",
+            (event_id, TENANT, json.dumps(payload), ts),
+        )
+        conn.commit()
+
+
+def _policy(table):
+    return next(p for p in retention.DEFAULT_POLICIES if p.table == table)
+
+
+def test_old_rows_move_to_monthly_archives_and_read_back(test_db):
+    _seed_run()
+    _event("e1", "2026-01-05 10:00:00", {"n": 1, "text": "x" * 2000})
+    _event("e2", "2026-02-20T08:00:00Z", {"n": 2})
+    _event("e3", "2026-06-10T08:00:00Z", {"n": 3})
+
+    report = retention.run_retention([_policy("run_events")], now=NOW, vacuum_pages=0)
+    assert report["archived"] == 2
+    assert report["tables"][0]["months"] == ["2026-01", "2026-02"]
+    assert [a["month"] for a in retention.list_archives()] == ["2026-01", "2026-02"]
+    assert os.path.dirname(retention.list_archives()[0]["path"]) == os.path.join(os.path.dirname(test_db), "archive")
+
+    with get_conn() as conn:
+        assert [r["id"] for r in conn.execute("SELECT id FROM run_events")] == ["e3"]
+
+    # Archived payloads are stored compressed
+    with get_conn() as conn:
+        conn.execute("ATTACH DATABASE ? AS a", (retention.archive_path("2026-01"),))
+        stored = conn.execute("SELECT payload_json FROM a.run_events WHERE id = 'e1'").fetchone()[0]
+    assert isinstance(stored, bytes) and len(stored) < 2000
+
+    with retention.archive_reader(since="2026-01-01", tables=["run_events"]) as conn:
+        rows = conn.execute("SELECT id, payload_json FROM run_events_all ORDER BY ts").fetchall()
+    assert [r["id"] for r in rows] == ["e1", "e2", "e3"]
+    assert json.loads(rows[0]["payload_json"])["text"] == "x" * 2000
+
+    with retention.archive_reader(since="2026-02", tables=["run_events"]) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM run_events_all").fetchone()[0] == 2
+
+    # Nothing left to move
+    assert retention.run_retention([_policy("run_events")], now=NOW, vacuum_pages=0)["archived"] == 0
+
+
+def test_small_batches_and_blob_payloads(test_db):
+    _seed_run()
+    candles = [{"t": i, "c": 100.0 + i} for i in range(100)]
+    with get_conn() as conn:
+        ref = blob_store.put_json(candles, conn=conn)
+        for i in range(5):
+            conn.execute(
+                """INSERT INTO market_candles_batches (batch_id, run_id, symbol, window, candles_json, query_params_json, ts)
+                   VALUES (?, 'run_old', 'BTC-USD', '1h', ?, '{}', ?)""",
+                (f"b{i}", ref, f"2026-03-0{i + 1}T00:00:00Z"),
+            )
+        conn.commit()
+    assert blob_store.is_ref(ref)
+
+    result = retention.archive_table(_policy("market_candles_batches"), now=NOW, batch_size=2, max_batches=1)
+    assert result["archived"] == 2 and result["blobs_dropped"] == 0  # still referenced
+
+    result = retention.archive_table(_policy("market_candles_batches"), now=NOW, batch_size=2)
+    assert result["archived"] == 3 and result["blobs_dropped"] == 1
+    with get_conn() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
+
+    with retention.archive_reader(tables=["market_candles_batches"]) as conn:
+        rows = conn.execute("SELECT candles_json FROM market_candles_batches_all").fetchall()
+    assert len(rows) == 5
+    assert all(json.loads(r["candles_json"]) == candles for r in rows)
+
+
+def test_policy_overrides_and_incremental_vacuum(test_db, monkeypatch):
+    from backend.core.config import get_settings
+
+    assert retention.parse_retention_days("run_events=7, tool_calls=0,bad,x=y") == {"run_events": 7, "tool_calls": 0}
+    monkeypatch.setattr(get_settings(), "retention_days", "run_events=7,tool_calls=0")
+    policies = {p.table: p for p in retention.get_policies()}
+    assert policies["run_events"].retain_days == 7
+    assert policies["audit_logs"].retain_days == _policy("audit_logs").retain_days
+
+    _seed_run()
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO tool_calls (id, run_id, tool_name, mcp_server, request_json, status, ts)
+               VALUES ('tc1', 'run_old', 'quote', 'coinbase', '{}', 'SUCCESS', '2020-01-01T00:00:00Z')"""
+        )
+        conn.commit()
+    assert retention.archive_table(policies["tool_calls"], now=NOW)["archived"] == 0  # disabled
+
+    assert retention.auto_vacuum_mode() == 0
+    retention.enable_incremental_vacuum()
+    assert retention.auto_vacuum_mode() == 2
+    for i in range(200):
+        _event(f"v{i}", "2026-01-01T00:00:00Z", {"pad": "y" * 500})
+    report = retention.run_retention([policies["run_events"]], now=NOW, vacuum_pages=1000)
+    assert report["archived"] == 200
+    assert report["vacuum"]["freed_pages"] > 0
+    assert retention.last_run() is report
+
+
+def test_epoch_timestamps_and_composite_keys(test_db):
+    old, recent = int(datetime(2025, 11, 3, tzinfo=timezone.utc).timestamp()), int(NOW.timestamp())
+    with get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO price_history (symbol, ts, price, source) VALUES (?, ?, ?, 'ticker')",
+            [("BTC", old, 100.0), ("ETH", old, 10.0), ("BTC", recent, 120.0)],
+        )
+        conn.commit()
+
+    result = retention.archive_table(_policy("price_history"), now=NOW)
+    assert result["archived"] == 2
+    assert result["months"] == ["2025-11"]
+    with get_conn() as conn:
+        assert [r["symbol"] for r in conn.execute("SELECT symbol FROM price_history")] == ["BTC"]
+
+    with retention.archive_reader(since="2025-11", tables=["price_history"]) as conn:
+        rows = conn.execute("SELECT symbol, ts, price FROM price_history_all ORDER BY ts, symbol").fetchall()
+    assert [tuple(r) for r in rows] == [("BTC", old, 100.0), ("ETH", old, 10.0), ("BTC", recent, 120.0)]
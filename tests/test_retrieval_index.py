@@ -0,0 +1,123 @@
+"""Tests for the local BM25 retrieval index (news items + policy documents)."""
+from unittest.mock import patch
+
+from backend.db.connect import get_conn
+from backend.services import retrieval_index
+from backend.services.retrieval_index import (
+    backfill_news,
+    ensure_index,
+    index_document,
+    search,
+    search_news_for_symbols,
+    sync_policy_documents,
+)
+
+
+def _news_item(i, title, summary, published_at, source_id=None):
+    return {
+        "source_id": source_id,
+        "title": title,
+        "summary": summary,
+        "url": f"https://example.com/{i}",
+        "canonical_url": f"https://example.com/{i}",
+        "published_at": published_at,
+        "content_hash": f"hash_{i}",
+        "raw_payload_json": "{}",
+        "lang": "en",
+    }
+
+
+def test_ingestion_indexes_items_incrementally(test_db):
+    from backend.services.news_ingestion import NewsIngestionService
+
+    svc = NewsIngestionService()
+    saved = svc._save_items([
+        _news_item(1, "Bitcoin ETF inflows surge", "BTC demand climbs", "2026-01-02T10:00:00Z"),
+        _news_item(2, "Ethereum upgrade ships", "ETH gas fees fall", "2026-01-02T11:00:00Z"),
+    ])
+    assert saved == 2
+
+    result = search("bitcoin inflows", doc_types=["news"], top_k=5)
+    assert [h.title for h in result.hits][:1] == ["Bitcoin ETF inflows surge"]
+    assert result.latency_ms >= 0
+
+    by_symbol = search_news_for_symbols(["ETH"], since="2026-01-01T00:00:00")
+    assert [h.title for h in by_symbol.hits] == ["Ethereum upgrade ships"]
+
+
+def test_time_window_filters(test_db):
+    with get_conn() as conn:
+        index_document(conn, "n_old", "news", "Solana outage", "SOL halted", "2025-01-01T00:00:00Z", ["SOL"])
+        index_document(conn, "n_new", "news", "Solana recovers", "SOL rallies", "2026-01-01T00:00:00Z", ["SOL"])
+        conn.commit()
+
+    result = search("solana", doc_types=["news"], since="2025-06-01T00:00:00")
+    assert [h.doc_id for h in result.hits] == ["n_new"]
+
+
+def test_reindex_skips_unchanged_content(test_db):
+    with get_conn() as conn:
+        assert index_document(conn, "p1", "policy", "Limits", "Max notional 100") is True
+        assert index_document(conn, "p1", "policy", "Limits", "Max notional 100") is False
+        assert index_document(conn, "p1", "policy", "Limits", "Max notional 200") is True
+        conn.commit()
+    assert [h.body for h in search("notional", doc_types=["policy"]).hits] == ["Max notional 200"]
+
+
+def test_policy_documents_are_searchable(test_db):
+    assert sync_policy_documents() > 0
+    assert sync_policy_documents() == 0  # unchanged settings -> nothing re-indexed
+    result = search("trading policy and risk constraints", doc_types=["policy"], top_k=5)
+    assert result.hits
+    assert all(h.doc_type == "policy" for h in result.hits)
+
+
+def test_index_is_created_once_per_database(test_db):
+    statements = []
+    with get_conn() as conn:
+        ensure_index(conn)
+        conn.set_trace_callback(statements.append)
+        ensure_index(conn)
+    assert not any("CREATE" in s for s in statements)
+
+
+def test_policy_write_syncs_policy_documents(test_db):
+    from fastapi.testclient import TestClient
+
+    from backend.api.main import app
+
+    assert not search("notional", doc_types=["policy"]).hits
+    response = TestClient(app).post(
+        "/api/v1/policies", json={"name": "limits", "policy_json": {}}, headers={"X-Dev-Tenant": "t_default"}
+    )
+    assert response.status_code == 200
+    assert search("notional", doc_types=["policy"]).hits
+
+
+def test_backfill_indexes_existing_rows(test_db):
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO news_items (id, source_id, published_at, url, canonical_url, title, summary,
+               raw_payload_json, content_hash, lang, domain)
+               VALUES ('legacy_1', NULL, '2026-01-03T00:00:00Z', 'u', 'u', 'Dogecoin spikes', '', '{}', 'h', 'en', '')"""
+        )
+        conn.execute(
+            "INSERT INTO news_asset_mentions (item_id, asset_symbol, confidence, method) VALUES ('legacy_1', 'DOGE', 0.9, 'dict')"
+        )
+        conn.commit()
+
+    assert backfill_news() == 1
+    assert backfill_news() == 0
+    assert [h.doc_id for h in search_news_for_symbols(["DOGE"]).hits] == ["legacy_1"]
+
+
+def test_python_bm25_fallback_without_fts(test_db):
+    with get_conn() as conn:
+        index_document(conn, "a", "news", "Bitcoin miners", "bitcoin bitcoin hashrate", "2026-01-01T00:00:00Z")
+        index_document(conn, "b", "news", "Stablecoin rules", "bitcoin mentioned once", "2026-01-01T00:00:00Z")
+        conn.commit()
+
+    with patch.object(retrieval_index, "ensure_index", return_value=False):
+        result = search("bitcoin hashrate", doc_types=["news"])
+    assert result.backend == "python_bm25"
+    assert [h.doc_id for h in result.hits] == ["a", "b"]
@@ -0,0 +1,83 @@
+"""Tests for the per-node run profile (DB / HTTP / LLM / JSON / sleep / loop-blocked time)."""
+import asyncio
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from backend.core import profiling
+from backend.core.profiling import RunProfiler
+from backend.db.connect import get_conn
+
+
+def _handler(request):
+    time.sleep(0.01)
+    return httpx.Response(200, json={"ok": True})
+
+
+async def _node_body():
+    with get_conn() as conn:
+        conn.execute("SELECT COUNT(*) FROM runs").fetchone()
+    profiling.loads(profiling.dumps({"x": list(range(100))}))
+    profiling.sleep(0.01)
+    await profiling.asleep(0.01)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+        await client.get("https://api.exchange.coinbase.com/products")
+        await client.post("https://api.openai.com/v1/chat/completions", json={})
+    time.sleep(0.06)  # blocks the loop
+
+
+def test_node_profile_breaks_down_time_by_category(test_db):
+    profiler = RunProfiler("run_prof")
+
+    async def run():
+        async with profiler.node("research"):
+            await _node_body()
+        await _node_body()  # outside any node: not counted
+
+    asyncio.run(run())
+
+    profile = profiler.to_dict()
+    [node] = profile["nodes"]
+    assert node["node"] == "research"
+    assert node["counts"]["db"] >= 2 and node["db_ms"] > 0
+    assert node["counts"]["json"] == 2
+    assert node["counts"]["sleep"] == 2 and node["sleep_ms"] == 20.0
+    assert node["counts"]["http"] == 1 and node["counts"]["llm"] == 1
+    assert node["http_ms"] >= 10 and node["llm_ms"] >= 10
+    assert set(node["http_by_provider_ms"]) == {"api.exchange.coinbase.com", "api.openai.com"}
+    assert node["loop_blocked_ms"] >= 30
+    assert node["wall_ms"] >= 80
+    assert profile["totals"]["wall_ms"] == node["wall_ms"]
+    assert profiling.current() is None
+
+
+def test_run_telemetry_and_endpoint_expose_the_profile(test_db):
+    from backend.api.main import app
+    from backend.core.telemetry_repo import create_or_update_run_telemetry
+    from backend.orchestrator.runner import _persist_run_profile
+
+    with get_conn() as conn:
+        conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES ('run_prof2', 't_default', 'COMPLETED')")
+        conn.commit()
+
+    profiler = RunProfiler("run_prof2")
+
+    async def run():
+        async with profiler.node("execution"):
+            profiling.sleep(0.005)
+
+    asyncio.run(run())
+    totals = _persist_run_profile("run_prof2", profiler)
+    create_or_update_run_telemetry("run_prof2", "t_default", profile=totals)
+
+    with get_conn() as conn:
+        telemetry = conn.execute("SELECT * FROM run_telemetry WHERE run_id = 'run_prof2'").fetchone()
+    assert telemetry["sleep_ms"] == 5.0
+    assert telemetry["db_ms"] == totals["db_ms"]
+
+    client = TestClient(app)
+    body = client.get("/api/v1/runs/run_prof2/profile", headers={"X-Dev-Tenant": "t_default"}).json()
+    assert body["run_id"] == "run_prof2"
+    assert [n["node"] for n in body["nodes"]] == ["execution"]
+    assert client.get("/api/v1/runs/run_missing/profile", headers={"X-Dev-Tenant": "t_default"}).status_code == 404
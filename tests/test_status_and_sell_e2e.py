@@ -39,6 +39,10 @@ def _tiny_btc_state() -> ExecutableState:
     )
 
 
+async def _fetch_tiny_btc_state(_tenant, refresh=False) -> ExecutableState:
+    return _tiny_btc_state()
+
+
 def _seed_portfolio_snapshot(
     *,
     tenant_id: str = "t_default",
@@ -86,7 +90,7 @@ def test_sell_more_than_holdings_offers_sell_max(test_db, monkeypatch, allow_liv
     conversation_id = _seed_conversation("conv_sell_max")
     _seed_portfolio_snapshot()
 
-    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", lambda _tenant: _tiny_btc_state())
+    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", _fetch_tiny_btc_state)
     monkeypatch.setattr(
         "backend.api.routes.chat._build_product_catalog",
         lambda _symbols: {"BTC-USD": {"is_disabled": False, "trading_disabled": False, "limit_only": False, "cancel_only": False}},
@@ -124,7 +128,7 @@ def test_sell_below_minimum_is_blocked_before_confirm(test_db, monkeypatch, allo
     conversation_id = _seed_conversation("conv_sell_block")
     _seed_portfolio_snapshot()
 
-    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", lambda _tenant: _tiny_btc_state())
+    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", _fetch_tiny_btc_state)
     monkeypatch.setattr(
         "backend.api.routes.chat._build_product_catalog",
         lambda _symbols: {"BTC-USD": {"is_disabled": False, "trading_disabled": False, "limit_only": False, "cancel_only": False}},
@@ -153,7 +157,7 @@ def test_sell_all_dust_blocked_with_preview_guidance(test_db, monkeypatch, allow
     conversation_id = _seed_conversation("conv_sell_dust_preview")
     _seed_portfolio_snapshot()
 
-    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", lambda _tenant: _tiny_btc_state())
+    monkeypatch.setattr("backend.api.routes.chat._fetch_executable_state", _fetch_tiny_btc_state)
     monkeypatch.setattr(
         "backend.api.routes.chat._build_product_catalog",
         lambda _symbols: {"BTC-USD": {"is_disabled": False, "trading_disabled": False, "limit_only": False, "cancel_only": False}},
@@ -0,0 +1,214 @@
+"""Tests for per-tenant SQLite shards and connection routing."""
+import os
+
+import pytest
+
+from backend.core.background_loop import get_background_loop
+from backend.db import blob_store, sharding
+from backend.db.connect import get_canonical_db_path, get_conn, get_current_tenant, tenant_scope
+
+
+@pytest.fixture
+def sharded(test_db, monkeypatch):
+    from backend.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "tenant_sharding", True)
+    sharding.reset_shards()
+    yield
+    sharding.reset_shards()
+
+
+def _create_run(run_id, tenant_id):
+    with get_conn() as conn:
+        conn.execute("INSERT INTO runs (run_id, tenant_id, status) VALUES (?, ?, 'COMPLETED')", (run_id, tenant_id))
+        conn.execute(
+            """INSERT INTO run_events (id, run_id, tenant_id, event_type, payload_json, ts)
+               VALUES (?, ?, ?, 'X', '{}', '2026-01-01T00:00:00Z')""",
+            (run_id + "_e", run_id, tenant_id),
+        )
+        conn.commit()
+
+
+def test_tenant_rows_route_to_their_shard(sharded):
+    with tenant_scope("t_a"):
+        _create_run("run_a", "t_a")
+    with tenant_scope("t_b"):
+        _create_run("run_b", "t_b")
+        with get_conn() as conn:
+            assert [r[0] for r in conn.execute("SELECT run_id FROM runs")] == ["run_b"]
+
+    shard_a = sharding.shard_path("t_a")
+    assert os.path.exists(shard_a) and shard_a != get_canonical_db_path()
+    with get_conn() as conn:  # no tenant in scope: the global DB
+        assert conn.execute("SELECT COUNT(*) FROM runs WHERE run_id IN ('run_a', 'run_b')").fetchone()[0] == 0
+        assert conn.execute("SELECT tenant_id FROM tenant_shards ORDER BY tenant_id").fetchall()[0][0] == "t_a"
+
+    rows = sharding.query_all("SELECT run_id FROM runs WHERE run_id LIKE 'run_%'")
+    assert sorted((r["shard"], r["run_id"]) for r in rows) == [("t_a", "run_a"), ("t_b", "run_b")]
+    assert [s["tenant_id"] for s in sharding.list_shards()] == ["t_a", "t_b"]
+
+
+def test_global_tables_resolve_to_global_db_from_a_shard(sharded):
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT INTO product_catalog (product_id, base_currency, quote_currency, updated_at) VALUES ('BTC-USD', 'BTC', 'USD', 'now')"
+        )
+        conn.execute("INSERT INTO news_sources (id, name, type, url) VALUES ('src', 'Src', 'rss', 'http://x')")
+        conn.execute(
+            """INSERT INTO news_items (id, source_id, published_at, url, canonical_url, title, content_hash)
+               VALUES ('n1', 'src', '2026-01-01', 'http://x/1', 'http://x/1', 'Headline', 'h1')"""
+        )
+        conn.commit()
+
+    with tenant_scope("t_a"):
+        _create_run("run_a", "t_a")
+        with get_conn() as conn:
+            tables = {r[0] for r in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+            assert "product_catalog" not in tables and "runs" in tables
+            assert conn.execute("SELECT base_currency FROM product_catalog").fetchone()[0] == "BTC"
+            # Tenant rows can point at global news items
+            conn.execute("INSERT INTO run_news_evidence (run_id, item_id, role) VALUES ('run_a', 'n1', 'context')")
+            joined = conn.execute(
+                "SELECT n.title FROM run_news_evidence e JOIN news_items n ON n.id = e.item_id WHERE e.run_id = 'run_a'"
+            ).fetchone()
+            assert joined[0] == "Headline"
+            conn.commit()
+        ref = blob_store.put_text("x" * 4096)
+
+    with get_conn() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM blobs WHERE blob_hash = ?", (ref[5:],)).fetchone()[0] == 1
+
+
+def test_background_loop_keeps_the_tenant_in_scope(sharded):
+    async def current():
+        return get_current_tenant()
+
+    with tenant_scope("t_a"):
+        assert get_background_loop().run(current(), timeout=5) == "t_a"
+    assert get_background_loop().run(current(), timeout=5) is None
+
+
+def test_retention_visits_each_shard(sharded):
+    from datetime import datetime, timezone
+
+    from backend.db import retention
+
+    with tenant_scope("t_a"):
+        _create_run("run_a", "t_a")
+    policy = next(p for p in retention.DEFAULT_POLICIES if p.table == "run_events")
+    report = retention.run_retention([policy], now=datetime(2026, 6, 1, tzinfo=timezone.utc), vacuum_pages=0)
+    assert [(t.get("shard"), t["archived"]) for t in report["tables"]] == [(None, 0), ("t_a", 1)]
+    with tenant_scope("t_a"):
+        assert [a["month"] for a in retention.list_archives()] == ["2026-01"]
+        assert os.path.basename(retention.archive_path("2026-01")).startswith("test_enterprise-t_a-")
+
+
+def test_retrieval_search_from_a_shard_uses_the_global_index(sharded):
+    from backend.services import retrieval_index
+
+    with get_conn() as conn:
+        retrieval_index.index_document(conn, "policy_x", "policy", "Position limits", "Max position size is capped")
+        conn.commit()
+
+    with tenant_scope("t_a"):
+        # Writes from tenant code land in the global index too
+        with get_conn() as conn:
+            retrieval_index.index_document(conn, "policy_y", "policy", "Stop losses", "Every position needs a stop")
+            conn.commit()
+        hits = retrieval_index.search("position", doc_types=["policy"], top_k=5)
+        with get_conn() as conn:
+            tables = {r[0] for r in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")}
+
+    if hits.backend != "fts5":
+        pytest.skip("SQLite build without FTS5")
+    assert {h.doc_id for h in hits.hits} == {"policy_x", "policy_y"}
+    assert "retrieval_fts" not in tables
+
+
+def test_migrate_tenant_moves_existing_rows_into_the_shard(test_db, monkeypatch):
+    from backend.core.config import get_settings
+
+    with get_conn() as conn:
+        conn.executemany("INSERT OR IGNORE INTO tenants (tenant_id, name) VALUES (?, ?)", [("t_a", "A"), ("t_b", "B")])
+        conn.commit()
+    _create_run("run_old", "t_a")  # written before sharding was turned on
+    _create_run("run_other", "t_b")
+    with get_conn() as conn:
+        conn.execute(
+            """INSERT INTO dag_nodes (node_id, run_id, name, node_type, status, started_at)
+               VALUES ('node_old', 'run_old', 'research', 'research', 'COMPLETED', datetime('now'))"""
+        )
+        # No tenant_id or foreign key: found through its run
+        conn.execute(
+            """INSERT INTO notification_events (id, created_at, channel, status, action, run_id)
+               VALUES ('notif_old', datetime('now'), 'pushover', 'sent', 'trade_placed', 'run_old')"""
+        )
+        conn.commit()
+
+    monkeypatch.setattr(get_settings(), "tenant_sharding", True)
+    sharding.reset_shards()
+    try:
+        moved = sharding.migrate_tenant("t_a")
+        assert moved["runs"] == 1 and moved["run_events"] == 1 and moved["dag_nodes"] == 1
+        assert moved["notification_events"] == 1
+        with tenant_scope("t_a"):
+            with get_conn() as conn:
+                assert [r[0] for r in conn.execute("SELECT run_id FROM runs")] == ["run_old"]
+                assert conn.execute("SELECT run_id FROM dag_nodes").fetchone()[0] == "run_old"
+                assert conn.execute("SELECT run_id FROM notification_events").fetchone()[0] == "run_old"
+        with get_conn() as conn:
+            remaining = [r[0] for r in conn.execute("SELECT run_id FROM runs WHERE run_id LIKE 'run_%'")]
+            assert remaining == ["run_other"]
+            assert conn.execute("SELECT COUNT(*) FROM dag_nodes WHERE node_id = 'node_old'").fetchone()[0] == 0
+        assert sharding.migrate_tenant("t_a") == {}
+    finally:
+        sharding.reset_shards()
+
+
+def test_migrate_tenant_rolls_back_on_conflicting_rows(test_db, monkeypatch):
+    from backend.core.config import get_settings
+
+    insert_policy = "INSERT INTO policies (policy_id, tenant_id, name, version, policy_json) VALUES (?, 't_a', 'limits', 1, '{}')"
+    with get_conn() as conn:
+        conn.execute("INSERT OR IGNORE INTO tenants (tenant_id, name) VALUES ('t_a', 'A')")
+        conn.execute(insert_policy, ("pol_old",))
+        conn.commit()
+    _create_run("run_old", "t_a")
+
+    monkeypatch.setattr(get_settings(), "tenant_sharding", True)
+    sharding.reset_shards()
+    try:
+        with tenant_scope("t_a"):  # same name and version written to the shard first
+            with get_conn() as conn:
+                conn.execute(insert_policy, ("pol_new",))
+                conn.commit()
+        with pytest.raises(ValueError, match="policies"):
+            sharding.migrate_tenant("t_a")
+        with get_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM policies WHERE policy_id = 'pol_old'").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM runs WHERE run_id = 'run_old'").fetchone()[0] == 1
+        with tenant_scope("t_a"):
+            with get_conn() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+    finally:
+        sharding.reset_shards()
+
+
+def test_request_tenant_binding_is_reset_after_the_request():
+    import asyncio
+
+    from backend.api.middleware.tenant_context import TenantContextMiddleware
+    from backend.db.connect import set_current_tenant
+
+    seen = []
+
+    async def app(scope, receive, send):
+        set_current_tenant("t_a")  # what the auth dependency does
+        seen.append(get_current_tenant())
+
+    async def request():
+        await TenantContextMiddleware(app)({"type": "http"}, None, None)
+        return get_current_tenant()
+
+    assert asyncio.run(request()) is None
+    assert seen == ["t_a"]